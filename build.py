@@ -27,6 +27,7 @@ import bz2
 import tarfile
 import tempfile
 import datetime
+import time
 import shlex
 import textwrap
 import warnings
@@ -35,9 +36,9 @@ from pathlib import Path
 from shutil import which
 
 try:
-    from setuptools.modified import newer, newer_group
+    from setuptools.modified import newer
 except ImportError:
-    from distutils.dep_util import newer, newer_group
+    from distutils.dep_util import newer
 
 from buildtools.config  import Config, msg, opj, posixjoin, loadETG, etg2sip, findCmd, \
                                phoenixDir, wxDir, copyIfNewer, copyFile, \
@@ -47,6 +48,7 @@ from buildtools.config  import Config, msg, opj, posixjoin, loadETG, etg2sip, fi
                                TemporaryDirectory, getMSVCInfo, generateVersionFiles
 
 import buildtools.version as version
+from buildtools.manifest import BuildManifest
 
 
 
@@ -80,6 +82,9 @@ baseName = version.PROJECT_NAME
 eggInfoName = baseName + '.egg-info'
 defaultMask='%s-%s*' % (baseName, version.VER_MAJOR)
 
+# The content hashes of the inputs and outputs of the etg and sip commands
+BUILD_MANIFEST = 'build/manifest.json'
+
 pyICON = 'packaging/docset/Vippi-blocks-icon-32.png'
 wxICON = 'packaging/docset/mondrian.png'
 
@@ -119,7 +124,9 @@ Usage: ./build.py [command(s)] [options]
       touch         'touch' the etg files so they will all get run the next
                     time the etg command is run.
       etg           Run the ETG scripts that are out of date to update their
-                    SIP files and their Sphinx input files
+                    SIP files and their Sphinx input files. Use --jobs to
+                    run them in parallel, and --no_doxy_cache to parse all
+                    of the Doxygen XML again
       sip           Run sip to generate the C++ wrapper source
 
       wxlib         Build the Sphinx input files for wx.lib
@@ -453,6 +460,7 @@ def makeOptionParser():
         ("unicode",        (True,  "Build wxPython with unicode support (always on for wx2.9+)")),
         (("v", "verbose"), (False, "Print out more information during the build.")),
         ("nodoc",          (False, "Do not run the default docs generator")),
+        ("no_doxy_cache",  (False, "Do not use the cache of items parsed from the Doxygen XML in the etg command")),
         ("upload",         (False, "Upload bdist and/or sdist packages to snapshot server.")),
         ("cairo",          (False, "Allow Cairo use with wxGraphicsContext (Windows only)")),
         ("x64",            (False, "Use and build for the 64bit version of Python on Windows")),
@@ -1136,6 +1144,8 @@ def cmd_etg(options, args):
     flags = '--sip'
     if options.nodoc:
         flags += ' --nodoc'
+    if options.no_doxy_cache:
+        flags += ' --nocache'
 
     # get the files to run, moving _core the to the front of the list
     etgfiles = sorted(glob.glob(opj('etg', '_*.py')))
@@ -1144,6 +1154,11 @@ def cmd_etg(options, args):
         etgfiles.remove(core_file)
         etgfiles.insert(0, core_file)
 
+    # find the scripts to run, only those with any dependencies changed
+    # since their sip file was made
+    manifest = getBuildManifest()
+    steps = dict()  # script --> (dependencies, outputs)
+    torun = []
     for script in etgfiles:
         sipfile = etg2sip(script)
         deps = [script]
@@ -1155,9 +1170,87 @@ def cmd_etg(options, args):
         if hasattr(ns, 'OTHERDEPS'):
             deps += ns.OTHERDEPS
 
-        # run the script only if any dependencies are newer
-        if newer_group(deps, sipfile):
-            runcmd('"%s" %s %s' % (PYTHON, script, flags))
+        if script in steps:
+            continue
+        steps[script] = (deps, [sipfile])
+        if manifest.isChanged('etg:' + script, deps, [sipfile]):
+            torun.append(script)
+
+    timings = []
+    def scriptDone(script, elapsed):
+        timings.append((elapsed, script))
+        msg('%s: %.1fs' % (script, elapsed))
+        deps, outputs = steps[script]
+        manifest.update('etg:' + script, deps, outputs)
+
+    jobs = int(options.jobs) if options.jobs else 1
+    try:
+        if jobs <= 1:
+            for script in torun:
+                start = time.perf_counter()
+                runcmd('"%s" %s %s' % (PYTHON, script, flags))
+                scriptDone(script, time.perf_counter() - start)
+        else:
+            # _core is run first, by itself, as the other modules depend on it
+            if core_file in torun:
+                torun.remove(core_file)
+                _runETGScripts([core_file], flags, 1, scriptDone)
+            _runETGScripts(torun, flags, jobs, scriptDone)
+    finally:
+        # keep the scripts that were done, even if one of them failed
+        manifest.save()
+
+    if len(timings) > 1:
+        msg('Slowest ETG scripts:')
+        for elapsed, script in sorted(timings, reverse=True)[:10]:
+            msg('  %6.1fs  %s' % (elapsed, script))
+
+
+def getBuildManifest():
+    return BuildManifest(opj(phoenixDir(), BUILD_MANIFEST))
+
+
+def _runETGScript(script, flags):
+    # Run an ETG script, returning its exit code, output and run time
+    start = time.perf_counter()
+    sp = subprocess.run('"%s" %s %s' % (PYTHON, script, flags), shell=True,
+                        env=os.environ, stdout=subprocess.PIPE,
+                        stderr=subprocess.STDOUT)
+    output = sp.stdout.decode('cp1252' if sys.platform == 'win32' else 'utf-8',
+                              errors='replace')
+    return sp.returncode, output.rstrip(), time.perf_counter() - start
+
+
+def _runETGScripts(scripts, flags, jobs, scriptDone):
+    """
+    Run the ETG scripts in parallel, each in its own Python process. The
+    output of each script is printed when it is done, then scriptDone is
+    called with the script and its run time if it succeeded.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(_runETGScript, script, flags): script
+                   for script in scripts}
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            script = futures[future]
+            rval, output, elapsed = future.result()
+            msg('"%s" %s %s' % (PYTHON, script, flags))
+            if output:
+                print(output)
+            if rval:
+                print("Command '%s' failed with exit code %d." % (script, rval))
+                failed.append(script)
+                # don't start the scripts that are still waiting
+                for f in futures:
+                    f.cancel()
+            else:
+                scriptDone(script, elapsed)
+    if failed:
+        sys.exit(1)
 
 
 def cmd_sphinx(options, args):
@@ -1308,21 +1401,22 @@ def cmd_sip(options, args):
         modules.remove(core_file)
         modules.insert(0, core_file)
 
+    manifest = getBuildManifest()
     for src_name in modules:
         tmpdir = tempfile.mkdtemp()
         tmpdir = tmpdir.replace('\\', '/')
         src_name = src_name.replace('\\', '/')
         base = os.path.basename(os.path.splitext(src_name)[0])
         sbf = posixjoin(cfg.ROOT_DIR, cfg.SIPOUT, base) + '.sbf'
-        pycode = base[1:] # remove the leading _
-        pycode = opj(cfg.ROOT_DIR, cfg.PKGDIR, pycode) + '.py'
+        pycodeFile = base[1:] # remove the leading _
+        pycodeFile = opj(cfg.ROOT_DIR, cfg.PKGDIR, pycodeFile) + '.py'
 
-        # Check if any of the included files are newer than the .sbf file
-        # produced by the previous run of sip. If not then we don't need to
-        # run sip again.
+        # Check if any of the included files have changed since the previous
+        # run of sip, or if its output is missing. If not then we don't need
+        # to run sip again.
         etg = loadETG(posixjoin('etg', base + '.py'))
         sipFiles = getSipFiles(etg.INCLUDES) + [opj(cfg.SIPGEN, base+'.sip')]
-        if not newer_group(sipFiles, sbf) and os.path.exists(pycode):
+        if not manifest.isChanged('sip:' + base, sipFiles, [sbf, pycodeFile]):
             continue
 
         # Leave it turned off for now. TODO: Experiment with this...
@@ -1331,7 +1425,7 @@ def cmd_sip(options, args):
 
         # SIP extracts are used to pull python snippets and put them into the
         # module's .py file
-        pycode = 'pycode'+base+':'+pycode
+        pycode = 'pycode'+base+':'+pycodeFile
 
         # Write out a pyproject.toml to configure sip
         pyproject_toml = textwrap.dedent("""\
@@ -1378,7 +1472,9 @@ def cmd_sip(options, args):
         header = min(glob.glob('*.h'))
         sources = sorted(glob.glob('*.cpp'))
         del sip_pwd
-        Path(sbf).write_text(f"sources = {' '.join(sources)}\nheaders = {header}\n")
+        sbfTxt = f"sources = {' '.join(sources)}\nheaders = {header}\n"
+        if not os.path.exists(sbf) or Path(sbf).read_text() != sbfTxt:
+            Path(sbf).write_text(sbfTxt)
         classesNeedingClassInfo = { 'sip_corewxTreeCtrl.cpp' : 'wxTreeCtrl', }
 
         def processSrc(src, keepHashLines=False):
@@ -1437,6 +1533,10 @@ def cmd_sip(options, args):
         # Remove tmpdir and its contents
         shutil.rmtree(tmpdir)
 
+        manifest.update('sip:' + base, sipFiles, [sbf, pycodeFile])
+        manifest.save()
+    manifest.save()     # for the modules recorded without running sip
+
     # Generate sip module code
     deleteIfExists(cfg.SIPINC)
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -1462,6 +1562,11 @@ def cmd_touch(options, args):
     etg = Path('etg')
     for item in sorted(etg.glob('*.py')):
         item.touch()
+    # the etg command only looks at the contents of the files, so make it
+    # forget that the scripts were run
+    manifest = getBuildManifest()
+    manifest.forget('etg:')
+    manifest.save()
     cmd_touch_others(options, args)
 
 
@@ -2144,6 +2249,11 @@ def cmd_cleanall(options, args):
     for wc in ['sip/cpp/*.h', 'sip/cpp/*.cpp', 'sip/cpp/*.sbf', 'sip/gen/*.sip']:
         files += sorted(glob.glob(wc))
     delFiles(files)
+    # and the items cached from the Doxygen XML by the ETG scripts, and the
+    # record of the files used by the etg and sip commands
+    deleteIfExists(opj('build', 'doxycache'))
+    if os.path.exists(BUILD_MANIFEST):
+        delFiles([BUILD_MANIFEST])
 
     cmd_clean_docker(options, args)
 
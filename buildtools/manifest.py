@@ -0,0 +1,142 @@
+#----------------------------------------------------------------------
+# Name:        buildtools.manifest
+# Purpose:     A record of the content hashes of the inputs and outputs
+#              of the build steps, used to skip the steps whose inputs
+#              have not changed.
+#
+# Created:     18-Oct-2026
+# License:     wxWindows License
+#----------------------------------------------------------------------
+
+"""
+The build manifest remembers, for each ETG script and SIP module, the SHA-1
+of the files it was last run with and of the files it produced. A step only
+needs to run again if one of its inputs has different contents, or if one
+of its outputs is missing or was changed since then. Touching a file, or
+switching to a git branch with the same file contents, does not cause a
+rebuild.
+
+The hashes of the files are also kept with their size and modification
+time, so a file is only read again when one of those has changed.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+
+try:
+    from setuptools.modified import newer_group
+except ImportError:
+    from distutils.dep_util import newer_group
+
+# Bump this when the format of the manifest changes
+MANIFEST_VERSION = 1
+
+#----------------------------------------------------------------------
+
+class BuildManifest(object):
+    """
+    The content hashes of the inputs and outputs of the build steps, stored
+    in a JSON file. Each step is identified by a key like ``'etg:etg/_core.py'``
+    or ``'sip:_core'``.
+    """
+    def __init__(self, fileName):
+        self.fileName = fileName
+        self.steps = dict()     # key --> dict(inputs={name: hash}, outputs={name: hash})
+        self.hashes = dict()    # name --> [size, mtime_ns, hash]
+        self.modified = False
+        if os.path.exists(fileName):
+            try:
+                with open(fileName, 'rt') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    self.steps = data['steps']
+                    self.hashes = data['hashes']
+            except ValueError:
+                # a damaged manifest, just start a new one
+                pass
+
+
+    def fileHash(self, name):
+        """
+        Returns the SHA-1 of the contents of the file, or None if it doesn't
+        exist.
+        """
+        try:
+            st = os.stat(name)
+        except OSError:
+            return None
+        cached = self.hashes.get(name)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        with open(name, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        self.hashes[name] = [st.st_size, st.st_mtime_ns, digest]
+        self.modified = True
+        return digest
+
+
+    def _hashes(self, names):
+        return {name: self.fileHash(name) for name in sorted(set(names))}
+
+
+    def isChanged(self, key, inputs, outputs):
+        """
+        Returns True if the step needs to run: any of its inputs has changed
+        since it was last run, or any of its outputs is missing or was changed.
+        If the step is not in the manifest yet the modification times are
+        compared instead, like before, and the step is recorded if it is up
+        to date.
+        """
+        step = self.steps.get(key)
+        if step is None:
+            if any(not os.path.exists(out) or newer_group(inputs, out)
+                   for out in outputs):
+                return True
+            self.update(key, inputs, outputs)
+            return False
+
+        if step['inputs'] != self._hashes(inputs):
+            return True
+        outputHashes = self._hashes(outputs)
+        if None in outputHashes.values() or step['outputs'] != outputHashes:
+            return True
+        return False
+
+
+    def update(self, key, inputs, outputs):
+        """
+        Record the hashes of the inputs and outputs of a step that was just run.
+        """
+        self.steps[key] = dict(inputs=self._hashes(inputs),
+                               outputs=self._hashes(outputs))
+        self.modified = True
+
+
+    def forget(self, prefix=''):
+        """
+        Remove the steps whose key starts with prefix, so they will be run the
+        next time.
+        """
+        for key in [key for key in self.steps if key.startswith(prefix)]:
+            del self.steps[key]
+            self.modified = True
+
+
+    def save(self):
+        if not self.modified:
+            return
+        dirName = os.path.dirname(os.path.abspath(self.fileName))
+        if not os.path.exists(dirName):
+            os.makedirs(dirName)
+        data = dict(version=MANIFEST_VERSION, steps=self.steps, hashes=self.hashes)
+        # write to a temporary file and rename it, so an interrupted build
+        # doesn't leave a partly written manifest
+        fd, tmpName = tempfile.mkstemp(dir=dirName, suffix='.tmp')
+        with os.fdopen(fd, 'wt') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmpName, self.fileName)
+        self.modified = False
+
+#----------------------------------------------------------------------
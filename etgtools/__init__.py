@@ -20,12 +20,14 @@ sys.path.insert(0, os.path.abspath(os.path.split(__file__)[0]+'/..'))
 
 from buildtools.config import Config
 from .extractors import *
+from . import extractors, doxy_cache
 
 #---------------------------------------------------------------------------
 cfg = Config(noWxConfig=True)
 
 phoenixRoot = cfg.ROOT_DIR
 XMLSRC = cfg.DOXY_XML_DIR
+DOXYCACHE = os.path.join(cfg.ROOT_DIR, 'build', 'doxycache')
 
 class DoxyXMLError(Exception):
     pass
@@ -42,6 +44,10 @@ def parseDoxyXML(module, class_or_filename_list):
     If a name in the list a wx class name then the Doxygen XML filename is
     calculated from that name, otherwise it is treated as a filename in the
     Doxygen XML output folder.
+
+    The extracted items are cached in DOXYCACHE, and taken from there when
+    none of the XML files they came from has changed, unless --nocache is
+    given on the command line.
     """
 
     def _classToDoxyName(name, attempts, base='class'):
@@ -66,6 +72,16 @@ def parseDoxyXML(module, class_or_filename_list):
             name = 'interface_2wx_2' + name
             return os.path.join(XMLSRC, name) + '.xml', name + '.xml'
 
+    cache = None
+    if not module.items and doxy_cache.enabled():
+        # only a module with no items yet can be cached, as the items
+        # extracted depend on the ones already in the module
+        cache = doxy_cache.DoxyCache(DOXYCACHE, class_or_filename_list)
+        if cache.load(module, class_or_filename_list):
+            module.parseCompleted()
+            return
+    extractors.xmlFilesParsed.clear()
+
     for class_or_filename in class_or_filename_list:
         attempts = []
         pathname = _classToDoxyName(class_or_filename, attempts)
@@ -85,7 +101,7 @@ def parseDoxyXML(module, class_or_filename_list):
             print("Loading %s..." % pathname)
         _filesparsed.add(pathname)
 
-        root = ET.parse(pathname).getroot()
+        root = parseXMLFile(pathname)
         for element in root:
             # extract and add top-level elements from the XML document
             item = module.addElement(element)
@@ -108,6 +124,8 @@ def parseDoxyXML(module, class_or_filename_list):
 
         _filesparsed.clear()
 
+    if cache is not None:
+        cache.save(module, class_or_filename_list, extractors.xmlFilesParsed)
     module.parseCompleted()
 
 #---------------------------------------------------------------------------
@@ -0,0 +1,140 @@
+#---------------------------------------------------------------------------
+# Name:        etgtools/doxy_cache.py
+#
+# Created:     18-Oct-2026
+# License:     wxWindows License
+#---------------------------------------------------------------------------
+
+"""
+A disk cache of the items extracted from the Doxygen XML files, so the ETG
+scripts don't need to parse the XML again when it has not changed.
+
+An entry is stored for each list of items given to parseDoxyXML. It holds the
+pickled items, before any tweaking is done, and the hash of every XML file
+that was read to extract them. The entry is only used if all of those files
+still have the same hash, and if the extractors code has not changed since it
+was written.
+"""
+
+import sys
+import os
+import io
+import hashlib
+import pickle
+import tempfile
+
+from . import extractors
+
+# Bump this to invalidate all the cached entries
+CACHE_VERSION = 1
+
+#---------------------------------------------------------------------------
+
+def enabled():
+    return '--nocache' not in sys.argv
+
+
+def fileDigest(pathname):
+    with open(pathname, 'rb') as fid:
+        return hashlib.sha1(fid.read()).hexdigest()
+
+
+def codeDigest():
+    """
+    A digest of the code that makes the extracted items, so entries written
+    by an older version of that code are not used.
+    """
+    sha = hashlib.sha1(str(CACHE_VERSION).encode())
+    folder = os.path.dirname(__file__)
+    for name in ['extractors.py', 'tweaker_tools.py']:
+        sha.update(fileDigest(os.path.join(folder, name)).encode())
+    return sha.hexdigest()
+
+
+class _Pickler(pickle.Pickler):
+    # The items refer to the module they were added to, which is not cached.
+    # It is replaced by the module being loaded when the items are unpickled.
+    def __init__(self, fid, module):
+        super(_Pickler, self).__init__(fid, pickle.HIGHEST_PROTOCOL)
+        self.module = module
+
+    def persistent_id(self, obj):
+        if obj is self.module:
+            return 'module'
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, fid, module):
+        super(_Unpickler, self).__init__(fid)
+        self.module = module
+
+    def persistent_load(self, pid):
+        assert pid == 'module'
+        return self.module
+
+
+class DoxyCache(object):
+    """
+    The cache entry for one list of Doxygen XML items. Its name is made from
+    the names of the items and the digest of the extractors code.
+    """
+    def __init__(self, cacheDir, names):
+        self.cacheDir = cacheDir
+        key = '\n'.join([codeDigest()] + list(names))
+        self.fileName = os.path.join(cacheDir,
+                                     hashlib.sha1(key.encode()).hexdigest() + '.pkl')
+
+
+    def load(self, module, names):
+        """
+        Add the cached items to the module, if the entry exists and none of
+        the XML files it was made from has changed. The include files found
+        while parsing are appended to names, as parseDoxyXML does. Returns
+        True if the cached items were used.
+        """
+        if not os.path.isfile(self.fileName):
+            return False
+        try:
+            with open(self.fileName, 'rb') as fid:
+                files, allNames, data = pickle.load(fid)
+            for pathname, digest in files:
+                if not os.path.isfile(pathname) or fileDigest(pathname) != digest:
+                    return False
+            items = _Unpickler(io.BytesIO(data), module).load()
+        except Exception as e:
+            # a corrupted or incompatible entry, it will be written again
+            print("Ignoring Doxygen parse cache entry %s: %s" % (self.fileName, e))
+            return False
+
+        if extractors.verbose():
+            print("Loaded %d items from %s" % (len(items), self.fileName))
+        module.items.extend(items)
+        names[:] = allNames
+        return True
+
+
+    def save(self, module, names, files):
+        """
+        Write the items of the module to the cache, with the digests of the
+        XML files that were parsed to extract them.
+        """
+        try:
+            buf = io.BytesIO()
+            _Pickler(buf, module).dump(module.items)
+            files = [(pathname, fileDigest(pathname)) for pathname in sorted(files)]
+            entry = pickle.dumps((files, list(names), buf.getvalue()),
+                                 pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print("Unable to cache the Doxygen items of %s: %s" % (module.name, e))
+            return
+
+        # Write to a temporary file and rename it, so ETG scripts running in
+        # parallel never see a partly written entry.
+        os.makedirs(self.cacheDir, exist_ok=True)
+        fd, tmpName = tempfile.mkstemp(dir=self.cacheDir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as fid:
+            fid.write(entry)
+        os.replace(tmpName, self.fileName)
+
+#---------------------------------------------------------------------------
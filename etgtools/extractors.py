@@ -767,7 +767,7 @@ class ClassDef(BaseDef):
                 return all_classes, specials
 
             fname = os.path.join(XMLSRC, refid+'.xml')
-            root = ET.parse(fname).getroot()
+            root = parseXMLFile(fname)
             compounds = findDescendants(root, 'basecompoundref')
         else:
             compounds = element.findall('basecompoundref')
@@ -810,7 +810,7 @@ class ClassDef(BaseDef):
             from etgtools import XMLSRC
             ref = node.get('refid')
             fname = os.path.join(XMLSRC, ref+'.xml')
-            root = ET.parse(fname).getroot()
+            root = parseXMLFile(fname)
             innerclass = root[0]
             kind = innerclass.get('kind')
             assert kind in ['class', 'struct']
@@ -1630,7 +1630,7 @@ class ModuleDef(BaseDef):
         from etgtools import XMLSRC
         refid = node.get('refid')
         fname = os.path.join(XMLSRC, refid.rsplit('_', 1)[0]) + '.xml'
-        root = ET.parse(fname).getroot()
+        root = parseXMLFile(fname)
         return root.find(".//memberdef[@id='{}']".format(refid))
 
 
@@ -1801,6 +1801,18 @@ def _pf(item, indent):
     return txt
 
 
+def parseXMLFile(pathname):
+    """
+    Parse a Doxygen XML file and return its root element. The names of the
+    files parsed are collected in xmlFilesParsed, so the parse cache can tell
+    which files the extracted items depend on.
+    """
+    xmlFilesParsed.add(pathname)
+    return ET.parse(pathname).getroot()
+
+xmlFilesParsed = set()
+
+
 def verbose():
     return '--verbose' in sys.argv
 
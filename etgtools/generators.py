@@ -12,6 +12,7 @@ Just some base classes and stubs for the various generators
 """
 
 import sys
+import os
 
 #---------------------------------------------------------------------------
 
@@ -113,5 +114,20 @@ def textfile_open(filename, mode='rt'):
     return open(filename, mode, encoding='utf-8')
 
 
+def writeIfChanged(filename, text):
+    """
+    Write text to the file, unless it already has the same contents. This
+    keeps the modification time of generated files that didn't change, so
+    the later build steps don't need to process them again.
+    """
+    if os.path.exists(filename):
+        with textfile_open(filename, 'rt') as f:
+            if f.read() == text:
+                return False
+    with textfile_open(filename, 'wt') as f:
+        f.write(text)
+    return True
+
+
 #---------------------------------------------------------------------------
 
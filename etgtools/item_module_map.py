@@ -23,6 +23,7 @@ import json
 # Phoenix imports
 from .generators import textfile_open
 from sphinxtools.constants import SPHINXROOT
+from sphinxtools.utilities import FileLock
 
 # ---------------------------------------------------------------------------
 
@@ -70,11 +71,17 @@ class ItemModuleMap(object):
     def flush(self):
         if not self._haveReadData and not self._items:
             return
-        with textfile_open(self.fileName, 'wt') as fid:
-            # Dump the data to a file in json, using a format that minimizes
-            # excess whitespace.
-            json.dump(self._items, fid, sort_keys=True,
-                      indent=0, separators=(',', ':'))
+        with FileLock(self.fileName):
+            # Other ETG scripts running at the same time may have added their
+            # items since we read the file, so merge ours with the current ones.
+            items = dict(self._items)
+            self.read()
+            self._items.update(items)
+            with textfile_open(self.fileName, 'wt') as fid:
+                # Dump the data to a file in json, using a format that minimizes
+                # excess whitespace.
+                json.dump(self._items, fid, sort_keys=True,
+                          indent=0, separators=(',', ':'))
 
 
     def reset(self):
@@ -25,7 +25,7 @@ import sys, os, re
 from typing import Optional, Union
 import etgtools.extractors as extractors
 import etgtools.generators as generators
-from etgtools.generators import nci, Utf8EncodingStream, textfile_open
+from etgtools.generators import nci, Utf8EncodingStream, textfile_open, writeIfChanged
 from etgtools.tweaker_tools import FixWxPrefix, magicMethods, \
                                    guessTypeInt, guessTypeFloat, guessTypeStr
 
@@ -184,8 +184,7 @@ class PiWrapperGenerator(generators.WrapperGeneratorBase, FixWxPrefix):
             # replace the existing lines
             lines[sectionBeginLine+1:sectionEndLine] = [sectionText]
 
-        with textfile_open(destFile, 'wt') as f:
-            f.writelines(lines)
+        writeIfChanged(destFile, ''.join(lines))
 
     #-----------------------------------------------------------------------
     def generateModule(self, module, stream):
@@ -15,7 +15,7 @@ objects produced by the ETG scripts.
 import sys, os, re
 import etgtools.extractors as extractors
 import etgtools.generators as generators
-from etgtools.generators import nci, Utf8EncodingStream, textfile_open, wrapText
+from etgtools.generators import nci, Utf8EncodingStream, textfile_open, writeIfChanged, wrapText
 
 
 from buildtools.config import Config
@@ -48,8 +48,7 @@ class SipWrapperGenerator(generators.WrapperGeneratorBase):
         # Write the contents of the stream to the destination file
         if not destFile:
             destFile = os.path.join(phoenixRoot, 'sip/gen', module.name + '.sip')
-        with textfile_open(destFile, 'wt') as f:
-            f.write(stream.getvalue())
+        writeIfChanged(destFile, stream.getvalue())
 
     #-----------------------------------------------------------------------
     def generateModule(self, module, stream):
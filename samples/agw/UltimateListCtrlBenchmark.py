@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""
+Benchmarks of UltimateListCtrl in report mode with variable row heights.
+
+The first benchmark doesn't need a window: it compares finding the y
+position of lines, and the first line shown at a scroll position, with
+the LineHeightIndex against summing the heights of the lines above.
+
+The second one fills a ULC_REPORT | ULC_HAS_VARIABLE_ROW_HEIGHT list,
+scrolls it from top to bottom painting each page, then sorts it, and
+inserts and deletes lines in the middle.
+
+Usage:
+
+    python UltimateListCtrlBenchmark.py [number of rows]
+
+"""
+
+import random
+import sys
+import time
+
+import wx
+import wx.lib.agw.ultimatelistctrl as ULC
+
+
+def Heights(N):
+    rnd = random.Random(0)
+    return [rnd.choice((17, 17, 17, 30, 45)) for i in range(N)]
+
+
+def IndexBenchmark(N, lookups=1000):
+    heights = Heights(N)
+    rnd = random.Random(1)
+    lines = [rnd.randrange(N) for i in range(lookups)]
+    total = sum(heights)
+    positions = [rnd.randrange(total) for i in range(lookups)]
+
+    start = time.perf_counter()
+    index = ULC.LineHeightIndex()
+    index.Build(heights)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for line in lines:
+        index.GetY(line)
+    for y in positions:
+        index.FindLine(y)
+    indexed = time.perf_counter() - start
+
+    # what the list did before: sum the heights of the lines above
+    start = time.perf_counter()
+    for line in lines[:lookups // 10]:
+        sum(heights[:line])
+    linear = (time.perf_counter() - start) * 10
+
+    print("LineHeightIndex, %i rows: build %.1f ms, %i lookups %.2f ms "
+          "(linear sums %.0f ms)" % (N, build * 1e3, 2 * lookups,
+                                      indexed * 1e3, 2 * linear * 1e3))
+
+
+class Frame(wx.Frame):
+
+    def __init__(self, N):
+        wx.Frame.__init__(self, None, title="UltimateListCtrl benchmark",
+                          size=(600, 500))
+        self.list = ULC.UltimateListCtrl(self, agwStyle=wx.LC_REPORT |
+                                         ULC.ULC_HAS_VARIABLE_ROW_HEIGHT)
+        self.list.InsertColumn(0, "Row")
+        self.list.InsertColumn(1, "Text")
+        self.list.SetColumnWidth(1, 400)
+        self.N = N
+
+    def Fill(self):
+        rnd = random.Random(0)
+        for i in range(self.N):
+            index = self.list.InsertStringItem(i, str(i))
+            text = "\n".join(["line"] * rnd.choice((1, 1, 1, 2, 3)))
+            self.list.SetStringItem(index, 1, text)
+            self.list.SetItemData(index, rnd.randrange(self.N))
+
+    def Scroll(self):
+        main = self.list._mainWin
+        pages = 0
+        x, y = main.GetViewStart()
+        while True:
+            main.Refresh()
+            main.Update()
+            pages += 1
+            main.Scroll(-1, y + main.GetClientSize().height // ULC.SCROLL_UNIT_Y)
+            if main.GetViewStart()[1] == y:
+                return pages
+            x, y = main.GetViewStart()
+
+    def Sort(self):
+        self.list.SortItems(lambda a, b: (a > b) - (a < b))
+        self.list._mainWin.Update()
+
+    def InsertDelete(self, count=100):
+        middle = self.N // 2
+        for i in range(count):
+            self.list.InsertStringItem(middle, "new")
+            self.list._mainWin.Update()
+        for i in range(count):
+            self.list.DeleteItem(middle)
+            self.list._mainWin.Update()
+
+
+def Time(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def ListBenchmark(N):
+    app = wx.App(False)
+    frame = Frame(N)
+    frame.Show()
+    wx.Yield()
+
+    t, r = Time(frame.Fill)
+    print("Fill %i rows: %.2f s" % (N, t))
+    t, pages = Time(frame.Scroll)
+    print("Scroll %i pages: %.2f s, %.1f ms per page" % (pages, t, t / pages * 1e3))
+    t, r = Time(frame.Sort)
+    print("Sort: %.2f s" % t)
+    t, r = Time(frame.InsertDelete)
+    print("Insert and delete 100 rows: %.2f s" % t)
+
+    frame.Destroy()
+    app.Destroy()
+
+
+if __name__ == "__main__":
+    N = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    IndexBenchmark(N)
+    ListBenchmark(N)
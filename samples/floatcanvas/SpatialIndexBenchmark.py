@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+A benchmark of the FloatCanvas visibility culling.
+
+It compares the linear Bounding Box check done by FloatCanvas._ShouldRedraw
+with a query of the GridIndex used when FloatCanvas.EnableSpatialIndex() is
+turned on, for a viewport that shows a small part of the whole scene.
+
+No window is needed, only the Bounding Boxes of the objects are used.
+
+Usage:
+
+    python SpatialIndexBenchmark.py [N ...]
+
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from wx.lib.floatcanvas.FloatCanvas import FloatCanvas
+from wx.lib.floatcanvas.Utilities import BBox
+from wx.lib.floatcanvas.Utilities.SpatialIndex import GridIndex
+
+
+class BenchObject:
+    """Just enough of a DrawObject for the culling code."""
+    def __init__(self, BB):
+        self.BoundingBox = BB
+
+
+def MakeObjects(N, WorldSize=1000.0, seed=0):
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform(0, WorldSize, (N, 2))
+    wh = rng.exponential(WorldSize / 2000.0, (N, 2))
+    return [BenchObject(BBox.asBBox((p, p + s))) for p, s in zip(xy, wh)]
+
+
+def Time(fun, repeat=5):
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = fun()
+        t = time.perf_counter() - start
+        best = t if best is None else min(best, t)
+    return best, result
+
+
+def Run(N, WorldSize=1000.0):
+    objects = MakeObjects(N, WorldSize)
+    # a viewport showing about 1% of the world
+    ViewPortBB = np.array(((450.0, 450.0), (550.0, 550.0)))
+
+    start = time.perf_counter()
+    Index = GridIndex()
+    for obj in objects:
+        Index.Insert(obj)
+    Index.Rebuild()
+    build = time.perf_counter() - start
+
+    linear, expected = Time(lambda: FloatCanvas._ShouldRedraw(objects, ViewPortBB))
+    indexed, found = Time(lambda: Index.Query(ViewPortBB))
+    assert found == expected
+
+    # pan the viewport by a few steps
+    def pan():
+        for dx in range(0, 50, 5):
+            Index.Query(ViewPortBB + dx)
+    panned, _ = Time(pan, repeat=1)
+
+    print("%9i objects, %6i visible: linear %8.2f ms, index %7.2f ms "
+          "(%6.1fx), 10 pans %7.2f ms, build %7.2f s"
+          % (N, len(found), linear * 1000, indexed * 1000,
+             linear / indexed, panned * 1000, build))
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [10000, 100000, 1000000]
+    for N in sizes:
+        Run(N)
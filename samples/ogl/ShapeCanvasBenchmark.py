@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+Benchmark of wx.lib.ogl.ShapeCanvas scrolling on a large diagram.
+
+A canvas with a 50000 x 50000 virtual size is filled with shapes and
+lines, then scrolled down in small steps, and across the diagram a page
+at a time, painting after each step. For each buffer mode it prints the
+memory used by the buffer bitmaps and the time taken by the scrolls.
+
+The default mode allocates a bitmap of the virtual size of the canvas,
+which is skipped when it would take more than 1 GB. Give a smaller
+virtual size to compare both modes.
+
+Usage:
+
+    python ShapeCanvasBenchmark.py [number of shapes] [virtual size]
+
+"""
+
+import random
+import sys
+import time
+
+import wx
+import wx.lib.ogl as ogl
+
+SCROLL_UNIT = 10
+MAX_VIRTUAL_BYTES = 1024 * 1024 * 1024
+
+
+class Frame(wx.Frame):
+
+    def __init__(self, N, size, viewport):
+        wx.Frame.__init__(self, None, title="ShapeCanvas benchmark",
+                          size=(1000, 800))
+        self.canvas = ogl.ShapeCanvas(self)
+        self.canvas.SetBackgroundColour(wx.WHITE)
+        self.canvas.SetViewportBuffer(viewport)
+        self.diagram = ogl.Diagram()
+        self.canvas.SetDiagram(self.diagram)
+        self.diagram.SetCanvas(self.canvas)
+        self.canvas.SetScrollbars(SCROLL_UNIT, SCROLL_UNIT,
+                                  size // SCROLL_UNIT, size // SCROLL_UNIT)
+        self.N = N
+        self.size = size
+
+    def Fill(self):
+        rnd = random.Random(0)
+        shapes = []
+        for i in range(self.N):
+            if i % 2:
+                shape = ogl.RectangleShape(rnd.randrange(40, 120), rnd.randrange(30, 80))
+            else:
+                shape = ogl.CircleShape(rnd.randrange(30, 80))
+            shape.SetCanvas(self.canvas)
+            shape.SetX(rnd.randrange(100, self.size - 100))
+            shape.SetY(rnd.randrange(100, self.size - 100))
+            shape.SetBrush(wx.Brush(wx.Colour(rnd.randrange(256), rnd.randrange(256), 200)))
+            shape.AddText("Shape %i" % i)
+            self.diagram.AddShape(shape)
+            shape.Show(True)
+            shapes.append(shape)
+
+        # link each shape to a close one
+        shapes.sort(key=lambda shape: (shape.GetY() // 500, shape.GetX()))
+        dc = wx.MemoryDC(self.canvas.GetBuffer())
+        self.canvas.PrepareDC(dc)
+        for fromShape, toShape in zip(shapes[::2], shapes[1::2]):
+            line = ogl.LineShape()
+            line.SetCanvas(self.canvas)
+            line.SetPen(wx.BLACK_PEN)
+            line.SetBrush(wx.BLACK_BRUSH)
+            line.AddArrow(ogl.ARROW_ARROW)
+            line.MakeLineControlPoints(2)
+            fromShape.AddLine(line, toShape)
+            self.diagram.AddShape(line)
+            line.Show(True)
+            fromShape.MoveLinks(dc)
+        dc.SelectObject(wx.NullBitmap)
+
+        self.canvas.AddDamage()
+        self.canvas.Draw()
+        self.canvas.Update()
+
+    def ScrollTo(self, positions):
+        times = []
+        for x, y in positions:
+            start = time.perf_counter()
+            self.canvas.Scroll(x, y)
+            self.canvas.Update()
+            times.append(time.perf_counter() - start)
+        return times
+
+    def SmallSteps(self, count=200, step=3):
+        x, y = self.canvas.GetViewStart()
+        return self.ScrollTo([(x, y + step * (i + 1)) for i in range(count)])
+
+    def Pages(self, count=50):
+        w, h = self.canvas.GetClientSize()
+        pageX, pageY = w // SCROLL_UNIT, h // SCROLL_UNIT
+        x, y = self.canvas.GetViewStart()
+        return self.ScrollTo([(x + pageX * (i + 1), y + pageY * (i + 1))
+                              for i in range(count)])
+
+    def BufferBytes(self):
+        buffer = self.canvas.GetBuffer()
+        nbytes = buffer.GetWidth() * buffer.GetHeight() * 4
+        if self.canvas.GetViewportBuffer():
+            # the back buffer used to scroll, and the tiles
+            nbytes = 2 * nbytes + self.canvas.GetTileCache().GetBytes()
+        return nbytes
+
+
+def Time(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def Report(name, times):
+    times = sorted(times)
+    print("  %s: %i scrolls, mean %.2f ms, median %.2f ms, max %.2f ms"
+          % (name, len(times), sum(times) / len(times) * 1e3,
+             times[len(times) // 2] * 1e3, times[-1] * 1e3))
+
+
+def CanvasBenchmark(N, size, viewport):
+    print("%s buffer, %i x %i virtual size, %i shapes:"
+          % ("Viewport" if viewport else "Virtual size", size, size, N))
+    if not viewport and size * size * 4 > MAX_VIRTUAL_BYTES:
+        print("  skipped, the buffer would take %i MB" % (size * size * 4 // 2**20))
+        return
+
+    frame = Frame(N, size, viewport)
+    frame.Show()
+    wx.Yield()
+
+    t, r = Time(frame.Fill)
+    print("  fill and first draw: %.2f s" % t)
+    Report("small steps", frame.SmallSteps())
+    Report("pages", frame.Pages())
+    print("  buffer memory: %.1f MB" % (frame.BufferBytes() / 2**20))
+
+    frame.Destroy()
+    wx.Yield()
+
+
+if __name__ == "__main__":
+    N = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    app = wx.App(False)
+    ogl.OGLInitialize()
+    CanvasBenchmark(N, size, True)
+    CanvasBenchmark(N, size, False)
+    app.Destroy()
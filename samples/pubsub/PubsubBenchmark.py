@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Micro-benchmarks of wx.lib.pubsub sendMessage().
+
+Each benchmark sends messages through a fresh Publisher, for a few shapes
+of topic tree: a topic with no listener, with one or many listeners, a
+deep topic whose parents have listeners, topic names given as tuples,
+and a send with a notification handler registered.
+
+Usage:
+
+    python PubsubBenchmark.py [number of messages]
+
+"""
+
+import sys
+import time
+import warnings
+
+with warnings.catch_warnings():
+    warnings.simplefilter('ignore')
+    from wx.lib.pubsub.core import Publisher
+    from wx.lib.pubsub.utils.notification import IgnoreNotificationsMixin
+
+
+class Counter:
+    """A listener that counts the messages it gets."""
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, value):
+        self.count += 1
+
+
+class SendCounter(IgnoreNotificationsMixin):
+    """A notification handler that counts the send notifications."""
+    def __init__(self):
+        self.count = 0
+
+    def notifySend(self, stage, topicObj, pubListener=None):
+        self.count += 1
+
+
+def Time(send, N, repeat=3):
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        for j in range(N):
+            send()
+        t = time.perf_counter() - start
+        best = t if best is None else min(best, t)
+    return best
+
+
+def NoListener(pub):
+    pub.getTopicMgr().getOrCreateTopic('a', lambda value: None)
+    return lambda: pub.sendMessage('a', value=1), []
+
+
+def OneListener(pub):
+    listener = Counter()
+    pub.subscribe(listener, 'a')
+    return lambda: pub.sendMessage('a', value=1), [listener]
+
+
+def TenListeners(pub):
+    listeners = [Counter() for i in range(10)]
+    for listener in listeners:
+        pub.subscribe(listener, 'a')
+    return lambda: pub.sendMessage('a', value=1), listeners
+
+
+def DeepTopic(pub):
+    # a listener on every level of a five level deep topic
+    names = ['a', 'a.b', 'a.b.c', 'a.b.c.d', 'a.b.c.d.e']
+    listeners = [Counter() for name in names]
+    for listener, name in zip(listeners, names):
+        pub.subscribe(listener, name)
+    return lambda: pub.sendMessage('a.b.c.d.e', value=1), listeners
+
+
+def TupleName(pub):
+    listener = Counter()
+    pub.subscribe(listener, 'a.b')
+    return lambda: pub.sendMessage(('a', 'b'), value=1), [listener]
+
+
+def Notified(pub):
+    handler = SendCounter()
+    pub.addNotificationHandler(handler)
+    pub.setNotificationFlags(sendMessage=True)
+    listener = Counter()
+    pub.subscribe(listener, 'a')
+    return lambda: pub.sendMessage('a', value=1), [listener]
+
+
+BENCHMARKS = [NoListener, OneListener, TenListeners, DeepTopic, TupleName,
+              Notified]
+
+
+def Run(N):
+    print("%i messages per run, best of 3" % N)
+    for benchmark in BENCHMARKS:
+        pub = Publisher()
+        send, listeners = benchmark(pub)
+        t = Time(send, N)
+        for listener in listeners:
+            assert listener.count == 3 * N
+        print("%14s: %6.2f us per message, %9.0f messages per second"
+              % (benchmark.__name__, t / N * 1e6, N / t))
+
+
+if __name__ == "__main__":
+    N = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    Run(N)
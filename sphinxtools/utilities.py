@@ -19,6 +19,11 @@ import re
 import pickle
 from collections import UserDict
 
+if sys.platform == 'win32':
+    import msvcrt
+else:
+    import fcntl
+
 # Phoenix-specific imports
 from .templates import TEMPLATE_CONTRIB
 from .constants import IGNORE, PUNCTUATION, MODULENAME_REPLACE
@@ -613,19 +618,53 @@ def chopDescription(text):
 
 # ----------------------------------------------------------------------- #
 
+class FileLock(object):
+    """
+    An exclusive lock on a file shared by processes, such as the ETG scripts
+    run in parallel by ``build.py etg``. The lock is held on a ``.lock`` file
+    next to the file, which is created if needed.
+    """
+    def __init__(self, fileName):
+        self.lockName = fileName + '.lock'
+
+    def __enter__(self) -> Self:
+        self.fid = open(self.lockName, 'a+b')
+        if sys.platform == 'win32':
+            self.fid.seek(0)
+            msvcrt.locking(self.fid.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(self.fid.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if sys.platform == 'win32':
+            self.fid.seek(0)
+            msvcrt.locking(self.fid.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(self.fid.fileno(), fcntl.LOCK_UN)
+        self.fid.close()
+
+# ----------------------------------------------------------------------- #
+
 class PickleFile(object):
     """
-    A class to help simplify loading and saving data to pickle files.
+    A class to help simplify loading and saving data to pickle files. When
+    used in a with statement the file is locked until the data is written,
+    so other processes can't change it in the meantime.
     """
     def __init__(self, fileName):
         self.fileName = fileName
 
     def __enter__(self) -> Self:
+        self.lock = FileLock(self.fileName).__enter__()
         self.read()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.write(self.items)
+        try:
+            self.write(self.items)
+        finally:
+            self.lock.__exit__(exc_type, exc_val, exc_tb)
 
     def read(self):
         if os.path.isfile(self.fileName):
@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from buildtools.manifest import BuildManifest
+
+#---------------------------------------------------------------------------
+
+class buildtools_manifest_Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.fileName = os.path.join(self.tmpdir, 'manifest.json')
+        self.inputs = [self.makeFile('_core.sip', 'class wxObject;')]
+        self.outputs = [os.path.join(self.tmpdir, '_core.sbf'),
+                        os.path.join(self.tmpdir, 'core.py')]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def makeFile(self, name, text):
+        name = os.path.join(self.tmpdir, name)
+        with open(name, 'wt') as f:
+            f.write(text)
+        return name
+
+    def runStep(self):
+        # Do what cmd_sip does for one module, returns True if it was run
+        manifest = BuildManifest(self.fileName)
+        if not manifest.isChanged('sip:_core', self.inputs, self.outputs):
+            manifest.save()
+            return False
+        for name in self.outputs:
+            self.makeFile(name, 'generated')
+        manifest.update('sip:_core', self.inputs, self.outputs)
+        manifest.save()
+        return True
+
+    def test_secondRunSkipped(self):
+        self.assertTrue(self.runStep())
+        self.assertFalse(self.runStep())
+
+    def test_touchedInputSkipped(self):
+        self.runStep()
+        self.makeFile('_core.sip', 'class wxObject;')
+        self.assertFalse(self.runStep())
+
+    def test_changedInputRuns(self):
+        self.runStep()
+        self.makeFile('_core.sip', 'class wxObject; class wxEvent;')
+        self.assertTrue(self.runStep())
+        self.assertFalse(self.runStep())
+
+    def test_missingOutputRuns(self):
+        self.runStep()
+        os.remove(self.outputs[1])
+        self.assertTrue(self.runStep())
+
+
+#---------------------------------------------------------------------------
+
+
+if __name__ == '__main__':
+    unittest.main()
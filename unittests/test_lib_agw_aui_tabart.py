@@ -4,6 +4,7 @@ import wx
 import os
 
 import wx.lib.agw.aui.tabart as ta
+import wx.lib.agw.aui.auibook as auibook
 
 #---------------------------------------------------------------------------
 
@@ -18,6 +19,65 @@ class lib_agw_aui_tabart_Tests(wtc.WidgetTestCase):
         ta.VC71TabArt()
         ta.VC8TabArt()
 
+
+    def test_lib_agw_aui_tabartSVGButtons(self):
+        art = ta.AuiDefaultTabArt()
+        art.SetSVGButtons()
+        self.assertTrue(art._active_close_bmp.IsOk())
+        self.assertEqual(art._active_close_bmp.GetSize(), wx.Size(16, 16))
+        art.UpdateButtonBitmaps(self.frame)
+        self.assertEqual(art._bundle_scale, self.frame.GetDPIScaleFactor())
+
+        # a plain bitmap replaces the bundles of the close button
+        bmp = wx.Bitmap(12, 12)
+        art.SetCustomButton(ta.AUI_BUTTON_CLOSE, ta.AUI_BUTTON_STATE_NORMAL, bmp)
+        self.assertNotIn((ta.AUI_BUTTON_CLOSE, ta.AUI_BUTTON_STATE_DISABLED),
+                         art._button_bundles)
+
+    def test_lib_agw_aui_tabartNotebookButtons(self):
+        # the notebook gives its tab controls clones of its art provider
+        nb = auibook.AuiNotebook(self.frame)
+        nb.AddPage(wx.Panel(nb), "page")
+        art = ta.AuiDefaultTabArt()
+        art.SetSVGButtons()
+        bmp = wx.Bitmap(12, 12)
+        art.SetCustomButton(ta.AUI_BUTTON_CLOSE, ta.AUI_BUTTON_STATE_NORMAL, bmp)
+        nb.SetArtProvider(art)
+
+        tabArt = nb.GetActiveTabCtrl().GetArtProvider()
+        self.assertIsNot(tabArt, art)
+        self.assertEqual(tabArt._button_bundles, art._button_bundles)
+        self.assertIn((ta.AUI_BUTTON_LEFT, ta.AUI_BUTTON_STATE_NORMAL),
+                      tabArt._button_bundles)
+        self.assertEqual(tabArt._active_close_bmp.GetSize(), wx.Size(12, 12))
+
+        tabArt.UpdateButtonBitmaps(nb)
+        self.assertEqual(tabArt._bundle_scale, nb.GetDPIScaleFactor())
+        self.assertEqual(tabArt._active_close_bmp.GetSize(), wx.Size(12, 12))
+        self.assertIn((ta.AUI_BUTTON_LEFT, ta.AUI_BUTTON_STATE_NORMAL),
+                      art._button_bundles)
+
+    def test_lib_agw_aui_tabartNotebookButtons(self):
+        # the notebook gives its tab controls clones of its art provider
+        nb = auibook.AuiNotebook(self.frame)
+        nb.AddPage(wx.Panel(nb), "page")
+        art = ta.AuiDefaultTabArt()
+        art.SetSVGButtons()
+        bmp = wx.Bitmap(12, 12)
+        art.SetCustomButton(ta.AUI_BUTTON_CLOSE, ta.AUI_BUTTON_STATE_NORMAL, bmp)
+        nb.SetArtProvider(art)
+
+        tabArt = nb.GetActiveTabCtrl().GetArtProvider()
+        self.assertIsNot(tabArt, art)
+        self.assertEqual(tabArt._button_bundles, art._button_bundles)
+        self.assertIn((ta.AUI_BUTTON_LEFT, ta.AUI_BUTTON_STATE_NORMAL),
+                      tabArt._button_bundles)
+        self.assertEqual(tabArt._active_close_bmp.GetSize(), wx.Size(12, 12))
+
+        tabArt.UpdateButtonBitmaps(nb)
+        self.assertEqual(tabArt._bundle_scale, nb.GetDPIScaleFactor())
+        self.assertEqual(tabArt._active_close_bmp.GetSize(), wx.Size(12, 12))
+
 #---------------------------------------------------------------------------
 
 if __name__ == '__main__':
@@ -7,6 +7,17 @@ import wx.lib.agw.customtreectrl as CT
 
 #---------------------------------------------------------------------------
 
+class VirtualTree(CT.CustomTreeCtrl):
+
+    counts = {}
+
+    def OnGetChildrenCount(self, item):
+        return self.counts.get(self.GetItemIndex(item), 0)
+
+    def OnGetItemText(self, item):
+        return 'item %s' % (self.GetItemIndex(item),)
+
+
 class lib_agw_customtreectrl_Tests(wtc.WidgetTestCase):
 
     def test_lib_agw_customtreectrlCtor(self):
@@ -112,6 +123,94 @@ class lib_agw_customtreectrl_Tests(wtc.WidgetTestCase):
         else:
             self.assertEqual(len(tree.GetChildren()), 0)
 
+    def test_lib_agw_customtreectrlVirtual(self):
+        tree = VirtualTree(self.frame, agwStyle=CT.TR_DEFAULT_STYLE|CT.TR_HIDE_ROOT|CT.TR_VIRTUAL)
+        tree.counts = {(): 1000, (5,): 3}
+        root = tree.AddRoot('root item')
+
+        # only the top-level items exist
+        self.assertEqual(tree.GetChildrenCount(root), 1000)
+        children = root.GetChildren()
+        self.assertEqual(tree.GetItemText(children[5]), 'item (5,)')
+        self.assertTrue(tree.ItemHasChildren(children[5]))
+        self.assertFalse(tree.ItemHasChildren(children[4]))
+
+        tree.Expand(children[5])
+        self.assertEqual(tree.GetChildrenCount(children[5]), 3)
+        grandchild = children[5].GetChildren()[2]
+        self.assertEqual(tree.GetItemIndex(grandchild), (5, 2))
+        self.assertEqual(tree.GetItemText(grandchild), 'item (5, 2)')
+
+        # the children are released when collapsed
+        tree.Collapse(children[5])
+        self.assertEqual(tree.GetChildrenCount(children[5]), 0)
+        self.assertTrue(tree.ItemHasChildren(children[5]))
+
+        tree.counts = {(): 10}
+        tree.RefreshItems()
+        self.assertEqual(tree.GetChildrenCount(root), 10)
+        self.assertFalse(tree.ItemHasChildren(root.GetChildren()[5]))
+
+    def test_lib_agw_customtreectrlRowIndex(self):
+        index = CT.TreeRowIndex()
+        index.BLOCK_SIZE = 4
+        rows = [CT.GenericTreeItem(None, 'row %d' % i) for i in range(10)]
+        index.Build(rows, [10] * 10, 2)
+        self.assertEqual(len(index), 10)
+        self.assertEqual(rows[9].GetY(), 92)
+        self.assertEqual(index.GetBottom(), 102)
+
+        # insert rows in the middle, the rows below move down
+        new = [CT.GenericTreeItem(None, 'new %d' % i) for i in range(7)]
+        self.assertEqual(index.Replace(5, 5, new, [20] * 7), [])
+        self.assertEqual(len(index), 17)
+        self.assertEqual(new[0].GetY(), 52)
+        self.assertEqual(rows[5].GetY(), 192)
+        self.assertEqual(index.GetRow(rows[5]), 12)
+        self.assertTrue(index.FindRow(60) is new[0])
+        self.assertTrue(index.FindRow(193) is rows[5])
+
+        # and remove them
+        self.assertEqual(index.Replace(5, 12, [], []), new)
+        self.assertFalse(index.Contains(new[0]))
+        self.assertEqual(rows[5].GetY(), 52)
+        self.assertTrue(index.FindRow(60) is rows[5])
+        self.assertEqual(index.GetBottom(), 102)
+
+    def test_lib_agw_customtreectrlExpandLayout(self):
+        tree = CT.CustomTreeCtrl(self.frame, agwStyle=CT.TR_DEFAULT_STYLE|CT.TR_HIDE_ROOT)
+        root = tree.AddRoot('root item')
+        parents = [tree.AppendItem(root, 'item %d' % i) for i in range(20)]
+        for parent in parents:
+            for j in range(30):
+                tree.AppendItem(parent, 'child %d' % j)
+        tree.CalculatePositions()
+
+        def Positions(item=root):
+            positions = []
+            for child in item.GetChildren():
+                positions.append((child.GetText(), child.GetX(), child.GetY()))
+                if child.IsExpanded():
+                    positions.extend(Positions(child))
+            return positions
+
+        # expanding and collapsing only moves the items below
+        tree.Expand(parents[3])
+        tree.Expand(parents[10])
+        tree.Expand(parents[12])
+        tree.Collapse(parents[10])
+        positions = Positions()
+        self.assertEqual(len(positions), 80)
+
+        tree.CalculatePositions()
+        self.assertEqual(Positions(), positions)
+
+        child = parents[3].GetChildren()[0]
+        x, y = tree.CalcScrolledPosition(child.GetX() + 2,
+                                         child.GetY() + tree.GetLineHeight(child) // 2)
+        item, flags = tree.HitTest((x, y))
+        self.assertTrue(item is child)
+
     def test_lib_agw_customtreectrlConstantsExist(self):
         CT.TR_NO_BUTTONS
         CT.TR_SINGLE
@@ -134,6 +233,7 @@ class lib_agw_customtreectrl_Tests(wtc.WidgetTestCase):
         CT.TR_ALIGN_WINDOWS_RIGHT
         CT.TR_ELLIPSIZE_LONG_ITEMS
         CT.TR_TOOLTIP_ON_LONG_ITEMS
+        CT.TR_VIRTUAL
 
         CT.TreeItemIcon_Normal
         CT.TreeItemIcon_Selected
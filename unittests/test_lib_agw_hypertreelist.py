@@ -7,6 +7,17 @@ import wx.lib.agw.customtreectrl as CT
 
 #---------------------------------------------------------------------------
 
+class VirtualTreeList(HTL.HyperTreeList):
+
+    counts = {}
+
+    def OnGetChildrenCount(self, item):
+        return self.counts.get(self.GetItemIndex(item), 0)
+
+    def OnGetItemText(self, item, column):
+        return 'item %s, column %d' % (self.GetItemIndex(item), column)
+
+
 class lib_agw_hypertreelist_Tests(wtc.WidgetTestCase):
 
     def test_lib_agw_hypertreelistCtor(self):
@@ -108,6 +119,26 @@ class lib_agw_hypertreelist_Tests(wtc.WidgetTestCase):
                          tree.GetItemBackgroundColour(child,column=2))
         self.assertEqual(None, tree.GetItemBackgroundColour(child, column=1))
 
+    def test_lib_agw_hypertreelistVirtual(self):
+        tree = VirtualTreeList(self.frame, agwStyle=HTL.TR_DEFAULT_STYLE|HTL.TR_HIDE_ROOT|HTL.TR_VIRTUAL)
+        tree.AddColumn("First column")
+        tree.AddColumn("Second column")
+        tree.counts = {(): 100, (7,): 2}
+        root = tree.AddRoot('root item')
+
+        self.assertEqual(tree.GetChildrenCount(root), 100)
+        child = root.GetChildren()[7]
+        self.assertEqual(tree.GetItemText(child, 1), 'item (7,), column 1')
+        self.assertTrue(tree.ItemHasChildren(child))
+
+        tree.Expand(child)
+        grandchild = child.GetChildren()[1]
+        self.assertEqual(tree.GetItemIndex(grandchild), (7, 1))
+        self.assertEqual(grandchild.GetText(0), 'item (7, 1), column 0')
+
+        tree.Collapse(child)
+        self.assertEqual(tree.GetChildrenCount(child), 0)
+
     def test_lib_agw_hypertreelistColourWholeItemColumns(self):
 
         tree = HTL.HyperTreeList(self.frame, agwStyle=HTL.TR_DEFAULT_STYLE|
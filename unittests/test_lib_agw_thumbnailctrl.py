@@ -1,6 +1,9 @@
 import unittest
 from unittests import wtc
 import wx
+import os
+import shutil
+import tempfile
 
 import wx.lib.agw.scrolledthumbnail as ST
 import wx.lib.agw.thumbnailctrl as TNC
@@ -12,6 +15,64 @@ class lib_agw_thumbnailctrl_Tests(wtc.WidgetTestCase):
     def test_lib_agw_thumbnailctrlCtor(self):
         tnc = TNC.ThumbnailCtrl(self.frame, -1, imagehandler=TNC.NativeImageHandler)
 
+    def test_lib_agw_thumbnailctrlThumbnailSize(self):
+        self.assertEqual(ST.GetThumbnailSize(400, 300, 96, 80), (96, 72))
+        self.assertEqual(ST.GetThumbnailSize(300, 400, 96, 80), (60, 80))
+        self.assertEqual(ST.GetThumbnailSize(50, 40, 96, 80), (50, 40))
+
+    def test_lib_agw_thumbnailctrlCache(self):
+        folder = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(folder, 'image.png')
+            wx.Image(400, 300).SaveFile(filename, wx.BITMAP_TYPE_PNG)
+            cache = ST.ThumbnailCache(os.path.join(folder, 'thumbnails.db'))
+
+            # only the thumbnail is kept in memory, a larger one in the cache
+            thumb = ST.Thumb(folder, 'image.png', imagehandler=ST.NativeImageHandler)
+            thumb.LoadThumbnail(96, 80, cache)
+            self.assertTrue(thumb.HasThumbnail(96, 80))
+            self.assertFalse(thumb.HasThumbnail(192, 160))
+            self.assertEqual(thumb.GetOriginalSize(), (400, 300))
+            self.assertEqual(thumb.GetImage().GetSize(), wx.Size(96, 72))
+
+            img, size = cache.Get(filename)
+            self.assertEqual(size, (400, 300))
+            self.assertEqual(img.GetSize(), wx.Size(256, 192))
+
+            thumb = ST.Thumb(folder, 'image.png', imagehandler=ST.NativeImageHandler)
+            thumb.LoadThumbnail(192, 160, cache)
+            self.assertEqual(thumb.GetImage().GetSize(), wx.Size(192, 144))
+
+            # the thumbnail of a modified file is not used
+            os.utime(filename, (0, 0))
+            self.assertTrue(cache.Get(filename) is None)
+            cache.Close()
+        finally:
+            shutil.rmtree(folder)
+
+    def test_lib_agw_thumbnailctrlRotate(self):
+        self.assertEqual(ST.GetRotatedSize(400, 300, 90), (300, 400))
+        self.assertEqual(ST.GetRotatedSize(400, 300, -180), (400, 300))
+        folder = tempfile.mkdtemp()
+        try:
+            wx.Image(400, 300).SaveFile(os.path.join(folder, 'image.png'), wx.BITMAP_TYPE_PNG)
+            thumb = ST.Thumb(folder, 'image.png', imagehandler=ST.NativeImageHandler)
+            thumb.LoadThumbnail(96, 80)
+            thumb.Rotate(90)
+            self.assertEqual(thumb.GetRotation(), 90)
+            self.assertEqual(thumb.GetOriginalSize(), (300, 400))
+            self.assertTrue(thumb.HasThumbnail(96, 80))
+            self.assertFalse(thumb.HasThumbnail(192, 160))
+
+            # the rotation is applied again to a larger thumbnail
+            thumb.LoadThumbnail(192, 160)
+            self.assertEqual(thumb.GetOriginalSize(), (300, 400))
+            size = thumb.GetImage().GetSize()
+            self.assertTrue(size.width < size.height <= 160)
+            self.assertTrue(thumb.HasThumbnail(192, 160))
+        finally:
+            shutil.rmtree(folder)
+
     def test_lib_agw_thumbnailctrlEvents(self):
         ST.EVT_THUMBNAILS_SEL_CHANGED
         ST.EVT_THUMBNAILS_POINTED
@@ -89,6 +89,92 @@ class lib_agw_ultimatelistctrl_Tests(wtc.WidgetTestCase):
         #wx.EVT_LIST_ITEM_LEFT_CLICK
         #wx.EVT_LIST_END_DRAG
 
+
+class lib_agw_ultimatelistctrl_LineHeightIndex_Tests(wtc.WidgetTestCase):
+
+    def makeIndex(self, heights):
+        index = ULC.LineHeightIndex()
+        index.Build(heights)
+        return index
+
+    def checkIndex(self, index, heights):
+        self.assertEqual(len(index), len(heights))
+        for line in range(len(heights) + 1):
+            self.assertEqual(index.GetY(line), sum(heights[:line]))
+        self.assertEqual(index.GetTotalHeight(), sum(heights))
+
+    def test_lib_agw_ultimatelistctrlLineHeightIndexEmpty(self):
+        index = ULC.LineHeightIndex()
+        self.assertFalse(index.IsValid())
+        index.Build([])
+        self.assertTrue(index.IsValid())
+        self.assertEqual(index.GetTotalHeight(), 0)
+        self.assertEqual(index.FindLine(10), -1)
+
+    def test_lib_agw_ultimatelistctrlLineHeightIndexGetY(self):
+        heights = [(i * 7) % 13 + 5 for i in range(37)]
+        self.checkIndex(self.makeIndex(heights), heights)
+
+    def test_lib_agw_ultimatelistctrlLineHeightIndexSetHeight(self):
+        heights = [20] * 50
+        index = self.makeIndex(heights)
+        for line, height in [(0, 35), (17, 3), (49, 60), (32, 20), (17, 40)]:
+            index.SetHeight(line, height)
+            heights[line] = height
+            self.assertEqual(index.GetHeight(line), height)
+        self.checkIndex(index, heights)
+
+    def test_lib_agw_ultimatelistctrlLineHeightIndexFindLine(self):
+        heights = [(i * 5) % 11 + 10 for i in range(100)]
+        index = self.makeIndex(heights)
+        for y in range(-5, sum(heights) + 20, 3):
+            expected = 0
+            for line in range(len(heights)):
+                if sum(heights[:line]) <= y:
+                    expected = line
+            self.assertEqual(index.FindLine(y), expected)
+
+    def test_lib_agw_ultimatelistctrlLineHeightIndexInvalidate(self):
+        index = self.makeIndex([10, 20])
+        index.Invalidate()
+        self.assertFalse(index.IsValid())
+
+    def test_lib_agw_ultimatelistctrlLineHeightReset(self):
+        class Renderer(object):
+            height = 30
+            def DrawSubItem(self, dc, rect, line, highlighted, enabled):
+                pass
+            def GetLineHeight(self):
+                return self.height
+            def GetSubItemWidth(self):
+                return 50
+
+        ulc = ULC.UltimateListCtrl(self.frame, size=(300, 200),
+                                   agwStyle=wx.LC_REPORT | ULC.ULC_HAS_VARIABLE_ROW_HEIGHT)
+        ulc.InsertColumn(0, "col")
+        renderer = Renderer()
+        for i in range(5):
+            ulc.InsertStringItem(i, "item %d" % i)
+            ulc.SetItemCustomRenderer(i, 0, renderer)
+        self.frame.SendSizeEvent()
+        self.myYield()
+
+        main = ulc._mainWin
+        height = main.GetLineHeight(2)
+        y = main.GetLineY(3)
+
+        # a layout measures the lines again, which keep their height until then
+        renderer.height = 50
+        main.ResetLineHeights()
+        self.assertEqual(main.GetLineY(3), y)
+        self.assertEqual(main.GetLineHeight(2), height + 20)
+        self.assertEqual(main.GetLineY(3), y + 20)
+
+        renderer.height = 40
+        ulc.DoLayout()
+        if main.IsShownOnScreen():
+            self.assertEqual(main.GetLineHeight(2), height + 10)
+
 #---------------------------------------------------------------------------
 
 if __name__ == '__main__':
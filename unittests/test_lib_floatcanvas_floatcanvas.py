@@ -1,6 +1,7 @@
 import unittest
 from unittests import wtc
 import wx
+import numpy as np
 
 import wx.lib.floatcanvas.FloatCanvas as fc
 import wx.lib.floatcanvas.NavCanvas as nc
@@ -167,6 +168,183 @@ class lib_floatcanvas_floatcanvas_Tests(wtc.WidgetTestCase):
         fccanvas.AddObject(obj)
         fccanvas.Destroy()
 
+    def test_lib_floatcanvas_fc_markercollection(self):
+        fccanvas = fc.FloatCanvas(self.frame)
+
+        obj = fc.MarkerCollection(((2, 2), (4, 4), (6, 6)),
+                                  Styles=[{"FillColor": "Red"}, {"FillColor": "Blue"}],
+                                  StyleIndex=(0, 1, 0))
+
+        fccanvas.AddObject(obj)
+        fccanvas.Draw(Force=True)
+        self.assertEqual(obj.FindItem((4.2, 3.9)), 1)
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_fc_polylinecollection(self):
+        fccanvas = fc.FloatCanvas(self.frame)
+
+        obj = fc.PolylineCollection((((0, 0), (10, 0)), ((0, 5), (5, 10), (10, 5))),
+                                    LineColor="Red")
+
+        fccanvas.AddObject(obj)
+        fccanvas.Draw(Force=True)
+        self.assertEqual(obj.NumItems(), 2)
+        self.assertEqual(obj.FindItem((5, 1)), 0)
+        self.assertEqual(obj.FindItem((5, 9)), 1)
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_fc_rectanglecollection(self):
+        fccanvas = fc.FloatCanvas(self.frame)
+
+        obj = fc.RectangleCollection(((0, 0), (20, 20)), ((10, 10), (5, 5)),
+                                     FillColor="Green")
+
+        fccanvas.AddObject(obj)
+        fccanvas.Draw(Force=True)
+        self.assertEqual(obj.FindItem((22, 22)), 1)
+        self.assertRaises(ValueError, obj.SetStyleIndex, (0, 1))
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_fc_line_lod(self):
+        fccanvas = fc.FloatCanvas(self.frame)
+
+        x = np.linspace(0, 1000, 10000)
+        obj = fc.Line(np.column_stack((x, np.sin(x))))
+        fccanvas.AddObject(obj)
+        fccanvas.ZoomToBB()
+        self.assertEqual(len(obj.GetLODPoints(fccanvas.ScaleWorldToPixel)), 10000)
+
+        obj.SetLODTolerance(1)
+        points = obj.GetLODPoints(fccanvas.ScaleWorldToPixel)
+        self.assertTrue(len(points) < 10000)
+        self.assertTrue((points[0] == obj.Points[0]).all())
+        self.assertTrue((points[-1] == obj.Points[-1]).all())
+        fccanvas.Draw(Force=True)
+
+        obj.SetLODTolerance(None)
+        self.assertEqual(len(obj.GetLODPoints(fccanvas.ScaleWorldToPixel)), 10000)
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_spatialindex(self):
+        fccanvas = fc.FloatCanvas(self.frame)
+        fccanvas.EnableSpatialIndex()
+
+        near = fccanvas.AddRectangle((0, 0), (1, 1))
+        far = fccanvas.AddRectangle((100, 100), (1, 1))
+        fore = fccanvas.AddPoint((0, 0), InForeground=True)
+        viewport = ((-5, -5), (5, 5))
+
+        index = fccanvas._GetSpatialIndex(fccanvas._DrawList)
+        self.assertEqual(index.Query(viewport), [near])
+
+        far.SetShape((1, 1), (1, 1))
+        self.assertEqual(index.Query(viewport), [near, far])
+        far.Move((100, 100))
+        self.assertEqual(index.Query(viewport), [near])
+
+        fccanvas.RemoveObject(near)
+        self.assertEqual(index.Query(viewport), [])
+
+        foreindex = fccanvas._GetSpatialIndex(fccanvas._ForeDrawList)
+        self.assertEqual(foreindex.Query(viewport), [fore])
+        fore.PutInBackground()
+        self.assertEqual(foreindex.Query(viewport), [])
+        self.assertEqual(index.Query(viewport), [fore])
+
+        fccanvas.Draw(Force=True)
+        fccanvas.EnableSpatialIndex(False)
+        self.assertTrue(fccanvas._GetSpatialIndex(fccanvas._DrawList) is None)
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_tilecache(self):
+        fccanvas = fc.FloatCanvas(self.frame)
+        fccanvas.SetSize((200, 200))
+        fccanvas.EnableTileCache(TileSize=64)
+
+        fccanvas.AddRectangle((0, 0), (10, 10))
+        fccanvas.ZoomToBB()
+        fccanvas.Draw()
+        self.assertTrue(len(fccanvas._TileCache) > 0)
+
+        level = fccanvas._TileLevel()
+        tiles, offset = fccanvas._VisibleTiles()
+        for (i, j) in tiles:
+            self.assertTrue((level, i, j) in fccanvas._TileCache)
+
+        fccanvas.AddCircle((5, 5), 2)
+        self.assertEqual(len(fccanvas._TileCache), 0)
+        fccanvas.Draw()
+        self.assertTrue(len(fccanvas._TileCache) > 0)
+
+        # foreground objects don't touch the tiles
+        fccanvas.AddPoint((0, 0), InForeground=True)
+        self.assertTrue(len(fccanvas._TileCache) > 0)
+
+        fccanvas.EnableTileCache(False)
+        fccanvas.Draw(Force=True)
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_backgroundthread(self):
+        fccanvas = fc.FloatCanvas(self.frame)
+        fccanvas.SetSize((200, 200))
+        fccanvas.EnableBackgroundThread()
+
+        red = fccanvas.AddRectangle((0, 0), (10, 10), FillColor="Red",
+                                    LineStyle="Transparent")
+        # the text is drawn on the GUI thread, and so is all that follows it
+        text = fccanvas.AddScaledText("Text", (0, 0), Size=1)
+        blue = fccanvas.AddRectangle((6, 6), (4, 4), FillColor="Blue",
+                                     LineStyle="Transparent")
+        self.assertTrue(red.ThreadSafeDraw)
+        self.assertFalse(text.ThreadSafeDraw)
+        fccanvas.ZoomToBB()
+        fccanvas.Draw(Force=True)
+        generation = fccanvas._RenderGeneration
+        self.waitFor(200)
+        self.myYield()
+        self.assertEqual(fccanvas._RenderGeneration, generation)
+
+        image = fccanvas._Buffer.ConvertToImage()
+        x, y = fccanvas.WorldToPixel((2, 8))
+        self.assertEqual((image.GetRed(x, y), image.GetGreen(x, y),
+                          image.GetBlue(x, y)), (255, 0, 0))
+        x, y = fccanvas.WorldToPixel((8, 8))
+        self.assertEqual((image.GetRed(x, y), image.GetGreen(x, y),
+                          image.GetBlue(x, y)), (0, 0, 255))
+
+        # a new draw cancels the current render
+        fccanvas.Draw(Force=True)
+        self.assertEqual(fccanvas._RenderGeneration, generation + 1)
+
+        fccanvas.EnableBackgroundThread(False)
+        fccanvas.Draw(Force=True)
+        fccanvas.Destroy()
+
+    def test_lib_floatcanvas_geometrichittest(self):
+        fccanvas = fc.FloatCanvas(self.frame)
+        fccanvas.SetSize((200, 200))
+        fccanvas.EnableGeometricHitTest()
+
+        rect = fccanvas.AddRectangle((0, 0), (10, 10), FillColor="Red")
+        circle = fccanvas.AddCircle((10, 10), 4)
+        line = fccanvas.AddLine(((-10, -10), (-5, -5)))
+        fore = fccanvas.AddPoint((1, 1), InForeground=True)
+        fccanvas.ZoomToBB()
+
+        self.assertEqual(fccanvas.ObjectsAtPoint((9, 9)), [circle, rect])
+        self.assertEqual(fccanvas.ObjectsAtPoint((1, 1)), [fore, rect])
+        self.assertEqual(fccanvas.ObjectsAtPoint((30, 30)), [])
+        self.assertEqual(fccanvas.ObjectsInRect(((-8, -8), (-6, 0))), [line])
+        self.assertEqual(fccanvas.ObjectsInRect(((-11, -11), (11, 11)), Inside=True),
+                         [fore, line, rect])
+
+        rect.Bind(fc.EVT_FC_LEFT_DOWN, lambda obj: None)
+        self.assertTrue(fccanvas._HTBitmap is None)
+        xy = fccanvas.WorldToPixel((5, 5))
+        self.assertEqual(fccanvas._GetHitKey(xy), rect.HitColor)
+        self.assertEqual(fccanvas.ObjectsAtPoint((9, 9), HitAbleOnly=True), [rect])
+        fccanvas.Destroy()
+
     def test_lib_floatcanvas_floatcanvasEvents(self):
 
         fc.EVT_FC_ENTER_WINDOW
@@ -0,0 +1,47 @@
+import unittest
+from unittests import wtc
+
+import numpy as np
+
+from wx.lib.floatcanvas.Utilities import Geometry
+
+#---------------------------------------------------------------------------
+
+Square = np.array(((0, 0), (10, 0), (10, 10), (0, 10)), float)
+
+
+class testGeometry(wtc.WidgetTestCase):
+
+    def testPointInPolygon(self):
+        self.assertTrue(Geometry.PointInPolygon((5, 5), Square))
+        self.assertFalse(Geometry.PointInPolygon((15, 5), Square))
+        self.assertFalse(Geometry.PointInPolygon((5, 5), Square[:2]))
+
+    def testDistanceToPolyline(self):
+        self.assertEqual(Geometry.DistanceToPolyline((5, -3), Square), 3.0)
+        # the closing segment is only there for a closed polyline
+        self.assertEqual(Geometry.DistanceToPolyline((-3, 5), Square, Closed=True), 3.0)
+        self.assertAlmostEqual(Geometry.DistanceToPolyline((-3, 5), Square),
+                               np.hypot(3, 5))
+        self.assertEqual(Geometry.DistanceToPolyline((0, 0), np.zeros((0, 2))), np.inf)
+
+    def testDistanceToSegments(self):
+        d = Geometry.DistanceToSegments((0, 1), ((0, 0), (5, 5)), ((1, 0), (5, 5)))
+        self.assertEqual(list(d), [1.0, np.hypot(5, 4)])
+
+    def testPolylineIntersectsRect(self):
+        Line = ((-5, 5), (15, 5))
+        self.assertTrue(Geometry.PolylineIntersectsRect(Line, ((2, 2), (3, 8))))
+        self.assertFalse(Geometry.PolylineIntersectsRect(Line, ((2, 6), (3, 8))))
+        # touching the border counts
+        self.assertTrue(Geometry.PolylineIntersectsRect(Line, ((2, 5), (3, 8))))
+        self.assertFalse(Geometry.PolylineIntersectsRect(Square, ((2, 2), (8, 8))))
+
+    def testEllipseIntersectsRect(self):
+        self.assertTrue(Geometry.EllipseIntersectsRect((0, 0), (5, 2), ((4, 0), (6, 1))))
+        self.assertFalse(Geometry.EllipseIntersectsRect((0, 0), (5, 2), ((4, 1.9), (6, 3))))
+
+#---------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from unittests import wtc
+
+import numpy as np
+
+from wx.lib.floatcanvas.Utilities import BBox
+from wx.lib.floatcanvas.Utilities.SpatialIndex import GridIndex
+
+#---------------------------------------------------------------------------
+
+class Obj:
+    def __init__(self, BB):
+        self.BoundingBox = BBox.asBBox(BB)
+
+
+class testGridIndex(wtc.WidgetTestCase):
+
+    def makeIndex(self, objs, CellSize=None):
+        index = GridIndex(CellSize)
+        for obj in objs:
+            index.Insert(obj)
+        return index
+
+    def testEmpty(self):
+        index = GridIndex()
+        self.assertEqual(index.Query(((0, 0), (10, 10))), [])
+
+    def testQuery(self):
+        a = Obj(((0, 0), (1, 1)))
+        b = Obj(((5, 5), (6, 6)))
+        c = Obj(((20, 20), (21, 21)))
+        index = self.makeIndex([a, b, c], CellSize=2)
+        self.assertEqual(index.Query(((0, 0), (10, 10))), [a, b])
+        self.assertEqual(index.Query(((19, 19), (30, 30))), [c])
+        self.assertEqual(index.Query(((10, 10), (15, 15))), [])
+
+    def testTouching(self):
+        a = Obj(((0, 0), (1, 1)))
+        index = self.makeIndex([a], CellSize=2)
+        self.assertEqual(index.Query(((1, 1), (3, 3))), [a])
+
+    def testOrder(self):
+        objs = [Obj(((i, i), (i + 1, i + 1))) for i in range(10)]
+        index = self.makeIndex(objs[::-1], CellSize=1)
+        self.assertEqual(index.Query(((0, 0), (11, 11))), objs[::-1])
+
+    def testRemove(self):
+        a = Obj(((0, 0), (1, 1)))
+        b = Obj(((0, 0), (2, 2)))
+        index = self.makeIndex([a, b], CellSize=1)
+        index.Query(((0, 0), (1, 1)))
+        index.Remove(a)
+        self.assertEqual(index.Query(((0, 0), (3, 3))), [b])
+        self.assertEqual(len(index), 1)
+        self.assertFalse(a in index)
+
+    def testUpdate(self):
+        a = Obj(((0, 0), (1, 1)))
+        b = Obj(((0, 0), (1, 1)))
+        index = self.makeIndex([a, b], CellSize=1)
+        self.assertEqual(index.Query(((0, 0), (1, 1))), [a, b])
+        a.BoundingBox = BBox.asBBox(((50, 50), (51, 51)))
+        index.Update(a)
+        self.assertEqual(index.Query(((0, 0), (1, 1))), [b])
+        self.assertEqual(index.Query(((40, 40), (60, 60))), [a])
+        a.BoundingBox = BBox.asBBox(((0, 0), (1, 1)))
+        index.Update(a)
+        # keeps its place in the drawing order
+        self.assertEqual(index.Query(((0, 0), (1, 1))), [a, b])
+
+    def testLargeObject(self):
+        a = Obj(((-1000, -1000), (1000, 1000)))
+        b = Obj(((0, 0), (1, 1)))
+        index = self.makeIndex([a, b], CellSize=1)
+        self.assertEqual(index.Query(((500, 500), (501, 501))), [a])
+        self.assertEqual(index.Query(((0, 0), (1, 1))), [a, b])
+
+    def testNullAndInfBBox(self):
+        a = Obj(BBox.NullBBox())
+        b = Obj(BBox.InfBBox())
+        index = self.makeIndex([a, b])
+        self.assertEqual(index.Query(((0, 0), (1, 1))), [b])
+
+    def testMatchesOverlaps(self):
+        rng = np.random.RandomState(0)
+        xy = rng.uniform(0, 100, (500, 2))
+        wh = rng.uniform(0, 5, (500, 2))
+        objs = [Obj((p, p + s)) for p, s in zip(xy, wh)]
+        index = self.makeIndex(objs)
+        for ViewPort in (((10, 10), (20, 30)), ((-5, -5), (200, 200)),
+                         ((50, 50), (50, 50))):
+            ViewPort = BBox.asBBox(ViewPort)
+            expected = [o for o in objs if o.BoundingBox.Overlaps(ViewPort)]
+            self.assertEqual(index.Query(ViewPort), expected)
+
+#---------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
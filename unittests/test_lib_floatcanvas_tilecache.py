@@ -0,0 +1,51 @@
+import unittest
+from unittests import wtc
+
+from wx.lib.floatcanvas.Utilities.TileCache import TileCache
+
+#---------------------------------------------------------------------------
+
+class testTileCache(wtc.WidgetTestCase):
+
+    def testPutGet(self):
+        cache = TileCache(100)
+        cache.Put("a", 1, 10)
+        self.assertEqual(cache.Get("a"), 1)
+        self.assertEqual(cache.Get("b"), None)
+        self.assertEqual(cache.Get("b", 2), 2)
+        self.assertTrue("a" in cache)
+        self.assertEqual(cache.Memory, 10)
+
+    def testEviction(self):
+        cache = TileCache(30)
+        for key in "abc":
+            cache.Put(key, key, 10)
+        cache.Get("a")
+        cache.Put("d", "d", 10)
+        # "b" was the least recently used
+        self.assertEqual(cache.Keys(), ["c", "a", "d"])
+        self.assertEqual(cache.Memory, 30)
+
+    def testReplace(self):
+        cache = TileCache(100)
+        cache.Put("a", 1, 10)
+        cache.Put("a", 2, 20)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.Memory, 20)
+        cache.Remove("a")
+        cache.Remove("a")
+        self.assertEqual(cache.Memory, 0)
+
+    def testKeepsOne(self):
+        cache = TileCache(10)
+        cache.Put("a", 1, 50)
+        self.assertEqual(cache.Keys(), ["a"])
+        cache.Put("b", 2, 50)
+        self.assertEqual(cache.Keys(), ["b"])
+        cache.Clear()
+        self.assertEqual(len(cache), 0)
+
+#---------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    unittest.main()
@@ -226,6 +226,118 @@ class lib_ogl_Tests(wtc.WidgetTestCase):
         ogl.KEY_SHIFT
         ogl.KEY_CTRL
 
+    def test_lib_oglDamageAndIndex(self):
+        ogl.OGLInitialize()
+        osc = ogl.ShapeCanvas(self.frame)
+        self.diagram = ogl.Diagram()
+        osc.SetDiagram(self.diagram)
+        self.diagram.SetCanvas(osc)
+        osc.SetScrollbars(20, 20, 100, 100)
+        osc.Draw()
+
+        shapes = []
+        for i in range(20):
+            aShape = ogl.RectangleShape(w=40, h=40)
+            aShape.SetCanvas(osc)
+            aShape.SetX(50 + 100 * i)
+            aShape.SetY(50)
+            aShape.SetId(i)
+            self.diagram.AddShape(aShape)
+            aShape.Show(True)
+            shapes.append(aShape)
+        osc.Draw()
+        self.assertEqual(osc._damage, [])
+
+        dc = wx.MemoryDC(osc.GetBuffer())
+        shapes[3].Move(dc, 50, 500)
+        self.assertTrue(osc._damage)
+        osc.Draw()
+        self.assertEqual(osc._damage, [])
+
+        self.assertEqual(osc.FindShape(50, 500)[0], shapes[3])
+        self.assertEqual(osc.FindShape(350, 50)[0], None)
+        self.assertEqual(osc.FindShape(450, 50)[0], shapes[4])
+        self.assertEqual(self.diagram.GetShapesInRect(wx.Rect(0, 0, 200, 100)),
+                         shapes[:2])
+
+        self.assertEqual(self.diagram.FindShape(7), shapes[7])
+        shapes[7].SetId(100)
+        self.assertEqual(self.diagram.FindShape(7), None)
+        self.assertEqual(self.diagram.FindShape(100), shapes[7])
+        self.diagram.RemoveShape(shapes[7])
+        self.assertEqual(self.diagram.FindShape(100), None)
+        self.assertEqual(osc.FindShape(750, 50)[0], None)
+
+    def test_lib_oglRedrawDC(self):
+        ogl.OGLInitialize()
+        osc = ogl.ShapeCanvas(self.frame, size=(300, 200))
+        self.diagram = ogl.Diagram()
+        osc.SetDiagram(self.diagram)
+        self.diagram.SetCanvas(osc)
+        osc.SetScrollbars(20, 20, 100, 100)
+        osc.Scroll(2, 2)
+        aShape = ogl.RectangleShape(w=40, h=40)
+        aShape.SetCanvas(osc)
+        aShape.SetX(50)
+        aShape.SetY(50)
+        aShape.SetBrush(wx.RED_BRUSH)
+        self.diagram.AddShape(aShape)
+        aShape.Show(True)
+        osc.Draw()
+
+        # the full size buffer is in logical coordinates, even when scrolled
+        dc = wx.MemoryDC(osc.GetBuffer())
+        self.assertTrue(osc.IsBufferDC(dc))
+        osc.PrepareDC(dc)
+        self.assertEqual(tuple(dc.GetDeviceOrigin()), (0, 0))
+        dc.SelectObject(wx.NullBitmap)
+
+        # a DC which isn't on the buffer gets the full diagram
+        bmp = wx.Bitmap(100, 100)
+        dc = wx.MemoryDC(bmp)
+        dc.SetBackground(wx.WHITE_BRUSH)
+        dc.Clear()
+        self.assertFalse(osc.IsBufferDC(dc))
+        osc.Redraw(dc)
+        dc.SelectObject(wx.NullBitmap)
+        self.assertEqual(bmp.ConvertToImage().GetRed(50, 50), 255)
+        self.assertEqual(bmp.ConvertToImage().GetGreen(50, 50), 0)
+
+    def test_lib_oglViewportBuffer(self):
+        ogl.OGLInitialize()
+        osc = ogl.ShapeCanvas(self.frame, size=(300, 200))
+        self.diagram = ogl.Diagram()
+        osc.SetDiagram(self.diagram)
+        self.diagram.SetCanvas(osc)
+        osc.SetViewportBuffer(True)
+        osc.SetScrollbars(20, 20, 2500, 2500)
+
+        shapes = []
+        for i in range(10):
+            aShape = ogl.CircleShape(30)
+            aShape.SetCanvas(osc)
+            aShape.SetX(40 + 400 * i)
+            aShape.SetY(40 + 400 * i)
+            self.diagram.AddShape(aShape)
+            aShape.Show(True)
+            shapes.append(aShape)
+        osc.Draw()
+
+        w, h = osc.GetClientSize()
+        self.assertEqual(osc.GetBuffer().GetSize(), wx.Size(max(w, 1), max(h, 1)))
+        self.assertTrue(len(osc.GetTileCache()) > 0)
+
+        osc.Scroll(40, 40)
+        osc.GetBuffer()
+        self.assertEqual(osc._bufferOrigin, tuple(osc.CalcUnscrolledPosition(0, 0)))
+
+        dc = wx.MemoryDC(osc.GetBuffer())
+        osc.PrepareDC(dc)
+        shapes[2].Move(dc, 850, 850)
+        osc.Draw()
+        self.assertEqual(osc._damage, [])
+        self.assertTrue(osc.GetViewportBuffer())
+
 #---------------------------------------------------------------------------
 
 if __name__ == '__main__':
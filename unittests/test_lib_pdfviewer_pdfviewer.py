@@ -49,6 +49,63 @@ class lib_pdfviewer_pdfviewer_Tests(wtc.WidgetTestCase):
         self.viewer.LoadFile(samplePdf)
         self.waitFor(500)
 
+    @unittest.skipIf(not havePyPDF,  "PyMuPDF or PyPDF2 required")
+    def test_lib_pdfviewer_cache(self):
+        from wx.lib.pdfviewer.viewer import pdfCache
+        cache = pdfCache(100)
+        cache.Put('a', 1, 40)
+        cache.Put('b', 2, 40)
+        self.assertEqual(cache.Get('a'), 1)
+        cache.Put('c', 3, 40)
+        # 'b' is the least recently used
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+        self.assertEqual(cache.nbytes, 80)
+        cache.SetMaxBytes(10)
+        self.assertEqual(list(cache.items), ['c'])
+
+    @unittest.skipIf(not havePyPDF,  "PyMuPDF or PyPDF2 required")
+    def test_lib_pdfviewer_tiles(self):
+        from wx.lib.pdfviewer.viewer import TILE_SIZE
+        self.viewer = pdfViewer(self.frame, wx.ID_ANY, wx.DefaultPosition,
+                                (400, 300),
+                                wx.HSCROLL|wx.VSCROLL|wx.SUNKEN_BORDER)
+        self.viewer.LoadFile(samplePdf)
+        self.waitFor(500)
+        tiles = self.viewer.GetTiles(0, 0, TILE_SIZE + 1, TILE_SIZE)
+        self.assertEqual(tiles, [(0, 0), (1, 0)])
+        bmp = self.viewer.GetTile(0, 0)
+        self.assertEqual(bmp.GetSize(), (TILE_SIZE, TILE_SIZE))
+        self.assertIs(self.viewer.GetTile(0, 0), bmp)
+
+        # the visible tiles are rendered when idle, not while painting
+        for tile in self.viewer.GetTiles(0, 0, 400, 300):
+            self.assertIn(('tile', self.viewer.zoomkey) + tile, self.viewer.cache)
+
+        # the tiles of the previous zoom are kept to show while zooming
+        zoomkey = self.viewer.zoomkey
+        self.viewer.SetZoom(2.0)
+        self.waitFor(500)
+        self.assertNotEqual(self.viewer.zoomkey, zoomkey)
+        self.assertIn(('tile', zoomkey, 0, 0), self.viewer.cache)
+
+    @unittest.skipIf(not havePyPDF,  "PyMuPDF or PyPDF2 required")
+    def test_lib_pdfviewer_pagebitmap(self):
+        from wx.lib.pdfviewer import viewer
+        if viewer.mupdf:
+            return      # PyMuPDF renders only the area of each tile
+        self.viewer = pdfViewer(self.frame, wx.ID_ANY, wx.DefaultPosition,
+                                (400, 300),
+                                wx.HSCROLL|wx.VSCROLL|wx.SUNKEN_BORDER)
+        self.viewer.LoadFile(samplePdf)
+        self.waitFor(500)
+        # the tiles of a page are cut from a single rendering of the page
+        self.viewer.GetTile(0, 0)
+        page = self.viewer.cache.Get(('page', self.viewer.zoomkey, 0))
+        self.assertIsNotNone(page)
+        self.assertEqual(page.GetWidth(), self.viewer.Xpagespixels[0])
+        self.assertIs(self.viewer.GetPageBitmap(0), page)
+
 #---------------------------------------------------------------------------
 
 if __name__ == '__main__':
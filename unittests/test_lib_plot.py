@@ -2,8 +2,10 @@
 import unittest
 from unittests import wtc
 import wx
+import numpy as np
 
 import wx.lib.plot as wxplot
+from wx.lib.plot.utils import nearest_point_index
 
 #---------------------------------------------------------------------------
 
@@ -14,6 +16,159 @@ class lib_plot_PlotCanvas_Tests(wtc.WidgetTestCase):
         p = wxplot.PlotCanvas(self.frame)
 
 
+class lib_plot_PolyLine_Tests(wtc.WidgetTestCase):
+
+    def test_lib_plot_polyline_decimate(self):
+        x = np.arange(100000, dtype=float)
+        y = np.sin(x / 100.0) + np.random.RandomState(0).normal(size=len(x))
+        line = wxplot.PolyLine(np.column_stack((x, y)))
+
+        # 1000 pixel columns
+        line.decimate((0, len(x)), (1000.0 / len(x), 1))
+        points = line._drawPoints
+        self.assertTrue(len(points) <= 4 * 1000 + 2)
+        self.assertEqual(points[:, 1].max(), y.max())
+        self.assertEqual(points[:, 1].min(), y.min())
+        self.assertTrue((np.diff(points[:, 0]) > 0).all())
+
+        # panning gives the same result as a fresh decimation
+        line.decimate((5000, 5000 + len(x)), (1000.0 / len(x), 1))
+        panned = line._drawPoints
+        fresh = wxplot.PolyLine(np.column_stack((x, y)))
+        fresh.decimate((5000, 5000 + len(x)), (1000.0 / len(x), 1))
+        self.assertTrue(np.array_equal(panned, fresh._drawPoints))
+
+        # few points in view: they are all drawn, plus one on each side
+        line.decimate((100, 200), (10, 1))
+        self.assertTrue(np.array_equal(line._drawPoints[:, 0], x[99:202]))
+
+        line.decimate(None, (10, 1))
+        self.assertTrue(line._drawPoints is None)
+
+    def test_lib_plot_polyline_decimate_unsorted(self):
+        line = wxplot.PolyLine([(0, 0), (2, 1), (1, 2)])
+        line.decimate((0, 2), (1, 1))
+        self.assertTrue(line._drawPoints is None)
+
+
+class lib_plot_RingBuffer_Tests(wtc.WidgetTestCase):
+
+    def test_lib_plot_ringbuffer_append(self):
+        buf = wxplot.RingBuffer(5, [(0, 0), (1, 1)])
+        self.assertEqual(len(buf), 2)
+        buf.append((2, 4))
+        buf.append([(3, 9), (4, 16), (5, 25)])
+        self.assertEqual(len(buf), 5)
+        self.assertEqual(buf.total, 6)
+        self.assertTrue(np.array_equal(buf.array[:, 0], [1, 2, 3, 4, 5]))
+        buf.append([(i, i * i) for i in range(6, 20)])
+        self.assertTrue(np.array_equal(buf.array[:, 0], range(15, 20)))
+        self.assertTrue(buf.ascending)
+        buf.append((0, 0))
+        self.assertFalse(buf.ascending)
+        buf.clear()
+        self.assertEqual(len(buf), 0)
+        self.assertEqual(buf.total, 21)
+
+    def test_lib_plot_ringbuffer_source(self):
+        buf = wxplot.RingBuffer(100, [(0, 0), (1, 1)])
+        line = wxplot.PolyLine(buf)
+        self.assertEqual(len(line.points), 2)
+        state = line._appendState()
+        self.assertEqual(state[1:], (2, 0, 1))
+        buf.append([(2, 2), (3, 3)])
+        self.assertTrue(np.array_equal(line.points[:, 0], [0, 1, 2, 3]))
+        self.assertNotEqual(line._appendState()[0], state[0])
+        line.points = [(0, 0)]
+        buf.append((4, 4))
+        self.assertEqual(len(line.points), 1)
+
+    def test_lib_plot_ringbuffer_clear(self):
+        buf = wxplot.RingBuffer(100, [(0, 0), (1, 1)])
+        line = wxplot.PolyLine(buf)
+        self.assertEqual(len(line.points), 2)
+        generation = buf.generation
+        buf.clear()
+        self.assertNotEqual(buf.generation, generation)
+        self.assertEqual(len(line.points), 0)
+        buf.append([(5, 5), (6, 6)])
+        self.assertTrue(np.array_equal(line.points[:, 0], [5, 6]))
+
+    def test_lib_plot_drawappended(self):
+        canvas = wxplot.PlotCanvas(self.frame, size=(400, 300))
+        self.frame.SendSizeEvent()
+        self.myYield()
+        buf = wxplot.RingBuffer(1000, [(x, np.sin(x / 5.0)) for x in range(50)])
+        graphics = wxplot.PlotGraphics([wxplot.PolyLine(buf)])
+        canvas.Draw(graphics, xAxis=(0, 100), yAxis=(-1.5, 1.5))
+
+        columns = []
+        restorePlotArea = canvas._restorePlotArea
+        def spy(*args):
+            columns.append(restorePlotArea(*args))
+            return columns[-1]
+        canvas._restorePlotArea = spy
+
+        # the old picture is scrolled, only the new part is drawn
+        buf.append([(x, np.sin(x / 5.0)) for x in range(50, 60)])
+        canvas.DrawAppended(xAxis=(10, 110))
+        self.assertEqual(len(columns), 1)
+        self.assertIsNotNone(columns[0])
+        incremental = canvas._Buffer.ConvertToImage().GetData()
+
+        # and it looks the same as a full redraw
+        graphics, xAxis, yAxis = canvas.last_draw
+        canvas.Draw(graphics, xAxis=tuple(xAxis), yAxis=tuple(yAxis))
+        self.assertEqual(incremental, canvas._Buffer.ConvertToImage().GetData())
+
+
+class lib_plot_ClosestPoint_Tests(wtc.WidgetTestCase):
+
+    def bruteForce(self, points, pxy):
+        d = np.sqrt(((points - pxy) ** 2).sum(1))
+        return np.argmin(d), d.min()
+
+    def test_lib_plot_nearest_point_index(self):
+        rng = np.random.RandomState(1)
+        x = np.sort(rng.uniform(0, 100, 5000))
+        for points in (np.column_stack((x, rng.normal(size=len(x)))),
+                       rng.uniform(0, 100, (5000, 2))):
+            index = nearest_point_index(points)
+            for pxy in rng.uniform(-10, 110, (50, 2)):
+                i, dist = index.nearest(pxy)
+                j, expected = self.bruteForce(points, pxy)
+                self.assertEqual(i, j)
+                self.assertAlmostEqual(dist, expected)
+
+    def test_lib_plot_nearest_point_index_nan(self):
+        points = np.array([(0, 0), (np.nan, 1), (2, 2), (1, 1)])
+        index = nearest_point_index(points)
+        self.assertEqual(index.nearest((1.9, 1.9))[0], 2)
+        self.assertEqual(index.nearest((0.9, 1.0))[0], 3)
+
+    def test_lib_plot_getclosestpoint(self):
+        rng = np.random.RandomState(2)
+        points = rng.uniform(0, 10, (1000, 2))
+        line = wxplot.PolyLine(points)
+        line.scaleAndShift((10, -50), (5, 600))
+        for pxy in rng.uniform(0, 10, (20, 2)):
+            index, pointXY, scaledXY, dist = line.getClosestPoint(pxy)
+            j, expected = self.bruteForce(line.scaled,
+                                          np.multiply(line.currentScale, pxy)
+                                          + line.currentShift)
+            self.assertEqual(index, j)
+            self.assertAlmostEqual(dist, expected)
+            index, pointXY, scaledXY, dist = line.getClosestPoint(pxy, False)
+            self.assertEqual(index, self.bruteForce(points, pxy)[0])
+
+        # a new scale rebuilds the index
+        line.scaleAndShift((1, -500), (5, 600))
+        pxy = np.array((5.0, 5.0))
+        j = self.bruteForce(line.scaled, np.multiply(line.currentScale, pxy)
+                            + line.currentShift)[0]
+        self.assertEqual(line.getClosestPoint(pxy)[0], j)
+
+
 class lib_plot_Tests(wtc.WidgetTestCase):
     def test_lib_plot_tempstyle_contextmanager(self):
         pass
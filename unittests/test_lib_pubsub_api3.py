@@ -107,6 +107,44 @@ class lib_pubsub_Except(wtc.PubsubTestCase):
         self.assertEqual(topicNames(listenToAll), [self.pub.ALL_TOPICS])
 
 
+    def testSendAfterSubscriptionChanges(self):
+        # the listeners are cached for sending, check the cache follows
+        # the changes to the subscriptions, in the topic and its parents
+        received = []
+        def child(a):
+            received.append('child')
+        def parent(a):
+            received.append('parent')
+
+        self.pub.subscribe(child, 'sendCache.child')
+        self.pub.sendMessage('sendCache.child', a=1)
+        self.assertEqual(received, ['child'])
+
+        self.pub.subscribe(parent, 'sendCache')
+        del received[:]
+        self.pub.sendMessage('sendCache.child', a=1)
+        self.pub.sendMessage(('sendCache', 'child'), a=1)
+        self.assertEqual(received, ['child', 'parent'] * 2)
+
+        self.pub.unsubscribe(child, 'sendCache.child')
+        del received[:]
+        self.pub.sendMessage('sendCache.child', a=1)
+        self.assertEqual(received, ['parent'])
+
+        self.pub.unsubAll('sendCache')
+        del received[:]
+        self.pub.sendMessage('sendCache.child', a=1)
+        self.assertEqual(received, [])
+
+        # a topic deleted and created again is a different topic
+        topicMgr = self.pub.getDefaultTopicMgr()
+        topicMgr.delTopic('sendCache')
+        self.pub.subscribe(child, 'sendCache.child')
+        self.pub.sendMessage('sendCache.child', a=1)
+        self.assertEqual(received, ['child'])
+        self.assertTrue(topicMgr.getTopic('sendCache.child').hasListener(child))
+
+
     def testMissingReqdArgs(self):
         def proto(a, b, c=None):
             pass
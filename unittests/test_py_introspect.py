@@ -1,4 +1,5 @@
 import sys
+import types
 import unittest
 
 import wx.py.introspect as inrspct
@@ -13,6 +14,52 @@ class py_introspect_Tests(unittest.TestCase):
         attributes = inrspct.getAutoCompleteList("wx.")
         self.assertTrue(len(attributes) > 100)
 
+    def test_getAutoCompleteListPrefix(self):
+        sys.ps2 = '... '
+        attributes = inrspct.getAutoCompleteList("wx.", prefix='fra')
+        self.assertIn('Frame', attributes)
+        self.assertTrue(all(name.upper().startswith('FRA') for name in attributes))
+
+    def test_attributeCache(self):
+        class Obj(object):
+            pass
+        obj = Obj()
+        index = inrspct.getAttributeIndex(obj)
+        self.assertIs(inrspct.getAttributeIndex(obj), index)
+
+        # adding an attribute invalidates the cached names
+        obj.spam = 1
+        self.assertIn('spam', inrspct.getAttributeNames(obj))
+        Obj.eggs = 2
+        self.assertIn('eggs', inrspct.getAttributeNames(obj))
+
+        # replacing an attribute by another one keeps the same count
+        del obj.spam
+        obj.ham = 3
+        names = inrspct.getAttributeNames(obj)
+        self.assertIn('ham', names)
+        self.assertNotIn('spam', names)
+
+        # the entry goes away with the object
+        key = (id(obj), type(obj))
+        self.assertIn(key, inrspct._attributeCache)
+        del obj, index
+        self.assertNotIn(key, inrspct._attributeCache)
+
+    def test_attributeCacheModule(self):
+        module = types.ModuleType('spam')
+        module.eggs = 1
+        self.assertIn('eggs', inrspct.getAttributeNames(module))
+        # like a reload which defines as many names, but other ones
+        namespace = dict(module.__dict__)
+        del namespace['eggs']
+        namespace['ham'] = 2
+        module.__dict__.clear()
+        module.__dict__.update(namespace)
+        names = inrspct.getAttributeNames(module)
+        self.assertIn('ham', names)
+        self.assertNotIn('eggs', names)
+
 
 #---------------------------------------------------------------------------
 
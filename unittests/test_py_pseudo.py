@@ -0,0 +1,51 @@
+import threading
+import unittest
+
+import wx.py.pseudo as pseudo
+
+#---------------------------------------------------------------------------
+
+class py_pseudo_Tests(unittest.TestCase):
+
+    def test_OutputBufferCoalesces(self):
+        displayed = []
+        scheduled = []
+        output = pseudo.OutputBuffer(lambda kind, text: displayed.append((kind, text)),
+                                     lambda: scheduled.append(1))
+        for i in range(1000):
+            output.write('line %d\n' % i)
+        output.write('oops\n', 'Error')
+        output.write('more\n')
+        self.assertEqual(len(scheduled), 1)
+        self.assertTrue(output.pending())
+
+        output.flush()
+        self.assertFalse(output.pending())
+        self.assertEqual([kind for kind, text in displayed], ['Output', 'Error', 'Output'])
+        self.assertEqual(displayed[0][1].count('\n'), 1000)
+
+        output.write('again')
+        self.assertEqual(len(scheduled), 2)
+
+    def test_OutputBufferThreads(self):
+        displayed = []
+        output = pseudo.OutputBuffer(lambda kind, text: displayed.append(text))
+
+        def writer(n):
+            for i in range(1000):
+                output.write('%d\n' % n)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        output.flush()
+        self.assertEqual(''.join(displayed).count('\n'), 4000)
+
+
+#---------------------------------------------------------------------------
+
+
+if __name__ == '__main__':
+    unittest.main()
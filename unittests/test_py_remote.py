@@ -0,0 +1,104 @@
+import threading
+import time
+import unittest
+from unittests import wtc
+import wx
+
+from wx.py.remote import RemoteInterpreter
+
+class py_remote_App_Tests(wtc.WidgetTestCase):
+
+    def test_input(self):
+        # Like Shell.raw_input, wait for the answer while processing the
+        # events, which doesn't work from inside a Yield.
+        def rawin(prompt):
+            answer = []
+            wx.CallAfter(answer.append, 'typed')
+            deadline = time.time() + 5
+            while not answer and time.time() < deadline:
+                wx.GetApp().Yield(onlyIfNeeded=True)
+            return answer[0] if answer else 'stuck'
+
+        out = _Output()
+        interp = RemoteInterpreter(stdout=out, stderr=out, rawin=rawin)
+        try:
+            interp.push('print(input("name? "))')
+        finally:
+            interp.stop()
+        self.assertIn('typed', out.getvalue())
+
+
+#---------------------------------------------------------------------------
+
+class _Output(object):
+    def __init__(self):
+        self.data = []
+
+    def write(self, text):
+        self.data.append(text)
+
+    def getvalue(self):
+        return ''.join(self.data)
+
+
+class py_remote_Tests(unittest.TestCase):
+
+    def setUp(self):
+        self.out = _Output()
+        self.err = _Output()
+        self.interp = RemoteInterpreter(stdout=self.out, stderr=self.err,
+                                        rawin=lambda prompt: 'typed')
+
+    def tearDown(self):
+        self.interp.stop()
+
+    def test_push(self):
+        interp = self.interp
+        self.assertFalse(interp.push('x = 41'))
+        self.assertTrue(interp.push('def f(a, b=2):'))
+        self.assertTrue(interp.push('    return a + 1'))
+        self.assertFalse(interp.push(''))
+        interp.push('print(f(x))')
+        self.assertIn('42', self.out.getvalue())
+        interp.push('print(input("name? "))')
+        self.assertIn('typed', self.out.getvalue())
+
+    def test_stdin(self):
+        lines = ['spam', 'eggs', '']
+        self.interp.rawin = lambda prompt: lines.pop(0)
+        self.interp.push('import sys')
+        self.interp.push('print(repr(sys.stdin.readlines()))')
+        self.assertIn(repr(['spam\n', 'eggs\n', '\n']), self.out.getvalue())
+
+    def test_stdinEOF(self):
+        def rawin(prompt):
+            raise EOFError
+        self.interp.rawin = rawin
+        self.interp.push('import sys')
+        self.interp.push('print(repr(sys.stdin.readline()), sys.stdin.readlines())')
+        self.assertIn("'' []", self.out.getvalue())
+
+    def test_queries(self):
+        interp = self.interp
+        interp.push('import os')
+        self.assertIn('path', interp.getAutoCompleteList('os.'))
+        interp.push('def f(a, b=2): pass')
+        interp.push('')
+        self.assertIn('a, b=2', interp.getCallTip('f')[1])
+
+    def test_interrupt(self):
+        interp = self.interp
+        timer = threading.Timer(0.5, interp.interrupt)
+        timer.start()
+        interp.push('while True: pass')
+        interp.push('')
+        timer.join()
+        self.assertIn('KeyboardInterrupt', self.err.getvalue())
+        self.assertTrue(interp.isAlive())
+
+
+#---------------------------------------------------------------------------
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import threading
+import unittest
+from unittests import wtc
+import wx
+import wx.svg
+import wx.svg.bundle
+
+svgData = b"""\
+<svg xmlns="http://www.w3.org/2000/svg" width="32" height="32">
+  <rect x="2" y="2" width="28" height="28" fill="#3060c0" stroke="black"/>
+  <circle cx="16" cy="16" r="8" fill="white" fill-opacity="0.5"/>
+</svg>
+"""
+
+#---------------------------------------------------------------------------
+
+class svgimage_Tests(wtc.WidgetTestCase):
+
+    def test_svgimagePoints(self):
+        img = wx.svg.SVGimage.CreateFromBytes(svgData)
+        for shape in img.shapes:
+            for path in shape.paths:
+                pts = path.pts_view.tolist()
+                self.assertEqual(len(pts), path.npts * 2)
+                self.assertEqual(pts[0::2], [x for x, y in path.points])
+                self.assertEqual(pts[1::2], [y for x, y in path.points])
+
+
+    def test_svgimageBitmapCache(self):
+        img = wx.svg.SVGimage.CreateFromBytes(svgData)
+        bmp = img.ConvertToScaledBitmap((24, 24))
+        self.assertTrue(bmp.IsOk())
+        self.assertEqual(bmp.GetSize(), wx.Size(24, 24))
+        self.assertIs(img.ConvertToScaledBitmap((24, 24)), bmp)
+        self.assertIsNot(img.ConvertToScaledBitmap((32, 32)), bmp)
+
+        for size in range(1, img.BitmapCacheSize + 1):
+            img.ConvertToScaledBitmap((size, size))
+        self.assertIsNot(img.ConvertToScaledBitmap((24, 24)), bmp)
+
+        bmp = img.ConvertToScaledBitmap((24, 24))
+        img.ClearCache()
+        self.assertIsNot(img.ConvertToScaledBitmap((24, 24)), bmp)
+
+
+    def test_svgimageRenderToGC(self):
+        img = wx.svg.SVGimage.CreateFromBytes(svgData)
+        images = []
+        for i in range(2):
+            bmp = wx.Bitmap(32, 32)
+            dc = wx.MemoryDC(bmp)
+            dc.SetBackground(wx.WHITE_BRUSH)
+            dc.Clear()
+            gc = wx.GraphicsContext.Create(dc)
+            img.RenderToGC(gc)
+            del gc
+            dc.SelectObject(wx.NullBitmap)
+            images.append(bmp.ConvertToImage())
+
+        # the second rendering, from the cached paths, looks the same
+        self.assertEqual(images[0].GetData(), images[1].GetData())
+        self.assertEqual((images[1].GetRed(5, 5), images[1].GetGreen(5, 5),
+                          images[1].GetBlue(5, 5)), (0x30, 0x60, 0xc0))
+
+
+    def test_svgimageRasterizeThreads(self):
+        img = wx.svg.SVGimage.CreateFromBytes(svgData)
+        expected = img.Rasterize(0.0, 0.0, 2.0, 64, 64)
+        results = []
+        def rasterize():
+            for i in range(20):
+                results.append(img.Rasterize(0.0, 0.0, 2.0, 64, 64))
+        threads = [threading.Thread(target=rasterize) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(results), 80)
+        self.assertTrue(all(buf == expected for buf in results))
+
+
+class svgbundle_Tests(wtc.WidgetTestCase):
+
+    def test_svgbundleGetBitmap(self):
+        bundle = wx.svg.bundle.BitmapBundleFromSVG(svgData, (16, 16))
+        self.assertTrue(bundle.IsOk())
+        self.assertEqual(bundle.GetDefaultSize(), wx.Size(16, 16))
+        bmp = bundle.GetBitmap((32, 32))
+        self.assertTrue(bmp.IsOk())
+        self.assertEqual(bmp.GetSize(), wx.Size(32, 32))
+
+
+    def test_svgbundleSharedSource(self):
+        a = wx.svg.bundle.GetSVGSource(svgData)
+        b = wx.svg.bundle.GetSVGSource(svgData)
+        self.assertIs(a, b)
+
+
+    def test_svgbundlePrefetch(self):
+        cache = wx.svg.bundle.GetBitmapCache()
+        cache.Clear()
+        source = wx.svg.bundle.GetSVGSource(svgData)
+        impl = wx.svg.bundle.SVGBitmapBundleImpl(source, (16, 16))
+        impl.Prefetch([3.0])
+        # the prefetched bitmap is moved to the cache once it is ready
+        for i in range(50):
+            if not source.pending:
+                break
+            wx.MilliSleep(10)
+            self.myYield()
+        self.assertEqual(source.pending, {})
+        self.assertIsNotNone(cache.Get((source.key, 48, 48)))
+        self.assertEqual(cache.GetBytes(), 48 * 48 * 4)
+
+
+    def test_svgbundleCache(self):
+        cache = wx.svg.bundle.BitmapCache(maxBytes=2 * 16 * 16 * 4)
+        for i in range(3):
+            cache.Put(i, wx.Bitmap(16, 16), 16 * 16 * 4)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.Get(0))
+        self.assertIsNotNone(cache.Get(1))
+        cache.Put(3, wx.Bitmap(16, 16), 16 * 16 * 4)
+        # 1 was used more recently than 2
+        self.assertIsNone(cache.Get(2))
+        self.assertIsNotNone(cache.Get(1))
+        self.assertEqual(cache.GetBytes(), 2 * 16 * 16 * 4)
+        cache.SetMaxBytes(0)
+        self.assertEqual(len(cache), 0)
+
+#---------------------------------------------------------------------------
+
+
+if __name__ == '__main__':
+    unittest.main()
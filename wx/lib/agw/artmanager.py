@@ -745,17 +745,38 @@ class ArtManager(wx.EvtHandler):
         self._bitmaps.update({"arrow_up": bmp})
 
 
-    def GetStockBitmap(self, name):
+    def SetStockBitmap(self, name, bmp):
+        """
+        Adds a bitmap to the stock, or replaces one.
+
+        :param string `name`: the bitmap name;
+        :param `bmp`: a :class:`wx.Bitmap`, or a :class:`wx.BitmapBundle` (for example made
+         from an SVG image with :func:`wx.svg.bundle.BitmapBundleFromSVG`) to get bitmaps
+         suited to the display scale of the window they are drawn on.
+        """
+
+        self._bitmaps.update({name: bmp})
+
+
+    def GetStockBitmap(self, name, window=None):
         """
         Returns a bitmap from a stock.
 
-        :param string `name`: the bitmap name.
+        :param string `name`: the bitmap name;
+        :param `window`: if the stock bitmap is a :class:`wx.BitmapBundle`, the :class:`wx.Window`
+         whose display scale selects the bitmap. If ``None``, the default size is used.
 
         :return: The stock bitmap, if `name` was found in the stock bitmap dictionary.
          Otherwise, :class:`NullBitmap` is returned.
         """
 
-        return self._bitmaps.get(name, wx.NullBitmap)
+        bmp = self._bitmaps.get(name, wx.NullBitmap)
+        if isinstance(bmp, wx.BitmapBundle):
+            if window is not None:
+                return bmp.GetBitmapFor(window)
+            return bmp.GetBitmap(wx.DefaultSize)
+
+        return bmp
 
 
     def Get(self):
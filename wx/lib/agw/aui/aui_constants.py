@@ -56,6 +56,22 @@ nb_right_bits = b"\xff\xff\xff\xff\xff\xff\xdf\xff\x9f\xff\x1f\xff\x1f\xfe\x1f\x
 nb_list_bits = b"\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\x0f\xf8\xff\xff\x0f\xf8\x1f\xfc\x3f\xfe\x7f\xff\xff\xff\xff\xff\xff\xff\xff\xff"
 """ AuiNotebook windows list button image. """
 
+nb_close_svg = b"""<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16">
+<path d="M4 4L12 12M12 4L4 12" fill="none" stroke="%s" stroke-width="2"/></svg>"""
+""" AuiNotebook close button SVG image, with a placeholder for the colour. """
+
+nb_left_svg = b"""<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16">
+<path d="M9 3L4 7.5L9 12Z" fill="%s"/></svg>"""
+""" AuiNotebook left button SVG image, with a placeholder for the colour. """
+
+nb_right_svg = b"""<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16">
+<path d="M6 3L11 7.5L6 12Z" fill="%s"/></svg>"""
+""" AuiNotebook right button SVG image, with a placeholder for the colour. """
+
+nb_list_svg = b"""<svg xmlns="http://www.w3.org/2000/svg" width="16" height="16">
+<path d="M4 6H11V7H4ZM4 8H11L7.5 11.5Z" fill="%s"/></svg>"""
+""" AuiNotebook windows list button SVG image, with a placeholder for the colour. """
+
 
 #----------------------------------------------------------------------
 tab_active_center = PyEmbeddedImage(
@@ -22,6 +22,7 @@ __date__ = "31 March 2009"
 
 
 import wx
+from wx.svg.bundle import BitmapBundleFromSVG
 
 from .aui_constants import *
 
@@ -153,6 +154,19 @@ def BitmapFromBits(bits, w, h, colour):
     return wx.Bitmap(img)
 
 
+def SVGButtonBundle(svg, colour, size=(16, 16)):
+    """
+    Returns a :class:`wx.BitmapBundle` drawing a button SVG image in the given colour.
+
+    :param bytes `svg`: the SVG image, with a ``%s`` placeholder for the colour;
+    :param wx.Colour `colour`: the colour of the button;
+    :param wx.Size `size`: the default size of the button bitmaps.
+    """
+
+    colour = colour.GetAsString(wx.C2S_HTML_SYNTAX).encode("ascii")
+    return BitmapBundleFromSVG(svg % colour, size)
+
+
 def IndentPressedBitmap(rect, button_state):
     """
     Indents the input rectangle `rect` based on the value of `button_state`.
@@ -631,7 +645,7 @@ def GetSlidingPoints(rect, size, direction):
 
 def CopyAttributes(newArt, oldArt):
     """
-    Copies pens, brushes, colours and fonts from the old tab art to the new one.
+    Copies pens, brushes, colours, fonts and button bitmaps from the old tab art to the new one.
 
     :param `newArt`: the new instance of :class:`~wx.lib.agw.aui.tabart.AuiDefaultTabArt`;
     :param `oldArt`: the old instance of :class:`~wx.lib.agw.aui.tabart.AuiDefaultTabArt`.
@@ -642,7 +656,13 @@ def CopyAttributes(newArt, oldArt):
     for attr in attrs:
         if attr.startswith("_") and (attr.endswith("_colour") or attr.endswith("_font") or \
                                      attr.endswith("_font") or attr.endswith("_brush") or \
-                                     attr.endswith("Pen") or attr.endswith("_pen")):
+                                     attr.endswith("Pen") or attr.endswith("_pen") or \
+                                     attr.endswith("_bmp")):
             setattr(newArt, attr, getattr(oldArt, attr))
 
+    if hasattr(oldArt, "_button_bundles"):
+        # the bitmaps of the bundles are picked again for the window of the new art
+        newArt._button_bundles = dict(oldArt._button_bundles)
+        newArt._bundle_scale = None
+
     return newArt
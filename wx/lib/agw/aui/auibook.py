@@ -1451,6 +1451,9 @@ class AuiTabContainer(object):
         if not raw_dc or not raw_dc.IsOk():
             return
 
+        if isinstance(self._art, TA.AuiDefaultTabArt):
+            self._art.UpdateButtonBitmaps(wnd)
+
         dc = wx.MemoryDC()
 
         # use the same layout direction as the window DC uses to ensure that the
@@ -32,6 +32,7 @@ import wx
 
 
 from .aui_utilities import BitmapFromBits, StepColour, IndentPressedBitmap, ChopText
+from .aui_utilities import SVGButtonBundle
 from .aui_utilities import GetBaseColour, DrawMACCloseButton, LightColour, TakeScreenShot
 from .aui_utilities import CopyAttributes
 
@@ -155,6 +156,10 @@ class AuiDefaultTabArt(object):
         self._focusPen.SetDashes([1, 1])
         self._focusPen.SetCap(wx.CAP_BUTT)
 
+        # (bitmap_id, button_state) --> wx.BitmapBundle, in the order they were set
+        self._button_bundles = {}
+        self._bundle_scale = None
+
 
     def SetBaseColour(self, base_colour):
         """
@@ -614,7 +619,34 @@ class AuiDefaultTabArt(object):
 
         :param integer `bitmap_id`: the button identifier;
         :param integer `button_state`: the button state;
-        :param wx.Bitmap `bmp`: the custom bitmap to use for the button.
+        :param `bmp`: the custom bitmap to use for the button, a :class:`wx.Bitmap` or
+         a :class:`wx.BitmapBundle`. The bitmap of a bundle is chosen for the display
+         scale of the notebook, see :meth:`UpdateButtonBitmaps`.
+        """
+
+        if bitmap_id == AUI_BUTTON_CLOSE and button_state == AUI_BUTTON_STATE_NORMAL:
+            # this replaces the bitmaps of all the states
+            for key in list(self._button_bundles):
+                if key[0] == AUI_BUTTON_CLOSE:
+                    del self._button_bundles[key]
+        else:
+            self._button_bundles.pop((bitmap_id, button_state), None)
+
+        if isinstance(bmp, wx.BitmapBundle):
+            self._button_bundles[(bitmap_id, button_state)] = bmp
+            self._bundle_scale = None
+            bmp = bmp.GetBitmap(wx.DefaultSize)
+
+        self.DoSetCustomButton(bitmap_id, button_state, bmp)
+
+
+    def DoSetCustomButton(self, bitmap_id, button_state, bmp):
+        """
+        Sets the bitmap of a button, used by :meth:`SetCustomButton` and :meth:`UpdateButtonBitmaps`.
+
+        :param integer `bitmap_id`: the button identifier;
+        :param integer `button_state`: the button state;
+        :param wx.Bitmap `bmp`: the bitmap to use for the button.
         """
 
         if bitmap_id == AUI_BUTTON_CLOSE:
@@ -650,6 +682,42 @@ class AuiDefaultTabArt(object):
                 self._active_windowlist_bmp = bmp
 
 
+    def SetSVGButtons(self):
+        """
+        Uses SVG images for the close, left, right and window list buttons, so that
+        they are drawn sharply at any display scale instead of using the 16x16 bitmaps.
+
+        :see: :func:`~wx.svg.bundle.BitmapBundleFromSVG`
+        """
+
+        active_colour, disabled_colour = wx.BLACK, wx.Colour(128, 128, 128)
+
+        for bitmap_id, svg in [(AUI_BUTTON_CLOSE, nb_close_svg), (AUI_BUTTON_LEFT, nb_left_svg),
+                               (AUI_BUTTON_RIGHT, nb_right_svg), (AUI_BUTTON_WINDOWLIST, nb_list_svg)]:
+            self.SetCustomButton(bitmap_id, AUI_BUTTON_STATE_NORMAL, SVGButtonBundle(svg, active_colour))
+            self.SetCustomButton(bitmap_id, AUI_BUTTON_STATE_DISABLED, SVGButtonBundle(svg, disabled_colour))
+
+
+    def UpdateButtonBitmaps(self, wnd):
+        """
+        Picks the bitmaps of the buttons set with a :class:`wx.BitmapBundle` for the display
+        scale of the window, if it changed. This is called by the notebook before drawing the tabs.
+
+        :param `wnd`: a :class:`wx.Window` instance object.
+        """
+
+        if not self._button_bundles:
+            return
+
+        scale = wnd.GetDPIScaleFactor()
+        if scale == self._bundle_scale:
+            return
+
+        self._bundle_scale = scale
+        for (bitmap_id, button_state), bundle in self._button_bundles.items():
+            self.DoSetCustomButton(bitmap_id, button_state, bundle.GetBitmapFor(wnd))
+
+
     def GetIndentSize(self):
         """ Returns the tabs indent size. """
 
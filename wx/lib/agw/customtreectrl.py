@@ -101,6 +101,8 @@ to the standard :class:`TreeCtrl` behaviour this class supports:
 * Tooltips on long items when the horizontal space is low, via the ``TR_TOOLTIP_ON_LONG_ITEMS``
   style (`New in version 0.9.3`).
 * Hiding items
+* Virtual mode, via the ``TR_VIRTUAL`` style: the items are created from a data model
+  only when their parent is expanded, and released when it is collapsed.
 
 And a lot more. Check the demo for an almost complete review of the functionalities.
 
@@ -134,6 +136,18 @@ ellipsized and/or highlighted with a tooltip:
 - ``TR_TOOLTIP_ON_LONG_ITEMS``: shows tooltips on long items when the horizontal space
   for :class:`CustomTreeCtrl` is low (`New in version 0.9.3`);.
 
+And a style to use :class:`CustomTreeCtrl` as a view of a (possibly very large) data
+model:
+
+- ``TR_VIRTUAL``: the tree asks the :meth:`~CustomTreeCtrl.OnGetChildrenCount`,
+  :meth:`~CustomTreeCtrl.OnGetItemText`, :meth:`~CustomTreeCtrl.OnGetItemImage` and
+  :meth:`~CustomTreeCtrl.OnGetItemAttr` methods for the items, which you override in
+  a derived class. The children of an item are only created when the item is expanded,
+  and they are released when it is collapsed, so only the items that are shown exist
+  as :class:`GenericTreeItem` objects. Use :meth:`~CustomTreeCtrl.GetItemIndex` to
+  find the position of an item in the model, and :meth:`~CustomTreeCtrl.RefreshItems`
+  when the model changes.
+
 All the methods available in :class:`TreeCtrl` are also available in :class:`CustomTreeCtrl`.
 
 
@@ -330,6 +344,7 @@ Window agwStyle Flags             Hex Value   Description
 ``TR_ALIGN_WINDOWS_RIGHT``            0x40000 Flag used to align windows (in items with windows) to the rightmost edge of :class:`CustomTreeCtrl`.
 ``TR_ELLIPSIZE_LONG_ITEMS``           0x80000 Flag used to ellipsize long items when the horizontal space for :class:`CustomTreeCtrl` is low.
 ``TR_TOOLTIP_ON_LONG_ITEMS``         0x100000 Flag used to show tooltips on long items when the horizontal space for :class:`CustomTreeCtrl` is low.
+``TR_VIRTUAL``                       0x800000 :class:`CustomTreeCtrl` will have virtual behaviour, creating its items from the ``OnGetXXX`` methods.
 ================================= =========== ==================================================
 
 The ``wx.TR_HAS_VARIABLE_LINE_HEIGHT`` style should be set if item rows might
@@ -402,6 +417,8 @@ Version 2.8
 __version__ = "2.8"
 
 import wx
+import bisect
+import itertools
 from wx.lib.expando import ExpandoTextCtrl
 
 # ----------------------------------------------------------------------------
@@ -488,6 +505,8 @@ TR_ELLIPSIZE_LONG_ITEMS = 0x80000                              # to ellipsize lo
 """ Flag used to ellipsize long items when the horizontal space for :class:`CustomTreeCtrl` is low."""
 TR_TOOLTIP_ON_LONG_ITEMS = 0x100000                            # to display tooltips on long items when horizontal space is low
 """ Flag used to show tooltips on long items when the horizontal space for :class:`CustomTreeCtrl` is low."""
+TR_VIRTUAL = 0x800000                                          # the items are created from a data model when needed
+""" :class:`CustomTreeCtrl` will have virtual behaviour, creating its items from the ``OnGetXXX`` methods. """
 
 TR_DEFAULT_STYLE = wx.TR_DEFAULT_STYLE                         # default style for the tree control
 """ The set of flags that are closest to the defaults for the native control for a particular toolkit. """
@@ -819,6 +838,250 @@ def BisectChildren(children, y):
     # Always return the previous index (it may be partially visible).
     return lo - 1 if lo > 0 else 0
 
+
+class TreeRowBlock(object):
+    """
+    A block of consecutive rows of a :class:`TreeRowIndex`. Used internally.
+
+    The rows of a block never change: when rows are inserted in it or removed
+    from it, the block is replaced by new ones.
+    """
+
+    def __init__(self, owner, rows, heights):
+        """
+        Default class constructor.
+
+        :param `owner`: the :class:`TreeRowIndex` the block belongs to;
+        :param `rows`: a list of :class:`GenericTreeItem`, the rows of the block;
+        :param `heights`: the heights of the rows.
+        """
+
+        self._owner = owner
+        self._rows = rows
+        self._heights = heights
+        # self._offsets[i] is the y position of row i relative to the block
+        self._offsets = [0]
+        self._offsets.extend(itertools.accumulate(heights))
+        self._width = None
+        # position of the block in the index, -1 once the block is replaced
+        self._index = -1
+
+        for pos, row in enumerate(rows):
+            row._rowBlock = self
+            row._rowPos = pos
+
+
+    def GetY(self, item):
+        """
+        Returns the `y` position of a row of the block.
+
+        :param `item`: an instance of :class:`GenericTreeItem`, a row of the block.
+        """
+
+        return self._owner._starts[self._index] + self._offsets[item._rowPos]
+
+
+    def GetHeight(self):
+        """ Returns the height of the rows of the block. """
+
+        return self._offsets[-1]
+
+
+    def GetWidth(self):
+        """ Returns the rightmost edge of the rows of the block, in logical coordinates. """
+
+        if self._width is None:
+            self._width = GetRowsWidth(self._rows)
+
+        return self._width
+
+
+def GetRowsWidth(rows):
+    """
+    Returns the rightmost edge of some rows of :class:`CustomTreeCtrl`, in logical
+    coordinates. As in :meth:`CustomTreeCtrl.CalculateLevel() <customtreectrl.CustomTreeCtrl.CalculateLevel>`,
+    hidden items and separators are not taken into account.
+
+    :param list `rows`: a Python list of :class:`GenericTreeItem` objects.
+    """
+
+    width = 0
+    for row in rows:
+        if not row.IsHidden() and not row.IsSeparator():
+            width = max(width, row.GetX() + row.GetWidth())
+
+    return width
+
+
+class TreeRowIndex(object):
+    """
+    TreeRowIndex keeps the rows of :class:`CustomTreeCtrl`, i.e. the items that are
+    laid out in display order, with their heights. It gives the `y` position of
+    a row, and the row at a `y` position, in O(log N) time.
+
+    The rows are stored in blocks of :data:`TreeRowIndex.BLOCK_SIZE` rows, each
+    one knowing its height. Expanding or collapsing an item only replaces the
+    blocks where its children are inserted or removed: the rows below move with
+    their blocks, without being laid out again.
+    """
+
+    BLOCK_SIZE = 256
+
+    def __init__(self):
+        """ Default class constructor. """
+
+        self._blocks = []
+        # self._starts[i] is the y position of block i, and self._firsts[i]
+        # the number of rows before it
+        self._starts = []
+        self._firsts = []
+        self._top = self._bottom = 0
+        self._count = 0
+
+
+    def __len__(self):
+        """ Returns the number of rows in the index. """
+
+        return self._count
+
+
+    def Build(self, rows, heights, top=0):
+        """
+        Builds the index.
+
+        :param `rows`: a list of :class:`GenericTreeItem`, all the rows in display order;
+        :param `heights`: the heights of the rows;
+        :param integer `top`: the `y` position of the first row.
+        """
+
+        for block in self._blocks:
+            block._index = -1
+
+        size = self.BLOCK_SIZE
+        self._blocks = [TreeRowBlock(self, rows[i:i + size], heights[i:i + size])
+                        for i in range(0, len(rows), size)]
+        self._top = top
+        self.UpdateBlocks()
+
+
+    def UpdateBlocks(self):
+        """ Updates the positions of the blocks, after some of them changed. Used internally. """
+
+        starts = [self._top]
+        firsts = [0]
+        for index, block in enumerate(self._blocks):
+            block._index = index
+            starts.append(starts[-1] + block.GetHeight())
+            firsts.append(firsts[-1] + len(block._rows))
+
+        self._count = firsts.pop()
+        self._bottom = starts.pop()
+        self._starts = starts
+        self._firsts = firsts
+
+
+    def Contains(self, item):
+        """
+        Returns ``True`` if the item is a row of the index.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+        """
+
+        block = item._rowBlock
+        return block is not None and block._owner is self and block._index >= 0
+
+
+    def GetRow(self, item):
+        """
+        Returns the position of a row in display order.
+
+        :param `item`: an instance of :class:`GenericTreeItem`, a row of the index.
+        """
+
+        return self._firsts[item._rowBlock._index] + item._rowPos
+
+
+    def GetBottom(self):
+        """ Returns the `y` position below the last row. """
+
+        return self._bottom
+
+
+    def GetWidth(self):
+        """ Returns the rightmost edge of the rows, in logical coordinates. """
+
+        return max([block.GetWidth() for block in self._blocks] or [0])
+
+
+    def FindRow(self, y):
+        """
+        Returns the row at a `y` position.
+
+        :param integer `y`: the `y` position, in logical coordinates.
+
+        :return: An instance of :class:`GenericTreeItem`, the last row that starts
+         above `y`, or ``None`` if there are none.
+        """
+
+        index = bisect.bisect_left(self._starts, y) - 1
+        if index < 0:
+            return None
+
+        block = self._blocks[index]
+        pos = bisect.bisect_left(block._offsets, y - self._starts[index], 0, len(block._rows))
+
+        return block._rows[pos - 1]
+
+
+    def Replace(self, start, stop, rows, heights):
+        """
+        Replaces some consecutive rows by others.
+
+        :param integer `start`: the position of the first row to replace;
+        :param integer `stop`: the position after the last row to replace, equal
+         to `start` to insert rows;
+        :param `rows`: a list of :class:`GenericTreeItem`, the new rows;
+        :param `heights`: the heights of the new rows.
+
+        :return: A Python list containing the rows that have been removed.
+        """
+
+        blocks = self._blocks
+        if not blocks:
+            self.Build(rows, heights, self._top)
+            return []
+
+        first = max(bisect.bisect_right(self._firsts, start) - 1, 0)
+        last = max(bisect.bisect_right(self._firsts, max(stop - 1, start)) - 1, first)
+        head, tail = blocks[first], blocks[last]
+        cut, keep = start - self._firsts[first], stop - self._firsts[last]
+
+        if first == last:
+            removed = head._rows[cut:keep]
+        else:
+            removed = head._rows[cut:]
+            for block in blocks[first + 1:last]:
+                removed.extend(block._rows)
+            removed.extend(tail._rows[:keep])
+
+        for block in blocks[first:last + 1]:
+            block._index = -1
+        for row in removed:
+            row._rowBlock = None
+
+        newRows = head._rows[:cut] + list(rows) + tail._rows[keep:]
+        newHeights = head._heights[:cut] + list(heights) + tail._heights[keep:]
+
+        size = self.BLOCK_SIZE
+        if len(newRows) <= 2 * size:
+            size = max(len(newRows), 1)
+
+        blocks[first:last + 1] = [TreeRowBlock(self, newRows[i:i + size], newHeights[i:i + size])
+                                  for i in range(0, len(newRows), size)]
+        self.UpdateBlocks()
+
+        return removed
+
 #---------------------------------------------------------------------------
 # DragImage Implementation
 # This Class Handles The Creation Of A Custom Image In Case Of Item Drag
@@ -1821,6 +2084,10 @@ class GenericTreeItem(object):
         self._hypertext = False     # indicates if the item is hypertext
         self._visited = False       # visited state for an hypertext item
         self._hidden = False        # hidden items are not painted
+        self._virtualIndex = -1     # index in the parent, for the items
+                                    # created by a virtual tree
+        self._rowBlock = None       # TreeRowBlock holding the item, if it
+        self._rowPos = 0            # is laid out, and its position there
 
         # Build checked images array
         self._checkedimages = [None, None, None, None, None]
@@ -2052,6 +2319,11 @@ class GenericTreeItem(object):
     def GetY(self):
         """ Returns the `y` position on an item, in logical coordinates. """
 
+        block = self._rowBlock
+        if block is not None and block._index >= 0:
+            # the rows above may have moved since the item was laid out
+            return block.GetY(self)
+
         return self._y
 
 
@@ -2839,7 +3111,7 @@ class GenericTreeItem(object):
          visible children.
         """
 
-        bottomY = self._y + theButton.GetLineHeight(self)
+        bottomY = self.GetY() + theButton.GetLineHeight(self)
 
         if y < bottomY:
             y = bottomY
@@ -2880,9 +3152,10 @@ class GenericTreeItem(object):
             h = theCtrl.GetLineHeight(self)
 
             pointX, pointY = point[0], point[1]
-            if pointY > self._y and pointY < self._y + h:
+            y = self.GetY()
+            if pointY > y and pointY < y + h:
 
-                y_mid = self._y + h // 2
+                y_mid = y + h // 2
 
                 if pointY < y_mid:
                     flags |= TREE_HITTEST_ONITEMUPPERPART
@@ -3198,6 +3471,9 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         self._hasWindows = False
         self._itemWithWindow = set()
 
+        # The laid out items, to move them when an item is expanded or collapsed
+        self._rowIndex = TreeRowIndex()
+
         if wx.Platform == "__WXMAC__":
             agwStyle &= ~TR_LINES_AT_ROOT
             agwStyle |= TR_NO_LINES
@@ -5714,11 +5990,16 @@ class CustomTreeCtrl(wx.ScrolledWindow):
             self._hasWindows = True
             self._itemWithWindow.add(self._anchor)
 
+        if self.IsVirtual():
+            self._anchor.SetHasPlus(self.OnGetItemHasChildren(self._anchor))
+
         if self.HasAGWFlag(TR_HIDE_ROOT):
 
             # if root is hidden, make sure we can navigate
             # into children
             self._anchor.SetHasPlus()
+            if self.IsVirtual():
+                self.CreateVirtualChildren(self._anchor)
             self._anchor.Expand()
             self.CalculatePositions()
 
@@ -6128,13 +6409,20 @@ class CustomTreeCtrl(wx.ScrolledWindow):
                 # cancelled by program
                 return
 
+        dirty = self._dirty
+        if self.IsVirtual() and not item.HasChildren():
+            self.CreateVirtualChildren(item)
+
         item.Expand()
 
         if not self._sendEvent:
             # We are in ExpandAll/ExpandAllChildren
             return
 
-        self.CalculatePositions()
+        # The children created from the data model are laid out right now.
+        self._dirty = dirty
+        if not self.CalculateChildrenPositions(item):
+            self.CalculatePositions()
         self.RefreshSubtree(item)
 
         if self._hasWindows:
@@ -6216,8 +6504,14 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         self.ChildrenClosing(item)
         item.Collapse()
 
-        self.CalculatePositions()
-        self.Refresh()
+        dirty = self._dirty
+        if self.IsVirtual() and self.HasVirtualChildren(item):
+            self.ReleaseChildren(item)
+            self._dirty = dirty
+
+        if not self.CalculateChildrenPositions(item):
+            self.CalculatePositions()
+        self.RefreshSubtree(item)
 
         if self._hasWindows:
             self.HideWindows()
@@ -6250,6 +6544,268 @@ class CustomTreeCtrl(wx.ScrolledWindow):
             self.Expand(item)
 
 
+    def IsVirtual(self):
+        """ Returns ``True`` if :class:`CustomTreeCtrl` has the ``TR_VIRTUAL`` flag set. """
+
+        return self.HasAGWFlag(TR_VIRTUAL)
+
+
+    def OnGetChildrenCount(self, item):
+        """
+        If the ``TR_VIRTUAL`` style is set this function **must** be overloaded
+        in the derived class. It should return the number of children of the
+        specified item in the data model.
+
+        :param `item`: an instance of :class:`GenericTreeItem`, the root item for
+         the top-level items of the model.
+
+        :see: :meth:`~CustomTreeCtrl.GetItemIndex` to find the item in the data model.
+        """
+
+        return 0
+
+
+    def OnGetItemHasChildren(self, item):
+        """
+        This function may be overloaded in the derived class for a control with
+        the ``TR_VIRTUAL`` style, if it is faster to know if an item has children
+        than to count them. It should return whether the specified item has
+        children in the data model, to draw its expand button.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+
+        :note: The base class version returns whether :meth:`~CustomTreeCtrl.OnGetChildrenCount`
+         is greater than zero.
+        """
+
+        return self.OnGetChildrenCount(item) > 0
+
+
+    def OnGetItemText(self, item):
+        """
+        If the ``TR_VIRTUAL`` style is set this function **must** be overloaded
+        in the derived class. It should return the string containing the text
+        of the specified item.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+        """
+
+        return ""
+
+
+    def OnGetItemImage(self, item, which=TreeItemIcon_Normal):
+        """
+        This function may be overloaded in the derived class for a control with
+        the ``TR_VIRTUAL`` style. It should return the index of the image to use
+        for the specified item in the given state, or -1 for no image.
+
+        :param `item`: an instance of :class:`GenericTreeItem`;
+        :param integer `which`: the item state (see :meth:`~CustomTreeCtrl.SetItemImage`
+         for a list of valid states).
+        """
+
+        return _NO_IMAGE
+
+
+    def OnGetItemAttr(self, item):
+        """
+        This function may be overloaded in the derived class for a control with
+        the ``TR_VIRTUAL`` style. It should return the attributes (font, colours)
+        of the specified item, or ``None`` to use the default appearance.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+
+        :return: An instance of :class:`TreeItemAttr` or ``None``.
+        """
+
+        return None
+
+
+    def GetItemIndex(self, item):
+        """
+        Returns the position of an item in the tree, as a tuple with the index of
+        the item in its parent, preceded by the index of its parent in the
+        grandparent and so on. The root item has the empty tuple ``()``.
+
+        With the ``TR_VIRTUAL`` style this is the position of the item in the data
+        model, and it is found in O(depth) time.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+        """
+
+        index = []
+        parent = item.GetParent()
+
+        while parent:
+            if item._virtualIndex >= 0:
+                index.append(item._virtualIndex)
+            else:
+                index.append(parent.GetChildren().index(item))
+
+            item, parent = parent, parent.GetParent()
+
+        index.reverse()
+        return tuple(index)
+
+
+    def HasVirtualChildren(self, item):
+        """
+        Returns ``True`` if the children of an item were created from the data
+        model, with the ``TR_VIRTUAL`` style.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+        """
+
+        children = item.GetChildren()
+        return len(children) > 0 and children[0]._virtualIndex >= 0
+
+
+    def CreateVirtualItem(self, parent, index):
+        """
+        Creates an item of the data model, for a control with the ``TR_VIRTUAL``
+        style. Used internally.
+
+        :param `parent`: an instance of :class:`GenericTreeItem`, the item parent;
+        :param integer `index`: the index of the item in its parent.
+
+        :return: An instance of :class:`GenericTreeItem`, not inserted in the tree yet.
+        """
+
+        item = GenericTreeItem(parent)
+        item._virtualIndex = index
+        self.UpdateVirtualItem(item)
+
+        return item
+
+
+    def UpdateVirtualItem(self, item):
+        """
+        Reads the text, images and attributes of an item from the data model, for a
+        control with the ``TR_VIRTUAL`` style. Used internally.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+        """
+
+        if item.GetParent():
+            # the text of the root item is set by AddRoot
+            item.SetText(EnsureText(self.OnGetItemText(item)))
+
+        for which in range(len(item._images)):
+            item.SetImage(self.OnGetItemImage(item, which), which)
+
+        attr = self.OnGetItemAttr(item)
+        if attr is not None or item.GetAttributes() is not None:
+            item.SetAttributes(attr)
+
+        item.SetHasPlus(self.OnGetItemHasChildren(item))
+        item._dirty = True
+
+
+    def CreateVirtualChildren(self, item):
+        """
+        Creates the children of an item from the data model, for a control with the
+        ``TR_VIRTUAL`` style. This is done when the item is expanded.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+
+        :note: No ``EVT_TREE_INSERT_ITEM`` events are sent for the items of the data model.
+        """
+
+        count = self.OnGetChildrenCount(item)
+        if not count:
+            return
+
+        self._dirty = True
+        item._children = [self.CreateVirtualItem(item, index) for index in range(count)]
+
+
+    def ReleaseChildren(self, item):
+        """
+        Releases the children of an item, and all their descendants, for a control
+        with the ``TR_VIRTUAL`` style. This is done when the item is collapsed; the
+        children are created again from the data model when it is expanded.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+
+        :note: Unlike :meth:`~CustomTreeCtrl.DeleteChildren`, no ``EVT_TREE_DELETE_ITEM``
+         events are sent for the released items, and the item keeps its expand button.
+        """
+
+        if not item.HasChildren():
+            return
+
+        self._dirty = True
+        self.ChildrenClosing(item)
+
+        if self.IsDescendantOf(item, self._underMouse) and self._underMouse != item:
+            self._underMouse = None
+
+        # only the selected items and the items with windows are kept
+        # elsewhere, there are usually few of them
+        selected = [child for child in self._selectedItems
+                    if child != item and self.IsDescendantOf(item, child)]
+        self._selectedItems.difference_update(selected)
+
+        windows = [child for child in self._itemWithWindow
+                   if child != item and self.IsDescendantOf(item, child)]
+        for child in windows:
+            self.DeleteItemWindow(child)
+            self._itemWithWindow.discard(child)
+
+        item._children = []
+        item.SetHasPlus(True)
+
+
+    def RefreshItems(self):
+        """
+        Reads all the items that have been created again from the data model, for
+        a control with the ``TR_VIRTUAL`` style. Call this after the data model
+        changed.
+
+        The expanded items stay expanded, unless their number of children changed:
+        their children are then created again, collapsed.
+        """
+
+        if not self.IsVirtual() or not self._anchor:
+            return
+
+        self.UpdateVirtualItem(self._anchor)
+        if self.HasAGWFlag(TR_HIDE_ROOT):
+            self._anchor.SetHasPlus()
+
+        self.RefreshVirtualChildren(self._anchor)
+        self._dirty = True
+        self.Refresh()
+
+
+    def RefreshVirtualChildren(self, item):
+        """
+        Reads the children of an item again from the data model, recursively, for a
+        control with the ``TR_VIRTUAL`` style. Used internally.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+        """
+
+        if not item.IsExpanded():
+            self.ReleaseChildren(item)
+            return
+
+        children = item.GetChildren()
+
+        if len(children) != self.OnGetChildrenCount(item):
+            self.ReleaseChildren(item)
+            self.CreateVirtualChildren(item)
+            if not item.HasChildren() and item != self._anchor:
+                item.Collapse()
+                item.SetHasPlus(False)
+            return
+
+        for child in children:
+            self.UpdateVirtualItem(child)
+            if child.HasChildren():
+                self.RefreshVirtualChildren(child)
+
+
     def HideWindows(self):
         """ Hides the windows associated to the items. Used internally. """
 
@@ -8605,7 +9161,15 @@ class CustomTreeCtrl(wx.ScrolledWindow):
             return None, flags
 
         point = self.CalcUnscrolledPosition(*point)
-        hit, flags = self._anchor.HitTest(point, self, flags, 0)
+
+        if self._dirty:
+            hit, flags = self._anchor.HitTest(point, self, flags, 0)
+        else:
+            # Only the row at the point needs to be tested.
+            row = self._rowIndex.FindRow(point[1])
+            hit = None
+            if row is not None:
+                hit, flags = row.HitTest(point, self, flags, 1)
 
         if hit is None:
             flags = TREE_HITTEST_NOWHERE
@@ -9249,7 +9813,7 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         item.SetHeight(totalHeight)
 
 
-    def CalculateLevel(self, item, dc, level, x_colstart, y, align=0):
+    def CalculateLevel(self, item, dc, level, x_colstart, y, align=0, rows=None):
         """
         Calculates the level of an item inside the tree hierarchy.
 
@@ -9267,6 +9831,8 @@ class CustomTreeCtrl(wx.ScrolledWindow):
                 2        Windows (in items with windows) are aligned at the rightmost edge of :class:`CustomTreeCtrl`.
          =============== =========================================
 
+        :param `rows`: if not ``None``, a Python list the laid out items are appended to.
+
         :return: A 2-tuple of (x, y) where `x` is the maximum width of the tree
          thus far and `y` is the new vertical position inside the :class:`ScrolledWindow`.
         """
@@ -9280,6 +9846,8 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         # Set its position
         item.SetX(x)
         item.SetY(y)
+        if rows is not None:
+            rows.append(item)
 
         # hidden items don't get a height (height=0).
         if item.IsHidden():
@@ -9290,18 +9858,11 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         wnd = item.GetWindow()
         if wnd:
             # If necessary move window (vertically only) to correct row.
-            xa, ya = self.CalcScrolledPosition((0, y))
-            wndWidth, wndHeight = item.GetWindowSize()
-            if item_height > wndHeight:
-                ya += (item_height - wndHeight) // 2
-            wndx, wndy = wnd.GetPosition()
-            if wndy != ya:
-                # Move window vertically. PaintItem does final x/y positioning.
-                wnd.Move(wndx, ya, flags=wx.SIZE_ALLOW_MINUS_ONE)
+            self.MoveItemWindow(item, y)
             
             if level >= 0 and align == 1:
                 # Record maximum item width for this level to align windows.
-                width = item_width - wndWidth
+                width = item_width - item.GetWindowSize()[0]
                 if width > self.absoluteWindows.get(level, 0):
                     self.absoluteWindows[level] = width
         
@@ -9316,10 +9877,31 @@ class CustomTreeCtrl(wx.ScrolledWindow):
 
         # Recurse
         for child in item.GetChildren():
-            y = self.CalculateLevel(child, dc, level + 1, x_colstart, y, align)
+            y = self.CalculateLevel(child, dc, level + 1, x_colstart, y, align, rows)
         return y
 
 
+    def MoveItemWindow(self, item, y):
+        """
+        Moves the window associated to an item (vertically only) to the item row.
+
+        :param `item`: an instance of :class:`GenericTreeItem` with a window;
+        :param integer `y`: the `y` position of the item, in logical coordinates.
+        """
+
+        wnd = item.GetWindow()
+        item_height = self.GetLineHeight(item)
+
+        xa, ya = self.CalcScrolledPosition((0, y))
+        wndWidth, wndHeight = item.GetWindowSize()
+        if item_height > wndHeight:
+            ya += (item_height - wndHeight) // 2
+        wndx, wndy = wnd.GetPosition()
+        if wndy != ya:
+            # Move window vertically. PaintItem does final x/y positioning.
+            wnd.Move(wndx, ya, flags=wx.SIZE_ALLOW_MINUS_ONE)
+
+
     def CalculatePositions(self):
         """Calculates the positions of all items in the tree.
 
@@ -9369,18 +9951,22 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         align = 1 if self.HasAGWFlag(TR_ALIGN_WINDOWS) else 0
         x_colstart = self._leftWidth + self._spacing
         y = 2
+        rows = []
 
         if not self.HasAGWFlag(TR_HIDE_ROOT):
             # Calculate tree from root.
             x_colstart += self._indent
-            y = self.CalculateLevel(self._anchor, dc, 0, x_colstart, y, align)
+            y = self.CalculateLevel(self._anchor, dc, 0, x_colstart, y, align, rows)
         else:
             # A hidden root is not evaluated, but its children are.
             for child in self._anchor.GetChildren():
-                y = self.CalculateLevel(child, dc, 1, x_colstart, y, align)
+                y = self.CalculateLevel(child, dc, 1, x_colstart, y, align, rows)
         
         self._height = y
 
+        # Index the rows for CalculateChildrenPositions() and HitTest().
+        self._rowIndex.Build(rows, self.GetRowHeights(rows), 2)
+
         # If the size of the tree has changed, update our scrollbars.
         if self._width != old_width or self._height != old_height:
             self.AdjustMyScrollbars(tree_size=(self._width, self._height))
@@ -9390,6 +9976,83 @@ class CustomTreeCtrl(wx.ScrolledWindow):
         self.Refresh()
 
 
+    def GetRowHeights(self, rows):
+        """
+        Returns the heights of some laid out items. Used internally.
+
+        :param list `rows`: a Python list of :class:`GenericTreeItem` objects.
+        """
+
+        GetLineHeight = self.GetLineHeight
+        return [0 if row.IsHidden() else GetLineHeight(row) for row in rows]
+
+
+    def CalculateChildrenPositions(self, item):
+        """
+        Updates the positions after an item has been expanded or collapsed: only
+        the children of the item are laid out, the items below it are moved by
+        the height of the children. Used internally.
+
+        :param `item`: an instance of :class:`GenericTreeItem`.
+
+        :return: ``True`` if the positions have been updated, ``False`` if they
+         have to be calculated again with :meth:`~CustomTreeCtrl.CalculatePositions`.
+        """
+
+        index = self._rowIndex
+        if self._dirty or self._freezeCount or not index.Contains(item) or item.IsHidden():
+            return False
+        if self.HasAGWFlag(TR_ALIGN_WINDOWS):
+            # the windows of all the items may need to be aligned again
+            return False
+
+        # The rows of the children go up to the next row after the item that
+        # is not one of its descendants.
+        start, stop = index.GetRow(item) + 1, len(index)
+        node = item
+        while node is not None:
+            sibling = self.GetNextSibling(node)
+            if sibling is not None:
+                if not index.Contains(sibling):
+                    return False
+                stop = index.GetRow(sibling)
+                break
+            node = node.GetParent()
+
+        rows = []
+        old_width, old_height = self._width, self._height
+        if item.IsExpanded():
+            line_height = self._lineHeight
+
+            dc = wx.ClientDC(self)
+            self.PrepareDC(dc)
+            dc.SetFont(self._normalFont)
+
+            x = item.GetX() + self._indent
+            y = item.GetY() + self.GetLineHeight(item)
+            for child in item.GetChildren():
+                y = self.CalculateLevel(child, dc, 0, x, y, 0, rows)
+
+            if self._lineHeight != line_height and not self.HasAGWFlag(TR_HAS_VARIABLE_ROW_HEIGHT):
+                # all the rows are higher now
+                return False
+
+        removed = index.Replace(start, stop, rows, self.GetRowHeights(rows))
+
+        self._height = index.GetBottom()
+        if removed and GetRowsWidth(removed) >= self._width:
+            self._width = index.GetWidth()
+
+        for row in self._itemWithWindow:
+            if index.Contains(row) and not row.IsHidden():
+                self.MoveItemWindow(row, row.GetY())
+
+        if self._width != old_width or self._height != old_height:
+            self.AdjustMyScrollbars(tree_size=(self._width, self._height))
+
+        return True
+
+
     def RefreshSubtree(self, item):
         """
         Refreshes a damaged subtree of an item.
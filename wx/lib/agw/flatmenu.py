@@ -4305,10 +4305,10 @@ class FlatMenuBase(ShadowPopupWindow):
             # bottom right or else place them as menu items at the top and bottom.
             if self.GetRenderer().scrollBarButtons:
                 if not self._upButton:
-                    self._upButton = FlatMenuButton(self, True, ArtManager.Get().GetStockBitmap("arrow_up"))
+                    self._upButton = FlatMenuButton(self, True, ArtManager.Get().GetStockBitmap("arrow_up", self))
 
                 if not self._downButton:
-                    self._downButton = FlatMenuButton(self, False, ArtManager.Get().GetStockBitmap("arrow_down"))
+                    self._downButton = FlatMenuButton(self, False, ArtManager.Get().GetStockBitmap("arrow_down", self))
 
                 self._upButton.SetSize((SCROLL_BTN_HEIGHT, SCROLL_BTN_HEIGHT))
                 self._downButton.SetSize((SCROLL_BTN_HEIGHT, SCROLL_BTN_HEIGHT))
@@ -135,7 +135,10 @@ ellipsized:
   the same height and are always visible. In a TreeCtrl the topology of
   the tree can be very complex. Each item can be expanded, collapsed,
   hidden, and even different heights if the ``wx.TR_HAS_VARIABLE_ROW_HEIGHT``
-  style is used.
+  style is used. The texts of the items are asked to :meth:`~HyperTreeList.OnGetItemText`,
+  and if :meth:`~HyperTreeList.OnGetChildrenCount` is overloaded the items
+  themselves come from a data model: the children of an item are created
+  when it is expanded and released when it is collapsed.
 
 Please note that most TreeCtrl-like APIs are available in this class, although
 they may not be visible to IDEs or other tools as they are automatically
@@ -1728,7 +1731,7 @@ class TreeListItem(GenericTreeItem):
 
         if len(self._text) > 0:
             if self._owner.IsVirtual():
-                return self._owner.GetItemText(self._data, column)
+                return self._owner.GetItemText(self, column)
             else:
                 return self._text[column]
 
@@ -2392,6 +2395,116 @@ class TreeListMainWindow(CustomTreeCtrl):
         return self.HasAGWFlag(TR_VIRTUAL)
 
 
+    def OnGetChildrenCount(self, item):
+        """
+        Returns the number of children of an item in the data model, asking
+        :meth:`HyperTreeList.OnGetChildrenCount() <HyperTreeList.OnGetChildrenCount>`.
+
+        :param `item`: an instance of :class:`TreeListItem`.
+        """
+
+        return self._owner.OnGetChildrenCount(item)
+
+
+    def OnGetItemHasChildren(self, item):
+        """
+        Returns whether an item has children in the data model, asking
+        :meth:`HyperTreeList.OnGetItemHasChildren() <HyperTreeList.OnGetItemHasChildren>`.
+
+        :param `item`: an instance of :class:`TreeListItem`.
+        """
+
+        return self._owner.OnGetItemHasChildren(item)
+
+
+    def OnGetItemImage(self, item, which=wx.TreeItemIcon_Normal):
+        """
+        Returns the image of an item in the main column, asking
+        :meth:`HyperTreeList.OnGetItemImage() <HyperTreeList.OnGetItemImage>`.
+
+        :param `item`: an instance of :class:`TreeListItem`;
+        :param `which`: the item state.
+        """
+
+        return self._owner.OnGetItemImage(item, which)
+
+
+    def OnGetItemAttr(self, item):
+        """
+        Returns the attributes of an item, asking
+        :meth:`HyperTreeList.OnGetItemAttr() <HyperTreeList.OnGetItemAttr>`.
+
+        :param `item`: an instance of :class:`TreeListItem`.
+        """
+
+        return self._owner.OnGetItemAttr(item)
+
+
+    def CreateVirtualItem(self, parent, index):
+        """
+        Creates an item of the data model, for a control with the ``TR_VIRTUAL``
+        style. Used internally.
+
+        :param `parent`: an instance of :class:`TreeListItem`, the item parent;
+        :param `index`: the index of the item in its parent.
+
+        :return: An instance of :class:`TreeListItem`, not inserted in the tree yet.
+        """
+
+        item = TreeListItem(self, parent, [""] * self.GetColumnCount())
+        item._virtualIndex = index
+        self.UpdateVirtualItem(item)
+
+        return item
+
+
+    def UpdateVirtualItem(self, item):
+        """
+        Reads the images and attributes of an item from the data model, for a
+        control with the ``TR_VIRTUAL`` style. Used internally.
+
+        :param `item`: an instance of :class:`TreeListItem`.
+
+        :note: The texts of the columns are not stored in the item, they are
+         asked to :meth:`HyperTreeList.OnGetItemText() <HyperTreeList.OnGetItemText>`
+         when needed.
+        """
+
+        for which in range(len(item._images)):
+            item.SetImage(None, self.OnGetItemImage(item, which), which)
+
+        attr = self.OnGetItemAttr(item)
+        if attr is not None or item.GetAttributes() is not None:
+            item.SetAttributes(attr)
+
+        item.SetHasPlus(self.OnGetItemHasChildren(item))
+        # the texts may have changed as well
+        item._extents = None
+        item._dirty = True
+
+
+    def ReleaseChildren(self, item):
+        """
+        Releases the children of an item, and all their descendants, for a control
+        with the ``TR_VIRTUAL`` style.
+
+        :param `item`: an instance of :class:`TreeListItem`.
+
+        :see: :meth:`CustomTreeCtrl.ReleaseChildren() <lib.agw.customtreectrl.CustomTreeCtrl.ReleaseChildren>`.
+        """
+
+        if not item.HasChildren():
+            return
+
+        if item != self._shiftItem and self.IsDescendantOf(item, self._shiftItem):
+            self._shiftItem = item
+
+        if self.IsDescendantOf(item, self._dragItem):
+            self._dragItem = None
+
+        CustomTreeCtrl.ReleaseChildren(self, item)
+
+
 #-----------------------------------------------------------------------------
 # functions to work with tree items
 #-----------------------------------------------------------------------------
@@ -2732,10 +2845,15 @@ class TreeListMainWindow(CustomTreeCtrl):
             self._hasWindows = True
             self._itemWithWindow.add(self._anchor)
 
+        if self.IsVirtual():
+            self._anchor.SetHasPlus(self.OnGetItemHasChildren(self._anchor))
+
         if self.HasAGWFlag(wx.TR_HIDE_ROOT):
             # if root is hidden, make sure we can navigate
             # into children
             self._anchor.SetHasPlus()
+            if self.IsVirtual():
+                self.CreateVirtualChildren(self._anchor)
             self._anchor.Expand()
             self.CalculatePositions()
 
@@ -4569,7 +4687,8 @@ _methods = ["GetIndent", "SetIndent", "GetSpacing", "SetSpacing", "GetImageList"
             "GetEditControl", "ShouldInheritColours", "GetItemWindow", "SetItemWindow", "DeleteItemWindow", "SetItemTextColour",
             "HideItem", "DeleteAllItems", "ItemHasChildren", "ToggleItemSelection", "SetItemType", "GetDragFullScreen", "SetDragFullScreen",
             "GetCurrentItem", "SetItem3State", "SetItem3StateValue", "GetItem3StateValue", "IsItem3State", "GetPrev",
-            "GetNextShown", "GetPrevShown", "SetItemData", "GetItemData", "IsVisible", "EnableBellOnNoMatch"]
+            "GetNextShown", "GetPrevShown", "SetItemData", "GetItemData", "IsVisible", "EnableBellOnNoMatch",
+            "GetItemIndex", "RefreshItems"]
 
 
 class HyperTreeList(wx.Control):
@@ -4652,6 +4771,7 @@ class HyperTreeList(wx.Control):
     :meth:`~wx.lib.agw.customtreectrl.CustomTreeCtrl.GetItem3StateValue`             Gets the state of a 3-state checkbox item.
     :meth:`~wx.lib.agw.customtreectrl.CustomTreeCtrl.GetItemBackgroundColour`        Returns the item background colour.
     :meth:`~wx.lib.agw.customtreectrl.CustomTreeCtrl.GetItemFont`                    Returns the item font.
+    :meth:`~wx.lib.agw.customtreectrl.CustomTreeCtrl.GetItemIndex`                   Returns the position of an item in the tree, as a tuple of indexes.
     :meth:`~wx.lib.agw.hypertreelist.TreeListMainWindow.GetItemImage`                Returns the item image.
     :meth:`~wx.lib.agw.customtreectrl.CustomTreeCtrl.GetItemParent`                  Returns the item parent (can be ``None`` for root items).
     GetItemPyData                                                                    Another name for :meth:`~wx.lib.agw.customtreectrl.CustomTreeCtrl.GetPyData`
@@ -4696,6 +4816,7 @@ class HyperTreeList(wx.Control):
     :meth:`~wx.lib.agw.customtreectrl.CustomTreeCtrl.IsSelected`                     Returns whether the item is selected or not.
     :meth:`~wx.lib.agw.customtreectrl.CustomTreeCtrl.ItemHasChildren`                Returns whether the item has children or not.
     :meth:`~wx.lib.agw.customtreectrl.CustomTreeCtrl.PrependItem`                    Prepends an item as a first child of parent.
+    :meth:`~wx.lib.agw.customtreectrl.CustomTreeCtrl.RefreshItems`                   Reads the items again from the data model, with the ``TR_VIRTUAL`` style.
     :meth:`~wx.lib.agw.hypertreelist.TreeListMainWindow.ScrollTo`                    Scrolls the specified item into view.
     :meth:`~wx.lib.agw.customtreectrl.CustomTreeCtrl.SelectAll`                      Selects all the item in the tree.
     :meth:`~wx.lib.agw.customtreectrl.CustomTreeCtrl.SelectAllChildren`              Selects all the children of the given item.
@@ -5407,6 +5528,69 @@ class HyperTreeList(wx.Control):
         return ""
 
 
+    def OnGetChildrenCount(self, item):
+        """
+        This function should be overloaded in the derived class for a control with
+        the ``TR_VIRTUAL`` style, to create the items from a data model. It should
+        return the number of children of the specified item in the data model.
+
+        The children of an item are then created when it is expanded, and released
+        when it is collapsed.
+
+        :param `item`: an instance of :class:`TreeListItem`, the root item for the
+         top-level items of the model.
+
+        :see: :meth:`~HyperTreeList.GetItemIndex` to find the item in the data model.
+
+        :note: The base class version returns 0: the items are then added with
+         :meth:`~HyperTreeList.AppendItem` and the like, and only their text comes
+         from :meth:`~HyperTreeList.OnGetItemText`.
+        """
+
+        return 0
+
+
+    def OnGetItemHasChildren(self, item):
+        """
+        This function may be overloaded in the derived class for a control with the
+        ``TR_VIRTUAL`` style, if it is faster to know if an item has children than to
+        count them.
+
+        :param `item`: an instance of :class:`TreeListItem`.
+
+        :note: The base class version returns whether :meth:`~HyperTreeList.OnGetChildrenCount`
+         is greater than zero.
+        """
+
+        return self.OnGetChildrenCount(item) > 0
+
+
+    def OnGetItemImage(self, item, which=wx.TreeItemIcon_Normal):
+        """
+        This function may be overloaded in the derived class for a control with the
+        ``TR_VIRTUAL`` style. It should return the index of the image to use for the
+        specified item in the main column, or -1 for no image.
+
+        :param `item`: an instance of :class:`TreeListItem`;
+        :param `which`: the item state (see :meth:`TreeListMainWindow.GetItemImage() <TreeListMainWindow.GetItemImage>`
+         for a list of valid states).
+        """
+
+        return -1
+
+
+    def OnGetItemAttr(self, item):
+        """
+        This function may be overloaded in the derived class for a control with the
+        ``TR_VIRTUAL`` style. It should return the attributes (font, colours) of the
+        specified item, or ``None`` to use the default appearance.
+
+        :param `item`: an instance of :class:`TreeListItem`.
+        """
+
+        return None
+
+
     def SortChildren(self, item):
         """
         Sorts the children of the given item using :meth:`~HyperTreeList.OnCompareItems` method of :class:`HyperTreeList`.
@@ -124,6 +124,8 @@ With :class:`ScrolledThumbnail` you can:
   c) ``a`` key rotates 180 degrees.
 
 - Drag and drop thumbnails from :class:`ScrolledThumbnail` to whatever application you want;
+- Keep the thumbnails in a :class:`ThumbnailCache` on disk, so that a folder shown again
+  doesn't need to load its images again;
 - Use local (when at least one thumbnail is selected) or global (no need for
   thumbnail selection) popup menus;
 - possibility to show tooltips on thumbnails, which display file information
@@ -132,6 +134,11 @@ With :class:`ScrolledThumbnail` you can:
 :note: Using highlight thumbnails on mouse hovering may be slow on slower
  computers.
 
+The images are loaded by a small pool of threads: the thumbnails that are
+shown are loaded first, then the ones of the next page, and the loading of
+the thumbnails scrolled out of view is cancelled. Only an image of the size of
+the thumbnail is kept in memory.
+
 
 Window Styles
 =============
@@ -175,14 +182,15 @@ Version 1.0
 
 import io
 import os
+import sqlite3
+import threading
 import wx
 import zlib
-from math import radians
+from concurrent import futures
+from math import cos, radians, sin
 
 from wx.lib.embeddedimage import PyEmbeddedImage
 
-import _thread as thread
-
 #----------------------------------------------------------------------
 # Get Default Icon/Data
 #----------------------------------------------------------------------
@@ -329,6 +337,45 @@ def opj(path):
 
     return strs
 
+
+def GetThumbnailSize(imgwidth, imgheight, width, height):
+    """
+    Returns the size of the thumbnail of an image, which keeps the image aspect
+    ratio and fits in the given size. Images are never enlarged.
+
+    :param `imgwidth`: the image width;
+    :param `imgheight`: the image height;
+    :param `width`: the maximum thumbnail width;
+    :param `height`: the maximum thumbnail height.
+    """
+
+    if width >= imgwidth and height >= imgheight:
+        return imgwidth, imgheight
+
+    scale = min(float(width)/imgwidth, float(height)/imgheight)
+
+    return max(int(imgwidth*scale), 1), max(int(imgheight*scale), 1)
+
+
+def GetRotatedSize(imgwidth, imgheight, angle):
+    """
+    Returns the size of an image rotated by an angle, that is of the rectangle
+    holding the rotated image. Width and height are swapped for 90 and 270 degrees.
+
+    :param `imgwidth`: the image width;
+    :param `imgheight`: the image height;
+    :param `angle`: the rotation angle, in degrees.
+    """
+
+    angle = angle % 360
+    if angle % 180 == 0:
+        return imgwidth, imgheight
+    if angle % 180 == 90:
+        return imgheight, imgwidth
+
+    c, s = abs(cos(radians(angle))), abs(sin(radians(angle)))
+    return int(round(imgwidth*c + imgheight*s)), int(round(imgwidth*s + imgheight*c))
+
 #-----------------------------------------------------------------------------
 
 # Different Outline On Thumb Selection:
@@ -524,6 +571,142 @@ class NativeImageHandler(object):
         return img
 
 
+# ---------------------------------------------------------------------------- #
+# Class ThumbnailCache, keeps the thumbnails of the image files on disk
+# ---------------------------------------------------------------------------- #
+
+class ThumbnailCache(object):
+    """
+    This class keeps the thumbnails of the image files in a single SQLite file,
+    so that they don't need to be created again from the images the next time
+    a folder is shown.
+
+    A thumbnail is found by the path of its file, and it is only used while the
+    file modification time and size are the same as when it was stored. The
+    cache can be used from several threads.
+    """
+
+    def __init__(self, filename=None, size=256):
+        """
+        Default class constructor.
+
+        :param `filename`: the SQLite file. If ``None``, the file ``thumbnails.db`` in
+         the ``wxPython`` folder of the user cache directory is used;
+        :param `size`: the maximum width and height of the stored thumbnails, in pixels.
+        """
+
+        if filename is None:
+            folder = wx.StandardPaths.Get().GetUserDir(wx.StandardPaths.Dir_Cache)
+            folder = os.path.join(folder, "wxPython")
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+            filename = os.path.join(folder, "thumbnails.db")
+
+        self._filename = filename
+        self._size = size
+        self._lock = threading.Lock()
+
+        self._connection = sqlite3.connect(filename, check_same_thread=False)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS thumbnails (path TEXT PRIMARY KEY, "
+                                 "mtime INTEGER, size INTEGER, width INTEGER, height INTEGER, "
+                                 "image BLOB)")
+        self._connection.commit()
+
+
+    def GetFileName(self):
+        """ Returns the name of the SQLite file. """
+
+        return self._filename
+
+
+    def GetThumbSize(self):
+        """ Returns the maximum width and height of the stored thumbnails. """
+
+        return self._size, self._size
+
+
+    def GetKey(self, filename):
+        """
+        Returns the key of an image file in the cache, or ``None`` if it doesn't exist.
+
+        :param `filename`: a file containing an image.
+        """
+
+        try:
+            stats = os.stat(filename)
+        except OSError:
+            return None
+
+        return os.path.abspath(filename), stats.st_mtime_ns, stats.st_size
+
+
+    def Get(self, filename):
+        """
+        Returns the thumbnail of an image file.
+
+        :param `filename`: a file containing an image.
+
+        :return: a tuple with an instance of :class:`wx.Image`, the thumbnail, and the
+         original image size, or ``None`` if the thumbnail isn't in the cache or the
+         file changed since it was stored.
+        """
+
+        key = self.GetKey(filename)
+        if key is None:
+            return None
+
+        with self._lock:
+            row = self._connection.execute("SELECT mtime, size, width, height, image FROM thumbnails "
+                                           "WHERE path = ?", key[:1]).fetchone()
+
+        if row is None or tuple(row[:2]) != key[1:]:
+            return None
+
+        img = wx.Image(io.BytesIO(row[4]), wx.BITMAP_TYPE_PNG)
+        if not img.IsOk():
+            return None
+
+        return img, (row[2], row[3])
+
+
+    def Put(self, filename, img, originalsize):
+        """
+        Stores the thumbnail of an image file.
+
+        :param `filename`: a file containing an image;
+        :param `img`: an instance of :class:`wx.Image`, the thumbnail;
+        :param `originalsize`: the original image width and height.
+        """
+
+        key = self.GetKey(filename)
+        if key is None:
+            return
+
+        stream = io.BytesIO()
+        if not img.SaveFile(stream, wx.BITMAP_TYPE_PNG):
+            return
+
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO thumbnails VALUES (?, ?, ?, ?, ?, ?)",
+                                     key + tuple(originalsize) + (stream.getvalue(),))
+            self._connection.commit()
+
+
+    def Clear(self):
+        """ Removes all the thumbnails from the cache. """
+
+        with self._lock:
+            self._connection.execute("DELETE FROM thumbnails")
+            self._connection.commit()
+
+
+    def Close(self):
+        """ Closes the SQLite file. The cache can't be used anymore. """
+
+        with self._lock:
+            self._connection.close()
+
+
 # ---------------------------------------------------------------------------- #
 # Class Thumb
 # Auxiliary Class, To Handle Single Thumb Information For Every Thumb.
@@ -555,9 +738,14 @@ class Thumb(object):
         self._lastmod = lastmod
         self._captionbreaks = []
         self._image = wx.Image(1, 1)
+        self._originalsize = (0, 0)
+        self._rotation = 0
+        self._thumbsize = (0, 0)
         self._alpha = None
+        self._loaded = False
         self._imagehandler = imagehandler()
         self._bitmap = None
+        self._bitmapsize = None
 
 
     def SetCaption(self, caption=""):
@@ -585,6 +773,7 @@ class Thumb(object):
         """
 
         self._image = image
+        self._bitmap = None
 
 
     def GetFileName(self):
@@ -630,17 +819,7 @@ class Thumb(object):
         img = self._image
         imgwidth, imgheight = (img.GetWidth(), img.GetHeight())
         if width < imgwidth or height < imgheight:
-            scale = float(width)/imgwidth
-
-            if scale > float(height)/imgheight:
-                scale = float(height)/imgheight
-
-            newW, newH = int(imgwidth*scale), int(imgheight*scale)
-            if newW < 1:
-                newW = 1
-            if newH < 1:
-                newH = 1
-
+            newW, newH = GetThumbnailSize(imgwidth, imgheight, width, height)
             img = img.Scale(newW, newH)
 
         return img
@@ -654,13 +833,16 @@ class Thumb(object):
         :param `height`: the associated bitmap height.
         """
 
-        if self._bitmap:
-            if self._bitmap.GetWidth() == width and self._bitmap.GetHeight() == height:
-                return self._bitmap
+        bmp = self._bitmap
+        if bmp and self._bitmapsize == (width, height):
+            return bmp
 
         img = self.GetThumbnail(width, height)
         bmp = img.ConvertToBitmap()
 
+        self._bitmap = bmp
+        self._bitmapsize = (width, height)
+
         return bmp
 
 
@@ -712,11 +894,20 @@ class Thumb(object):
 
 
     def GetOriginalSize(self):
-        """ Returns a tuple containing the original image width and height, in pixels. """
+        """
+        Returns a tuple containing the original image width and height, in pixels,
+        swapped if the thumbnail was rotated by 90 or 270 degrees.
+        """
 
         return self._originalsize
 
 
+    def GetRotation(self):
+        """ Returns the angle, in degrees, by which the thumbnail has been rotated. """
+
+        return self._rotation
+
+
     def GetCaptionLinesCount(self, width):
         """
         Returns the number of lines for the caption.
@@ -800,13 +991,113 @@ class Thumb(object):
         self._image = img
         self._originalsize = size
         self._alpha = alpha
+        self._loaded = True
+        self._bitmap = None
+
+
+    def IsLoaded(self):
+        """ Returns ``True`` if the image has been loaded. """
+
+        return self._loaded
+
+
+    def HasThumbnail(self, width, height):
+        """
+        Returns ``True`` if the image has been loaded, and is large enough for a
+        thumbnail of the given size.
+
+        :param `width`: the thumbnail width;
+        :param `height`: the thumbnail height.
+        """
+
+        if not self._loaded:
+            return False
+
+        if width <= self._thumbsize[0] and height <= self._thumbsize[1]:
+            return True
+
+        newW, newH = GetThumbnailSize(self._originalsize[0], self._originalsize[1], width, height)
+        return self._image.GetWidth() >= newW and self._image.GetHeight() >= newH
+
+
+    def LoadThumbnail(self, width, height, cache=None):
+        """
+        Loads the image, keeping only a thumbnail of the given size. Used
+        internally, in the threads loading the images.
+
+        :param `width`: the thumbnail width;
+        :param `height`: the thumbnail height;
+        :param `cache`: a :class:`ThumbnailCache`, where the thumbnail is looked
+         for before loading the image, and stored after.
+        """
+
+        filename = self.GetFullFileName()
+
+        try:
+            if cache is not None:
+                cached = cache.Get(filename)
+                if cached is not None:
+                    img, size = cached
+                    newW, newH = GetThumbnailSize(size[0], size[1], width, height)
+                    if img.GetWidth() >= newW and img.GetHeight() >= newH:
+                        self._image = img
+                        self._originalsize = size
+                        self._alpha = img.HasAlpha()
+                        self.KeepThumbnail(width, height)
+                        return
+
+            self.LoadImage()
+
+            if cache is not None:
+                cache.Put(filename, self.GetThumbnail(*cache.GetThumbSize()), self._originalsize)
+
+            # Keep only the thumbnail, not the full size image
+            self.KeepThumbnail(width, height)
+
+        finally:
+            # Don't load it again, even if it failed
+            self._loaded = True
+
+
+    def KeepThumbnail(self, width, height):
+        """
+        Replaces the loaded image, which is not rotated, by its thumbnail rotated by
+        the angle of the previous calls to :meth:`Rotate`. Used internally.
+
+        :param `width`: the thumbnail width;
+        :param `height`: the thumbnail height.
+        """
+
+        angle = self._rotation
+        if angle % 180 == 90:
+            # fits in the thumbnail size once rotated
+            img = self.GetThumbnail(height, width)
+        elif angle % 90 == 0:
+            img = self.GetThumbnail(width, height)
+        else:
+            img = self._image
+
+        if angle:
+            img = self._imagehandler.Rotate(img, angle)
+            self._originalsize = GetRotatedSize(self._originalsize[0], self._originalsize[1], angle)
+
+        self._image = img
+        self.SetImage(self.GetThumbnail(width, height))
+        self._thumbsize = (width, height)
 
 
     def Rotate(self, angle):
-        """ Rotate image using imagehandler. """
+        """
+        Rotate image using imagehandler. The rotation is applied again when the
+        thumbnail is loaded at another size.
+
+        :param `angle`: the rotation angle, in degrees.
+        """
+
+        self._rotation = (self._rotation + angle) % 360
         img = self._imagehandler.Rotate(self._image, angle)
         self._image = img
-        self._originalsize = (img.GetWidth, img.GetHeight)
+        self._originalsize = GetRotatedSize(self._originalsize[0], self._originalsize[1], angle)
         self._alpha = img.HasAlpha()
         # Clear _bitmap so thumbnail is recreated after rotate
         self._bitmap = None
@@ -882,6 +1173,12 @@ class ScrolledThumbnail(wx.ScrolledWindow):
 
         self._enabletooltip = False
 
+        # The pool of threads loading the images, the thumbnails being loaded
+        # and the cache of thumbnails on disk
+        self._loader = None
+        self._loading = {}
+        self._cache = None
+
         self._parent = parent
 
         self._selectioncolour = "#009EFF"
@@ -909,6 +1206,7 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         self.Bind(wx.EVT_SIZE, self.OnResize)
         self.Bind(wx.EVT_ERASE_BACKGROUND, lambda x: None)
         self.Bind(wx.EVT_PAINT, self.OnPaint)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.OnDestroy)
 
 
     def GetSelectedItem(self, index):
@@ -1176,6 +1474,7 @@ class ScrolledThumbnail(wx.ScrolledWindow):
     def Clear(self):
         """ Clears :class:`ThumbnailCtrl`. """
 
+        self.CancelLoading()
         self._items = []
         self._selected = -1
         self._selectedarray = []
@@ -1183,47 +1482,107 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         self.Refresh()
 
 
-    def ThreadImage(self, filenames):
+    def SetThumbnailCache(self, cache):
         """
-        Threaded method to load images. Used internally.
+        Sets the cache of thumbnails on disk.
 
-        :param `filenames`: a Python list of file names containing images.
+        :param `cache`: an instance of :class:`ThumbnailCache`, or ``None`` to load all
+         the thumbnails from the images.
         """
 
-        count = 0
+        self._cache = cache
 
-        while count < len(filenames):
 
-            if not self._isrunning:
-                self._isrunning = False
-                thread.exit()
-                return
+    def GetThumbnailCache(self):
+        """ Returns the cache of thumbnails on disk, an instance of :class:`ThumbnailCache` or ``None``. """
 
-            self.LoadImages(filenames[count], count)
-            if count < 4:
-                self.Refresh()
-            elif count%4 == 0:
-                self.Refresh()
+        return self._cache
+
+
+    def LoadThumbs(self, indices):
+        """
+        Loads the thumbnails that are shown, then the ones of the next page, in
+        the pool of threads. The loading of the other thumbnails is cancelled.
+        Used internally.
+
+        :param `indices`: a Python list of the indices of the thumbnails shown.
+        """
+
+        if indices:
+            last = indices[-1] + 1
+            indices = indices + list(range(last, min(last + len(indices), len(self._items))))
+
+        thumbs = [self._items[index] for index in indices]
+        wanted = set(thumbs)
+
+        for thumb, future in list(self._loading.items()):
+            if thumb not in wanted and future.cancel():
+                del self._loading[thumb]
+
+        for thumb in thumbs:
+            if thumb in self._loading or thumb.HasThumbnail(self._tWidth, self._tHeight):
+                continue
+
+            if self._loader is None:
+                self._loader = futures.ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+
+            self._loading[thumb] = self._loader.submit(self.LoadThumb, thumb, self._tWidth,
+                                                       self._tHeight)
+
+
+    def LoadThumb(self, thumb, width, height):
+        """
+        Loads a thumbnail. Called in the pool of threads. Used internally.
 
-            count = count + 1
+        :param `thumb`: an instance of :class:`Thumb`;
+        :param `width`: the thumbnail width;
+        :param `height`: the thumbnail height.
+        """
 
-        self._isrunning = False
-        thread.exit()
+        try:
+            thumb.LoadThumbnail(width, height, self._cache)
+        finally:
+            wx.CallAfter(self.OnThumbLoaded, thumb)
 
 
-    def LoadImages(self, newfile, imagecount):
+    def OnThumbLoaded(self, thumb):
         """
-        Threaded method to load images. Used internally.
+        Called when a thumbnail has been loaded. Used internally.
 
-        :param `newfile`: a file name containing an image to thumbnail;
-        :param `imagecount`: the number of images loaded until now.
+        :param `thumb`: an instance of :class:`Thumb`.
         """
 
-        if not self._isrunning:
-            thread.exit()
+        if not self:
+            # destroyed while loading
             return
 
-        self._items[imagecount].LoadImage()
+        self._loading.pop(thumb, None)
+        self.Refresh()
+
+
+    def CancelLoading(self):
+        """ Cancels the loading of the thumbnails that haven't started loading yet. """
+
+        for future in self._loading.values():
+            future.cancel()
+
+        self._loading = {}
+
+
+    def OnDestroy(self, event):
+        """
+        Handles the ``wx.EVT_WINDOW_DESTROY`` event for :class:`ThumbnailCtrl`.
+
+        :param `event`: a :class:`wx.WindowDestroyEvent` event to be processed.
+        """
+
+        if event.GetEventObject() is self:
+            self.CancelLoading()
+            if self._loader is not None:
+                self._loader.shutdown(wait=False)
+                self._loader = None
+
+        event.Skip()
 
 
     def ShowThumbs(self, thumbs):
@@ -1233,23 +1592,16 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         :param `thumbs`: should be a sequence with instances of :class:`Thumb`;
         """
 
-        self._isrunning = False
+        self.CancelLoading()
 
         # update items
         self._items = thumbs
-        myfiles = [thumb.GetFullFileName() for thumb in thumbs]
-
-        self._isrunning = True
-
-        thread.start_new_thread(self.ThreadImage, (myfiles,))
-        wx.MilliSleep(20)
 
         self._selectedarray = []
         self.UpdateProp()
         self.Refresh()
 
 
-
     def SetSelection(self, value=-1):
         """
         Sets thumbnail selection.
@@ -1469,6 +1821,10 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         :param `pos`: the index at which we wish to remove the thumbnail.
         """
 
+        future = self._loading.pop(self._items[pos], None)
+        if future is not None:
+            future.cancel()
+
         del self._items[pos]
 
         self.UpdateProp()
@@ -1698,6 +2054,7 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         # items
         row = -1
         xwhite = self._tBorder
+        shown = []
 
         for ii in range(len(self._items)):
 
@@ -1716,6 +2073,7 @@ class ScrolledThumbnail(wx.ScrolledWindow):
             if not paintRect.Intersects(wx.Rect(tx, ty, tw, th)):
                 continue
 
+            shown.append(ii)
             thmb = wx.Bitmap(tw, th)
             self.DrawThumbnail(thmb, self._items[ii], ii)
             dc.DrawBitmap(thmb, tx, ty)
@@ -1740,6 +2098,8 @@ class ScrolledThumbnail(wx.ScrolledWindow):
                      self.GetCaptionHeight(0, self._rows - 1)
             dc.DrawRectangle(rect)
 
+        self.LoadThumbs(shown)
+
 
     def OnResize(self, event):
         """
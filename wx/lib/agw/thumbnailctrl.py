@@ -99,6 +99,8 @@ With :class:`ThumbnailCtrl` you can:
 
 - Delete files/thumbnails (via the ``del`` key);
 - Drag and drop thumbnails from :class:`ThumbnailCtrl` to whatever application you want;
+- Keep the thumbnails in a :class:`ThumbnailCache` on disk, so that reopening a folder
+  is almost instant (see :meth:`ScrolledThumbnail.SetThumbnailCache() <scrolledthumbnail.ScrolledThumbnail.SetThumbnailCache>`);
 - Use local (when at least one thumbnail is selected) or global (no need for
   thumbnail selection) popup menus;
 - Show/hide a :class:`ComboBox` at the top of :class:`ThumbnailCtrl`: this combobox contains
@@ -154,7 +156,7 @@ import os
 import time
 
 from wx.lib.agw.scrolledthumbnail import (ScrolledThumbnail, EVT_THUMBNAILS_CHAR,
-PILImageHandler, NativeImageHandler, Thumb)
+PILImageHandler, NativeImageHandler, Thumb, ThumbnailCache)
 
 # Image File Name Extensions: Am I Missing Some Extensions Here?
 extensions = [".jpeg", ".jpg", ".bmp", ".png", ".ico", ".tiff", ".ani", ".cur", ".gif",
@@ -300,7 +302,8 @@ class ThumbnailCtrl(wx.Panel):
                    "SetSelection", "GetSelection", "SetZoomFactor",
                    "GetZoomFactor", "SetCaptionFont", "GetCaptionFont", "GetItemIndex",
                    "InsertItem", "RemoveItemAt", "IsSelected", "Rotate", "ZoomIn", "ZoomOut",
-                   "EnableToolTips", "GetThumbInfo", "SetDropShadow", "GetDropShadow"]
+                   "EnableToolTips", "GetThumbInfo", "SetDropShadow", "GetDropShadow",
+                   "SetThumbnailCache", "GetThumbnailCache"]
 
         for method in methods:
             setattr(self, method, getattr(self._scrolled, method))
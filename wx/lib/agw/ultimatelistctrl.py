@@ -1136,6 +1136,153 @@ class SelectionStore(object):
         self._count = count
 
 
+# ----------------------------------------------------------------------------
+# LineHeightIndex: the positions of the lines with variable row heights
+# ----------------------------------------------------------------------------
+
+class LineHeightIndex(object):
+    """
+    LineHeightIndex keeps the heights of the lines of :class:`UltimateListCtrl`
+    in report mode with the ``ULC_HAS_VARIABLE_ROW_HEIGHT`` style, to find the
+    `y` position of a line, or the line at a `y` position, in O(log N) time.
+
+    The heights are stored in a Fenwick tree (binary indexed tree) of prefix
+    sums, so changing the height of a line is O(log N) as well. Inserting,
+    deleting or sorting lines only marks the index as invalid, and it is built
+    again in O(N) the next time it is needed.
+    """
+
+    def __init__(self):
+        """ Default class constructor. """
+
+        self._heights = []
+        # 1-based Fenwick tree: self._tree[i] is the sum of the heights of the
+        # (i & -i) lines that end with line i - 1
+        self._tree = [0]
+        self._valid = False
+
+
+    def __len__(self):
+        """ Returns the number of lines in the index. """
+
+        return len(self._heights)
+
+
+    def IsValid(self):
+        """ Returns ``True`` if the index has been built and not invalidated since. """
+
+        return self._valid
+
+
+    def Invalidate(self):
+        """ Marks the index as invalid, after the lines changed. """
+
+        self._valid = False
+
+
+    def Build(self, heights):
+        """
+        Builds the index.
+
+        :param `heights`: the heights of all the lines, in order.
+        """
+
+        self._heights = list(heights)
+        count = len(self._heights)
+        tree = [0] + self._heights
+
+        for i in range(1, count + 1):
+            parent = i + (i & -i)
+            if parent <= count:
+                tree[parent] += tree[i]
+
+        self._tree = tree
+        self._valid = True
+
+
+    def GetHeight(self, line):
+        """
+        Returns the height of a line.
+
+        :param `line`: the line index.
+        """
+
+        return self._heights[line]
+
+
+    def SetHeight(self, line, height):
+        """
+        Sets the height of a line.
+
+        :param `line`: the line index;
+        :param `height`: the new line height.
+        """
+
+        delta = height - self._heights[line]
+        if not delta:
+            return
+
+        self._heights[line] = height
+        count = len(self._heights)
+        i = line + 1
+
+        while i <= count:
+            self._tree[i] += delta
+            i += i & -i
+
+
+    def GetY(self, line):
+        """
+        Returns the sum of the heights of the lines above a line.
+
+        :param `line`: the line index, up to the number of lines.
+        """
+
+        y = 0
+        i = line
+
+        while i > 0:
+            y += self._tree[i]
+            i -= i & -i
+
+        return y
+
+
+    def GetTotalHeight(self):
+        """ Returns the sum of the heights of all the lines. """
+
+        return self.GetY(len(self._heights))
+
+
+    def FindLine(self, y):
+        """
+        Returns the index of the line at a `y` position, measured from the top
+        of the first line, or -1 if there are no lines.
+
+        Positions above the first line give the first line, and positions
+        below the last line give the last line.
+
+        :param `y`: the `y` position.
+        """
+
+        count = len(self._heights)
+        if not count:
+            return -1
+
+        # walk down the tree to the last line that starts at or above y
+        line = 0
+        step = 1 << (count.bit_length() - 1)
+
+        while step:
+            i = line + step
+            if i <= count and self._tree[i] <= y:
+                line = i
+                y -= self._tree[i]
+            step >>= 1
+
+        return min(line, count - 1)
+
+
 # ----------------------------------------------------------------------------
 # UltimateListItemAttr: a structure containing the visual attributes of an item
 # ----------------------------------------------------------------------------
@@ -3733,6 +3880,8 @@ class UltimateListLineData(object):
         # back pointer to the list ctrl
         self._owner = owner
         self._height = self._width = self._x = self._y = -1
+        # the line height is measured again if the owner's generation changed
+        self._heightGeneration = 0
 
         if self.InReportView():
 
@@ -6008,6 +6157,11 @@ class UltimateListMainWindow(wx.ScrolledWindow):
         # virtual list control we only ever use self._lines[0])
         self._lines = []
 
+        # the positions of the lines with ULC_HAS_VARIABLE_ROW_HEIGHT
+        self._lineHeightIndex = LineHeightIndex()
+        # incremented when the measured line heights may be out of date
+        self._lineHeightGeneration = 0
+
         # currently focused item or -1
         self._current = -1
 
@@ -6395,11 +6549,73 @@ class UltimateListMainWindow(wx.ScrolledWindow):
         :param `force`: ``True`` to reset all line dimensions.
         """
 
-        if (self.HasAGWFlag(ULC_REPORT) and self.HasAGWFlag(ULC_HAS_VARIABLE_ROW_HEIGHT) and not self.IsVirtual()) or force:
+        if self.HasLineHeightIndex() or force:
             for l in range(self.GetItemCount()):
                 line = self.GetLine(l)
                 line.ResetDimensions()
 
+        self._lineHeightIndex.Invalidate()
+
+
+    def ResetLinePositions(self):
+        """
+        Resets the line positions after lines were inserted, deleted or sorted.
+
+        With variable row heights in report mode, the heights of the lines are
+        kept and only their positions are recalculated. Otherwise this is the
+        same as calling :meth:`~UltimateListMainWindow.ResetLineDimensions` with
+        `force` set to ``True``.
+        """
+
+        if self.HasLineHeightIndex():
+            self._lineHeightIndex.Invalidate()
+        else:
+            self.ResetLineDimensions(True)
+
+
+    def ResetLineHeights(self):
+        """
+        Marks the measured heights of the lines as out of date, after a change of
+        the fonts, the custom renderers or the window size.
+
+        With variable row heights in report mode, each line is measured again the
+        next time it is shown, by :meth:`~UltimateListMainWindow.GetLineHeight`, and
+        keeps its previous height in the :class:`LineHeightIndex` until then, so the
+        lines don't move before they are measured.
+        """
+
+        self._lineHeightGeneration += 1
+
+
+    def HasLineHeightIndex(self):
+        """
+        Returns ``True`` if the line positions are kept in a :class:`LineHeightIndex`,
+        i.e. in report mode with the ``ULC_HAS_VARIABLE_ROW_HEIGHT`` style, if the
+        control is not virtual.
+        """
+
+        return self.HasAGWFlag(ULC_REPORT) and self.HasAGWFlag(ULC_HAS_VARIABLE_ROW_HEIGHT) and not self.IsVirtual()
+
+
+    def GetLineHeightIndex(self):
+        """
+        Returns the :class:`LineHeightIndex` of the lines, building it again if
+        the lines changed.
+
+        The lines that have not been measured yet count with the default line
+        height, so building the index doesn't measure every line: lines are only
+        measured when they are shown, by :meth:`~UltimateListMainWindow.GetLineHeight`.
+        """
+
+        index = self._lineHeightIndex
+
+        if not index.IsValid() or len(index) != len(self._lines):
+            default = self.GetLineHeight()
+            heights = [line.GetHeight() for line in self._lines]
+            index.Build([(height if height != -1 else default) for height in heights])
+
+        return index
+
     # these are for UltimateListLineData usage only
     # get the backpointer to the list ctrl
     def GetListCtrl(self):
@@ -6436,13 +6652,14 @@ class UltimateListMainWindow(wx.ScrolledWindow):
         """
         Forces us to recalculate the range of visible lines.
 
-        :param `reset`: ``True`` to reset all line dimensions, which will then be
-         recalculated.
+        :param `reset`: ``True`` to reset all line positions and heights, which will
+         then be recalculated.
         """
 
         self._lineFrom = -1
         if self.IsShownOnScreen() and reset:
-            self.ResetLineDimensions()
+            self.ResetLineHeights()
+            self._lineHeightIndex.Invalidate()
 
 
     # Called on EVT_SIZE to resize the _resizeColumn to fill the width of the window
@@ -6606,7 +6823,7 @@ class UltimateListMainWindow(wx.ScrolledWindow):
 
             line = self.GetLine(item)
             LH = line.GetHeight()
-            if LH != -1:
+            if LH != -1 and line._heightGeneration == self._lineHeightGeneration:
                 return LH
 
             dc = wx.ClientDC(self)
@@ -6638,6 +6855,11 @@ class UltimateListMainWindow(wx.ScrolledWindow):
 
             allTextY += EXTRA_HEIGHT
             line.SetHeight(allTextY)
+            line._heightGeneration = self._lineHeightGeneration
+
+            index = self._lineHeightIndex
+            if index.IsValid() and item < len(index) and not self.IsVirtual():
+                index.SetHeight(item, allTextY)
 
             return allTextY
 
@@ -6649,20 +6871,13 @@ class UltimateListMainWindow(wx.ScrolledWindow):
         :param `line`: an instance of :class:`UltimateListLineData`.
         """
 
-        if self.IsVirtual():
+        if self.IsVirtual() or not self.HasAGWFlag(ULC_HAS_VARIABLE_ROW_HEIGHT):
+            # all the lines have the same height
             return LINE_SPACING + line*self.GetLineHeight()
 
-        lineItem = self.GetLine(line)
-        lineY = lineItem.GetY()
-        if lineY != -1:
-            return lineY
-
-        lineY = 0
-        for l in range(line):
-            lineY += self.GetLineHeight(l)
-
-        lineItem.SetY(LINE_SPACING + lineY)
-        return LINE_SPACING + lineY
+        # the lines above that have not been measured yet count with the
+        # default line height
+        return LINE_SPACING + self.GetLineHeightIndex().GetY(line)
 
 
     def GetLineRect(self, line):
@@ -9977,7 +10192,7 @@ class UltimateListMainWindow(wx.ScrolledWindow):
         # we need to refresh the (vert) scrollbar as the number of items changed
         self._dirty = True
         self._lineHeight = 0
-        self.ResetLineDimensions(True)
+        self.ResetLinePositions()
         self.RecalculatePositions()
         self.RefreshAfter(lindex)
 
@@ -10037,6 +10252,7 @@ class UltimateListMainWindow(wx.ScrolledWindow):
                 self.DeleteItemWindow(item)
 
         self._lines = []
+        self._lineHeightIndex.Invalidate()
         self._itemWithWindow = []
         self._hasWindows = False
 
@@ -10245,6 +10461,7 @@ class UltimateListMainWindow(wx.ScrolledWindow):
         line.SetItem(item._col, item)
 
         self._lines.insert(id, line)
+        self._lineHeightIndex.Invalidate()
         self._dirty = True
 
         # If an item is selected at or below the point of insertion, we need to
@@ -10447,7 +10664,9 @@ class UltimateListMainWindow(wx.ScrolledWindow):
         if self.IsShownOnScreen():
             self._dirty = True
             self._lineHeight = 0
-            self.ResetLineDimensions(True)
+            self.ResetLinePositions()
+        else:
+            self._lineHeightIndex.Invalidate()
 
         self.RecalculatePositions(True)
 
@@ -10525,14 +10744,7 @@ class UltimateListMainWindow(wx.ScrolledWindow):
                     view_x, view_y = self.GetViewStart()
                     view_y *= SCROLL_UNIT_Y
 
-                    for i in range(0, count):
-                        rc = self.GetLineY(i)
-                        if rc > view_y:
-                            self._lineFrom = i - 1
-                            break
-
-                    if self._lineFrom < 0:
-                        self._lineFrom = 0
+                    self._lineFrom = self.GetLineHeightIndex().FindLine(view_y - LINE_SPACING)
 
                     self._lineTo = self._lineFrom
                     clientWidth, clientHeight = self.GetClientSize()
@@ -21,6 +21,7 @@ import wx
 import numpy as np
 
 from .Utilities import BBox
+from .Utilities import Geometry
 from wx.lib.floatcanvas.Utilities import Colors
 
 mac = sys.platform.startswith("darwin")
@@ -106,6 +107,11 @@ class DrawObject:
     a new DrawObject, see for example :class:`~lib.floatcanvas.FloatCanvas.Circle`.
 
     """
+    #: True if :meth:`_Draw` can be called from the worker thread of the
+    #: canvas (see :meth:`FloatCanvas.EnableBackgroundThread`): it only
+    #: uses the pens and brushes made beforehand, and no fonts or bitmaps.
+    ThreadSafeDraw = False
+
     #This class contains a series of static dictionaries:
 
     #* BrushList
@@ -144,6 +150,26 @@ class DrawObject:
 
         self.Visible = IsVisible
 
+    ## BoundingBox is a property so that the Canvas can keep its spatial
+    ## index up to date. Note that "self.BoundingBox += Delta" goes
+    ## through the setter as well.
+    @property
+    def BoundingBox(self):
+        """
+        getter for the BoundingBox property
+        """
+        return self._BoundingBox
+
+    @BoundingBox.setter
+    def BoundingBox(self, BB):
+        """
+        setter for the BoundingBox property
+        """
+        self._BoundingBox = BB
+        Canvas = getattr(self, "_Canvas", None)
+        if Canvas is not None:
+            Canvas._BoundingBoxChanged(self)
+
     # I pre-define all these as class variables to provide an easier
     # interface, and perhaps speed things up by caching all the Pens
     # and Brushes, although that may not help, as I think wx now
@@ -418,6 +444,7 @@ class DrawObject:
             self._Canvas._DrawList.append(self)
             self._Canvas._BackgroundDirty = True
             self.InForeground = False
+            self._Canvas._ObjectLayerChanged(self)
 
     def PutInForeground(self):
         """Put the object in the foreground."""
@@ -426,6 +453,63 @@ class DrawObject:
             self._Canvas._DrawList.remove(self)
             self._Canvas._BackgroundDirty = True
             self.InForeground = True
+            self._Canvas._ObjectLayerChanged(self)
+
+    def HitTestPoint(self, XY, Scale):
+        """
+        Returns True if the point XY is on the object.
+
+        This is used by the geometric hit-test, see
+        :meth:`~lib.floatcanvas.FloatCanvas.FloatCanvas.EnableGeometricHitTest`.
+        This default tests against the Bounding Box, grown by half the
+        HitLineWidth. The subclasses override it with an exact test where
+        they can.
+
+        :param `XY`: the (x, y) point in World coordinates, a (2,)
+         `NumPy <http://www.numpy.org/>`_ array
+        :param `Scale`: the (x, y) number of pixels per World unit
+
+        """
+        Tol = self.HitLineWidth / 2.0 / np.asarray(Scale, float)
+        BB = self.BoundingBox
+        return bool((XY >= BB[0] - Tol).all() and (XY <= BB[1] + Tol).all())
+
+    def HitTestRect(self, BB, Scale):
+        """
+        Returns True if any part of the object is inside the rectangle BB.
+
+        This default tests against the Bounding Box.
+
+        :param `BB`: a :class:`BBox` in World coordinates
+        :param `Scale`: the (x, y) number of pixels per World unit
+
+        """
+        return bool(self.BoundingBox.Overlaps(BB))
+
+    def _HitTestPoints(self, Points, XY, Scale, Closed=False, Fill=False):
+        """
+        Hit-test for the objects drawn as a line (or polygon) through Points.
+
+        The test is done in pixels relative to XY, so that the HitLineWidth
+        can be used as the tolerance.
+
+        """
+        Points = (np.asarray(Points, float).reshape(-1, 2) - XY) * Scale
+        if Fill and self.HitFill and Geometry.PointInPolygon((0, 0), Points):
+            return True
+        return bool(self.HitLine and
+                    Geometry.DistanceToPolyline((0, 0), Points, Closed) <=
+                    self.HitLineWidth / 2.0)
+
+    def _HitTestEllipse(self, Center, Radii, XY, Scale):
+        """
+        Hit-test for an axis-aligned ellipse, the outline is approximated by
+        a 64 sided polygon.
+
+        """
+        t = np.linspace(0, 2 * np.pi, 64, endpoint=False)
+        Points = Center + np.column_stack((np.cos(t), np.sin(t))) * Radii
+        return self._HitTestPoints(Points, XY, Scale, Closed=True, Fill=True)
 
     def Hide(self):
         """Hide the object."""
@@ -586,8 +670,15 @@ class PointsObjectMixin:
     A mixin class that provides some methods suitable for use
     with objects that have a set of (x, y) coordinate pairs.
 
+    It also provides an optional level of detail (LOD) simplification of
+    the points, see :meth:`~lib.floatcanvas.FloatCanvas.PointsObjectMixin.SetLODTolerance`
+
     """
 
+    ## Level of detail settings: LOD is off by default
+    LODTolerance = None
+    LODMinPoints = 64
+
     def Move(self, Delta):
         """
         Moves the object by delta, where delta is a (dx, dy) pair.
@@ -606,9 +697,82 @@ class PointsObjectMixin:
     def CalcBoundingBox(self):
         """Calculate the bounding box."""
         self.BoundingBox = BBox.fromPoints(self.Points)
+        # the points have changed, so the LOD levels have to be re-computed
+        self._LODCache = {}
         if self._Canvas:
             self._Canvas.BoundingBoxDirty = True
 
+    def SetLODTolerance(self, Tolerance=1):
+        """
+        Turn the level of detail (LOD) simplification of the points on or off.
+
+        With LOD on, the points that fall within ``Tolerance`` pixels of the
+        previous point drawn are skipped, so an object with many thousands
+        of vertices only sends a few to the DC when zoomed far out. The
+        simplified point sets are computed once for each zoom level (in
+        powers of two) that is drawn, and re-used until the points change.
+
+        Only objects that use :meth:`~lib.floatcanvas.FloatCanvas.PointsObjectMixin.GetLODPoints`
+        in their ``_Draw`` method (:class:`~lib.floatcanvas.FloatCanvas.Line`,
+        :class:`~lib.floatcanvas.FloatCanvas.Spline` and
+        :class:`~lib.floatcanvas.FloatCanvas.Polygon`) are simplified.
+
+        :param `Tolerance`: the size in pixels of the cells used to bin the
+         points, or ``None`` to turn LOD off.
+
+        """
+        self.LODTolerance = Tolerance
+        self._LODCache = {}
+
+    def GetLODPoints(self, ScaleWorldToPixel):
+        """
+        Returns the points to draw at the current zoom level.
+
+        If LOD is off, or there are only a few points, this is just
+        ``self.Points``.
+
+        :param `ScaleWorldToPixel`: the function passed in to ``_Draw``, used
+         to find the current scale.
+
+        """
+        Points = self.Points
+        if self.LODTolerance is None or len(Points) <= self.LODMinPoints:
+            return Points
+        Extent = max(self.BoundingBox.Width, self.BoundingBox.Height)
+        if not Extent > 0:
+            return Points
+        # the number of pixels the object spans: at least one
+        Pixels = max(np.abs(ScaleWorldToPixel((Extent, Extent))).max(), 1)
+        CellSize = self.LODTolerance * Extent / Pixels
+        Level = int(np.floor(np.log2(CellSize)))
+        if Level not in self._LODCache:
+            self._LODCache[Level] = self._DecimatePoints(2.0**Level)
+        Index = self._LODCache[Level]
+        if Index is None:
+            return Points
+        return Points[Index]
+
+    def _DecimatePoints(self, CellSize):
+        """
+        Bin the points on a grid of cells CellSize in size, and keep only
+        the first point of each run of points that fall in the same cell,
+        and the last point.
+
+        Returns an index array of the points to keep, or None if it would
+        not drop enough points to be worth it.
+
+        """
+        Points = self.Points
+        # relative to the first point, so that Move() doesn't change the result
+        Cells = np.floor((Points - Points[0]) / CellSize)
+        Keep = np.empty((len(Points),), bool)
+        Keep[0] = True
+        Keep[1:] = (Cells[1:] != Cells[:-1]).any(1)
+        Keep[-1] = True
+        if Keep.sum() > 0.75 * len(Keep):
+            return None
+        return np.nonzero(Keep)[0]
+
     def SetPoints(self, Points, copy=True):
         """
         Sets the coordinates of the points of the object to Points (NX2 array).
@@ -648,6 +812,8 @@ class Polygon(PointsObjectMixin, LineAndFillMixin, DrawObject):
     arrays.
 
     """
+    ThreadSafeDraw = True
+
     def __init__(self,
                  Points,
                  LineColor = "Black",
@@ -684,8 +850,22 @@ class Polygon(PointsObjectMixin, LineAndFillMixin, DrawObject):
         self.SetPen(LineColor,LineStyle,LineWidth)
         self.SetBrush(FillColor,FillStyle)
 
+    def HitTestPoint(self, XY, Scale):
+        return (DrawObject.HitTestPoint(self, XY, Scale) and
+                self._HitTestPoints(self.Points, XY, Scale, Closed=True, Fill=True))
+
+    def HitTestRect(self, BB, Scale):
+        if not self.BoundingBox.Overlaps(BB):
+            return False
+        return (Geometry.PolylineIntersectsRect(self.Points, BB, Closed=True) or
+                (self.HitFill and
+                 Geometry.PointInPolygon(np.mean(BB, 0), self.Points)))
+
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel = None, HTdc=None):
-        Points = WorldToPixel(self.Points)
+        if ScaleWorldToPixel is None:
+            Points = WorldToPixel(self.Points)
+        else:
+            Points = WorldToPixel(self.GetLODPoints(ScaleWorldToPixel))
         dc.SetPen(self.Pen)
         dc.SetBrush(self.Brush)
         dc.DrawPolygon(Points)
@@ -702,6 +882,8 @@ class Line(PointsObjectMixin, LineOnlyMixin, DrawObject):
     if there are more than two.
 
     """
+    ThreadSafeDraw = True
+
     def __init__(self, Points,
                  LineColor = "Black",
                  LineStyle = "Solid",
@@ -732,9 +914,17 @@ class Line(PointsObjectMixin, LineOnlyMixin, DrawObject):
 
         self.HitLineWidth = max(LineWidth,self.MinHitLineWidth)
 
+    def HitTestPoint(self, XY, Scale):
+        ## note: for a Spline this tests against the control points.
+        return (DrawObject.HitTestPoint(self, XY, Scale) and
+                self._HitTestPoints(self.Points, XY, Scale))
+
+    def HitTestRect(self, BB, Scale):
+        return (self.BoundingBox.Overlaps(BB) and
+                Geometry.PolylineIntersectsRect(self.Points, BB))
 
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
-        Points = WorldToPixel(self.Points)
+        Points = WorldToPixel(self.GetLODPoints(ScaleWorldToPixel))
         dc.SetPen(self.Pen)
         dc.DrawLines(Points)
         if HTdc and self.HitAble:
@@ -753,7 +943,7 @@ class Spline(Line):
         Line.__init__(self, *args, **kwargs)
 
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
-        Points = WorldToPixel(self.Points)
+        Points = WorldToPixel(self.GetLODPoints(ScaleWorldToPixel))
         dc.SetPen(self.Pen)
         dc.DrawSpline(Points)
         if HTdc and self.HitAble:
@@ -769,6 +959,8 @@ class Arrow(XYObjectMixin, LineOnlyMixin, DrawObject):
     defined by ``Direction``.
 
     """
+    ThreadSafeDraw = True
+
     def __init__(self,
                  XY,
                  Length,
@@ -902,6 +1094,7 @@ class ArrowLine(PointsObjectMixin, LineOnlyMixin, DrawObject):
     It takes a list of 2-tuples, or a NX2 NumPy Float array of point coordinates.
 
     """
+    ThreadSafeDraw = True
 
     def __init__(self,
                  Points,
@@ -962,6 +1155,14 @@ class ArrowLine(PointsObjectMixin, LineOnlyMixin, DrawObject):
             self.ArrowPoints[i,:,:] = AP
         self.ArrowPoints *= S
 
+    def HitTestPoint(self, XY, Scale):
+        return (DrawObject.HitTestPoint(self, XY, Scale) and
+                self._HitTestPoints(self.Points, XY, Scale))
+
+    def HitTestRect(self, BB, Scale):
+        return (self.BoundingBox.Overlaps(BB) and
+                Geometry.PolylineIntersectsRect(self.Points, BB))
+
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
         Points = WorldToPixel(self.Points)
         ArrowPoints = (Points[1:,np.newaxis,:] + self.ArrowPoints).astype(int)
@@ -996,6 +1197,8 @@ class PointSet(PointsObjectMixin, ColorOnlyMixin, DrawObject):
     In the case of points, the HitLineWidth is used as diameter.
 
     """
+    ThreadSafeDraw = True
+
     def __init__(self, Points, Color="Black", Diameter=1, InForeground=False):
         """
         Default class constructor.
@@ -1043,6 +1246,13 @@ class PointSet(PointsObjectMixin, ColorOnlyMixin, DrawObject):
         d = self.Points - XY
         return np.argmin(np.hypot(d[:,0],d[:,1]))
 
+    def HitTestPoint(self, XY, Scale):
+        d = (self.Points - XY) * Scale
+        Radius = max(self.Diameter, self.HitLineWidth) / 2.0
+        return bool((np.hypot(d[:,0], d[:,1]) <= Radius).any())
+
+    def HitTestRect(self, BB, Scale):
+        return bool(Geometry.PointsInRect(self.Points, BB).any())
 
     def DrawD2(self, dc, Points):
         # A Little optimization for a diameter2 - point
@@ -1096,6 +1306,8 @@ class Point(XYObjectMixin, ColorOnlyMixin, DrawObject):
        The HitLineWidth is used as diameter for the Hit Test.
 
     """
+    ThreadSafeDraw = True
+
     def __init__(self, XY, Color="Black", Diameter=1, InForeground=False):
         """
         Default class constructor.
@@ -1127,6 +1339,13 @@ class Point(XYObjectMixin, ColorOnlyMixin, DrawObject):
         """
         self.Diameter = Diameter
 
+    def HitTestPoint(self, XY, Scale):
+        Radius = max(self.Diameter, self.HitLineWidth) / 2.0
+        return bool(np.hypot(*((self.XY - XY) * Scale)) <= Radius)
+
+    def HitTestRect(self, BB, Scale):
+        return bool(Geometry.PointsInRect(self.XY, BB)[0])
+
     def _Draw(self, dc, WorldToPixel, ScaleWorldToPixel, HTdc=None):
         dc.SetPen(self.Pen)
         xy = WorldToPixel(self.XY)
@@ -1154,6 +1373,8 @@ class SquarePoint(XYObjectMixin, ColorOnlyMixin, DrawObject):
     The HitLineWidth is used as diameter for the  Hit Test.
 
     """
+    ThreadSafeDraw = True
+
     def __init__(self, Point, Color="Black", Size=4, InForeground=False):
         """
         Default class constructor.
@@ -1184,6 +1405,13 @@ class SquarePoint(XYObjectMixin, ColorOnlyMixin, DrawObject):
         """
         self.Size = Size
 
+    def HitTestPoint(self, XY, Scale):
+        HalfSize = max(self.Size, self.HitLineWidth) / 2.0
+        return bool((np.abs((self.XY - XY) * Scale) <= HalfSize).all())
+
+    def HitTestRect(self, BB, Scale):
+        return bool(Geometry.PointsInRect(self.XY, BB)[0])
+
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
         Size = self.Size
         dc.SetPen(self.Pen)
@@ -1206,6 +1434,8 @@ class SquarePoint(XYObjectMixin, ColorOnlyMixin, DrawObject):
 
 class RectEllipse(XYObjectMixin, LineAndFillMixin, DrawObject):
     """A RectEllipse draw object."""
+    ThreadSafeDraw = True
+
     def __init__(self, XY, WH,
                  LineColor = "Black",
                  LineStyle = "Solid",
@@ -1272,6 +1502,14 @@ class RectEllipse(XYObjectMixin, LineAndFillMixin, DrawObject):
 
 class Rectangle(RectEllipse):
     """Draws a rectangle see :class:`~lib.floatcanvas.FloatCanvas.RectEllipse`"""
+    def HitTestPoint(self, XY, Scale):
+        if not DrawObject.HitTestPoint(self, XY, Scale):
+            return False
+        if self.HitFill:
+            return True
+        Corners = self.XY + np.array(((0, 0), (1, 0), (1, 1), (0, 1)), float) * self.WH
+        return self._HitTestPoints(Corners, XY, Scale, Closed=True)
+
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
         ( XY, WH ) = self.SetUpDraw(dc,
                                     WorldToPixel,
@@ -1286,6 +1524,13 @@ class Rectangle(RectEllipse):
 
 class Ellipse(RectEllipse):
     """Draws an ellipse see :class:`~lib.floatcanvas.FloatCanvas.RectEllipse`"""
+    def HitTestPoint(self, XY, Scale):
+        return (DrawObject.HitTestPoint(self, XY, Scale) and
+                self._HitTestEllipse(self.XY + self.WH / 2, self.WH / 2, XY, Scale))
+
+    def HitTestRect(self, BB, Scale):
+        return Geometry.EllipseIntersectsRect(self.XY + self.WH / 2, self.WH / 2, BB)
+
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
         ( XY, WH ) = self.SetUpDraw(dc,
                                     WorldToPixel,
@@ -1299,6 +1544,8 @@ class Ellipse(RectEllipse):
 
 class Circle(XYObjectMixin, LineAndFillMixin, DrawObject):
     """Draws a circle"""
+    ThreadSafeDraw = True
+
     def __init__(self, XY, Diameter,
                  LineColor = "Black",
                  LineStyle = "Solid",
@@ -1357,6 +1604,13 @@ class Circle(XYObjectMixin, LineAndFillMixin, DrawObject):
         if self._Canvas:
             self._Canvas.BoundingBoxDirty = True
 
+    def HitTestPoint(self, XY, Scale):
+        return (DrawObject.HitTestPoint(self, XY, Scale) and
+                self._HitTestEllipse(self.XY, self.WH, XY, Scale))
+
+    def HitTestRect(self, BB, Scale):
+        return Geometry.EllipseIntersectsRect(self.XY, self.WH, BB)
+
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
         ( XY, WH ) = self.SetUpDraw(dc,
                                     WorldToPixel,
@@ -1428,6 +1682,17 @@ class TextObjectMixin(XYObjectMixin):
         """
         pass
 
+    def _PixelBoxBB(self, Width, Height, Scale):
+        """
+        Returns the World Bounding Box of a box Width x Height pixels in
+        size, placed at XY the way the ShiftFun places the object.
+
+        """
+        x, y = self.ShiftFun(0, 0, Width, Height)
+        Corners = (np.array(((x, y), (x + Width, y + Height)), float) /
+                   (np.asarray(Scale, float) * (1, -1)) + self.XY)
+        return BBox.fromPoints(Corners)
+
     ## store the function that shift the coords for drawing text. The
     ## "c" parameter is the correction for world coordinates, rather
     ## than pixel coords as the y axis is reversed
@@ -1532,6 +1797,17 @@ class Text(TextObjectMixin, DrawObject):
         (self.TextWidth, self.TextHeight) = (None, None)
         self.ShiftFun = self.ShiftFunDict[Position]
 
+    ## the size of the text is only known once it has been drawn
+    def HitTestPoint(self, XY, Scale):
+        if self.TextWidth is None or self.TextHeight is None:
+            return DrawObject.HitTestPoint(self, XY, Scale)
+        return bool(self._PixelBoxBB(self.TextWidth, self.TextHeight, Scale).PointInside(XY))
+
+    def HitTestRect(self, BB, Scale):
+        if self.TextWidth is None or self.TextHeight is None:
+            return DrawObject.HitTestRect(self, BB, Scale)
+        return bool(self._PixelBoxBB(self.TextWidth, self.TextHeight, Scale).Overlaps(BB))
+
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
         XY = WorldToPixel(self.XY)
         dc.SetFont(self.Font)
@@ -2069,6 +2345,12 @@ class Bitmap(TextObjectMixin, DrawObject):
         (self.Width, self.Height) = self.Bitmap.GetWidth(), self.Bitmap.GetHeight()
         self.ShiftFun = self.ShiftFunDict[Position]
 
+    def HitTestPoint(self, XY, Scale):
+        return bool(self._PixelBoxBB(self.Width, self.Height, Scale).PointInside(XY))
+
+    def HitTestRect(self, BB, Scale):
+        return bool(self._PixelBoxBB(self.Width, self.Height, Scale).Overlaps(BB))
+
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
         XY = WorldToPixel(self.XY)
         XY = self.ShiftFun(XY[0], XY[1], self.Width, self.Height)
@@ -2457,6 +2739,8 @@ class Arc(XYObjectMixin, LineAndFillMixin, DrawObject):
     the end point.
 
     """
+    ThreadSafeDraw = True
+
     def __init__(self,
                  StartXY,
                  EndXY,
@@ -2565,6 +2849,7 @@ class PieChart(XYObjectMixin, LineOnlyMixin, DrawObject):
     you, and it will make the chart, scaling the size of each "slice" to
     match your values.
     """
+    ThreadSafeDraw = True
 
     ##fixme: this should be a longer and better designed set.
     ##       Maybe one from: http://geography.uoregon.edu/datagraphics/color_scales.htm
@@ -2697,6 +2982,652 @@ class PieChart(XYObjectMixin, LineOnlyMixin, DrawObject):
             HTdc.DrawCircle(CenterXY.tolist(), int(radius))
 
 
+class CollectionMixin:
+    """
+    Mixin class for the collection DrawObjects.
+
+    A collection holds many items (markers, polylines, rectangles...) in
+    `NumPy <http://www.numpy.org/>`_ arrays, and draws all the items that
+    share a style with a single call to one of the DC ``Draw*List``
+    methods, rather than having a separate DrawObject for each item.
+
+    The styles are given as a list of dicts, each with any of the keys
+    ``LineColor``, ``LineStyle``, ``LineWidth``, ``FillColor`` and
+    ``FillStyle``, and an array of style indices, one per item.
+
+    The whole collection is one object as far as the hit-test is
+    concerned. When a bound event is called, the index of the item that
+    was hit is put in the ``HitIndex`` attribute.
+
+    The classes using it define ``NumItems()``, returning the number of
+    items, and ``FindItem(XY)``, returning the index of the item closest
+    to a point in World coordinates.
+
+    """
+
+    DefaultStyle = {"LineColor": "Black",
+                    "LineStyle": "Solid",
+                    "LineWidth": 1,
+                    "FillColor": None,
+                    "FillStyle": "Solid",
+                    }
+
+    HitIndex = None
+
+    def SetStyles(self, Styles, StyleIndex=None):
+        """
+        Set the styles of the items.
+
+        :param list `Styles`: a list of dicts, with any of the keys
+         ``LineColor``, ``LineStyle``, ``LineWidth``, ``FillColor`` and
+         ``FillStyle``, see :meth:`~lib.floatcanvas.FloatCanvas.DrawObject.SetColor`,
+         :meth:`~lib.floatcanvas.FloatCanvas.DrawObject.SetLineStyle` and
+         :meth:`~lib.floatcanvas.FloatCanvas.DrawObject.SetFillStyle`
+         for valid values
+        :param `StyleIndex`: a sequence with the index into `Styles` of the
+         style of each item, if ``None`` all items use the first style.
+
+        """
+        self.Styles = [dict(self.DefaultStyle, **Style) for Style in Styles]
+        self.Pens = []
+        self.Brushes = []
+        for Style in self.Styles:
+            LineColor, LineStyle = Style["LineColor"], Style["LineStyle"]
+            if LineColor is None or LineStyle is None:
+                Pen = wx.TRANSPARENT_PEN
+            else:
+                LineWidth = Style["LineWidth"]
+                Pen = self.PenList.setdefault(
+                    (LineColor, LineStyle, LineWidth),
+                    wx.Pen(LineColor, int(LineWidth), self.LineStyleList[LineStyle]))
+            FillColor, FillStyle = Style["FillColor"], Style["FillStyle"]
+            if FillColor is None or FillStyle is None:
+                Brush = wx.TRANSPARENT_BRUSH
+            else:
+                Brush = self.BrushList.setdefault(
+                    (FillColor, FillStyle),
+                    wx.Brush(FillColor, self.FillStyleList[FillStyle]))
+            self.Pens.append(Pen)
+            self.Brushes.append(Brush)
+        # the first style is used for the Pen and Brush of the object itself
+        self.Pen = self.Pens[0]
+        self.Brush = self.Brushes[0]
+
+        self.HitLineWidth = max([self.MinHitLineWidth] +
+                                [Style["LineWidth"] for Style in self.Styles])
+        if self.HitColor:
+            self.SetHitPen(self.HitColor, self.HitLineWidth)
+        self.SetStyleIndex(StyleIndex)
+
+    def SetStyleIndex(self, StyleIndex):
+        """
+        Set which style each item is drawn with.
+
+        :param `StyleIndex`: a sequence with the index into ``Styles`` of
+         the style of each item, if ``None`` all items use the first style.
+
+        """
+        if StyleIndex is None:
+            self.StyleIndex = np.zeros((self.NumItems(),), np.intp)
+        else:
+            StyleIndex = np.asarray(StyleIndex, np.intp).reshape((-1,))
+            if len(StyleIndex) != self.NumItems():
+                raise ValueError("StyleIndex must have one entry per item")
+            if len(StyleIndex) and (StyleIndex.min() < 0 or
+                                    StyleIndex.max() >= len(self.Styles)):
+                raise ValueError("StyleIndex entries must index into Styles")
+            self.StyleIndex = StyleIndex
+        self._StyleGroups = None
+
+    def StyleGroups(self):
+        """
+        Returns a list of (Pen, Brush, ItemIndices) tuples, one for each
+        style that is in use, in the order of the Styles.
+
+        """
+        if self._StyleGroups is None:
+            if len(self.Styles) == 1:
+                Groups = [(self.Pens[0], self.Brushes[0], slice(None))]
+            else:
+                Groups = []
+                for i in np.unique(self.StyleIndex):
+                    Groups.append((self.Pens[i], self.Brushes[i],
+                                   np.nonzero(self.StyleIndex == i)[0]))
+            self._StyleGroups = Groups
+        return self._StyleGroups
+
+
+class MarkerCollection(PointsObjectMixin, CollectionMixin, DrawObject):
+    """
+    Draws a set of circular markers, of a fixed size in pixels, each of
+    which can have its own style.
+
+    This is like :class:`~lib.floatcanvas.FloatCanvas.PointSet`, but the
+    markers can be drawn with different colors, and the index of the marker
+    that got hit is available in the ``HitIndex`` attribute of the object in
+    a bound event.
+
+    """
+    ThreadSafeDraw = True
+
+    def __init__(self, Points,
+                 Diameter = 4,
+                 Color = "Black",
+                 Styles = None,
+                 StyleIndex = None,
+                 InForeground = False):
+        """
+        Default class constructor.
+
+        :param `Points`: a NX2 `NumPy <http://www.numpy.org/>`_ array, or a
+         sequence of 2-tuples, of point coordinates
+        :param integer `Diameter`: the marker diameter in pixels
+        :param `Color`: the line and fill color of the markers if no `Styles`
+         are given, see :meth:`~lib.floatcanvas.FloatCanvas.DrawObject.SetColor`
+        :param list `Styles`: see :meth:`~lib.floatcanvas.FloatCanvas.CollectionMixin.SetStyles`
+        :param `StyleIndex`: the style index of each marker, see
+         :meth:`~lib.floatcanvas.FloatCanvas.CollectionMixin.SetStyles`
+        :param boolean `InForeground`: should object be in foreground
+
+        """
+        DrawObject.__init__(self, InForeground)
+
+        self.Points = np.array(Points, float)
+        self.Points.shape = (-1, 2)
+        self.CalcBoundingBox()
+        self.Diameter = Diameter
+
+        if Styles is None:
+            Styles = [{"LineColor": Color, "FillColor": Color}]
+        self.SetStyles(Styles, StyleIndex)
+
+    def SetPoints(self, Points, copy=True):
+        """
+        Sets the coordinates of the markers.
+
+        The number of markers must not change unless the style index is
+        re-set with :meth:`~lib.floatcanvas.FloatCanvas.CollectionMixin.SetStyleIndex`.
+
+        see :meth:`~lib.floatcanvas.FloatCanvas.PointsObjectMixin.SetPoints`
+
+        """
+        PointsObjectMixin.SetPoints(self, Points, copy)
+        if len(self.StyleIndex) != len(self.Points):
+            self.SetStyleIndex(None)
+
+    def SetColor(self, Color):
+        """
+        Set the line and fill color of all the styles
+
+        :param `Color`: see :meth:`~lib.floatcanvas.FloatCanvas.DrawObject.SetColor`
+         for valid values
+
+        """
+        self.SetStyles([dict(Style, LineColor=Color, FillColor=Color) for Style in self.Styles],
+                       self.StyleIndex)
+    SetFillColor = SetColor
+
+    def SetDiameter(self, Diameter):
+        """
+        Sets the diameter
+
+        :param integer `Diameter`: the marker diameter in pixels
+
+        """
+        self.Diameter = Diameter
+
+    def NumItems(self):
+        """Returns the number of markers."""
+        return len(self.Points)
+
+    def FindItem(self, XY):
+        """
+        Returns the index of the marker closest to the point XY, given
+        in World coordinates, or ``None`` if the collection is empty.
+
+        :param `XY`: the (x,y) coordinates of the point to look for, it takes a
+         2-tuple or (2,) numpy array in World coordinates
+
+        """
+        if not len(self.Points):
+            return None
+        d = self.Points - XY
+        return int(np.argmin(np.hypot(d[:,0], d[:,1])))
+
+    def HitTestPoint(self, XY, Scale):
+        d = (self.Points - XY) * Scale
+        Radius = max(self.Diameter, self.HitLineWidth) / 2.0
+        return bool((np.hypot(d[:,0], d[:,1]) <= Radius).any())
+
+    def HitTestRect(self, BB, Scale):
+        return bool(Geometry.PointsInRect(self.Points, BB).any())
+
+    def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
+        Points = WorldToPixel(self.Points)
+        if self.Diameter <= 1:
+            for Pen, Brush, Items in self.StyleGroups():
+                dc.SetPen(Pen)
+                dc.DrawPointList(Points[Items])
+            if HTdc and self.HitAble:
+                HTdc.SetPen(self.HitPen)
+                HTdc.DrawPointList(Points)
+        else:
+            Diameter = int(self.Diameter)
+            xywh = np.empty((len(Points), 4), np.int32)
+            xywh[:, :2] = Points - Diameter // 2
+            xywh[:, 2:] = Diameter
+            for Pen, Brush, Items in self.StyleGroups():
+                dc.SetPen(Pen)
+                dc.SetBrush(Brush)
+                dc.DrawEllipseList(xywh[Items])
+            if HTdc and self.HitAble:
+                HTdc.SetPen(self.HitPen)
+                HTdc.SetBrush(self.HitBrush)
+                HTdc.DrawEllipseList(xywh)
+
+
+class PolylineCollection(CollectionMixin, LineOnlyMixin, DrawObject):
+    """
+    Draws a set of polylines, each of which can have its own style.
+
+    All the vertices are kept in one NX2 array, ``Points``, and the polyline
+    ``i`` is made of the vertices ``Points[Offsets[i]:Offsets[i+1]]``. The
+    whole collection is transformed to pixel coordinates at once, and the
+    polylines are drawn as line segments, with one ``DrawLineList`` call
+    per style.
+
+    The index of the polyline that got hit is available in the ``HitIndex``
+    attribute of the object in a bound event.
+
+    """
+    ThreadSafeDraw = True
+
+    def __init__(self, Polylines,
+                 LineColor = "Black",
+                 LineStyle = "Solid",
+                 LineWidth = 1,
+                 Styles = None,
+                 StyleIndex = None,
+                 InForeground = False):
+        """
+        Default class constructor.
+
+        :param `Polylines`: a sequence of polylines, each of which is a NX2
+         `NumPy <http://www.numpy.org/>`_ array, or a sequence of 2-tuples,
+         of point coordinates
+        :param `LineColor`: see :meth:`~lib.floatcanvas.FloatCanvas.DrawObject.SetColor`
+        :param `LineStyle`: see :meth:`~lib.floatcanvas.FloatCanvas.DrawObject.SetLineStyle`
+        :param `LineWidth`: see :meth:`~lib.floatcanvas.FloatCanvas.DrawObject.SetLineWidth`
+        :param list `Styles`: see :meth:`~lib.floatcanvas.FloatCanvas.CollectionMixin.SetStyles`,
+         if given, the line arguments above are ignored.
+        :param `StyleIndex`: the style index of each polyline, see
+         :meth:`~lib.floatcanvas.FloatCanvas.CollectionMixin.SetStyles`
+        :param boolean `InForeground`: should object be in foreground
+
+        """
+        DrawObject.__init__(self, InForeground)
+
+        self.LineColor = LineColor
+        self.LineStyle = LineStyle
+        self.LineWidth = LineWidth
+
+        self.SetPolylines(Polylines)
+        if Styles is None:
+            Styles = [{"LineColor": LineColor,
+                       "LineStyle": LineStyle,
+                       "LineWidth": LineWidth}]
+        self.SetStyles(Styles, StyleIndex)
+
+    def SetPolylines(self, Polylines):
+        """
+        Sets the polylines of the collection.
+
+        If the number of polylines changes, they are all set to the first
+        style.
+
+        :param `Polylines`: a sequence of polylines, each of which is a NX2
+         `NumPy <http://www.numpy.org/>`_ array, or a sequence of 2-tuples,
+         of point coordinates
+
+        """
+        Polylines = [np.asarray(Points, float).reshape((-1, 2)) for Points in Polylines]
+        Lengths = [len(Points) for Points in Polylines]
+        self.Offsets = np.zeros((len(Polylines) + 1,), np.intp)
+        np.cumsum(Lengths, out=self.Offsets[1:])
+        if Polylines:
+            self.Points = np.concatenate(Polylines)
+        else:
+            self.Points = np.zeros((0, 2), float)
+        # a segment joins vertex i and i+1 if they are in the same polyline
+        Connected = np.ones((max(len(self.Points) - 1, 0),), bool)
+        Ends = self.Offsets[1:-1] - 1
+        Connected[Ends[(Ends >= 0) & (Ends < len(Connected))]] = False
+        self._SegmentStarts = np.nonzero(Connected)[0]
+        # the polyline each segment belongs to
+        self._SegmentItems = np.searchsorted(self.Offsets, self._SegmentStarts, 'right') - 1
+        self.CalcBoundingBox()
+        if getattr(self, "StyleIndex", None) is not None and len(self.StyleIndex) != len(Lengths):
+            self.SetStyleIndex(None)
+        self._StyleGroups = None
+
+    def GetPolyline(self, Index):
+        """
+        Returns the points of one polyline, a view into ``Points``.
+
+        :param integer `Index`: the index of the polyline
+
+        """
+        return self.Points[self.Offsets[Index]:self.Offsets[Index+1]]
+
+    def Move(self, Delta):
+        """
+        Moves the object by delta, where delta is a (dx, dy) pair.
+
+        :param `Delta`: is a (dx, dy) pair ideally a `NumPy <http://www.numpy.org/>`_
+         array of shape (2, )
+
+        """
+        Delta = np.asarray(Delta, float)
+        Delta.shape = (2,)
+        self.Points += Delta
+        self.BoundingBox += Delta
+        if self._Canvas:
+            self._Canvas.BoundingBoxDirty = True
+
+    def CalcBoundingBox(self):
+        """Calculate the bounding box."""
+        if len(self.Points):
+            self.BoundingBox = BBox.fromPoints(self.Points)
+        else:
+            self.BoundingBox = BBox.NullBBox()
+        if self._Canvas:
+            self._Canvas.BoundingBoxDirty = True
+
+    def SetLineColor(self, LineColor):
+        self.LineColor = LineColor
+        self.SetStyles([dict(Style, LineColor=LineColor) for Style in self.Styles], self.StyleIndex)
+    SetColor = SetLineColor
+
+    def SetLineStyle(self, LineStyle):
+        self.LineStyle = LineStyle
+        self.SetStyles([dict(Style, LineStyle=LineStyle) for Style in self.Styles], self.StyleIndex)
+
+    def SetLineWidth(self, LineWidth):
+        self.LineWidth = LineWidth
+        self.SetStyles([dict(Style, LineWidth=LineWidth) for Style in self.Styles], self.StyleIndex)
+
+    def NumItems(self):
+        """Returns the number of polylines."""
+        return len(self.Offsets) - 1
+
+    def StyleGroups(self):
+        """
+        Returns a list of (Pen, Brush, SegmentIndices) tuples, one for each
+        style that is in use, in the order of the Styles.
+
+        """
+        if self._StyleGroups is None:
+            if len(self.Styles) == 1:
+                self._StyleGroups = [(self.Pens[0], self.Brushes[0], slice(None))]
+            else:
+                SegmentStyles = self.StyleIndex[self._SegmentItems]
+                self._StyleGroups = [(self.Pens[i], self.Brushes[i],
+                                      np.nonzero(SegmentStyles == i)[0])
+                                     for i in np.unique(SegmentStyles)]
+        return self._StyleGroups
+
+    def FindItem(self, XY):
+        """
+        Returns the index of the polyline closest to the point XY, given
+        in World coordinates, or ``None`` if the collection is empty.
+
+        :param `XY`: the (x,y) coordinates of the point to look for, it takes a
+         2-tuple or (2,) numpy array in World coordinates
+
+        """
+        Starts = self._SegmentStarts
+        if not len(Starts):
+            if len(self.Points):
+                # only single point polylines
+                d = self.Points - XY
+                Vertex = np.argmin(np.hypot(d[:,0], d[:,1]))
+                return int(np.searchsorted(self.Offsets, Vertex, 'right') - 1)
+            return None
+        XY = np.asarray(XY, float)
+        A = self.Points[Starts]
+        B = self.Points[Starts + 1]
+        AB = B - A
+        LengthSq = (AB**2).sum(1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = ((XY - A) * AB).sum(1) / LengthSq
+        t = np.clip(np.nan_to_num(t), 0.0, 1.0)
+        d = A + t[:, np.newaxis] * AB - XY
+        return int(self._SegmentItems[np.argmin(np.hypot(d[:,0], d[:,1]))])
+
+    def HitTestPoint(self, XY, Scale):
+        if not DrawObject.HitTestPoint(self, XY, Scale) or not len(self.Points):
+            return False
+        Points = (self.Points - XY) * Scale
+        Starts = self._SegmentStarts
+        if len(Starts):
+            d = Geometry.DistanceToSegments((0, 0), Points[Starts], Points[Starts + 1])
+        else:
+            d = np.hypot(Points[:,0], Points[:,1])
+        return bool(d.min() <= self.HitLineWidth / 2.0)
+
+    def HitTestRect(self, BB, Scale):
+        if Geometry.PointsInRect(self.Points, BB).any():
+            return True
+        Starts = self._SegmentStarts
+        return bool(Geometry.SegmentsIntersectRect(self.Points[Starts],
+                                                   self.Points[Starts + 1],
+                                                   BB).any())
+
+    def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
+        Points = WorldToPixel(self.Points)
+        Starts = self._SegmentStarts
+        if not len(Starts):
+            return
+        Lines = np.concatenate((Points[Starts], Points[Starts + 1]), 1)
+        for Pen, Brush, Segments in self.StyleGroups():
+            dc.SetPen(Pen)
+            dc.DrawLineList(Lines[Segments])
+        if HTdc and self.HitAble:
+            HTdc.SetPen(self.HitPen)
+            HTdc.DrawLineList(Lines)
+
+
+class RectangleCollection(CollectionMixin, LineAndFillMixin, DrawObject):
+    """
+    Draws a set of rectangles, each of which can have its own style.
+
+    The corners and sizes of the rectangles, in world coordinates, are kept
+    in two NX2 arrays, ``XY`` and ``WH``, and all the rectangles of a style
+    are drawn with one ``DrawRectangleList`` call.
+
+    The index of the rectangle that got hit is available in the
+    ``HitIndex`` attribute of the object in a bound event.
+
+    """
+    ThreadSafeDraw = True
+
+    def __init__(self, XY, WH,
+                 LineColor = "Black",
+                 LineStyle = "Solid",
+                 LineWidth = 1,
+                 FillColor = None,
+                 FillStyle = "Solid",
+                 Styles = None,
+                 StyleIndex = None,
+                 InForeground = False):
+        """
+        Default class constructor.
+
+        :param `XY`: a NX2 `NumPy <http://www.numpy.org/>`_ array, or a
+         sequence of 2-tuples, of the corners of the rectangles
+        :param `WH`: a NX2 array, or a sequence of 2-tuples, of the width and
+         height of the rectangles
+        :param `LineColor`: see :meth:`~lib.floatcanvas.FloatCanvas.DrawObject.SetColor`
+        :param `LineStyle`: see :meth:`~lib.floatcanvas.FloatCanvas.DrawObject.SetLineStyle`
+        :param `LineWidth`: see :meth:`~lib.floatcanvas.FloatCanvas.DrawObject.SetLineWidth`
+        :param `FillColor`: see :meth:`~lib.floatcanvas.FloatCanvas.DrawObject.SetColor`
+        :param `FillStyle`: see :meth:`~lib.floatcanvas.FloatCanvas.DrawObject.SetFillStyle`
+        :param list `Styles`: see :meth:`~lib.floatcanvas.FloatCanvas.CollectionMixin.SetStyles`,
+         if given, the line and fill arguments above are ignored.
+        :param `StyleIndex`: the style index of each rectangle, see
+         :meth:`~lib.floatcanvas.FloatCanvas.CollectionMixin.SetStyles`
+        :param boolean `InForeground`: should object be in foreground
+
+        """
+        DrawObject.__init__(self, InForeground)
+
+        self.LineColor = LineColor
+        self.LineStyle = LineStyle
+        self.LineWidth = LineWidth
+        self.FillColor = FillColor
+        self.FillStyle = FillStyle
+
+        # these define the behaviour when zooming makes the objects really small.
+        self.MinSize = 1
+        self.DisappearWhenSmall = True
+
+        self.SetShapes(XY, WH)
+        if Styles is None:
+            Styles = [{"LineColor": LineColor,
+                       "LineStyle": LineStyle,
+                       "LineWidth": LineWidth,
+                       "FillColor": FillColor,
+                       "FillStyle": FillStyle}]
+        self.SetStyles(Styles, StyleIndex)
+
+    def SetShapes(self, XY, WH):
+        """
+        Set the corners and sizes of the rectangles.
+
+        If the number of rectangles changes, they are all set to the first
+        style.
+
+        :param `XY`: a NX2 array, or a sequence of 2-tuples, of the corners
+        :param `WH`: a NX2 array, or a sequence of 2-tuples, of the sizes
+
+        """
+        XY = np.array(XY, float).reshape((-1, 2))
+        WH = np.array(WH, float).reshape((-1, 2))
+        if XY.shape != WH.shape:
+            raise ValueError("XY and WH must have the same number of rectangles")
+        self.XY = XY
+        self.WH = WH
+        self.CalcBoundingBox()
+        if getattr(self, "StyleIndex", None) is not None and len(self.StyleIndex) != len(XY):
+            self.SetStyleIndex(None)
+
+    def Move(self, Delta):
+        """
+        Moves the object by delta, where delta is a (dx, dy) pair.
+
+        :param `Delta`: is a (dx, dy) pair ideally a `NumPy <http://www.numpy.org/>`_
+         array of shape (2, )
+
+        """
+        Delta = np.asarray(Delta, float)
+        Delta.shape = (2,)
+        self.XY += Delta
+        self.BoundingBox += Delta
+        if self._Canvas:
+            self._Canvas.BoundingBoxDirty = True
+
+    def CalcBoundingBox(self):
+        """Calculate the bounding box."""
+        if len(self.XY):
+            # you need both corners in case Width or Height are negative
+            self.BoundingBox = BBox.fromPoints(np.concatenate((self.XY, self.XY + self.WH)))
+        else:
+            self.BoundingBox = BBox.NullBBox()
+        if self._Canvas:
+            self._Canvas.BoundingBoxDirty = True
+
+    def SetLineColor(self, LineColor):
+        self.LineColor = LineColor
+        self.SetStyles([dict(Style, LineColor=LineColor) for Style in self.Styles], self.StyleIndex)
+    SetColor = SetLineColor
+
+    def SetLineStyle(self, LineStyle):
+        self.LineStyle = LineStyle
+        self.SetStyles([dict(Style, LineStyle=LineStyle) for Style in self.Styles], self.StyleIndex)
+
+    def SetLineWidth(self, LineWidth):
+        self.LineWidth = LineWidth
+        self.SetStyles([dict(Style, LineWidth=LineWidth) for Style in self.Styles], self.StyleIndex)
+
+    def SetFillColor(self, FillColor):
+        self.FillColor = FillColor
+        self.SetStyles([dict(Style, FillColor=FillColor) for Style in self.Styles], self.StyleIndex)
+
+    def SetFillStyle(self, FillStyle):
+        self.FillStyle = FillStyle
+        self.SetStyles([dict(Style, FillStyle=FillStyle) for Style in self.Styles], self.StyleIndex)
+
+    def NumItems(self):
+        """Returns the number of rectangles."""
+        return len(self.XY)
+
+    def FindItem(self, XY):
+        """
+        Returns the index of the rectangle containing the point XY, given
+        in World coordinates, the top one if several do, or else of the
+        closest one, or ``None`` if the collection is empty.
+
+        :param `XY`: the (x,y) coordinates of the point to look for, it takes a
+         2-tuple or (2,) numpy array in World coordinates
+
+        """
+        if not len(self.XY):
+            return None
+        XY = np.asarray(XY, float)
+        Min = np.minimum(self.XY, self.XY + self.WH)
+        Max = np.maximum(self.XY, self.XY + self.WH)
+        # distance from the point to each rectangle, zero if it is inside
+        d = np.maximum(np.maximum(Min - XY, XY - Max), 0.0)
+        d = np.hypot(d[:,0], d[:,1])
+        Inside = np.nonzero(d == 0)[0]
+        if len(Inside):
+            # the last one is drawn on top
+            return int(Inside[-1])
+        return int(np.argmin(d))
+
+    def HitTestPoint(self, XY, Scale):
+        Tol = self.HitLineWidth / 2.0 / np.asarray(Scale, float)
+        Min = np.minimum(self.XY, self.XY + self.WH) - Tol
+        Max = np.maximum(self.XY, self.XY + self.WH) + Tol
+        return bool(((XY >= Min) & (XY <= Max)).all(1).any())
+
+    def HitTestRect(self, BB, Scale):
+        Min = np.minimum(self.XY, self.XY + self.WH)
+        Max = np.maximum(self.XY, self.XY + self.WH)
+        return bool(((Max >= BB[0]) & (Min <= BB[1])).all(1).any())
+
+    def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel, HTdc=None):
+        XY = WorldToPixel(self.XY)
+        WH = ScaleWorldToPixel(self.WH)
+        # normalize so that width and height are positive
+        Rects = np.empty((len(XY), 4), np.int32)
+        Rects[:, :2] = np.minimum(XY, XY + WH)
+        Rects[:, 2:] = np.abs(WH)
+        if self.DisappearWhenSmall: # don't try to draw them too tiny
+            Shown = (Rects[:, 2:] > self.MinSize).all(1)
+        else:
+            Rects[:, 2:] = np.maximum(Rects[:, 2:], self.MinSize)
+            Shown = np.ones((len(Rects),), bool)
+        for Pen, Brush, Items in self.StyleGroups():
+            dc.SetPen(Pen)
+            dc.SetBrush(Brush)
+            dc.DrawRectangleList(Rects[Items][Shown[Items]])
+        if HTdc and self.HitAble:
+            HTdc.SetPen(self.HitPen)
+            HTdc.SetBrush(self.HitBrush)
+            HTdc.DrawRectangleList(Rects[Shown])
+
+
 class Group(DrawObject):
     """
     A group of other FloatCanvas Objects
@@ -2752,7 +3683,9 @@ class Group(DrawObject):
 
         """
         self.ObjectList.append(obj)
-        self.BoundingBox.Merge(obj.BoundingBox)
+        BB = self.BoundingBox
+        BB.Merge(obj.BoundingBox)
+        self.BoundingBox = BB # re-set so the Canvas knows it has changed
 
     def AddObjects(self, Objects):
         """
@@ -2764,6 +3697,14 @@ class Group(DrawObject):
         for o in Objects:
             self.AddObject(o)
 
+    def HitTestPoint(self, XY, Scale):
+        return any(obj.Visible and obj.HitTestPoint(XY, Scale)
+                   for obj in self.ObjectList)
+
+    def HitTestRect(self, BB, Scale):
+        return any(obj.Visible and obj.HitTestRect(BB, Scale)
+                   for obj in self.ObjectList)
+
     def CalcBoundingBox(self):
         """Calculate the bounding box."""
         if self.ObjectList:
@@ -2905,6 +3846,14 @@ class Group(DrawObject):
             if isinstance(obj, Group):
                 self._ChangeChildrenHitColor(obj.ObjectList)
 
+    @property
+    def ThreadSafeDraw(self):
+        """
+        True if all the objects in the group can be drawn from the worker
+        thread of the canvas.
+        """
+        return all(obj.ThreadSafeDraw for obj in self.ObjectList)
+
     def _Draw(self, dc , WorldToPixel, ScaleWorldToPixel = None, HTdc=None):
         for obj in self.ObjectList:
             obj._Draw(dc, WorldToPixel, ScaleWorldToPixel, HTdc)
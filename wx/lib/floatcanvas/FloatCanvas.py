@@ -43,6 +43,9 @@ Many samples are available in the `wxPhoenix/samples/floatcanvas` folder.
 """
 
 import sys
+import queue
+import threading
+import weakref
 mac = sys.platform.startswith("darwin")
 
 import numpy as np
@@ -55,6 +58,8 @@ import wx
 from .FCObjects import *
 
 from .Utilities import BBox
+from .Utilities import SpatialIndex
+from .Utilities import TileCache
 from . import GUIMode
 
 
@@ -103,6 +108,36 @@ class _MouseEvent(wx.PyCommandEvent):
         return getattr(self._NativeEvent, name)
 
 
+def _RenderWorker(CanvasRef, Queue):
+    """
+    The worker thread of a canvas using EnableBackgroundThread: renders the
+    queued backgrounds, skipping the ones that are out of date already. It
+    stops when it gets None, or when the canvas is gone.
+    """
+    while True:
+        try:
+            Job = Queue.get(timeout=1.0)
+        except queue.Empty:
+            if CanvasRef() is None:
+                return
+            continue
+        # only the latest job is worth doing
+        try:
+            while Job is not None:
+                Job = Queue.get_nowait()
+        except queue.Empty:
+            pass
+        Canvas = CanvasRef()
+        if Job is None or Canvas is None:
+            return
+        Generation, Image, Objects, Rest, WorldToPixel, ScaleWorldToPixel = Job
+        if Canvas._RenderInThread(Generation, Image, Objects, WorldToPixel,
+                                  ScaleWorldToPixel):
+            wx.CallAfter(Canvas._BackgroundRendered, Generation, Image, Rest,
+                         WorldToPixel, ScaleWorldToPixel)
+        del Canvas, Job
+
+
 #---------------------------------------------------------------------------
 class FloatCanvas(wx.Panel):
     """
@@ -192,6 +227,7 @@ class FloatCanvas(wx.Panel):
 
         self.HitColorGenerator = None
         self.UseHitTest = False
+        self.UseGeometricHitTest = False
 
         self.NumBetweenBlits = 500
 
@@ -201,6 +237,15 @@ class FloatCanvas(wx.Panel):
 
         self._DrawList = []
         self._ForeDrawList = []
+        self.UseSpatialIndex = False
+        self._SpatialIndex = None
+        self._ForeSpatialIndex = None
+        self.UseTileCache = False
+        self._TileCache = None
+        self._PendingTiles = None
+        self.UseBackgroundThread = False
+        self._RenderGeneration = 0
+        self._RenderQueue = None
         self.InitializePanel()
         self.MakeNewBuffers()
         self.BoundingBox = BBox.NullBBox()
@@ -335,6 +380,111 @@ class FloatCanvas(wx.Panel):
             hitcolor = dc.GetPixel( xy )
             return hitcolor.Get()
 
+    def EnableGeometricHitTest(self, Enable=True):
+        """
+        Turn the geometric hit-test on or off.
+
+        By default, the hit-test is done by drawing the objects that are
+        bound to events a second time, into an off-screen bitmap, each in
+        its own colour. With the geometric hit-test, no bitmap is used:
+        the objects under the mouse are found by testing the mouse position
+        against the geometry of each object, in World coordinates, see
+        :meth:`~lib.floatcanvas.FloatCanvas.DrawObject.HitTestPoint`. This
+        saves drawing everything twice, and the memory of the bitmaps.
+
+        Lines get the HitLineWidth as tolerance, as with the bitmap
+        hit-test. Objects that have no exact test fall back to their
+        Bounding Box.
+
+        :param boolean `Enable`: use the geometric hit-test
+
+        """
+        self.UseGeometricHitTest = Enable
+        self.MakeNewBuffers()
+
+    ## the extra space around a point, in pixels, used to find the objects
+    ## that may be hit through the spatial index -- for things like text and
+    ## points whose Bounding Box is smaller than what they draw.
+    HitTestMargin = 64
+
+    def _HitTestScale(self):
+        """The number of pixels per World unit, in x and y."""
+        return np.abs(self.TransformVector)
+
+    def _HitTestCandidates(self, DrawList, BB):
+        """
+        Returns the visible objects of DrawList that may touch BB, topmost
+        first.
+        """
+        Index = self._GetSpatialIndex(DrawList)
+        if Index is not None:
+            Margin = self.HitTestMargin / self._HitTestScale()
+            DrawList = Index.Query(np.array((BB[0] - Margin, BB[1] + Margin)))
+        return [Object for Object in reversed(DrawList) if Object.Visible]
+
+    def ObjectsAtPoint(self, XY, HitAbleOnly=False):
+        """
+        Returns all the objects under a point, the topmost one first.
+
+        The foreground objects come before the background ones. This uses
+        the same tests as the geometric hit-test, but works whether or not
+        it is turned on.
+
+        :param `XY`: the (x, y) point in World coordinates
+        :param boolean `HitAbleOnly`: only return the objects that are bound
+         to an event
+
+        """
+        XY = np.asarray(XY, float)
+        BB = np.array((XY, XY))
+        Scale = self._HitTestScale()
+        Objects = []
+        for DrawList in (self._ForeDrawList, self._DrawList):
+            for Object in self._HitTestCandidates(DrawList, BB):
+                if HitAbleOnly and not Object.HitAble:
+                    continue
+                if Object.HitTestPoint(XY, Scale):
+                    Objects.append(Object)
+        return Objects
+
+    def ObjectsInRect(self, BB, Inside=False):
+        """
+        Returns all the objects that are in a rectangle, the topmost one
+        first.
+
+        The foreground objects come before the background ones.
+
+        :param `BB`: a 2x2 array (or :class:`BBox`) of
+         ((MinX, MinY), (MaxX, MaxY)) in World coordinates
+        :param boolean `Inside`: if ``True`` only the objects entirely
+         inside the rectangle are returned, otherwise all the objects with
+         any part in it.
+
+        """
+        BB = BBox.fromPoints(BB)
+        Scale = self._HitTestScale()
+        Objects = []
+        for DrawList in (self._ForeDrawList, self._DrawList):
+            for Object in self._HitTestCandidates(DrawList, BB):
+                if Inside:
+                    if BB.Inside(Object.BoundingBox):
+                        Objects.append(Object)
+                elif Object.HitTestRect(BB, Scale):
+                    Objects.append(Object)
+        return Objects
+
+    def _GetHitKey(self, xy):
+        """
+        Returns the key into the HitDict of the object under the pixel xy,
+        which is its HitColor.
+        """
+        if self.UseGeometricHitTest:
+            Objects = self.ObjectsAtPoint(self.PixelToWorld(xy), HitAbleOnly=True)
+            if Objects:
+                return Objects[0].HitColor
+            return None
+        return self.GetHitTestColor(xy)
+
     def UnBindAll(self):
         """Removes all bindings to Objects."""
         self.HitDict = None
@@ -345,6 +495,8 @@ class FloatCanvas(wx.Panel):
         """
         Object.HitCoords = self.PixelToWorld( xy )
         Object.HitCoordsPixel = xy
+        if isinstance(Object, CollectionMixin):
+            Object.HitIndex = Object.FindItem(Object.HitCoords)
         Object.CallBackFuncs[HitEvent](Object)
 
     def HitTest(self, event, HitEvent):
@@ -352,7 +504,7 @@ class FloatCanvas(wx.Panel):
         if self.HitDict:
             if HitEvent in self.HitDict:
                 xy = event.GetPosition()
-                color = self.GetHitTestColor( xy )
+                color = self._GetHitKey( xy )
                 if color in self.HitDict[ HitEvent ]:
                     Object = self.HitDict[ HitEvent ][color]
                     self._CallHitCallback(Object, xy, HitEvent)
@@ -368,7 +520,7 @@ class FloatCanvas(wx.Panel):
              self.HitDict[EVT_FC_LEAVE_OBJECT ]    )
             ):
             xy = event.GetPosition()
-            color = self.GetHitTestColor( xy )
+            color = self._GetHitKey( xy )
             OldObject = self.ObjectUnderMouse
             ObjectCallbackCalled = False
             if color in self.HitDict[ EVT_FC_ENTER_OBJECT ]:
@@ -523,6 +675,9 @@ class FloatCanvas(wx.Panel):
         Off screen Bitmap used for Hit tests on background objects
 
         """
+        if self.UseGeometricHitTest:
+            self._HTBitmap = None
+            return
         self._HTBitmap = wx.Bitmap(self.PanelSize[0],
                                         self.PanelSize[1],
                                         depth=self.HitTestBitmapDepth)
@@ -535,6 +690,9 @@ class FloatCanvas(wx.Panel):
         Off screen Bitmap used for Hit tests on foreground objects
 
         """
+        if self.UseGeometricHitTest:
+            self._ForegroundHTBitmap = None
+            return
         self._ForegroundHTBitmap = wx.Bitmap(self.PanelSize[0],
                                                   self.PanelSize[1],
                                                   depth=self.HitTestBitmapDepth)
@@ -611,7 +769,15 @@ class FloatCanvas(wx.Panel):
 
         dc = wx.MemoryDC()
         dc.SelectObject(self._Buffer)
-        if self._BackgroundDirty or Force:
+        if Force:
+            self._InvalidateTiles()
+        if (self._BackgroundDirty or Force) and self._CanUseTiles():
+            self._DrawTiles(dc)
+            self._BackgroundDirty = False
+        elif (self._BackgroundDirty or Force) and self._CanUseThread():
+            self._StartBackgroundRender()
+            self._BackgroundDirty = False
+        elif self._BackgroundDirty or Force:
             dc.SetBackground(self.BackgroundBrush)
             dc.Clear()
             if self._HTBitmap is not None:
@@ -669,6 +835,418 @@ class FloatCanvas(wx.Panel):
         ## when zoomed in.
         DrawObject.FontList = {}
 
+    def EnableSpatialIndex(self, Enable=True, CellSize=None):
+        """
+        Turn the spatial index used to find the visible objects on or off.
+
+        Without the index, every Draw checks the Bounding Box of every object
+        on the Canvas. With it, only the objects near the viewport are looked
+        at, which is much faster when there are a lot of objects and only a
+        few of them are in view. The index is kept up to date as objects are
+        added, removed, moved or have their points changed.
+
+        :param boolean `Enable`: use the spatial index
+        :param float `CellSize`: the size of the index grid cells in world
+         coordinates, if ``None`` a size is chosen from the objects on the
+         Canvas. See :class:`~lib.floatcanvas.Utilities.SpatialIndex.GridIndex`
+
+        """
+        self.UseSpatialIndex = Enable
+        if Enable:
+            self._SpatialIndex = SpatialIndex.GridIndex(CellSize)
+            for Object in self._DrawList:
+                self._SpatialIndex.Insert(Object)
+            self._ForeSpatialIndex = SpatialIndex.GridIndex(CellSize)
+            for Object in self._ForeDrawList:
+                self._ForeSpatialIndex.Insert(Object)
+        else:
+            self._SpatialIndex = None
+            self._ForeSpatialIndex = None
+
+    def _GetSpatialIndex(self, DrawList):
+        """Returns the spatial index for DrawList, or None."""
+        if not self.UseSpatialIndex:
+            return None
+        elif DrawList is self._DrawList:
+            return self._SpatialIndex
+        elif DrawList is self._ForeDrawList:
+            return self._ForeSpatialIndex
+        return None
+
+    def _BoundingBoxChanged(self, Object):
+        """
+        Called by a DrawObject when its BoundingBox has changed.
+        """
+        if not Object.InForeground:
+            self._InvalidateTiles()
+        if self.UseSpatialIndex:
+            if Object.InForeground:
+                self._ForeSpatialIndex.Update(Object)
+            else:
+                self._SpatialIndex.Update(Object)
+
+    def _ObjectLayerChanged(self, Object):
+        """
+        Called by a DrawObject when it is moved to or from the foreground.
+        """
+        self._InvalidateTiles()
+        if self.UseSpatialIndex:
+            if Object.InForeground:
+                self._SpatialIndex.Remove(Object)
+                self._ForeSpatialIndex.Insert(Object)
+            else:
+                self._ForeSpatialIndex.Remove(Object)
+                self._SpatialIndex.Insert(Object)
+
+    def EnableTileCache(self, Enable=True, TileSize=256, MaxMemory=64*2**20):
+        """
+        Turn the tile cache for the background on or off.
+
+        With the tile cache on, the background objects are rendered into
+        square raster tiles that are aligned with the world coordinates, and
+        kept for each zoom level. Panning then only renders the tiles that
+        come into view, and going back to a zoom level re-uses its tiles.
+        After a zoom, the tiles of the previous zoom level are shown scaled
+        right away, and the sharp tiles are rendered when the application is
+        idle.
+
+        The tiles are thrown away whenever a background object is added,
+        removed or has its Bounding Box changed, and when Draw(Force=True)
+        is called. If you change the look of a background object without
+        changing its position, call Draw(Force=True).
+
+        The tile cache is not used while there is a GridUnder, or a hit-test
+        bitmap for the background objects: the canvas then draws the whole
+        background as usual.
+
+        :param boolean `Enable`: use the tile cache
+        :param integer `TileSize`: the width and height of a tile in pixels
+        :param integer `MaxMemory`: the memory budget of the cache in bytes,
+         the least recently used tiles are dropped when it is exceeded
+
+        """
+        self.UseTileCache = Enable
+        self._PendingTiles = None
+        if Enable:
+            self.TileSize = int(TileSize)
+            self._TileCache = TileCache.TileCache(MaxMemory)
+            self._TileLevels = {}
+        else:
+            self._TileCache = None
+        self._BackgroundDirty = True
+
+    ## the extra space around a tile, in pixels, used to find the objects
+    ## to draw on it -- for things like text and points whose Bounding Box
+    ## is smaller than what they draw.
+    TileMargin = 64
+
+    def _InvalidateTiles(self):
+        """Throw away all the cached tiles."""
+        if self._TileCache is not None:
+            self._TileCache.Clear()
+            self._TileLevels = {}
+            self._PendingTiles = None
+
+    def _CanUseTiles(self):
+        return (self.UseTileCache and
+                self.GridUnder is None and
+                self._HTBitmap is None)
+
+    def _TileLevel(self):
+        """
+        Returns a hashable key for the current zoom level.
+        """
+        return tuple(float("%.10g" % v) for v in self.TransformVector)
+
+    def _TileWorldBB(self, TransformVector, i, j, Margin=0):
+        """
+        Returns the world BB of the tile (i, j) at the zoom level given by
+        TransformVector, grown by Margin pixels.
+        """
+        T = self.TileSize
+        Corners = (np.array(((i*T - Margin, j*T - Margin),
+                             ((i+1)*T + Margin, (j+1)*T + Margin)), float)
+                   / TransformVector)
+        return np.array((Corners.min(0), Corners.max(0)))
+
+    def _RenderTile(self, Level, i, j, Candidates):
+        """
+        Render the tile (i, j) of the zoom level Level from the objects in
+        Candidates and put it in the cache.
+        """
+        T = self.TileSize
+        TransformVector = self._TileLevels[Level]
+        Origin = np.array((i*T, j*T), float)
+        def WorldToPixel(Coordinates):
+            return np.floor(np.asarray(Coordinates, float) * TransformVector -
+                            Origin).astype('i')
+        TileBB = self._TileWorldBB(TransformVector, i, j, self.TileMargin)
+        Bitmap = wx.Bitmap(T, T)
+        dc = wx.MemoryDC()
+        dc.SelectObject(Bitmap)
+        dc.SetBackground(self.BackgroundBrush)
+        dc.Clear()
+        # some objects (ScaledBitmap2) draw only the part that is in view.
+        ViewPortBB = self.ViewPortBB
+        self.ViewPortBB = self._TileWorldBB(TransformVector, i, j)
+        try:
+            for Object in self._ShouldRedraw(Candidates, TileBB):
+                if Object.Visible:
+                    Object._Draw(dc, WorldToPixel, self.ScaleWorldToPixel, None)
+        finally:
+            self.ViewPortBB = ViewPortBB
+        dc.SelectObject(wx.NullBitmap)
+        self._TileCache.Put((Level, i, j), Bitmap, T * T * 4)
+        return Bitmap
+
+    def _VisibleTiles(self):
+        """
+        Returns the (i, j) indexes of the tiles in view, and the panel
+        position of the origin of the tile grid.
+        """
+        T = self.TileSize
+        Offset = np.floor(self.HalfPanelSize -
+                          self.ViewPortCenter * self.TransformVector + 0.5)
+        i0, j0 = np.floor(-Offset / T).astype(int)
+        i1, j1 = np.floor((self.PanelSize - Offset) / T).astype(int)
+        Tiles = [(i, j) for j in range(j0, j1 + 1) for i in range(i0, i1 + 1)]
+        return Tiles, Offset.astype(int)
+
+    def _DrawPreview(self, dc, Level):
+        """
+        Draw the cached tiles of the most recently used other zoom level,
+        scaled to the current one.
+        """
+        Previous = None
+        for Key in reversed(self._TileCache.Keys()):
+            if Key[0] != Level:
+                Previous = Key[0]
+                break
+        if Previous is None:
+            return False
+        TransformVector = self._TileLevels[Previous]
+        Drawn = False
+        tiledc = wx.MemoryDC()
+        for Key in self._TileCache.Keys():
+            if Key[0] != Previous:
+                continue
+            BB = self._TileWorldBB(TransformVector, Key[1], Key[2])
+            if not BBox.asBBox(BB).Overlaps(self.ViewPortBB):
+                continue
+            # the corners of the tile in the order it was drawn
+            T = self.TileSize
+            Corners = (np.array(((Key[1]*T, Key[2]*T),
+                                 ((Key[1]+1)*T, (Key[2]+1)*T)), float)
+                       / TransformVector)
+            (x0, y0), (x1, y1) = self.WorldToPixel(Corners)
+            tiledc.SelectObject(self._TileCache.Get(Key))
+            dc.StretchBlit(int(x0), int(y0), int(x1 - x0), int(y1 - y0),
+                           tiledc, 0, 0, T, T)
+            tiledc.SelectObject(wx.NullBitmap)
+            Drawn = True
+        return Drawn
+
+    def _DrawTiles(self, dc):
+        """
+        Compose the background buffer from the tile cache, rendering the
+        tiles that are missing.
+        """
+        Level = self._TileLevel()
+        self._TileLevels[Level] = self.TransformVector.copy()
+        Tiles, Offset = self._VisibleTiles()
+        Missing = [(i, j) for (i, j) in Tiles if (Level, i, j) not in self._TileCache]
+
+        dc.SetBackground(self.BackgroundBrush)
+        dc.Clear()
+        if Missing and self._DrawPreview(dc, Level):
+            # Show the scaled tiles now, and render the sharp ones later
+            self._PendingTiles = (Level, Missing)
+            wx.CallAfter(self._RenderPendingTiles)
+            Missing = []
+        elif Missing:
+            Candidates = self._TileCandidates(Level, Missing)
+            for (i, j) in Missing:
+                self._RenderTile(Level, i, j, Candidates)
+
+        T = self.TileSize
+        tiledc = wx.MemoryDC()
+        for (i, j) in Tiles:
+            Bitmap = self._TileCache.Get((Level, i, j))
+            if Bitmap is not None:
+                tiledc.SelectObject(Bitmap)
+                dc.Blit(int(i*T + Offset[0]), int(j*T + Offset[1]), T, T,
+                        tiledc, 0, 0)
+                tiledc.SelectObject(wx.NullBitmap)
+
+    def _TileCandidates(self, Level, Tiles):
+        """
+        Returns the background objects that may be drawn on any of Tiles.
+        """
+        TransformVector = self._TileLevels[Level]
+        BBs = [self._TileWorldBB(TransformVector, i, j, self.TileMargin)
+               for (i, j) in Tiles]
+        UnionBB = BBox.fromBBArray(BBs)
+        Index = self._GetSpatialIndex(self._DrawList)
+        if Index is not None:
+            return Index.Query(UnionBB)
+        return self._ShouldRedraw(self._DrawList, UnionBB)
+
+    ## the number of tiles rendered each time the application is idle
+    TilesPerBatch = 4
+
+    def _RenderPendingTiles(self):
+        """
+        Render a batch of the tiles that are only shown scaled, then
+        re-draw the canvas.
+        """
+        if self._PendingTiles is None or not self:
+            return
+        Level, Tiles = self._PendingTiles
+        if Level != self._TileLevel():
+            # the zoom has changed since: these tiles aren't needed anymore
+            self._PendingTiles = None
+            return
+        Batch, Tiles = Tiles[:self.TilesPerBatch], Tiles[self.TilesPerBatch:]
+        Candidates = self._TileCandidates(Level, Batch)
+        for (i, j) in Batch:
+            self._RenderTile(Level, i, j, Candidates)
+        if Tiles:
+            self._PendingTiles = (Level, Tiles)
+            wx.CallAfter(self._RenderPendingTiles)
+        else:
+            self._PendingTiles = None
+        self._BackgroundDirty = True
+        self.Draw()
+
+    def EnableBackgroundThread(self, Enable=True):
+        """
+        Turn the rendering of the background in a worker thread on or off.
+
+        With the worker thread on, Draw() doesn't wait for the background
+        objects to be drawn: they are rendered into an off-screen image by a
+        worker thread, and the canvas keeps showing the previous frame (with
+        the foreground drawn on top of it) until the new one is ready. The
+        finished frame is handed back to the GUI thread with wx.CallAfter.
+
+        A render is abandoned as soon as the background needs to be
+        re-drawn again, so panning or zooming while a large scene is being
+        rendered only costs the render of the final view.
+
+        Drawing is done with a wx.GCDC on a wx.Image. Only the objects whose
+        ``ThreadSafeDraw`` attribute is True are drawn by the worker, which
+        are the ones drawing shapes with their pens and brushes. The grid,
+        and the objects from the first one that makes fonts or bitmaps
+        (text, bitmaps...) up, are drawn on the GUI thread once the worker
+        is done. The worker thread is not used while there is a hit-test
+        bitmap for the background objects.
+
+        :param boolean `Enable`: use the worker thread
+
+        """
+        self.UseBackgroundThread = Enable
+        self._RenderGeneration += 1 # cancels any render in progress
+        self._BackgroundDirty = True
+        if not Enable and self._RenderQueue is not None:
+            self._RenderQueue.put(None) # stops the worker
+            self._RenderQueue = None
+
+    def _CanUseThread(self):
+        return self.UseBackgroundThread and self._HTBitmap is None
+
+    def _StartBackgroundRender(self):
+        """
+        Start rendering the background objects in view in the worker thread.
+        """
+        self._RenderGeneration += 1
+        Generation = self._RenderGeneration
+
+        Index = self._GetSpatialIndex(self._DrawList)
+        if Index is not None:
+            Objects = Index.Query(self.ViewPortBB)
+        else:
+            Objects = self._ShouldRedraw(self._DrawList, self.ViewPortBB)
+        Objects = [Object for Object in Objects if Object.Visible]
+        # the worker draws the objects up to the first one that is not
+        # safe to draw off the GUI thread, the rest are drawn on top of
+        # its image by _BackgroundRendered
+        Split = len(Objects)
+        for i, Object in enumerate(Objects):
+            if not Object.ThreadSafeDraw:
+                Split = i
+                break
+
+        # the worker uses a copy of the current transform, so the canvas
+        # can be panned or zoomed while it runs.
+        ViewPortCenter = self.ViewPortCenter.copy()
+        TransformVector = self.TransformVector.copy()
+        HalfPanelSize = self.HalfPanelSize.copy()
+        def WorldToPixel(Coordinates):
+            return (((np.asarray(Coordinates, float) - ViewPortCenter) *
+                     TransformVector) + HalfPanelSize).astype('i')
+        def ScaleWorldToPixel(Lengths):
+            return (np.asarray(Lengths, float) * TransformVector).astype('i')
+
+        # the background and the grid are drawn here, the worker draws on
+        # top of them
+        Width, Height = [int(v) for v in self.PanelSize]
+        Bitmap = wx.Bitmap(Width, Height)
+        dc = wx.MemoryDC()
+        dc.SelectObject(Bitmap)
+        dc.SetBackground(self.BackgroundBrush)
+        dc.Clear()
+        if self.GridUnder is not None:
+            self.GridUnder._Draw(dc, self)
+        dc.SelectObject(wx.NullBitmap)
+        Image = Bitmap.ConvertToImage()
+
+        if self._RenderQueue is None:
+            self._RenderQueue = queue.Queue()
+            Thread = threading.Thread(target=_RenderWorker,
+                                      args=(weakref.ref(self),
+                                            self._RenderQueue))
+            Thread.daemon = True
+            Thread.start()
+        self._RenderQueue.put((Generation, Image,
+                               Objects[:Split], Objects[Split:],
+                               WorldToPixel, ScaleWorldToPixel))
+
+    def _RenderInThread(self, Generation, Image, Objects, WorldToPixel,
+                        ScaleWorldToPixel):
+        """
+        Runs in the worker thread: draw Objects on Image. Returns False if
+        the render has been cancelled.
+        """
+        dc = wx.GCDC(wx.GraphicsContext.Create(Image))
+        for Object in Objects:
+            if self._RenderGeneration != Generation:
+                return False
+            Object._Draw(dc, WorldToPixel, ScaleWorldToPixel, None)
+        # the image is only filled in when the context is destroyed
+        del dc
+        return self._RenderGeneration == Generation
+
+    def _BackgroundRendered(self, Generation, Image, Objects, WorldToPixel,
+                            ScaleWorldToPixel):
+        """
+        Called on the GUI thread with a finished background frame, and the
+        objects left to draw on top of it.
+        """
+        if not self or Generation != self._RenderGeneration:
+            return
+        if Image.GetSize() != self._Buffer.GetSize():
+            return
+        dc = wx.MemoryDC()
+        dc.SelectObject(self._Buffer)
+        dc.DrawBitmap(wx.Bitmap(Image), 0, 0)
+        if Objects:
+            gcdc = wx.GCDC(dc)
+            for Object in Objects:
+                Object._Draw(gcdc, WorldToPixel, ScaleWorldToPixel, None)
+            del gcdc
+        dc.SelectObject(wx.NullBitmap)
+        # compose the foreground and update the screen
+        self.Draw()
+
     def _ShouldRedraw(DrawList, ViewPortBB):
         # lrk: Returns the objects that should be redrawn
         ## fixme: should this check be moved into the object?
@@ -841,11 +1419,16 @@ class FloatCanvas(wx.Panel):
         ##fixme: Using the list.remove method is kind of slow
         if Object.InForeground:
             self._ForeDrawList.remove(Object)
+            if self.UseSpatialIndex:
+                self._ForeSpatialIndex.Remove(Object)
             if not self._ForeDrawList:
                 self._ForegroundBuffer = None
                 self._ForegroundHTdc = None
         else:
             self._DrawList.remove(Object)
+            if self.UseSpatialIndex:
+                self._SpatialIndex.Remove(Object)
+            self._InvalidateTiles()
             self._BackgroundDirty = True
         if ResetBB:
             self.BoundingBoxDirty = True
@@ -861,6 +1444,11 @@ class FloatCanvas(wx.Panel):
         """
         self._DrawList = []
         self._ForeDrawList = []
+        if self.UseSpatialIndex:
+            self._SpatialIndex.Clear()
+            self._ForeSpatialIndex.Clear()
+        self._InvalidateTiles()
+        self._RenderGeneration += 1
         self._BackgroundDirty = True
         self.HitColorGenerator = None
         self.UseHitTest = False
@@ -949,9 +1537,14 @@ class FloatCanvas(wx.Panel):
         obj._Canvas = self
         if  obj.InForeground:
             self._ForeDrawList.append(obj)
+            if self.UseSpatialIndex:
+                self._ForeSpatialIndex.Insert(obj)
             self.UseForeground = True
         else:
             self._DrawList.append(obj)
+            if self.UseSpatialIndex:
+                self._SpatialIndex.Insert(obj)
+            self._InvalidateTiles()
             self._BackgroundDirty = True
         self.BoundingBoxDirty = True
         return obj
@@ -980,7 +1573,12 @@ class FloatCanvas(wx.Panel):
         ScaleWorldToPixel = self.ScaleWorldToPixel # for speed
         Blit = ScreenDC.Blit # for speed
         NumBetweenBlits = self.NumBetweenBlits # for speed
-        for i, Object in enumerate(self._ShouldRedraw(DrawList, ViewPortBB)):
+        Index = self._GetSpatialIndex(DrawList)
+        if Index is not None:
+            RedrawList = Index.Query(ViewPortBB)
+        else:
+            RedrawList = self._ShouldRedraw(DrawList, ViewPortBB)
+        for i, Object in enumerate(RedrawList):
             if Object.Visible:
                 Object._Draw(dc, WorldToPixel, ScaleWorldToPixel, HTdc)
                 if (i+1) % NumBetweenBlits == 0:
@@ -1002,7 +1600,8 @@ class FloatCanvas(wx.Panel):
 def _makeFloatCanvasAddMethods(): ## lrk's code for doing this in module __init__
     classnames = ["Circle", "Ellipse", "Arc", "Rectangle", "ScaledText", "Polygon",
                   "Line", "Text", "PointSet","Point", "Arrow", "ArrowLine", "ScaledTextBox",
-                  "SquarePoint","Bitmap", "ScaledBitmap", "Spline", "Group"]
+                  "SquarePoint","Bitmap", "ScaledBitmap", "Spline", "Group",
+                  "MarkerCollection", "PolylineCollection", "RectangleCollection"]
     for classname in classnames:
         klass = globals()[classname]
         def getaddshapemethod(klass=klass):
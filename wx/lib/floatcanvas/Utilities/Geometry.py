@@ -0,0 +1,179 @@
+#----------------------------------------------------------------------------
+# Name:         Geometry.py
+# Purpose:      Vectorized geometry tests used for hit-testing
+#
+# Author:
+#
+# Created:
+# Version:
+# Date:
+# Licence:
+# Tags:         phoenix-port
+#----------------------------------------------------------------------------
+"""
+Geometry tests used by the FloatCanvas geometric hit-test.
+
+All the functions take `NumPy <http://www.numpy.org/>`_ arrays of (x, y)
+points, and do the work for all the points or segments at once.
+
+The FloatCanvas DrawObjects call these with coordinates that have been
+scaled to pixels (relative to the point being tested), so that tolerances
+can be given in pixels even when the x and y scales differ.
+
+"""
+
+import numpy as np
+
+
+def _Segments(Points, Closed):
+    Points = np.asarray(Points, float).reshape(-1, 2)
+    if Closed and len(Points) > 1:
+        B = np.roll(Points, -1, axis=0)
+        return Points, B
+    return Points[:-1], Points[1:]
+
+
+def DistanceToSegments(Point, A, B):
+    """
+    Returns the distance from Point to each of the segments A[i] - B[i].
+
+    :param `Point`: the (x, y) point
+    :param `A`: a Nx2 array of the start points of the segments
+    :param `B`: a Nx2 array of the end points of the segments
+
+    :returns: an array of N distances
+
+    """
+    Point = np.asarray(Point, float)
+    A = np.asarray(A, float).reshape(-1, 2)
+    AB = np.asarray(B, float).reshape(-1, 2) - A
+    LengthSq = (AB**2).sum(1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = ((Point - A) * AB).sum(1) / LengthSq
+    t = np.clip(np.nan_to_num(t), 0.0, 1.0)
+    d = A + t[:, np.newaxis] * AB - Point
+    return np.hypot(d[:,0], d[:,1])
+
+
+def DistanceToPolyline(Point, Points, Closed=False):
+    """
+    Returns the shortest distance from Point to the polyline through Points.
+
+    :param `Point`: the (x, y) point
+    :param `Points`: a Nx2 array of the vertices of the polyline
+    :param boolean `Closed`: if ``True`` the last vertex is joined to the
+     first one, as for a polygon
+
+    :returns: the distance, or ``inf`` if there are no vertices
+
+    """
+    Points = np.asarray(Points, float).reshape(-1, 2)
+    if len(Points) == 0:
+        return np.inf
+    if len(Points) == 1:
+        return float(np.hypot(*(Points[0] - np.asarray(Point, float))))
+    A, B = _Segments(Points, Closed)
+    return float(DistanceToSegments(Point, A, B).min())
+
+
+def PointInPolygon(Point, Polygon):
+    """
+    Returns True if Point is inside the polygon, using the even-odd rule,
+    which is how wx.DC.DrawPolygon fills polygons by default.
+
+    :param `Point`: the (x, y) point
+    :param `Polygon`: a Nx2 array of the vertices of the polygon, the
+     polygon is closed automatically
+
+    """
+    x, y = np.asarray(Point, float)
+    A, B = _Segments(Polygon, Closed=True)
+    if len(A) < 3:
+        return False
+    # the edges that cross the horizontal line through the point
+    Crosses = (A[:,1] > y) != (B[:,1] > y)
+    A, B = A[Crosses], B[Crosses]
+    # the x coordinate of each of those crossings
+    X = A[:,0] + (y - A[:,1]) * (B[:,0] - A[:,0]) / (B[:,1] - A[:,1])
+    return bool(np.count_nonzero(X > x) % 2)
+
+
+def PointsInRect(Points, BB):
+    """
+    Returns a boolean array, True for each point that is inside BB, or on its
+    border.
+
+    :param `Points`: a Nx2 array of points
+    :param `BB`: a 2x2 array (or :class:`BBox`) of ((MinX, MinY), (MaxX, MaxY))
+
+    """
+    Points = np.asarray(Points, float).reshape(-1, 2)
+    BB = np.asarray(BB, float)
+    return ((Points >= BB[0]) & (Points <= BB[1])).all(1)
+
+
+def SegmentsIntersectRect(A, B, BB):
+    """
+    Returns a boolean array, True for each of the segments A[i] - B[i] that
+    has a part inside BB.
+
+    The segments are clipped against BB with the Liang-Barsky algorithm,
+    all of them at once.
+
+    :param `A`: a Nx2 array of the start points of the segments
+    :param `B`: a Nx2 array of the end points of the segments
+    :param `BB`: a 2x2 array (or :class:`BBox`) of ((MinX, MinY), (MaxX, MaxY))
+
+    """
+    A = np.asarray(A, float).reshape(-1, 2)
+    D = np.asarray(B, float).reshape(-1, 2) - A
+    BB = np.asarray(BB, float)
+    # p * t <= q for each of the four sides of the rectangle
+    p = np.column_stack((-D[:,0], D[:,0], -D[:,1], D[:,1]))
+    q = np.column_stack((A[:,0] - BB[0,0], BB[1,0] - A[:,0],
+                         A[:,1] - BB[0,1], BB[1,1] - A[:,1]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = q / p
+    t0 = np.where(p < 0, r, 0.0).max(1)
+    t1 = np.where(p > 0, r, 1.0).min(1)
+    Parallel = ((p == 0) & (q < 0)).any(1)
+    return (t0 <= t1) & ~Parallel
+
+
+def PolylineIntersectsRect(Points, BB, Closed=False):
+    """
+    Returns True if any part of the polyline through Points is inside BB.
+
+    :param `Points`: a Nx2 array of the vertices of the polyline
+    :param `BB`: a 2x2 array (or :class:`BBox`) of ((MinX, MinY), (MaxX, MaxY))
+    :param boolean `Closed`: if ``True`` the last vertex is joined to the
+     first one, as for a polygon
+
+    """
+    Points = np.asarray(Points, float).reshape(-1, 2)
+    if len(Points) == 0:
+        return False
+    if PointsInRect(Points, BB).any():
+        return True
+    A, B = _Segments(Points, Closed)
+    return bool(SegmentsIntersectRect(A, B, BB).any())
+
+
+def EllipseIntersectsRect(Center, Radii, BB):
+    """
+    Returns True if the axis-aligned ellipse (including its inside)
+    touches BB.
+
+    :param `Center`: the (x, y) center of the ellipse
+    :param `Radii`: the (x, y) radii of the ellipse
+    :param `BB`: a 2x2 array (or :class:`BBox`) of ((MinX, MinY), (MaxX, MaxY))
+
+    """
+    Center = np.asarray(Center, float)
+    Radii = np.abs(np.asarray(Radii, float))
+    BB = np.asarray(BB, float)
+    # the point of BB closest to the center
+    Closest = np.clip(Center, BB[0], BB[1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d = np.nan_to_num((Closest - Center) / Radii, nan=0.0)
+    return bool((d**2).sum() <= 1.0)
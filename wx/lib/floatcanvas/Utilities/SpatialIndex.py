@@ -0,0 +1,267 @@
+#----------------------------------------------------------------------------
+# Name:         SpatialIndex.py
+# Purpose:      A spatial index used to speed up visibility culling
+#
+# Author:
+#
+# Created:
+# Version:
+# Date:
+# Licence:
+# Tags:         phoenix-port
+#----------------------------------------------------------------------------
+"""
+A simple uniform grid spatial index for FloatCanvas DrawObjects.
+
+The index stores each object in every grid cell its Bounding Box touches, so
+finding the objects that overlap a viewport only has to look at the cells
+covered by that viewport, rather than at every object on the Canvas.
+
+Objects are returned in the order they were inserted, so the drawing order
+of the Canvas is preserved.
+
+Usage::
+
+    Index = GridIndex()
+    for obj in DrawList:
+        Index.Insert(obj)
+    ...
+    VisibleObjects = Index.Query(ViewPortBB)
+
+"""
+
+import math
+
+import numpy as np
+
+
+class GridIndex:
+    """
+    A uniform grid spatial index of objects with a ``BoundingBox`` attribute.
+
+    The cell size is computed from the objects the first time the index is
+    queried, unless it is given explicitly. The index is rebuilt with a new
+    cell size whenever the number of objects has grown by more than a factor
+    of ``RebuildFactor`` since it was last built.
+
+    Objects that would cover more than ``MaxCellSpan`` cells in either
+    direction, and objects with an infinite Bounding Box, are kept in a
+    separate list that is checked on every query.
+
+    Objects with a Null Bounding Box are never returned by a query, which
+    matches the behaviour of :meth:`BBox.Overlaps`.
+
+    """
+
+    MaxCellSpan = 16
+    RebuildFactor = 4
+
+    def __init__(self, CellSize=None):
+        """
+        Default class constructor.
+
+        :param float `CellSize`: the size of a grid cell in world coordinates,
+         if ``None`` a size is chosen from the objects in the index.
+
+        """
+        self._FixedCellSize = CellSize
+        self.Clear()
+
+    def Clear(self):
+        """Removes all objects from the index."""
+        self.CellSize = self._FixedCellSize
+        self._Built = False
+        self._BuiltCount = 0
+        self._NextSeq = 0
+        # id(obj) -> [seq, obj, bounds, cells]
+        self._Entries = {}
+        # (i, j) -> {id(obj): obj}
+        self._Cells = {}
+        # id(obj) -> obj for objects that are checked on every query
+        self._Large = {}
+
+    def __len__(self):
+        return len(self._Entries)
+
+    def __contains__(self, obj):
+        return id(obj) in self._Entries
+
+    def Insert(self, obj):
+        """
+        Add an object to the index.
+
+        The object is placed after all the objects already in the index.
+
+        :param `obj`: an object with a ``BoundingBox`` attribute
+
+        """
+        key = id(obj)
+        if key in self._Entries:
+            self.Remove(obj)
+        entry = [self._NextSeq, obj, None, None]
+        self._NextSeq += 1
+        self._Entries[key] = entry
+        if self._Built:
+            self._Place(key, entry)
+
+    def Remove(self, obj):
+        """
+        Remove an object from the index.
+
+        Objects that are not in the index are ignored.
+
+        :param `obj`: the object to remove
+
+        """
+        entry = self._Entries.pop(id(obj), None)
+        if entry is not None and self._Built:
+            self._Unplace(id(obj), entry)
+
+    def Update(self, obj):
+        """
+        Re-index an object whose Bounding Box has changed.
+
+        The object keeps its position in the drawing order. Objects that
+        are not in the index are ignored.
+
+        :param `obj`: the object to update
+
+        """
+        key = id(obj)
+        entry = self._Entries.get(key)
+        if entry is not None and self._Built:
+            self._Unplace(key, entry)
+            self._Place(key, entry)
+
+    def Rebuild(self, CellSize=None):
+        """
+        Re-build the whole index.
+
+        :param float `CellSize`: the new cell size, if ``None`` the size given
+         to the constructor is used, or a new one is computed.
+
+        """
+        if CellSize is not None:
+            self._FixedCellSize = CellSize
+        self._Cells = {}
+        self._Large = {}
+        if self._FixedCellSize is not None:
+            self.CellSize = float(self._FixedCellSize)
+        else:
+            self.CellSize = self._ComputeCellSize()
+        self._Built = True
+        self._BuiltCount = len(self._Entries)
+        for key, entry in self._Entries.items():
+            self._Place(key, entry)
+
+    def Query(self, BB):
+        """
+        Returns the objects whose Bounding Boxes overlap BB.
+
+        :param `BB`: a 2x2 array (or :class:`BBox`) of
+         ((MinX, MinY), (MaxX, MaxY)) in world coordinates
+
+        :returns: a list of objects, in the order they were inserted
+
+        """
+        if (not self._Built or
+            len(self._Entries) > self.RebuildFactor * max(self._BuiltCount, 64)):
+            self.Rebuild()
+        x0, y0, x1, y1 = [float(v) for v in np.asarray(BB, float).ravel()]
+
+        found = dict(self._Large)
+        Cells = self._Cells
+        if not all(math.isfinite(v) for v in (x0, y0, x1, y1)):
+            # an unbounded query: every object is a candidate
+            for cell in Cells.values():
+                found.update(cell)
+        else:
+            i0, j0, i1, j1 = self._CellRange(x0, y0, x1, y1)
+            if (i1 - i0 + 1) * (j1 - j0 + 1) <= len(Cells):
+                for i in range(i0, i1 + 1):
+                    for j in range(j0, j1 + 1):
+                        cell = Cells.get((i, j))
+                        if cell:
+                            found.update(cell)
+            else:
+                # more cells in view than there are occupied ones
+                for (i, j), cell in Cells.items():
+                    if i0 <= i <= i1 and j0 <= j <= j1:
+                        found.update(cell)
+
+        Entries = self._Entries
+        result = []
+        for key in found:
+            entry = Entries[key]
+            bx0, by0, bx1, by1 = entry[2]
+            if bx1 >= x0 and bx0 <= x1 and by1 >= y0 and by0 <= y1:
+                result.append(entry)
+        result.sort(key=lambda entry: entry[0])
+        return [entry[1] for entry in result]
+
+    def _ComputeCellSize(self):
+        """Pick a cell size that suits the objects currently in the index."""
+        bounds = [entry[1].BoundingBox for entry in self._Entries.values()]
+        if not bounds:
+            return 1.0
+        BBs = np.asarray(bounds, float).reshape(-1, 2, 2)
+        BBs = BBs[np.isfinite(BBs).all(axis=(1, 2))]
+        if len(BBs) == 0:
+            return 1.0
+        sizes = (BBs[:, 1, :] - BBs[:, 0, :]).max(axis=1)
+        extent = (BBs[:, 1, :].max(axis=0) - BBs[:, 0, :].min(axis=0)).max()
+        # about one object per cell for small objects, and typical
+        # objects should not touch more than a few cells.
+        CellSize = max(2 * np.median(sizes), extent / np.sqrt(len(BBs)))
+        if not CellSize > 0:
+            CellSize = 1.0
+        return float(CellSize)
+
+    def _CellRange(self, x0, y0, x1, y1):
+        CellSize = self.CellSize
+        return (math.floor(x0 / CellSize), math.floor(y0 / CellSize),
+                math.floor(x1 / CellSize), math.floor(y1 / CellSize))
+
+    def _Place(self, key, entry):
+        obj = entry[1]
+        BB = obj.BoundingBox
+        x0, y0, x1, y1 = (float(BB[0, 0]), float(BB[0, 1]),
+                          float(BB[1, 0]), float(BB[1, 1]))
+        entry[2] = (x0, y0, x1, y1)
+        if any(math.isnan(v) for v in entry[2]):
+            # Null BB: never visible (see BBox.Overlaps)
+            entry[3] = None
+        elif not all(math.isfinite(v) for v in entry[2]):
+            entry[3] = "large"
+            self._Large[key] = obj
+        else:
+            i0, j0, i1, j1 = self._CellRange(x0, y0, x1, y1)
+            if (i1 - i0 >= self.MaxCellSpan) or (j1 - j0 >= self.MaxCellSpan):
+                entry[3] = "large"
+                self._Large[key] = obj
+            else:
+                entry[3] = (i0, j0, i1, j1)
+                Cells = self._Cells
+                for i in range(i0, i1 + 1):
+                    for j in range(j0, j1 + 1):
+                        cell = Cells.get((i, j))
+                        if cell is None:
+                            Cells[(i, j)] = cell = {}
+                        cell[key] = obj
+
+    def _Unplace(self, key, entry):
+        cells = entry[3]
+        if cells is None:
+            return
+        if cells == "large":
+            del self._Large[key]
+        else:
+            i0, j0, i1, j1 = cells
+            Cells = self._Cells
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    cell = Cells[(i, j)]
+                    del cell[key]
+                    if not cell:
+                        del Cells[(i, j)]
+        entry[3] = None
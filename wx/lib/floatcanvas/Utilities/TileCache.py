@@ -0,0 +1,95 @@
+#----------------------------------------------------------------------------
+# Name:         TileCache.py
+# Purpose:      A least recently used cache of rendered tiles
+#
+# Author:
+#
+# Created:
+# Version:
+# Date:
+# Licence:
+# Tags:         phoenix-port
+#----------------------------------------------------------------------------
+"""
+A least recently used (LRU) cache with a memory budget, used by the
+FloatCanvas to keep the raster tiles it has rendered.
+
+The cache doesn't know anything about what it is storing: the size in
+bytes of each item is passed in when it is added, and the least recently
+used items are dropped when the total goes over the budget.
+
+"""
+
+from collections import OrderedDict
+
+
+class TileCache:
+    """
+    A LRU cache of tiles, with a limit on the total size of the tiles.
+
+    Keys are usually ``(Level, i, j)`` tuples, where ``Level`` identifies
+    the zoom level and ``(i, j)`` the position of the tile on the grid.
+
+    """
+
+    def __init__(self, MaxMemory):
+        """
+        Default class constructor.
+
+        :param integer `MaxMemory`: the memory budget in bytes
+
+        """
+        self.MaxMemory = MaxMemory
+        self.Clear()
+
+    def Clear(self):
+        """Removes all the tiles."""
+        self._Tiles = OrderedDict()
+        self.Memory = 0
+
+    def __len__(self):
+        return len(self._Tiles)
+
+    def __contains__(self, key):
+        return key in self._Tiles
+
+    def Get(self, key, default=None):
+        """
+        Returns the tile for key, or default if it is not in the cache.
+
+        The tile is marked as the most recently used one.
+
+        """
+        try:
+            tile, size = self._Tiles[key]
+        except KeyError:
+            return default
+        self._Tiles.move_to_end(key)
+        return tile
+
+    def Put(self, key, tile, size):
+        """
+        Adds a tile to the cache, dropping the least recently used tiles if
+        the cache is over its memory budget.
+
+        :param `key`: the key of the tile
+        :param `tile`: the tile itself
+        :param integer `size`: the size of the tile in bytes
+
+        """
+        self.Remove(key)
+        self._Tiles[key] = (tile, size)
+        self.Memory += size
+        while self.Memory > self.MaxMemory and len(self._Tiles) > 1:
+            oldkey, (oldtile, oldsize) = self._Tiles.popitem(last=False)
+            self.Memory -= oldsize
+
+    def Remove(self, key):
+        """Removes the tile for key, if it is in the cache."""
+        item = self._Tiles.pop(key, None)
+        if item is not None:
+            self.Memory -= item[1]
+
+    def Keys(self):
+        """Returns the keys, from the least to the most recently used."""
+        return list(self._Tiles.keys())
@@ -966,7 +966,7 @@ class Shape(ShapeEvtHandler):
 
     def AssignNewIds(self):
         """Assign new ids to this image and its children."""
-        self._id = wx.NewIdRef()
+        self.SetId(wx.NewIdRef())
         for child in self._children:
             child.AssignNewIds()
 
@@ -1411,6 +1411,7 @@ class Shape(ShapeEvtHandler):
             return
 
         self._xpos, self._ypos = x, y
+        self.Invalidate()
 
         self.ResetControlPoints()
 
@@ -1452,6 +1453,7 @@ class Shape(ShapeEvtHandler):
     def Show(self, show):
         """Set a flag indicating whether the shape should be drawn."""
         self._visible = show
+        self.Invalidate()
         for child in self._children:
             child.Show(show)
 
@@ -1459,8 +1461,10 @@ class Shape(ShapeEvtHandler):
         """
         Erase the shape.
 
-        Does not repair damage caused to other shapes.
+        Does not repair damage caused to other shapes, but marks the area
+        as damaged so the next :meth:`ShapeCanvas.Draw` repairs it.
         """
+        self.Invalidate()
         self.GetEventHandler().OnErase(dc)
         self.GetEventHandler().OnEraseControlPoints(dc)
         self.GetEventHandler().OnDrawBranches(dc, erase = True)
@@ -1495,6 +1499,7 @@ class Shape(ShapeEvtHandler):
         """
         self.SetAttachmentSize(x, y)
         self.SetDefaultRegionSize()
+        self.Invalidate()
 
     def SetAttachmentSize(self, w, h):
         """
@@ -1757,6 +1762,7 @@ class Shape(ShapeEvtHandler):
 
         """
         self._selected = select
+        self.Invalidate()
         if select:
             self.MakeControlPoints()
             # Children of divisions are contained objects,
@@ -1870,6 +1876,37 @@ class Shape(ShapeEvtHandler):
             hh += self._shadowOffsetY
         return ww, hh
 
+    def GetExtent(self):
+        """
+        Get the area the shape draws in, as a :class:`wx.Rect` in logical
+        coordinates. It is the maximum bounding box with room for the pen,
+        the shadow and the control points.
+
+        Override this if the shape draws outside of that area.
+        """
+        w, h = self.GetBoundingBoxMax()
+        w, h = abs(w), abs(h)
+        margin = CONTROL_POINT_SIZE + 4
+        if self._pen:
+            margin += self._pen.GetWidth()
+        if self._shadowMode != SHADOW_NONE:
+            margin += max(abs(self._shadowOffsetX), abs(self._shadowOffsetY))
+
+        left = int(math.floor(self._xpos - w / 2.0 - margin))
+        top = int(math.floor(self._ypos - h / 2.0 - margin))
+        right = int(math.ceil(self._xpos + w / 2.0 + margin))
+        bottom = int(math.ceil(self._ypos + h / 2.0 + margin))
+        return wx.Rect(left, top, right - left + 1, bottom - top + 1)
+
+    def Invalidate(self):
+        """
+        Tell the diagram the shape has moved or changed, so it updates its
+        spatial index and the area is redrawn by the next
+        :meth:`ShapeCanvas.Draw`.
+        """
+        if self._canvas and self._canvas.GetDiagram():
+            self._canvas.GetDiagram().UpdateShape(self)
+
     def GetBoundingBoxMin(self):
         """
         Get the minimum bounding box for the shape, that defines the area
@@ -2295,6 +2332,7 @@ class Shape(ShapeEvtHandler):
         :param `x`: the x position
         """
         self._xpos = x
+        self.Invalidate()
 
     def SetY(self, y):
         """
@@ -2304,6 +2342,7 @@ class Shape(ShapeEvtHandler):
 
         """
         self._ypos = y
+        self.Invalidate()
 
     def GetParent(self):
         """Get the parent of this shape, if it is part of a composite."""
@@ -2469,6 +2508,8 @@ class Shape(ShapeEvtHandler):
     def SetId(self, i):
         """Set the integer identifier for this shape."""
         self._id = i
+        if self._canvas and self._canvas.GetDiagram():
+            self._canvas.GetDiagram().UpdateShapeId(self)
 
     def GetId(self):
         """Get the integer identifier for this shape."""
@@ -2790,6 +2831,7 @@ class RectangleShape(Shape):
         self._width = max(x, 1)
         self._height = max(y, 1)
         self.SetDefaultRegionSize()
+        self.Invalidate()
 
     def GetCornerRadius(self):
         """Get the radius of the rectangle's rounded corners."""
@@ -3060,6 +3102,7 @@ class PolygonShape(Shape):
         self._boundWidth = abs(new_width)
         self._boundHeight = abs(new_height)
         self.SetDefaultRegionSize()
+        self.Invalidate()
 
     # Make the original points the same as the working points
     def UpdateOriginalPoints(self):
@@ -3459,6 +3502,7 @@ class EllipseShape(Shape):
         self._width = x
         self._height = y
         self.SetDefaultRegionSize()
+        self.Invalidate()
 
     def GetNumberOfAttachments(self):
         """Get number of attachments."""
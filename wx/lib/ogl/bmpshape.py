@@ -54,6 +54,7 @@ class BitmapShape(RectangleShape):
         self._height = h
 
         self.SetDefaultRegionSize()
+        self.Invalidate()
 
     def GetBitmap(self):
         """Get the associated bitmap."""
@@ -13,6 +13,8 @@
 """
 The :class:`~lib.ogl.canvas.ShapeCanvas` class.
 """
+from collections import OrderedDict
+
 import wx
 from .lines import LineShape
 from .composit import *
@@ -20,6 +22,13 @@ from .oglmisc import *
 
 NoDragging, StartDraggingLeft, ContinueDraggingLeft, StartDraggingRight, ContinueDraggingRight = 0, 1, 2, 3, 4
 
+# The size of the tiles cached in viewport buffer mode, in pixels
+TILE_SIZE = 256
+# The default memory limit of the tile cache, in bytes
+DEFAULT_TILE_CACHE_SIZE = 32 * 1024 * 1024
+# Past this number of damaged areas the whole diagram is redrawn
+MAX_DAMAGE_RECTS = 64
+
 
 def WhollyContains(contains, contained):
     """Helper function.
@@ -48,6 +57,120 @@ def WhollyContains(contains, contained):
     return ((left1 <= left2) and (top1 <= top2) and (right1 >= right2) and (bottom1 >= bottom2))
 
 
+def MergeRects(rects):
+    """Helper function.
+
+    :param `rects`: a list of :class:`wx.Rect`
+    :returns: a list of rectangles covering the same area, where the
+     rectangles that intersect have been merged
+
+    """
+    merged = []
+    for rect in rects:
+        rect = wx.Rect(rect)
+        i = 0
+        while i < len(merged):
+            if merged[i].Intersects(rect):
+                rect = rect.Union(merged.pop(i))
+                # the bigger rectangle may intersect the ones already checked
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+
+class TileCache(object):
+    """
+    A cache of the tiles of the diagram rendered by a :class:`ShapeCanvas`
+    in viewport buffer mode, with a memory limit. The least recently used
+    tiles are dropped first when the limit is reached.
+    """
+    def __init__(self, maxBytes = DEFAULT_TILE_CACHE_SIZE):
+        """
+        Default class constructor.
+
+        :param `maxBytes`: the memory limit of the cache, in bytes
+
+        """
+        self._maxBytes = maxBytes
+        self._bytes = 0
+        self._tiles = OrderedDict()     # (column, row) --> (wx.Bitmap, size in bytes)
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def Get(self, key):
+        """
+        Return the tile cached for the key, or None.
+
+        :param `key`: the (column, row) of the tile
+
+        """
+        item = self._tiles.get(key)
+        if item is None:
+            return None
+        self._tiles.move_to_end(key)
+        return item[0]
+
+    def Put(self, key, bmp, nbytes):
+        """
+        Add a tile to the cache, dropping the least recently used ones if the
+        cache gets too big.
+
+        :param `key`: the (column, row) of the tile
+        :param `bmp`: the :class:`wx.Bitmap` of the tile
+        :param `nbytes`: the memory used by the bitmap, in bytes
+
+        """
+        self.Remove(key)
+        self._tiles[key] = (bmp, nbytes)
+        self._bytes += nbytes
+        while self._bytes > self._maxBytes and self._tiles:
+            key, (bmp, nbytes) = self._tiles.popitem(last = False)
+            self._bytes -= nbytes
+
+    def Remove(self, key):
+        """
+        Drop a tile from the cache, if it is in it.
+
+        :param `key`: the (column, row) of the tile
+
+        """
+        item = self._tiles.pop(key, None)
+        if item is not None:
+            self._bytes -= item[1]
+
+    def Keys(self):
+        """Return the keys of the cached tiles."""
+        return list(self._tiles)
+
+    def Clear(self):
+        """Drop all the tiles."""
+        self._tiles.clear()
+        self._bytes = 0
+
+    def SetMaxBytes(self, maxBytes):
+        """
+        Set the memory limit of the cache.
+
+        :param `maxBytes`: the new limit, in bytes
+
+        """
+        self._maxBytes = maxBytes
+        while self._bytes > self._maxBytes and self._tiles:
+            key, (bmp, nbytes) = self._tiles.popitem(last = False)
+            self._bytes -= nbytes
+
+    def GetMaxBytes(self):
+        """Return the memory limit of the cache, in bytes."""
+        return self._maxBytes
+
+    def GetBytes(self):
+        """Return the memory used by the cached tiles, in bytes."""
+        return self._bytes
+
+
 class ShapeCanvas(wx.ScrolledWindow):
     """The :class:`ShapeCanvas` class."""
     def __init__(self, parent = None, id = -1, pos = wx.DefaultPosition, size = wx.DefaultSize, style = wx.BORDER, name = "ShapeCanvas"):
@@ -83,15 +206,49 @@ class ShapeCanvas(wx.ScrolledWindow):
         self._checkTolerance = True
 
         self._buffer = wx.Bitmap(1, 1)
+        self._damageTracking = True
+        self._damage = None     # list of damaged wx.Rect, None for everything
+
+        # viewport buffer mode
+        self._viewportBuffer = False
+        self._backBuffer = None     # the previous buffer, used when scrolling
+        self._bufferOrigin = None   # logical position of the top left of the buffer
+        self._tiles = TileCache()
 
         self.Bind(wx.EVT_PAINT, self.OnPaint)
         self.Bind(wx.EVT_SIZE, self.OnSize)
         self.Bind(wx.EVT_MOUSE_EVENTS, self.OnMouseEvent)
 
     def Draw(self):
+        """
+        Update the buffer. Only the areas damaged since the last update are
+        cleared and redrawn, see :meth:`AddDamage`, unless damage tracking
+        is off, in which case the full diagram is redrawn every time.
+        """
+        if not self._damageTracking:
+            self.DrawAll()
+        elif self._damage is None:
+            self.DrawAll()
+            self.Refresh(False)
+        elif self._damage:
+            self.RepairDamage()
+
+    def DrawAll(self):
         """
         Update the buffer with the background and redraw the full diagram.
         """
+        self._damage = []
+        if self.GetDiagram():
+            # the extents of the shapes may have changed in ways the
+            # diagram was not told about
+            self.GetDiagram().RebuildIndex()
+
+        if self._viewportBuffer:
+            self._tiles.Clear()
+            self._bufferOrigin = None
+            self.UpdateViewport()
+            return
+
         dc = wx.MemoryDC(self._buffer)
 
         dc.SetBackground(wx.Brush(self.GetBackgroundColour(), wx.BRUSHSTYLE_SOLID))
@@ -100,18 +257,276 @@ class ShapeCanvas(wx.ScrolledWindow):
         if self.GetDiagram():
             self.GetDiagram().Redraw(dc)
 
+    def AddDamage(self, rect = None):
+        """
+        Mark an area of the diagram as needing to be redrawn at the next
+        call to :meth:`Draw`.
+
+        :param `rect`: a :class:`wx.Rect` in logical coordinates, or None to
+         redraw everything
+
+        """
+        if rect is None or (self._damage is not None and len(self._damage) >= MAX_DAMAGE_RECTS):
+            self._damage = None
+        elif self._damage is not None:
+            self._damage.append(wx.Rect(rect))
+
+    def RepairDamage(self):
+        """
+        Clear the damaged areas of the buffer and redraw the shapes
+        overlapping them.
+        """
+        if self._viewportBuffer:
+            rects = MergeRects(self._damage)
+            self._damage = []
+            for rect in rects:
+                self.DiscardTiles(rect)
+
+            self.UpdateViewport()
+            x0, y0 = self._bufferOrigin
+            view = wx.Rect(x0, y0, self._buffer.GetWidth(), self._buffer.GetHeight())
+            for rect in rects:
+                rect = rect.Intersect(view)
+                if rect.IsEmpty():
+                    continue
+                self.DrawArea(rect)
+                self.RefreshRect(wx.Rect(rect.x - x0, rect.y - y0, rect.width, rect.height), False)
+            return
+
+        rects = self._damage
+        self._damage = []
+
+        bufferRect = wx.Rect(0, 0, self._buffer.GetWidth(), self._buffer.GetHeight())
+        diagram = self.GetDiagram()
+
+        dc = wx.MemoryDC(self._buffer)
+        brush = wx.Brush(self.GetBackgroundColour(), wx.BRUSHSTYLE_SOLID)
+        for rect in MergeRects(rects):
+            rect = rect.Intersect(bufferRect)
+            if rect.IsEmpty():
+                continue
+
+            dc.SetClippingRegion(rect)
+            dc.SetPen(wx.TRANSPARENT_PEN)
+            dc.SetBrush(brush)
+            dc.DrawRectangle(rect)
+            if diagram:
+                diagram.Redraw(dc, rect)
+            dc.DestroyClippingRegion()
+
+            self.RefreshRect(wx.Rect(self.CalcScrolledPosition(rect.GetPosition()),
+                                     rect.GetSize()), False)
+
+    def SetDamageTracking(self, track):
+        """
+        Set whether :meth:`Draw` only redraws the damaged areas of the
+        diagram, which is the default, or always redraws the full diagram.
+
+        :param `track`: `True` to track the damaged areas
+
+        """
+        self._damageTracking = track
+        self._damage = None
+
+    def GetDamageTracking(self):
+        """Return `True` if only the damaged areas of the diagram are redrawn."""
+        return self._damageTracking
+
+    def SetViewportBuffer(self, viewport):
+        """
+        Set whether the buffer only covers the visible part of the diagram.
+
+        By default the buffer is a bitmap of the virtual size of the canvas,
+        which can be too big for a large diagram. In viewport buffer mode it
+        is the size of the window, and the diagram is rendered in tiles kept
+        in a cache. When the canvas is scrolled the part of the buffer that
+        is still visible is moved, and only the newly exposed strips are
+        drawn, from the cached tiles.
+
+        :param `viewport`: `True` for a buffer the size of the window
+
+        """
+        self._viewportBuffer = viewport
+        self._buffer = wx.Bitmap(1, 1)
+        self._backBuffer = None
+        self._bufferOrigin = None
+        self._tiles.Clear()
+        self.OnSize(None)
+        self.Refresh(False)
+
+    def GetViewportBuffer(self):
+        """Return `True` if the buffer only covers the visible part of the diagram."""
+        return self._viewportBuffer
+
+    def GetTileCache(self):
+        """Return the :class:`TileCache` used in viewport buffer mode."""
+        return self._tiles
+
+    def UpdateViewport(self):
+        """
+        In viewport buffer mode, make the buffer show the part of the
+        diagram at the current scroll position.
+        """
+        w, h = self.GetClientSize()
+        w, h = max(w, 1), max(h, 1)
+        x0, y0 = self.CalcUnscrolledPosition(0, 0)
+
+        if self._buffer.GetWidth() != w or self._buffer.GetHeight() != h:
+            self._buffer = wx.Bitmap(w, h)
+            self._backBuffer = wx.Bitmap(w, h)
+            self._bufferOrigin = None
+        if self._bufferOrigin == (x0, y0):
+            return
+
+        view = wx.Rect(x0, y0, w, h)
+        if self._bufferOrigin is None:
+            self._bufferOrigin = (x0, y0)
+            self.DrawArea(view)
+            return
+
+        ox, oy = self._bufferOrigin
+        common = view.Intersect(wx.Rect(ox, oy, w, h))
+        self._bufferOrigin = (x0, y0)
+        if common.IsEmpty():
+            self.DrawArea(view)
+            return
+
+        # Move the part that is still visible, into the other bitmap since
+        # the areas overlap, then draw the strips that have been exposed.
+        src = wx.MemoryDC(self._buffer)
+        dst = wx.MemoryDC(self._backBuffer)
+        dst.Blit(common.x - x0, common.y - y0, common.width, common.height,
+                 src, common.x - ox, common.y - oy)
+        src.SelectObject(wx.NullBitmap)
+        dst.SelectObject(wx.NullBitmap)
+        self._buffer, self._backBuffer = self._backBuffer, self._buffer
+
+        right, bottom = x0 + w, y0 + h
+        commonRight, commonBottom = common.x + common.width, common.y + common.height
+        if common.y > y0:
+            self.DrawArea(wx.Rect(x0, y0, w, common.y - y0))
+        if commonBottom < bottom:
+            self.DrawArea(wx.Rect(x0, commonBottom, w, bottom - commonBottom))
+        if common.x > x0:
+            self.DrawArea(wx.Rect(x0, common.y, common.x - x0, common.height))
+        if commonRight < right:
+            self.DrawArea(wx.Rect(commonRight, common.y, right - commonRight, common.height))
+
+    def DrawArea(self, rect):
+        """
+        In viewport buffer mode, copy an area of the diagram from the tiles
+        into the buffer.
+
+        :param `rect`: a :class:`wx.Rect` in logical coordinates, inside the
+         area shown by the buffer
+
+        """
+        x0, y0 = self._bufferOrigin
+        dc = wx.MemoryDC(self._buffer)
+        tileDC = wx.MemoryDC()
+        for row in range(rect.y // TILE_SIZE, (rect.y + rect.height - 1) // TILE_SIZE + 1):
+            for column in range(rect.x // TILE_SIZE, (rect.x + rect.width - 1) // TILE_SIZE + 1):
+                tileX, tileY = column * TILE_SIZE, row * TILE_SIZE
+                part = rect.Intersect(wx.Rect(tileX, tileY, TILE_SIZE, TILE_SIZE))
+                tileDC.SelectObject(self.GetTile(column, row))
+                dc.Blit(part.x - x0, part.y - y0, part.width, part.height,
+                        tileDC, part.x - tileX, part.y - tileY)
+                tileDC.SelectObject(wx.NullBitmap)
+
+    def GetTile(self, column, row):
+        """
+        Return the bitmap of a tile of the diagram, rendering it if it is not
+        in the tile cache.
+
+        :param `column`: the column of the tile
+        :param `row`: the row of the tile
+
+        """
+        bmp = self._tiles.Get((column, row))
+        if bmp is not None:
+            return bmp
+
+        bmp = wx.Bitmap(TILE_SIZE, TILE_SIZE)
+        dc = wx.MemoryDC(bmp)
+        dc.SetBackground(wx.Brush(self.GetBackgroundColour(), wx.BRUSHSTYLE_SOLID))
+        dc.Clear()
+        if self.GetDiagram():
+            tileX, tileY = column * TILE_SIZE, row * TILE_SIZE
+            dc.SetDeviceOrigin(-tileX, -tileY)
+            self.GetDiagram().Redraw(dc, wx.Rect(tileX, tileY, TILE_SIZE, TILE_SIZE))
+        dc.SelectObject(wx.NullBitmap)
+
+        self._tiles.Put((column, row), bmp, TILE_SIZE * TILE_SIZE * 4)
+        return bmp
+
+    def DiscardTiles(self, rect):
+        """
+        Drop the cached tiles overlapping an area of the diagram, so they are
+        rendered again the next time they are needed.
+
+        :param `rect`: a :class:`wx.Rect` in logical coordinates
+
+        """
+        columns = range(rect.x // TILE_SIZE, (rect.x + rect.width - 1) // TILE_SIZE + 1)
+        rows = range(rect.y // TILE_SIZE, (rect.y + rect.height - 1) // TILE_SIZE + 1)
+        if len(columns) * len(rows) > len(self._tiles):
+            keys = [(column, row) for column, row in self._tiles.Keys()
+                    if column in columns and row in rows]
+        else:
+            keys = [(column, row) for column in columns for row in rows]
+        for key in keys:
+            self._tiles.Remove(key)
+
     def OnSize(self, evt):
         """
         The size handler, it initializes the buffer to the size of the window.
         """
+        if self._viewportBuffer:
+            self.UpdateViewport()
+            return
+
         size  = self.GetVirtualSize()
 
         # Make sure we don't try to create a 0 size bitmap
         size = wx.Size(max(size.x, 1), max(size.y, 1))
         self._buffer = wx.Bitmap(size.x, size.y)
-        self.Draw()
+        self.DrawAll()
+
+    def IsBufferDC(self, dc):
+        """
+        Return `True` if `dc` is a :class:`wx.MemoryDC` drawing on the buffer.
+
+        :param `dc`: the device context to check
+
+        """
+        if not isinstance(dc, wx.MemoryDC):
+            return False
+        bitmap = dc.GetSelectedBitmap()
+        return bitmap.IsOk() and bitmap.GetHandle() == self._buffer.GetHandle()
+
+    def PrepareDC(self, dc):
+        """
+        Prepare `dc` for drawing the diagram at the current scroll position.
+
+        A :class:`wx.MemoryDC` on the buffer is left alone, unless in viewport
+        buffer mode, as the full size buffer is already in logical
+        coordinates. Preparing it would draw the shapes offset by the scroll
+        position.
+
+        :param `dc`: the device context to prepare
+
+        """
+        if self._viewportBuffer or not self.IsBufferDC(dc):
+            wx.ScrolledWindow.PrepareDC(self, dc)
 
     def GetBuffer(self):
+        """
+        Return the buffer. In viewport buffer mode it is first updated for
+        the current scroll position. In both modes a :class:`wx.MemoryDC`
+        prepared with :meth:`PrepareDC` draws on it at the right place.
+        """
+        if self._viewportBuffer:
+            self.UpdateViewport()
         return self._buffer
 
     def SetDiagram(self, diag):
@@ -121,6 +536,7 @@ class ShapeCanvas(wx.ScrolledWindow):
 
         """
         self._shapeDiagram = diag
+        self._damage = None
 
     def GetDiagram(self):
         """Get the diagram associated with this canvas."""
@@ -132,8 +548,12 @@ class ShapeCanvas(wx.ScrolledWindow):
         buffer to the screen.
         """
         dc = wx.PaintDC(self)
-        self.PrepareDC(dc)
-        dc.DrawBitmap(self._buffer, 0, 0)
+        if self._viewportBuffer:
+            self.UpdateViewport()
+            dc.DrawBitmap(self._buffer, 0, 0)
+        else:
+            self.PrepareDC(dc)
+            dc.DrawBitmap(self._buffer, 0, 0)
 
     def OnMouseEvent(self, evt):
         """The mouse event handler."""
@@ -334,24 +754,28 @@ class ShapeCanvas(wx.ScrolledWindow):
         nearest_attachment = 0
         nearest_object = None
 
-        # Go backward through the object list, since we want:
+        # Go backward through the shapes under the point, since we want:
         # (a) to have the control points drawn LAST to overlay
         #     the other objects
         # (b) to find the control points FIRST if they exist
+        # Only the shapes whose extent contains the point are looked at,
+        # and each of them is hit tested once.
+
+        hits = []
+        for object in reversed(self.GetDiagram().GetShapesAt(x, y)):
+            if object.IsShown() and \
+               ((info is None) or isinstance(object, info)) and \
+               (not notObject or not notObject.HasDescendant(object)):
+                hit = object.HitTest(x, y)
+                if hit:
+                    hits.append((object, hit))
 
-        rl = self.GetDiagram().GetShapeList()[:]
-        rl.reverse()
-        for object in rl:
+        for object, (temp_attachment, dist) in hits:
             # First pass for lines, which might be inside a container, so we
             # want lines to take priority over containers. This first loop
             # could fail if we clickout side a line, so then we'll
             # try other shapes.
-            if object.IsShown() and \
-               isinstance(object, LineShape) and \
-               object.HitTest(x, y) and \
-               ((info is None) or isinstance(object, info)) and \
-               (not notObject or not notObject.HasDescendant(object)):
-                temp_attachment, dist = object.HitTest(x, y)
+            if isinstance(object, LineShape):
                 # A line is trickier to spot than a normal object.
                 # For a line, since it's the diagonal of the box
                 # we use for the hit test, we may have several
@@ -364,17 +788,11 @@ class ShapeCanvas(wx.ScrolledWindow):
                     nearest_object = object
                     nearest_attachment = temp_attachment
 
-        for object in rl:
+        for object, (temp_attachment, dist) in hits:
             # On second pass, only ever consider non-composites or
             # divisions. If children want to pass up control to
             # the composite, that's up to them.
-            if (object.IsShown() and
-                   (isinstance(object, DivisionShape) or
-                    not isinstance(object, CompositeShape)) and
-                    object.HitTest(x, y) and
-                    (info is None or isinstance(object, info)) and
-                    (not notObject or not notObject.HasDescendant(object))):
-                temp_attachment, dist = object.HitTest(x, y)
+            if isinstance(object, DivisionShape) or not isinstance(object, CompositeShape):
                 if not isinstance(object, LineShape):
                     # If we've hit a container, and we have already
                     # found a line in the first pass, then ignore
@@ -422,8 +840,17 @@ class ShapeCanvas(wx.ScrolledWindow):
         return self.GetDiagram().GetQuickEditMode()
 
     def Redraw(self, dc):
-        """Redraw the diagram."""
-        self.GetDiagram().Redraw(dc)
+        """
+        Redraw the diagram on `dc`. When `dc` draws on the buffer and damage
+        tracking is on, only the damaged areas are redrawn, see :meth:`Draw`.
+
+        :param `dc`: the device context to draw on
+
+        """
+        if self._damageTracking and self.IsBufferDC(dc):
+            self.Draw()
+        else:
+            self.GetDiagram().Redraw(dc)
 
     def Snap(self, x, y):
         """Snap ???
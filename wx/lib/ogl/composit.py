@@ -553,6 +553,7 @@ class CompositeShape(RectangleShape):
 
         self._width = w
         self._height = h
+        self.Invalidate()
 
         if not recursive:
             return
@@ -17,6 +17,146 @@ import wx
 
 DEFAULT_MOUSE_TOLERANCE = 3
 
+# The size of the cells of the ShapeIndex grid, in logical units
+INDEX_CELL_SIZE = 128
+# Shapes covering more cells than this are not put in the cells, they are
+# checked by every query instead
+INDEX_MAX_CELLS = 64
+
+
+class ShapeIndex(object):
+    """
+    A spatial index of the shapes of a :class:`Diagram`. The diagram is
+    divided in square cells, and each cell holds the shapes whose extent
+    overlaps it, so the shapes in an area can be found without looking at
+    all the shapes of the diagram.
+    """
+    def __init__(self, cellSize = INDEX_CELL_SIZE):
+        """
+        Default class constructor.
+
+        :param `cellSize`: the size of the cells, in logical units
+
+        """
+        self._cellSize = cellSize
+        self._cells = {}        # (column, row) --> set of shapes
+        self._extents = {}      # shape --> (left, top, right, bottom)
+        self._big = set()       # shapes covering more than INDEX_MAX_CELLS cells
+
+    def __len__(self):
+        return len(self._extents)
+
+    def __contains__(self, shape):
+        return shape in self._extents
+
+    def _CellRanges(self, left, top, right, bottom):
+        size = self._cellSize
+        return (range(int(left // size), int(right // size) + 1),
+                range(int(top // size), int(bottom // size) + 1))
+
+    def Insert(self, shape, rect):
+        """
+        Add a shape to the index, or move it if it is already in it.
+
+        :param `shape`: an instance of :class:`~lib.ogl.Shape`
+        :param `rect`: the extent of the shape, a :class:`wx.Rect`
+
+        """
+        if shape in self._extents:
+            self.Remove(shape)
+
+        extent = (rect.x, rect.y, rect.x + rect.width - 1, rect.y + rect.height - 1)
+        self._extents[shape] = extent
+        columns, rows = self._CellRanges(*extent)
+        if len(columns) * len(rows) > INDEX_MAX_CELLS:
+            self._big.add(shape)
+            return
+
+        cells = self._cells
+        for column in columns:
+            for row in rows:
+                cell = cells.get((column, row))
+                if cell is None:
+                    cells[(column, row)] = cell = set()
+                cell.add(shape)
+
+    def Remove(self, shape):
+        """
+        Remove a shape from the index.
+
+        :param `shape`: an instance of :class:`~lib.ogl.Shape`
+
+        """
+        extent = self._extents.pop(shape, None)
+        if extent is None:
+            return
+        if shape in self._big:
+            self._big.discard(shape)
+            return
+
+        cells = self._cells
+        columns, rows = self._CellRanges(*extent)
+        for column in columns:
+            for row in rows:
+                cell = cells.get((column, row))
+                if cell is not None:
+                    cell.discard(shape)
+                    if not cell:
+                        del cells[(column, row)]
+
+    def Clear(self):
+        """Remove all the shapes from the index."""
+        self._cells = {}
+        self._extents = {}
+        self._big = set()
+
+    def GetExtent(self, shape):
+        """
+        Return the extent the shape was added with, as a :class:`wx.Rect`,
+        or None if it is not in the index.
+
+        :param `shape`: an instance of :class:`~lib.ogl.Shape`
+
+        """
+        extent = self._extents.get(shape)
+        if extent is None:
+            return None
+        left, top, right, bottom = extent
+        return wx.Rect(left, top, right - left + 1, bottom - top + 1)
+
+    def Query(self, rect):
+        """
+        Return the set of the shapes whose extent overlaps the rectangle.
+
+        :param `rect`: a :class:`wx.Rect`
+
+        """
+        left, top = rect.x, rect.y
+        right, bottom = left + rect.width - 1, top + rect.height - 1
+        extents = self._extents
+
+        candidates = set(self._big)
+        columns, rows = self._CellRanges(left, top, right, bottom)
+        if len(columns) * len(rows) > len(self._cells):
+            # cheaper to look at all the cells in use
+            for (column, row), cell in self._cells.items():
+                if column in columns and row in rows:
+                    candidates.update(cell)
+        else:
+            cells = self._cells
+            for column in columns:
+                for row in rows:
+                    cell = cells.get((column, row))
+                    if cell:
+                        candidates.update(cell)
+
+        result = set()
+        for shape in candidates:
+            l, t, r, b = extents[shape]
+            if l <= right and r >= left and t <= bottom and b >= top:
+                result.add(shape)
+        return result
+
 
 class Diagram(object):
     """
@@ -34,12 +174,25 @@ class Diagram(object):
         self._gridSpacing = 5.0
         self._shapeList = []
         self._mouseTolerance = DEFAULT_MOUSE_TOLERANCE
+        self._index = ShapeIndex()
+        self._order = None      # shape --> position in the shape list
+        self._idMap = None      # id --> first shape with this id
+
+    def Redraw(self, dc, rect = None):
+        """
+        Redraw the shapes in the diagram on the specified device context.
+
+        :param `dc`: the device context
+        :param `rect`: if not None, only the shapes overlapping this
+         :class:`wx.Rect` are drawn
 
-    def Redraw(self, dc):
-        """Redraw the shapes in the diagram on the specified device context."""
-        if self._shapeList:
+        """
+        if rect is None:
             for object in self._shapeList:
                 object.Draw(dc)
+        else:
+            for object in self.GetShapesInRect(rect):
+                object.Draw(dc)
 
     def Clear(self, dc):
         """Clear the specified device context."""
@@ -57,10 +210,16 @@ class Diagram(object):
         if not object in self._shapeList:
             if addAfter:
                 self._shapeList.insert(self._shapeList.index(addAfter) + 1, object)
+                self._ShapeListChanged()
             else:
                 self._shapeList.append(object)
+                if self._order is not None:
+                    self._order[object] = len(self._shapeList) - 1
+                if self._idMap is not None:
+                    self._idMap.setdefault(object.GetId(), object)
 
             object.SetCanvas(self.GetCanvas())
+            self._AddToIndex(object)
 
     def InsertShape(self, object):
         """
@@ -70,6 +229,8 @@ class Diagram(object):
 
         """
         self._shapeList.insert(0, object)
+        self._ShapeListChanged()
+        self._AddToIndex(object)
 
     def RemoveShape(self, object):
         """
@@ -81,10 +242,19 @@ class Diagram(object):
         """
         if object in self._shapeList:
             self._shapeList.remove(object)
+            self._ShapeListChanged()
+            extent = self._index.GetExtent(object)
+            self._index.Remove(object)
+            if extent is not None and self._diagramCanvas:
+                self._diagramCanvas.AddDamage(extent)
 
     def RemoveAllShapes(self):
         """Remove all shapes from the diagram but do not delete the shapes."""
         self._shapeList = []
+        self._ShapeListChanged()
+        self._index.Clear()
+        if self._diagramCanvas:
+            self._diagramCanvas.AddDamage()
 
     def DeleteAllShapes(self):
         """Remove and delete all shapes in the diagram."""
@@ -147,10 +317,96 @@ class Diagram(object):
         :param `id`: the shape id to find
 
         """
+        if self._idMap is None:
+            self._idMap = {}
+            for shape in self._shapeList:
+                self._idMap.setdefault(shape.GetId(), shape)
+        return self._idMap.get(id)
+
+    def UpdateShapeId(self, shape):
+        """
+        Tell the diagram that the identifier of a shape has changed, called
+        by :meth:`~lib.ogl.Shape.SetId`.
+
+        :param `shape`: an instance of :class:`~lib.ogl.Shape`
+
+        """
+        self._idMap = None
+
+    def UpdateShape(self, shape, damage = True):
+        """
+        Update the position of a shape in the spatial index of the diagram,
+        after it has moved or changed its size, and mark the areas it used
+        to cover and now covers as needing to be redrawn on the canvas.
+
+        This is called by the shapes themselves when they are moved, resized,
+        shown, selected or erased. Call it after changing a shape in another
+        way, or call :meth:`RebuildIndex` after changing many shapes.
+
+        :param `shape`: an instance of :class:`~lib.ogl.Shape`
+        :param `damage`: if `False`, only update the index
+
+        """
+        old = self._index.GetExtent(shape)
+        new = shape.GetExtent()
+        if old is not None and old != new:
+            self._index.Insert(shape, new)
+
+        canvas = self._diagramCanvas
+        if damage and canvas:
+            if old is not None and old != new:
+                canvas.AddDamage(old)
+            canvas.AddDamage(new)
+
+    def RebuildIndex(self):
+        """Recompute the extents of all the shapes in the spatial index."""
+        self._index.Clear()
         for shape in self._shapeList:
-            if shape.GetId() == id:
-                return shape
-        return None
+            self._index.Insert(shape, shape.GetExtent())
+        self._order = None
+
+    def GetShapesInRect(self, rect):
+        """
+        Return the shapes whose extent overlaps the rectangle, in the
+        order they are drawn.
+
+        :param `rect`: a :class:`wx.Rect`, in logical coordinates
+
+        """
+        order = self._GetOrder()
+        shapes = [shape for shape in self._index.Query(rect) if shape in order]
+        shapes.sort(key = order.__getitem__)
+        return shapes
+
+    def GetShapesAt(self, x, y):
+        """
+        Return the shapes whose extent contains the point, in the order
+        they are drawn.
+
+        :param `x`: the x position
+        :param `y`: the y position
+
+        """
+        return self.GetShapesInRect(wx.Rect(int(x), int(y), 1, 1))
+
+    def _AddToIndex(self, object):
+        extent = object.GetExtent()
+        self._index.Insert(object, extent)
+        if self._diagramCanvas:
+            self._diagramCanvas.AddDamage(extent)
+
+    def _ShapeListChanged(self):
+        self._order = None
+        self._idMap = None
+
+    def _GetOrder(self):
+        # The shape list can also be changed through GetShapeList(), so
+        # check that the index and the order still match it.
+        if len(self._index) != len(self._shapeList):
+            self.RebuildIndex()
+        if self._order is None or len(self._order) != len(self._shapeList):
+            self._order = {shape: i for i, shape in enumerate(self._shapeList)}
+        return self._order
 
     def Snap(self, x, y):
         """
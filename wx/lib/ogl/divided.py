@@ -248,6 +248,7 @@ class DividedShape(RectangleShape):
         self._width = w
         self._height = h
         self.SetRegionSizes()
+        self.Invalidate()
 
     def SetRegionSizes(self):
         """
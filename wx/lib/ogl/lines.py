@@ -1001,6 +1001,43 @@ class LineShape(Shape):
 
         return x2 - x1, y2 - y1
 
+    def GetExtent(self):
+        """
+        Get the area the line draws in, as a :class:`wx.Rect` in logical
+        coordinates. It covers the control points, the arrows and the
+        label regions.
+        """
+        if not self._lineControlPoints:
+            return Shape.GetExtent(self)
+
+        xs = [point[0] for point in self._lineControlPoints]
+        ys = [point[1] for point in self._lineControlPoints]
+        left, top, right, bottom = min(xs), min(ys), max(xs), max(ys)
+
+        margin = CONTROL_POINT_SIZE + 4
+        if self._pen:
+            margin += self._pen.GetWidth()
+        if self._arcArrows:
+            margin += max(arrow.GetSize() for arrow in self._arcArrows)
+        left, top, right, bottom = left - margin, top - margin, right + margin, bottom + margin
+
+        for i in range(3):
+            if self._regions[i] and len(self._regions[i]._formattedText):
+                region = self._regions[i]
+                xp, yp = self.GetLabelPosition(i)
+                cx, cy = region.GetPosition()
+                cw, ch = region.GetSize()
+                cx += xp
+                cy += yp
+                left = min(left, cx - cw / 2.0 - 2)
+                top = min(top, cy - ch / 2.0 - 2)
+                right = max(right, cx + cw / 2.0 + 2)
+                bottom = max(bottom, cy + ch / 2.0 + 2)
+
+        left, top = int(math.floor(left)), int(math.floor(top))
+        right, bottom = int(math.ceil(right)), int(math.ceil(bottom))
+        return wx.Rect(left, top, right - left + 1, bottom - top + 1)
+
     # For a node image of interest, finds the position of this arc
     # amongst all the arcs which are attached to THIS SIDE of the node image,
     # and the number of same.
@@ -38,6 +38,13 @@ will probably fail to display any random file you supply. However it does seem t
 satisfactorily render files typically produced by ReportLab using Western languages.
 The main limitation is that it doesn't currently support embedded fonts.
 
+Pages are only read and drawn when they are scrolled into view, so big files open
+quickly. The pages are drawn in tiles of 256 pixels square, so scrolling only draws
+the newly exposed tiles, and when the zoom changes the current tiles are shown
+scaled until the new ones are drawn. The pages and tiles next to the visible ones
+are prepared in the background and the drawing commands and tiles are kept in a
+cache limited by memory, see :meth:`~wx.lib.pdfviewer.viewer.pdfViewer.SetCacheSize`.
+
 Additional details on PyPDF2 can be found via http://pythonhosted.org/PyPDF2
 
 There is an optional :class:`~wx.lib.pdfviewer.buttonpanel.pdfButtonPanel` class, derived from
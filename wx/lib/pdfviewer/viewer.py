@@ -27,11 +27,18 @@ import bisect
 import itertools
 import copy
 import shutil
+import threading
+from collections import OrderedDict
+from concurrent import futures
 from io import BytesIO
 
 import wx
 
 VERBOSE = True
+CACHE_SIZE = 128 * 1024 * 1024  # bytes of parsed pages and page tiles kept
+PREFETCH_PAGES = 2              # pages read on either side of the visible ones
+TILE_SIZE = 256                 # width and height of the rendered tiles, in pixels
+PREFETCH_TILE_ROWS = 2          # rows of tiles rendered above and below the visible ones
 
 try:
     # see http://pythonhosted.org/PyMuPDF - documentation & installation
@@ -99,11 +106,12 @@ if not mupdf:
 class pdfViewer(wx.ScrolledWindow):
     """
     View pdf file in a scrolled window.  Contents are read from PDF file
-    and rendered in a GraphicsContext. Show visible window contents
-    as quickly as possible then, when using pyPDF, read the whole file and build
-    the set of drawing commands for each page. This can take time for a big file or if
-    there are complex drawings eg. ReportLab's colour shading inside charts and a
-    progress bar can be displayed by setting self.ShowLoadProgress = True (default)
+    and rendered in a GraphicsContext, in tiles of TILE_SIZE pixels. Only the
+    visible pages are read and only the visible tiles are drawn when they are
+    needed, and the tiles next to them are prepared when the viewer is idle.
+    When using pyPDF, the page contents are read from the file in a worker
+    thread. The drawing commands and the tiles are kept in a cache limited to
+    CACHE_SIZE bytes, see :class:`pdfCache`.
     """
     def __init__(self, parent, nid, pos, size, style):
         """
@@ -136,18 +144,32 @@ class pdfViewer(wx.ScrolledWindow):
         self.zoomscale = -1     # fit page to screen width
         self.nom_page_gap = 20  # nominal inter-page gap (points)
         self.scrollrate = 20    # pixels per scrollbar increment
-        self.page_buffer_valid = False
         self.page_after_zoom_change = None
+        self.cache = pdfCache(CACHE_SIZE)
+        self.zoomkey = None     # identifies the scales of the pages of the cached tiles
+        self.fallback = None    # (zoomkey, ratio) of the tiles shown while zooming
+        self.missing_tiles = [] # visible tiles to render when idle
+        self.prefetch_tiles = []
         self.ClearBackground()
 
     def OnIdle(self, event):
         """
-        Redraw on resize.
+        Redraw on resize, otherwise render the next missing or prefetched tile.
         """
         if self.resizing:
-            self.page_buffer_valid = False
             self.Render()
             self.resizing = False
+        elif self.missing_tiles and self.have_file:
+            tile = self.missing_tiles.pop(0)
+            self.GetTile(*tile)
+            self.RefreshTile(*tile)
+            if not self.missing_tiles:
+                self.fallback = None
+            event.RequestMore()
+        elif self.prefetch_tiles and self.have_file:
+            self.GetTile(*self.prefetch_tiles.pop(0))
+            if self.prefetch_tiles:
+                event.RequestMore()
         event.Skip()
 
     def OnResize(self, event):
@@ -167,13 +189,33 @@ class pdfViewer(wx.ScrolledWindow):
 
     def OnPaint(self, event):
         """
-        Refresh visible window with bitmap contents.
+        Refresh visible window with the cached tiles. Tiles that are not in
+        the cache yet are rendered when idle, see OnIdle, and the tiles of
+        the previous zoom are shown scaled meanwhile after a zoom change.
         """
         paintDC = wx.PaintDC(self)
-        paintDC.Clear()         # in case buffer now smaller than visible window
-        if hasattr(self, 'pdc'):
-            paintDC.Blit(0, 0, self.winwidth, self.winheight, self.pdc,
-                                                     self.xshift, self.yshift)
+        paintDC.SetBackground(wx.Brush(self.GetBackgroundColour()))
+        paintDC.Clear()
+        if not self.have_file or self.zoomkey is None:
+            return
+
+        x0, y0 = self.CalcUnscrolledPosition(0, 0)
+        box = self.GetUpdateRegion().GetBox()
+        tiles = self.GetTiles(box.x + x0, box.y + y0, box.width, box.height)
+        missing = [tile for tile in tiles
+                   if ('tile', self.zoomkey) + tile not in self.cache]
+        if missing:
+            if self.fallback:
+                self.DrawFallbackTiles(paintDC, box)
+            self.missing_tiles.extend(tile for tile in missing
+                                      if tile not in self.missing_tiles)
+        else:
+            self.fallback = None
+
+        for tx, ty in tiles:
+            bitmap = self.cache.Get(('tile', self.zoomkey, tx, ty))
+            if bitmap is not None:
+                paintDC.DrawBitmap(bitmap, tx*TILE_SIZE - x0, ty*TILE_SIZE - y0)
 
 #----------------------------------------------------------------------------
 
@@ -198,6 +240,14 @@ class pdfViewer(wx.ScrolledWindow):
                 stream = f.read()
             return BytesIO(stream)
 
+        if hasattr(self, 'pdfdoc'):
+            self.pdfdoc.Close()
+        self.cache.Clear()
+        self.zoomkey = None
+        self.fallback = None
+        self.missing_tiles = []
+        self.prefetch_tiles = []
+
         self.pdfpathname = ''
         if isinstance(pdf_file, str):
             # a filename/path string, save its name
@@ -212,14 +262,13 @@ class pdfViewer(wx.ScrolledWindow):
         self.numpages = self.pdfdoc.numpages
         self.pagesizes = [self.pdfdoc.GetPageSize(i) for i in range(self.numpages)]
         
-        self.page_buffer_valid = False
         self.Scroll(0, 0)               # in case this is a re-LoadFile
         self.CalculateDimensions()      # to get initial visible page range
-        # draw and display the minimal set of pages
+        # draw and display the minimal set of pages, the others are read
+        # when they are scrolled into view
         self.pdfdoc.DrawFile(self.frompage, self.topage)
         self.have_file = True
-        # now draw full set of pages
-        wx.CallAfter(self.pdfdoc.DrawFile, 0, self.numpages-1)
+        self.Refresh(0)
 
     def Save(self):
         "Save a copy of the pdf file if it was originally named"
@@ -281,7 +330,6 @@ class pdfViewer(wx.ScrolledWindow):
         """
         pagenow = self.frompage
         self.zoomscale = zoomscale
-        self.page_buffer_valid = False
         # calling GoPage now will trigger rendering at the new size but the page location
         # will be calculated based on the old zoom scale - so save the required page number
         # and call GoPage again *after* rendering at the new size
@@ -309,9 +357,22 @@ class pdfViewer(wx.ScrolledWindow):
             self.Scroll(0, 0)
             return False
 
+    def SetCacheSize(self, maxbytes):
+        """
+        Set the memory limit of the cache of parsed pages and page tiles.
+
+        :param integer `maxbytes`: the limit, in bytes
+
+        """
+        self.cache.SetMaxBytes(maxbytes)
+
     @property
     def ShowLoadProgress(self):
-        """Property to control if file reading progress is shown (PyPDF2 only)"""
+        """
+        Property to control if file reading progress is shown when drawing
+        the whole file with DrawFile (PyPDF2 only). Pages are otherwise read
+        on demand so no progress is shown when loading a file.
+        """
         return self._showLoadProgress
 
     @ShowLoadProgress.setter
@@ -325,10 +386,12 @@ class pdfViewer(wx.ScrolledWindow):
 
     def CalculateDimensions(self):
         """
-        Compute the required buffer sizes to hold the viewed rectangle and
-        the range of pages visible. Set self.page_buffer_valid = False if
-        the current set of rendered pages changes
+        Compute the sizes and positions of the pages and the range of pages
+        visible. When the scales of the pages change, the tiles of the
+        previous zoom are kept as the fallback shown until the new tiles
+        are rendered.
         """
+        oldpage, oldscales = getattr(self, 'frompage', 0), getattr(self, 'scales', None)
         self.frompage = 0
         self.topage = 0
         device_scale = wx.ClientDC(self).GetPPI()[0]/72.0   # pixels per inch/points per inch
@@ -357,6 +420,22 @@ class pdfViewer(wx.ScrolledWindow):
             else:                           # fit page
                 self.scales = [self.winheight / self.pagesizes[pageno][1] 
                                for pageno in range(self.numpages)]
+
+        if self.zoomscale > 0.0:
+            zoomkey = (self.zoomscale, device_scale)
+        elif int(self.zoomscale) == -1:
+            zoomkey = (-1, self.winwidth)
+        else:
+            zoomkey = (-2, self.winheight)
+        if zoomkey != self.zoomkey:
+            if self.zoomkey is not None:
+                ratio = self.scales[oldpage] / oldscales[oldpage]
+                if self.fallback:       # the new tiles were not all rendered yet
+                    self.fallback = (self.fallback[0], self.fallback[1] * ratio)
+                else:
+                    self.fallback = (self.zoomkey, ratio)
+            self.zoomkey = zoomkey
+            self.missing_tiles = []
         self.Xpagespixels = [int(round(self.pagesizes[pageno][0] * self.scales[pageno]))
                              for pageno in range(self.numpages)]
 
@@ -394,103 +473,255 @@ class pdfViewer(wx.ScrolledWindow):
                           self.numpages-1)
         if self.frompage > self.topage:
             return False # Nothing to render. Can happen during initialization
-        
-        self.page_x0 = 0
-        self.pagebufferwidth = max(self.Xpagespixels[pageno]
-                                   for pageno in range(self.frompage, self.topage+1))
-        self.page_y0 = self.cumYpagespixels[self.frompage-1] if self.frompage else 0
-        self.pagebufferheight = self.cumYpagespixels[self.topage] - self.page_y0
 
         # Inform buttonpanel controls of any changes
         if self.buttonpanel:
             self.buttonpanel.Update(self.frompage, self.numpages,
                                       self.scales[self.frompage]/device_scale)
-        
-        self.xshift = self.x0 - self.page_x0
-        self.yshift = self.y0 - self.page_y0
-        
-        if not self.page_buffer_valid:  # via external setting
-            self.cur_frompage = self.frompage
-            self.cur_topage = self.topage
-        else:   # page range unchanged? whole visible area will always be inside page buffer
-            if self.frompage != self.cur_frompage or self.topage != self.cur_topage:
-                self.page_buffer_valid = False    # due to page buffer change
-                self.cur_frompage = self.frompage
-                self.cur_topage = self.topage
                 
         return True
 
     def Render(self):
         """
-        Recalculate dimensions as client area may have been scrolled or resized.
-        The smallest unit of rendering that can be done is the pdf page. So render
-        the drawing commands for the pages in the visible rectangle into a buffer
-        big enough to hold this set of pages. Force re-creating the page buffer
-        only when client view moves outside it.
-        With PyPDF2, use gc.Translate to render each page wrt the pdf origin,
-        which is at the bottom left corner of the page.
+        Recalculate dimensions as client area may have been scrolled or resized,
+        then repaint everything if the zoom changed. When scrolling only the
+        newly exposed area is repainted, see OnPaint.
         """
         if not self.have_file:
             return
+        zoomkey = self.zoomkey
         if not self.CalculateDimensions():
             return # Invalid dimensions: Nothing to render
-        if not self.page_buffer_valid:
-            # Initialize the buffer bitmap.
-            self.pagebuffer = wx.Bitmap(self.pagebufferwidth, self.pagebufferheight)
-            self.pdc = wx.MemoryDC(self.pagebuffer)     # must persist
 
-            gc = GraphicsContext.Create(self.pdc)       # Cairo/wx.GraphicsContext API
+        self.SchedulePrefetch()
+        if self.zoomkey != zoomkey:
+            self.Refresh(0)
+
+        # ensure we stay on the same page after zoom scale is changed
+        if self.page_after_zoom_change:
+            self.GoPage(self.page_after_zoom_change)
+            self.page_after_zoom_change = None
+
+    def GetTiles(self, x, y, width, height):
+        """
+        Return the (column, row) of the tiles covering a rectangle, in
+        unscrolled pixels.
+        """
+        lastx = min(x + width, self.maxwidth) - 1
+        lasty = min(y + height, self.maxheight) - 1
+        return [(tx, ty) for ty in range(max(y, 0) // TILE_SIZE, lasty // TILE_SIZE + 1)
+                         for tx in range(max(x, 0) // TILE_SIZE, lastx // TILE_SIZE + 1)]
+
+    def GetTile(self, tx, ty):
+        """
+        Return the bitmap of a tile at the current zoom, from the cache if
+        possible.
+
+        :param integer `tx`: the column of the tile
+        :param integer `ty`: the row of the tile
+
+        """
+        key = ('tile', self.zoomkey, tx, ty)
+        bitmap = self.cache.Get(key)
+        if bitmap is None:
+            bitmap = self.RenderTile(tx, ty)
+            self.cache.Put(key, bitmap, TILE_SIZE * TILE_SIZE * 4)
+        return bitmap
+
+    def RenderTile(self, tx, ty):
+        """
+        Render the parts of the pages inside a tile into a new bitmap.
+        With mupdf only the tile is rendered, with PyPDF2 it is cut from the
+        bitmap of the whole page, see GetPageBitmap.
+
+        :param integer `tx`: the column of the tile
+        :param integer `ty`: the row of the tile
+
+        """
+        x, y = tx * TILE_SIZE, ty * TILE_SIZE
+        bitmap = wx.Bitmap(TILE_SIZE, TILE_SIZE)
+        dc = wx.MemoryDC(bitmap)
+        # non-page areas are shown gray
+        dc.SetBackground(wx.Brush(self.GetBackgroundColour()))
+        dc.Clear()
+        gc = GraphicsContext.Create(dc)             # Cairo/wx.GraphicsContext API
+
+        # the pages from the first one ending below the top of the tile
+        for pageno in range(bisect.bisect_right(self.cumYpagespixels, y), self.numpages):
+            pagetop = self.cumYpagespixels[pageno] - self.Ypagespixels[pageno]
+            if pagetop >= y + TILE_SIZE:
+                break
+            scale = self.scales[pageno]
+            width = self.Xpagespixels[pageno]
+            height = int(round(self.pagesizes[pageno][1] * scale))
+            if x >= width or y >= pagetop + height:
+                continue
+
+            gc.PushState()
+            gc.Translate(-x, pagetop - y)
+            gc.Clip(0, 0, width, height)
 
             # white background
             path = gc.CreatePath()
-            path.AddRectangle(0, 0,
-                                self.pagebuffer.GetWidth(), self.pagebuffer.GetHeight())
+            path.AddRectangle(0, 0, width, height)
             gc.SetBrush(wx.WHITE_BRUSH)
             gc.FillPath(path)
 
-            for pageno in range(self.frompage, self.topage+1):
-                scale = self.scales[pageno]
-                pagegap = self.page_gaps[pageno]
-                self.xpageoffset = 0 - self.x0
-                self.ypageoffset = (self.cumYpagespixels[pageno] - self.Ypagespixels[pageno] -
-                                    self.page_y0)
-    
-                gc.PushState()
-                if mupdf:
-                    gc.Translate(self.xpageoffset, self.ypageoffset)
-                    # scaling is done inside RenderPage
+            if mupdf:
+                # scaling is done inside RenderPage, only the tile is rendered
+                clip = wx.Rect(x, y - pagetop, TILE_SIZE, TILE_SIZE)
+                self.pdfdoc.RenderPage(gc, pageno, scale=scale,
+                                       clip=clip.Intersect(wx.Rect(0, 0, width, height)))
+            else:
+                # PyPDF2 cannot render only a part of a page, so the page is
+                # rendered once per zoom and the tiles are cut from it
+                page = self.GetPageBitmap(pageno)
+                if page is not None:
+                    gc.DrawBitmap(page, 0, 0, width, height)
                 else:
-
-                    gc.Translate(self.xpageoffset, self.ypageoffset +
-                                    self.pagesizes[pageno][1]*scale)
+                    gc.Translate(0, self.pagesizes[pageno][1]*scale)
                     gc.Scale(scale, scale)
-                self.pdfdoc.RenderPage(gc, pageno, scale=scale)
-                
-                # Show non-page areas as gray
-                gc.PushState()
-                gc.SetBrush(wx.Brush(self.GetBackgroundColour()))
-                gc.SetPen(wx.TRANSPARENT_PEN)
-                gc.Scale(1.0, 1.0)
-                
-                #inter-page gap
-                gc.DrawRectangle(0, self.pagesizes[pageno][1]*scale,
-                                 self.pagesizes[pageno][0]*scale, pagegap*scale)
-                # gap to the right of the page
-                extrawidth = self.winwidth - self.Xpagespixels[pageno]
-                if extrawidth > 0:
-                    gc.DrawRectangle(self.pagesizes[pageno][0]*scale, 0, 
-                                     extrawidth, self.Ypagespixels[pageno])
-                gc.PopState() # Pop non-page area
-        
-                gc.PopState() # Pop page area
+                    self.pdfdoc.RenderPage(gc, pageno, scale=scale)
+            gc.ResetClip()
+            gc.PopState()
 
-        self.page_buffer_valid = True
-        self.Refresh(0) # Blit appropriate area of new or existing page buffer to screen
+        del gc
+        dc.SelectObject(wx.NullBitmap)
+        return bitmap
 
-        # ensure we stay on the same page after zoom scale is changed
-        if self.page_after_zoom_change:
-            self.GoPage(self.page_after_zoom_change)
-            self.page_after_zoom_change = None
+    def GetPageBitmap(self, pageno):
+        """
+        Return the bitmap of a whole page at the current zoom, from the cache
+        if possible, or None if it would take too much of the cache. Only
+        used with PyPDF2, to render each page once for all of its tiles.
+
+        :param integer `pageno`: the page number
+
+        """
+        key = ('page', self.zoomkey, pageno)
+        bitmap = self.cache.Get(key)
+        if bitmap is not None:
+            return bitmap
+        scale = self.scales[pageno]
+        width = self.Xpagespixels[pageno]
+        height = int(round(self.pagesizes[pageno][1] * scale))
+        nbytes = width * height * 4
+        if nbytes > self.cache.maxbytes // 4:
+            return None
+
+        bitmap = wx.Bitmap(width, height)
+        dc = wx.MemoryDC(bitmap)
+        dc.SetBackground(wx.WHITE_BRUSH)
+        dc.Clear()
+        gc = GraphicsContext.Create(dc)
+        gc.Translate(0, self.pagesizes[pageno][1]*scale)
+        gc.Scale(scale, scale)
+        self.pdfdoc.RenderPage(gc, pageno, scale=scale)
+        del gc
+        dc.SelectObject(wx.NullBitmap)
+        self.cache.Put(key, bitmap, nbytes)
+        return bitmap
+
+    def RefreshTile(self, tx, ty):
+        " Repaint the area of a tile, if it is visible "
+        x0, y0 = self.CalcUnscrolledPosition(0, 0)
+        self.RefreshRect(wx.Rect(tx*TILE_SIZE - x0, ty*TILE_SIZE - y0,
+                                 TILE_SIZE, TILE_SIZE), False)
+
+    def DrawFallbackTiles(self, dc, box):
+        """
+        Draw the cached tiles of the previous zoom scaled to the current zoom,
+        to show while the new tiles are rendered.
+
+        :param `dc`: the paint DC
+        :param `box`: the area to draw, in client coordinates
+
+        """
+        zoomkey, ratio = self.fallback
+        x0, y0 = self.CalcUnscrolledPosition(0, 0)
+        # the tiles covering the area in the pixels of the previous zoom
+        ox, oy = int((box.x + x0) / ratio), int((box.y + y0) / ratio)
+        owidth, oheight = int(box.width / ratio) + 2, int(box.height / ratio) + 2
+        dc.SetUserScale(ratio, ratio)
+        for ty in range(oy // TILE_SIZE, (oy + oheight) // TILE_SIZE + 1):
+            for tx in range(ox // TILE_SIZE, (ox + owidth) // TILE_SIZE + 1):
+                bitmap = self.cache.Get(('tile', zoomkey, tx, ty))
+                if bitmap is not None:
+                    dc.DrawBitmap(bitmap, int(round(tx*TILE_SIZE - x0/ratio)),
+                                          int(round(ty*TILE_SIZE - y0/ratio)))
+        dc.SetUserScale(1.0, 1.0)
+
+    def SchedulePrefetch(self):
+        """
+        Choose the rows of tiles above and below the visible ones, which are
+        rendered when the viewer is idle, and the pages next to the visible
+        ones, whose drawing commands are read in the background with PyPDF2.
+        """
+        pages = []
+        for i in range(1, PREFETCH_PAGES+1):
+            for pageno in (self.topage + i, self.frompage - i):
+                if 0 <= pageno < self.numpages:
+                    pages.append(pageno)
+        self.pdfdoc.Prefetch(pages)
+
+        rows = PREFETCH_TILE_ROWS * TILE_SIZE
+        tiles = (self.GetTiles(self.x0, self.y0 + self.winheight, self.winwidth, rows) +
+                 self.GetTiles(self.x0, self.y0 - rows, self.winwidth, rows))
+        self.prefetch_tiles = [tile for tile in tiles
+                               if ('tile', self.zoomkey) + tile not in self.cache]
+
+#============================================================================
+
+class pdfCache(object):
+    """
+    A cache of parsed page drawings and page tiles, dropping the least
+    recently used items when their total size reaches a memory limit.
+    It is only used from the GUI thread.
+    """
+    def __init__(self, maxbytes):
+        """
+        :param integer `maxbytes`: the memory limit of the cache, in bytes
+        """
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self.items = OrderedDict()     # key --> (value, size in bytes)
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def Get(self, key):
+        " Return the value cached for key, or None "
+        item = self.items.get(key)
+        if item is None:
+            return None
+        self.items.move_to_end(key)
+        return item[0]
+
+    def Put(self, key, value, nbytes):
+        " Add value to the cache, dropping old items if it becomes too big "
+        old = self.items.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[1]
+        self.items[key] = (value, nbytes)
+        self.nbytes += nbytes
+        self.Trim()
+
+    def Trim(self):
+        " Drop the least recently used items until the cache fits its limit "
+        # always keep the newest item, even if it is too big on its own
+        while self.nbytes > self.maxbytes and len(self.items) > 1:
+            key, (value, nbytes) = self.items.popitem(last=False)
+            self.nbytes -= nbytes
+
+    def SetMaxBytes(self, maxbytes):
+        " Set the memory limit of the cache "
+        self.maxbytes = maxbytes
+        self.Trim()
+
+    def Clear(self):
+        " Drop all the cached items "
+        self.items.clear()
+        self.nbytes = 0
 
 #============================================================================
 
@@ -543,21 +774,43 @@ class mupdfProcessor(object):
         """
         self.parent.GoPage(frompage)
 
-    def RenderPage(self, gc, pageno, scale=1.0):
-        " Render the set of pagedrawings into gc for specified page "
+    def Prefetch(self, pages):
+        """
+        This is a no-op for mupdf, as there is nothing to parse. The page
+        tiles are prefetched by the viewer.
+        """
+        pass
+
+    def Close(self):
+        " Close the document "
+        self.pdfdoc.close()
+
+    def RenderPage(self, gc, pageno, scale=1.0, clip=None):
+        """
+        Render the specified page into gc, straight from the document.
+        If clip is a wx.Rect, in pixels at the given scale, only that
+        part of the page is rendered.
+        """
         try:
             page = self.pdfdoc.load_page(pageno)
         except AttributeError: # old PyMuPDF version
             page = self.pdfdoc.loadPage(pageno)
         matrix = pymupdf.Matrix(scale, scale)
+        x = y = 0
+        kwargs = {}
+        if clip is not None:
+            x, y = clip.x, clip.y
+            kwargs['clip'] = pymupdf.Rect(clip.x / scale, clip.y / scale,
+                                          (clip.x + clip.width) / scale,
+                                          (clip.y + clip.height) / scale)
         try:
             try:
                 # MUST be keyword arg(s)
-                pix = page.get_pixmap(matrix=matrix, alpha=False)
+                pix = page.get_pixmap(matrix=matrix, alpha=False, **kwargs)
             except AttributeError: # old PyMuPDF version
-                pix = page.getPixmap(matrix=matrix, alpha=False)
+                pix = page.getPixmap(matrix=matrix, alpha=False, **kwargs)
             bmp = wx.Bitmap.FromBuffer(pix.width, pix.height, pix.samples)
-            gc.DrawBitmap(bmp, 0, 0, pix.width, pix.height)
+            gc.DrawBitmap(bmp, x, y, pix.width, pix.height)
             self.zoom_error = False
         except (RuntimeError, MemoryError):
             if not self.zoom_error:     # report once only
@@ -572,14 +825,18 @@ class mupdfProcessor(object):
 class pypdfProcessor(object):
     """
     Create an instance of this class to open a PDF file, process the contents of
-    every page using PyPDF2 then render each one on demand
+    each page using PyPDF2 when it is first needed, then render each one on demand.
+    The content streams of the pages about to be needed are read in a worker
+    thread, see Prefetch.
     """
     def __init__(self, parent, fileobj, showloadprogress):
         self.parent = parent
         self.showloadprogress = showloadprogress
         self.pdfdoc = PdfFileReader(fileobj)
         self.numpages = self.pdfdoc.getNumPages()
-        self.pagedrawings = {}
+        self.lock = threading.Lock()    # serializes the reads of the pdf file
+        self.executor = futures.ThreadPoolExecutor(max_workers=1)
+        self.pending = {}               # pageno --> future of ReadPage
         self.unimplemented = {}
         self.formdrawings = {}
         self.page = None
@@ -612,27 +869,86 @@ class pypdfProcessor(object):
         straight into a PseudoDC and the visible section painted directly into
         scrolled window, but we need to be able to zoom and scale the output quickly
         without having to rebuild the drawing commands (slow). So build our
-        own command lists, one per page, into self.pagedrawings.
+        own command lists, one per page, which are kept in the viewer's cache,
+        see GetPageDrawing.
         """
         numpages_generated = 0
         rp = (self.showloadprogress and frompage == 0 and topage == self.numpages-1)
         if rp: self.Progress('start', self.numpages)
         for pageno in range(frompage, topage+1):
-            self.gstate = pdfState()    # state is reset with every new page
-            self.saved_state = []
-            self.page = self.pdfdoc.getPage(pageno)
+            self.GetPageDrawing(pageno)
             numpages_generated += 1
-            pdf_fonts = self.FetchFonts(self.page)
-            self.pagedrawings[pageno] = self.ProcessOperators(
-                                    self.page.extractOperators(), pdf_fonts)
             if rp: self.Progress('progress', numpages_generated)
 
         if rp: self.Progress('end', None)
         self.parent.GoPage(frompage)
 
+    def ReadPage(self, pageno):
+        """
+        Read the fonts and the content stream operators of a page. This does not
+        create any wx objects, so it can run in the worker thread.
+        """
+        with self.lock:
+            page = self.pdfdoc.getPage(pageno)
+            return page, self.FetchFonts(page), page.extractOperators()
+
+    def Prefetch(self, pages):
+        """
+        Start reading the content streams of pages in the worker thread, so that
+        their drawing commands are quick to build when they are needed.
+        Reading is cancelled for the pages that are no longer in the list.
+        """
+        for pageno in list(self.pending):
+            if pageno not in pages:
+                self.pending.pop(pageno).cancel()
+        for pageno in pages:
+            if (pageno not in self.pending and
+                           ('drawing', pageno) not in self.parent.cache):
+                self.pending[pageno] = self.executor.submit(self.ReadPage, pageno)
+
+    def Close(self):
+        " Stop reading pages in the worker thread "
+        for future in self.pending.values():
+            future.cancel()
+        self.pending = {}
+        self.executor.shutdown(wait=False)
+
+    def GetPageDrawing(self, pageno):
+        """
+        Return the drawing commands of a page, from the cache if possible.
+        """
+        cache = self.parent.cache
+        drawlist = cache.Get(('drawing', pageno))
+        if drawlist is not None:
+            return drawlist
+
+        future = self.pending.pop(pageno, None)
+        if future is not None and not future.cancel():
+            self.page, pdf_fonts, opslist = future.result()
+        else:
+            self.page, pdf_fonts, opslist = self.ReadPage(pageno)
+        self.gstate = pdfState()    # state is reset with every new page
+        self.saved_state = []
+        with self.lock:             # XObjects are read from the file
+            drawlist = self.ProcessOperators(opslist, pdf_fonts)
+        cache.Put(('drawing', pageno), drawlist, self.GetDrawingSize(drawlist))
+        return drawlist
+
+    def GetDrawingSize(self, drawlist):
+        """
+        Return an estimate of the memory used by a list of drawing commands,
+        counting the bitmaps it contains.
+        """
+        nbytes = 0
+        for drawcmd, args, kwargs in drawlist:
+            nbytes += 200
+            if drawcmd == 'DrawBitmap':
+                nbytes += args[0].GetWidth() * args[0].GetHeight() * 4
+        return nbytes
+
     def RenderPage(self, gc, pageno, scale=None):
         """
-        Render the set of pagedrawings
+        Render the drawing commands of the page, see GetPageDrawing, into gc.
         In a pdf file, bitmaps are treated as being of unit width and height and
         are scaled via a previous ConcatTransform containing the corresponding width
         and height as scale factors. wx.GraphicsContext/Cairo appear not to respond to
@@ -649,7 +965,7 @@ class pypdfProcessor(object):
                     'DrawBitmap': gc.DrawBitmap,
                     'CreatePath': gc.CreatePath,
                     'DrawPath': gc.DrawPath }
-        for drawcmd, args, kwargs in self.pagedrawings[pageno]:
+        for drawcmd, args, kwargs in self.GetPageDrawing(pageno):
             # scale font if requested by printer DC
             if drawcmd == 'SetFont' and hasattr(gc, 'font_scale'):
                 args[0].Scale(gc.font_scale)
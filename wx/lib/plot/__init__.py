@@ -21,6 +21,7 @@ __all__ = [
     'PlotGraphics',
     'PlotCanvas',
     'PlotPrintout',
+    'RingBuffer',
 ]
 
 # Expose items so that the old API can still be used.
@@ -37,6 +38,7 @@ from .polyobjects import PolyHistogram
 from .polyobjects import PolyBoxPlot
 from .polyobjects import PlotGraphics
 from .polyobjects import PlotPrintout
+from .polyobjects import RingBuffer
 
 from .utils import TempStyle
 from .utils import pendingDeprecation
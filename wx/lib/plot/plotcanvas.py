@@ -121,6 +121,8 @@ class PlotCanvas(wx.Panel):
 
         # Drawing Variables
         self.last_draw = None
+        # what the plot area looked like at the last draw, for DrawAppended
+        self._lastLayout = None
         self._pointScale = 1
         self._pointShift = 0
         self._xSpec = 'auto'
@@ -163,6 +165,7 @@ class PlotCanvas(wx.Panel):
 
         self._antiAliasingEnabled = False
         self._hiResEnabled = False
+        self._decimationEnabled = True
         self._pointSize = (1.0, 1.0)
         self._fontScale = 1.0
 
@@ -843,6 +846,32 @@ class PlotCanvas(wx.Panel):
         self._hiResEnabled = value
         self.Redraw()
 
+    @property
+    def enableDecimation(self):
+        """
+        The current enableDecimation value.
+
+        When enabled, lines only draw the points that are in view, and
+        lines with many points per pixel column are reduced to the first,
+        min, max and last point of each column, which looks the same but
+        makes the drawing time depend on the plot width rather than on the
+        number of points. See
+        :meth:`~wx.lib.plot.polyobjects.PolyLine.decimate`.
+
+        :getter: Returns the value of enableDecimation.
+        :setter: Sets the value of enableDecimation.
+        :type:   bool
+        :raises: `TypeError` if setting a non-boolean value.
+        """
+        return self._decimationEnabled
+
+    @enableDecimation.setter
+    def enableDecimation(self, value):
+        if not isinstance(value, bool):
+            raise TypeError("Value must be a bool.")
+        self._decimationEnabled = value
+        self.Redraw()
+
     def SetEnableDrag(self, value):
         """
         Set the enableDrag value.
@@ -1757,6 +1786,62 @@ class PlotCanvas(wx.Panel):
 
         graphics.logScale = self.logScale
 
+        axes = self._checkAxes(xAxis, yAxis)
+        if axes is None:
+            return
+        self._Draw(graphics, axes[0], axes[1], dc)
+
+    def DrawAppended(self, xAxis=None, yAxis=None):
+        """
+        Redraw the last plot after points have been appended to its
+        :class:`~wx.lib.plot.polyobjects.RingBuffer` data sources.
+
+        When the layout of the plot has not changed, the plot area is not
+        redrawn: the picture is shifted by the scroll of the x axis, and
+        only the newly exposed part and the new points are drawn. Otherwise
+        the whole plot is redrawn, as :meth:`Draw` does.
+
+        When `xAxis` has the same span as before, it is rounded so that the
+        plot scrolls by a whole number of pixels.
+
+        :param xAxis: The ``(minX, maxX)`` range to view, or None to keep the
+                      range of the last draw.
+        :type xAxis: tuple
+        :param yAxis: The ``(minY, maxY)`` range to view, or None to keep the
+                      range of the last draw.
+        :type yAxis: tuple
+        """
+        if self.last_draw is None:
+            return
+        graphics, lastXAxis, lastYAxis = self.last_draw
+        axes = self._checkAxes(xAxis, yAxis)
+        if axes is None:
+            return
+        xAxis, yAxis = axes
+        if xAxis is None:
+            xAxis = lastXAxis
+        if yAxis is None:
+            yAxis = lastYAxis
+
+        if self._lastLayout is not None:
+            # scroll by whole pixels, so the old picture can be reused
+            span = lastXAxis[1] - lastXAxis[0]
+            if abs((xAxis[1] - xAxis[0]) - span) <= 1e-9 * abs(span):
+                xScale = self._lastLayout['scale'][0]
+                dx = round((xAxis[0] - lastXAxis[0]) * xScale) / xScale
+                xAxis = (lastXAxis[0] + dx, lastXAxis[1] + dx)
+
+        if self.last_PointLabel is not None:
+            self._drawPointLabel(self.last_PointLabel)  # erase old
+            self.last_PointLabel = None
+        self._Draw(graphics, xAxis, yAxis, incremental=True)
+
+    def _checkAxes(self, xAxis, yAxis):
+        """
+        Check the axes passed to Draw, and take the log of them if needed.
+
+        Returns None if there is nothing to draw.
+        """
         # check Axis is either tuple or none
         err_txt = "xAxis should be None or (minX, maxX). Got type `{}`."
         if type(xAxis) not in [type(None), tuple]:
@@ -1769,17 +1854,18 @@ class PlotCanvas(wx.Panel):
         # check case for axis = (a,b) where a==b caused by improper zooms
         if xAxis is not None:
             if xAxis[0] == xAxis[1]:
-                return
+                return None
             if self.logScale[0]:
                 xAxis = np.log10(xAxis)
         if yAxis is not None:
             if yAxis[0] == yAxis[1]:
-                return
+                return None
             if self.logScale[1]:
                 yAxis = np.log10(yAxis)
-        self._Draw(graphics, xAxis, yAxis, dc)
+        return xAxis, yAxis
 
-    def _Draw(self, graphics, xAxis=None, yAxis=None, dc=None):
+    def _Draw(self, graphics, xAxis=None, yAxis=None, dc=None,
+              incremental=False):
         """\
         Draw objects in graphics with specified x and y axis.
         graphics- instance of PlotGraphics with list of PolyXXX objects
@@ -1787,15 +1873,22 @@ class PlotCanvas(wx.Panel):
         yAxis - same as xAxis
         dc - drawing context - doesn't have to be specified.
         If it's not, the offscreen buffer is used
+        incremental - reuse the plot area of the last draw where possible
         """
 
+        savedPlot = None
         if dc is None:
+            screen = True
+            if incremental:
+                savedPlot = self._savePlotArea(graphics)
             # sets new dc and clears it
             dc = wx.BufferedDC(wx.ClientDC(self.canvas), self._Buffer)
             bbr = wx.Brush(self.GetBackgroundColour(), wx.BRUSHSTYLE_SOLID)
             dc.SetBackground(bbr)
             dc.SetBackgroundMode(wx.SOLID)
             dc.Clear()
+        else:
+            screen = False
         if self._antiAliasingEnabled:
             if not isinstance(dc, wx.GCDC):
                 try:
@@ -1935,10 +2028,38 @@ class PlotCanvas(wx.Panel):
         # set clipping area so drawing does not occur outside axis box
         ptx, pty, rectWidth, rectHeight = self._point2ClientCoord(p1, p2)
         # allow graph to overlap axis lines by adding units to w and h
-        dc.SetClippingRegion(int(ptx * self._pointSize[0]),
-                             int(pty * self._pointSize[1]),
-                             int(rectWidth * self._pointSize[0] + 2),
-                             int(rectHeight * self._pointSize[1] + 1))
+        clipX = int(ptx * self._pointSize[0])
+        clipY = int(pty * self._pointSize[1])
+        clipW = int(rectWidth * self._pointSize[0] + 2)
+        clipH = int(rectHeight * self._pointSize[1] + 1)
+        layout = {'rect': (int(ptx), int(pty), int(ptx + rectWidth),
+                           int(pty + rectHeight)),
+                  'scale': tuple(scale),
+                  'shift': tuple(shift),
+                  'pointSize': self._pointSize,
+                  }
+
+        columns = None
+        if savedPlot is not None:
+            columns = self._restorePlotArea(dc, graphics, savedPlot, layout)
+        if columns is None:
+            xRange = (p1[0], p2[0])
+            dc.SetClippingRegion(clipX, clipY, clipW, clipH)
+        else:
+            # only draw the columns of pixels that were not restored, all
+            # in one go so each line and marker is only drawn once
+            x0, x1 = columns[0][0], columns[-1][1]
+            xRange = ((x0 - shift[0]) / scale[0], (x1 - shift[0]) / scale[0])
+            region = wx.Region()
+            for x0, x1 in columns:
+                region.Union(x0, clipY, x1 - x0, clipH)
+            dc.SetDeviceClippingRegion(region)
+
+        # pick the points of each line to draw for the x range in view
+        if self._decimationEnabled:
+            graphics.decimate(xRange, self._pointScale)
+        else:
+            graphics.decimate(None, self._pointScale)
         # Draw the lines and markers
 #        start = _time.perf_counter()
         graphics.draw(dc)
@@ -1947,6 +2068,12 @@ class PlotCanvas(wx.Panel):
         # remove the clipping region
         dc.DestroyClippingRegion()
 
+        if screen:
+            layout['objects'] = [obj._appendState() for obj in graphics]
+            self._lastLayout = layout
+        else:
+            self._lastLayout = None
+
         self._adjustScrollbars()
 
     def Redraw(self, dc=None):
@@ -2007,7 +2134,7 @@ class PlotCanvas(wx.Panel):
         l = []
         for curveNum, obj in enumerate(graphics):
             # check there are points in the curve
-            if len(obj.points) == 0:
+            if len(obj._userPoints()) == 0:
                 continue  # go to next obj
             #[curveNum, legend, closest pt index, pointXY, scaledXY, dist]
             cn = ([curveNum] +
@@ -2232,6 +2359,87 @@ class PlotCanvas(wx.Panel):
             graphics, xSpec, ySpec = self.last_draw
             self._Draw(graphics, xSpec, ySpec, printDC)
 
+    def _savePlotArea(self, graphics):
+        """
+        Copy the inside of the plot area of the last draw from the buffer,
+        for _restorePlotArea. Returns None if it can't be reused.
+        """
+        layout = self._lastLayout
+        if (layout is None
+                or self.last_draw is None
+                or graphics is not self.last_draw[0]
+                or layout['pointSize'] != (1.0, 1.0)
+                or self._centerLinesEnabled
+                or self._diagonalsEnabled):
+            return None
+        left, top, right, bottom = layout['rect']
+        rect = wx.Rect(left, top + 1, right - left + 1, bottom - top - 1)
+        if (rect.width < 1 or rect.height < 1
+                or not wx.Rect(self._Buffer.GetSize()).Contains(rect)):
+            return None
+        return self._Buffer.GetSubBitmap(rect), layout
+
+    def _restorePlotArea(self, dc, graphics, savedPlot, layout):
+        """
+        Draw the plot area saved by _savePlotArea back, shifted by the
+        scroll of the x axis, when only points appended to the RingBuffers
+        have changed.
+
+        Returns the ``(x0, x1)`` columns of pixels that still need to be
+        drawn, or None if the whole plot area has to be drawn.
+        """
+        bitmap, old = savedPlot
+        if (layout['rect'] != old['rect']
+                or layout['pointSize'] != (1.0, 1.0)
+                or not np.allclose(layout['scale'], old['scale'],
+                                   rtol=1e-9, atol=0)
+                or abs(layout['shift'][1] - old['shift'][1]) > 1e-6):
+            return None
+        # the plot scrolls left by dx pixels
+        dx = old['shift'][0] - layout['shift'][0]
+        if dx < -1e-6 or abs(dx - round(dx)) > 1e-6:
+            return None
+        dx = int(round(dx))
+
+        left, top, right, bottom = layout['rect']
+        xScale, xShift = layout['scale'][0], layout['shift'][0]
+        # the columns at the edges hold the axes and the y ticks, which
+        # don't scroll, and the symbols reach a little way past the points
+        edge = int(np.ceil(abs(self.tickLengthPrinterScale[1]))) + 2
+        margin = int(np.ceil(max(graphics.getSymExtent(self.printerScale))))
+        margin += 2
+
+        start = right - dx - edge
+        for obj, state in zip(graphics, old['objects']):
+            obj._syncSource()
+            version, total, dropped, lastX = state
+            if obj._version == version:
+                continue
+            source = obj._source
+            if (total is None or source is None or not source.ascending
+                    or source.total <= total):
+                return None
+            if source.total - len(source) > dropped:
+                # points were dropped, which is fine if they were all off
+                # the left of the plot.
+                first = obj._applyScale(np.array(source.array[:1]))
+                if (not len(first)
+                        or first[0, 0] * xScale + xShift
+                        > left + edge - margin):
+                    return None
+            if lastX is None:
+                start = left
+            else:
+                start = min(start, int(np.floor(lastX * xScale + xShift)))
+        start -= margin
+        if start <= left + edge:
+            return None
+
+        part = bitmap.GetSubBitmap(wx.Rect(edge + dx, 0, start - left - edge,
+                                           bitmap.GetHeight()))
+        dc.DrawBitmap(part, left + edge, top + 1)
+        return [(left, left + edge), (start, right + 2)]
+
     def _drawPointLabel(self, mDataDict):
         """Draws and erases pointLabels"""
         width = self._Buffer.GetWidth()
@@ -34,6 +34,144 @@ except:
 from .utils import pendingDeprecation
 from .utils import TempStyle
 from .utils import pairwise
+from .utils import m4_columns
+from .utils import nearest_point_index
+
+
+class RingBuffer(object):
+    """
+    A fixed capacity buffer of ``(x, y)`` points, for plotting data that
+    streams in.
+
+    Points are added with :meth:`append`. Once the buffer is full, the
+    oldest points are dropped to make room for the new ones.
+
+    Pass the buffer to :class:`~wx.lib.plot.polyobjects.PolyLine` or
+    :class:`~wx.lib.plot.polyobjects.PolyMarker` in place of the list of
+    points, and the line picks up the new points when it is next drawn.
+    :meth:`~wx.lib.plot.plotcanvas.PlotCanvas.DrawAppended` redraws only
+    the part of the plot that changed.
+
+    :param capacity: The maximum number of points kept.
+    :type capacity: int
+    :param points: Points to start with.
+    :type points: list of ``(x, y)`` pairs
+    """
+
+    def __init__(self, capacity, points=None):
+        if capacity < 1:
+            raise ValueError("`capacity` must be at least 1")
+        self._capacity = int(capacity)
+        # every point is stored twice, capacity apart, so that the points
+        # in the buffer are always a contiguous slice of the array.
+        self._data = np.zeros((2 * self._capacity, 2), np.float64)
+        self._start = 0
+        self._count = 0
+        self._total = 0
+        self._generation = 0
+        self._ascending = True
+        self._lastX = None
+        if points is not None:
+            self.append(points)
+
+    @property
+    def capacity(self):
+        """
+        The maximum number of points kept.
+
+        :getter: Returns the capacity
+        :type: int
+        """
+        return self._capacity
+
+    @property
+    def total(self):
+        """
+        The number of points appended since the buffer was created,
+        including the ones that have been dropped or cleared.
+
+        :getter: Returns the total
+        :type: int
+        """
+        return self._total
+
+    @property
+    def generation(self):
+        """
+        A number that changes every time the points in the buffer change,
+        when points are appended or the buffer is cleared.
+
+        :getter: Returns the generation
+        :type: int
+        """
+        return self._generation
+
+    @property
+    def ascending(self):
+        """
+        ``True`` if the x values of all the points appended so far,
+        including the ones that have been dropped or cleared, are in
+        ascending order.
+
+        :getter: Returns the value of ascending
+        :type: bool
+        """
+        return self._ascending
+
+    @property
+    def array(self):
+        """
+        The points in the buffer, from the oldest to the newest.
+
+        This is a view on the buffer, not a copy, and it is only valid until
+        the next call to :meth:`append`.
+
+        :getter: Returns the points
+        :type: :class:`np.array` of shape ``(len(self), 2)``
+        """
+        return self._data[self._start:self._start + self._count]
+
+    def __len__(self):
+        return self._count
+
+    def append(self, points):
+        """
+        Add points to the end of the buffer, dropping the oldest points if
+        it is full.
+
+        :param points: The points to add.
+        :type points: list of ``(x, y)`` pairs, or a single ``(x, y)`` pair
+        """
+        points = np.asarray(points, np.float64).reshape(-1, 2)
+        if len(points) == 0:
+            return
+        if self._ascending:
+            x = points[:, 0]
+            if self._lastX is not None and x[0] < self._lastX:
+                self._ascending = False
+            elif (np.diff(x) < 0).any():
+                self._ascending = False
+        self._lastX = points[-1, 0]
+        self._total += len(points)
+        self._generation += 1
+        points = points[-self._capacity:]
+
+        index = ((self._start + self._count + np.arange(len(points)))
+                 % self._capacity)
+        self._data[index] = points
+        self._data[index + self._capacity] = points
+        count = self._count + len(points)
+        if count > self._capacity:
+            self._start = (self._start + count - self._capacity) \
+                % self._capacity
+            count = self._capacity
+        self._count = count
+
+    def clear(self):
+        """Remove all the points."""
+        self._start = 0
+        self._count = 0
+        self._generation += 1
 
 
 class PolyPoints(object):
@@ -41,7 +179,8 @@ class PolyPoints(object):
     Base Class for lines and markers.
 
     :param points: The points to plot
-    :type points: list of ``(x, y)`` pairs
+    :type points: list of ``(x, y)`` pairs, or a
+                  :class:`~wx.lib.plot.polyobjects.RingBuffer`
     :param attr: Additional attributes
     :type attr: dict
 
@@ -50,14 +189,24 @@ class PolyPoints(object):
     """
 
     def __init__(self, points, attr):
-        self._points = np.array(points).astype(np.float64)
+        if isinstance(points, RingBuffer):
+            self._source = points
+            self._sourceGeneration = points.generation
+            self._points = points.array
+        else:
+            self._source = None
+            self._points = np.array(points).astype(np.float64)
         self._logscale = (False, False)
         self._absScale = (False, False)
         self._symlogscale = (False, False)
         self._pointSize = (1.0, 1.0)
         self.currentScale = (1, 1)
         self.currentShift = (0, 0)
-        self.scaled = self.points
+        self._scaled = None
+        # data derived from the points, cleared when they change
+        self._cache = {}
+        # counts the changes to the points
+        self._version = 0
         self.attributes = {}
         self.attributes.update(self._attributes)
         for name, value in attr.items():
@@ -83,6 +232,8 @@ class PolyPoints(object):
     def logScale(self, logscale):
         if not isinstance(logscale, tuple) or len(logscale) != 2:
             raise ValueError("`logscale` must be a 2-tuple of bools")
+        if logscale != self._logscale:
+            self._pointsChanged()
         self._logscale = logscale
 
     def setLogScale(self, logscale):
@@ -209,6 +360,8 @@ class PolyPoints(object):
 
         if not isinstance(absscale, tuple) and len(absscale) == 2:
             raise ValueError("`absscale` must be a 2-tuple of bools")
+        if absscale != self._absScale:
+            self._pointsChanged()
         self._absScale = absscale
 
     @property
@@ -226,10 +379,20 @@ class PolyPoints(object):
            Only set unscaled points - do not perform the log, abs, or symlog
            adjustments yourself.
         """
+        self._syncSource()
         data = np.array(self._points, copy=True)    # need the copy
                                                     # TODO: get rid of the
                                                     # need for copy
+        return self._applyScale(data)
 
+    @points.setter
+    def points(self, points):
+        self._source = None
+        self._points = points
+        self._pointsChanged()
+
+    def _applyScale(self, data):
+        """ Apply the Log, Abs, and SymLog options to a copy of the data """
         # work on X:
         if self.absScale[0]:
             data = self._abs(data, 0)
@@ -255,9 +418,55 @@ class PolyPoints(object):
 
         return data
 
-    @points.setter
-    def points(self, points):
-        self._points = points
+    def _pointsChanged(self):
+        """ Drop everything that was computed from the points """
+        self._scaled = None
+        self._cache = {}
+        self._version += 1
+
+    def _syncSource(self):
+        """ Pick up the points appended to the RingBuffer, if there is one """
+        if (self._source is not None
+                and self._source.generation != self._sourceGeneration):
+            self._points = self._source.array
+            self._sourceGeneration = self._source.generation
+            self._pointsChanged()
+
+    def _appendState(self):
+        """
+        Returns what is needed to tell later which points were appended:
+        ``(version, total, dropped, lastX)``. ``total`` and ``dropped`` are
+        the number of points appended to and dropped from the RingBuffer,
+        or None unless points are only ever appended in ascending x order.
+        """
+        self._syncSource()
+        total = dropped = None
+        if (self._source is not None and self._source.ascending
+                and not self.absScale[0]):
+            total = self._source.total
+            dropped = total - len(self._source)
+        lastX = None
+        data = self._applyScale(np.array(self._points[-1:], copy=True))
+        if len(data):
+            lastX = data[0, 0]
+        return (self._version, total, dropped, lastX)
+
+    @property
+    def scaled(self):
+        """
+        The points, scaled and shifted for plotting.
+
+        This is computed when it is first needed after the points or the
+        scaling change.
+        """
+        if self._scaled is None:
+            self._scaled = (np.asarray(self.currentScale) * self.points
+                            + self.currentShift)
+        return self._scaled
+
+    @scaled.setter
+    def scaled(self, scaled):
+        self._scaled = scaled
 
     def _log10(self, data, index):
         """ Take the Log10 of the data, dropping any negative values """
@@ -312,8 +521,8 @@ class PolyPoints(object):
         # cast everything to list: some might be np.ndarray objects
         if (list(scale) != list(self.currentScale)
                 or list(shift) != list(self.currentShift)):
-            # update point scaling
-            self.scaled = scale * self.points + shift
+            # update point scaling, done when the scaled points are needed
+            self._scaled = None
             self.currentScale = scale
             self.currentShift = shift
         # else unchanged use the current scaling
@@ -329,23 +538,39 @@ class PolyPoints(object):
         if pointScaled == True, then based on screen coords
         if pointScaled == False, then based on user coords
         """
+        points = self._userPoints()
         if pointScaled:
-            # Using screen coords
-            p = self.scaled
-            pxy = self.currentScale * np.array(pntXY) + self.currentShift
+            # Using screen coords. The shift doesn't change the distances,
+            # so the index only has to be rebuilt when the scale changes.
+            scale = tuple(np.asarray(self.currentScale, np.float64))
+            pxy = np.asarray(scale) * np.array(pntXY)
+            cached = self._cache.get('closest_scaled')
+            if cached is None or cached[0] != scale:
+                cached = (scale, nearest_point_index(np.asarray(scale)
+                                                     * points))
+                self._cache['closest_scaled'] = cached
+            index = cached[1]
         else:
             # Using user coords
-            p = self.points
             pxy = np.array(pntXY)
-        # determine distance for each point
-        d = np.sqrt(np.add.reduce((p - pxy) ** 2, 1))  # sqrt(dx^2+dy^2)
-        pntIndex = np.argmin(d)
-        dist = d[pntIndex]
+            index = self._cache.get('closest')
+            if index is None:
+                index = self._cache['closest'] = nearest_point_index(points)
+        # the closest point, in O(log N)
+        pntIndex, dist = index.nearest(pxy)
         return [pntIndex,
-                self.points[pntIndex],
+                points[pntIndex],
                 self.scaled[pntIndex] / self._pointSize,
                 dist]
 
+    def _userPoints(self):
+        """ The points, computed only once until they change """
+        self._syncSource()
+        points = self._cache.get('points')
+        if points is None:
+            points = self._cache['points'] = self.points
+        return points
+
 
 class PolyLine(PolyPoints):
     """
@@ -396,8 +621,94 @@ class PolyLine(PolyPoints):
     _drawstyles = ("line", "steps-pre", "steps-post",
                    "steps-mid-x", "steps-mid-y")
 
+    #: Lines are only decimated when they have more than this many
+    #: points per pixel column in view.
+    decimationThreshold = 4
+
+    #: The number of zoom levels kept in the decimation cache.
+    decimationCacheSize = 4
+
     def __init__(self, points, **attr):
         PolyPoints.__init__(self, points, attr)
+        self._drawPoints = None
+
+    def decimate(self, xRange, scale):
+        """
+        Pick the points to draw for the x range in view.
+
+        Only the points in view are drawn, and when there are more of them
+        than ``decimationThreshold`` per pixel column, the line is reduced
+        to the first, min, max and last point of each pixel column (M4
+        decimation), which draws the same picture. The columns are cached
+        for each zoom level, so panning only has to compute the columns
+        that come into view.
+
+        Decimation needs the x values to be sorted, and is only done for
+        the ``'line'`` drawstyle. Otherwise, all the points are drawn.
+
+        :param xRange: The ``(minX, maxX)`` range in view, or None to draw
+                       all the points.
+        :param scale: The ``[x_scale, y_scale]`` in pixels per user unit.
+        """
+        self._drawPoints = None
+        self._syncSource()
+        if xRange is None or self.attributes.get('drawstyle') != 'line':
+            return
+        points = self._cache.get('decimation_points')
+        if points is None:
+            points = self.points
+            x = points[:, 0]
+            self._cache['decimation_points'] = points
+            self._cache['x_sorted'] = bool(len(x) < 2
+                                           or (np.diff(x) >= 0).all())
+        if not self._cache['x_sorted'] or len(points) < 2:
+            return
+
+        x = points[:, 0]
+        xMin, xMax = min(xRange), max(xRange)
+        # include one point on each side, so the line runs off the plot
+        first = max(np.searchsorted(x, xMin, 'left') - 1, 0)
+        last = min(np.searchsorted(x, xMax, 'right') + 1, len(x))
+        width = 1.0 / abs(scale[0])     # one pixel column, in user units
+        k0 = int(np.floor(xMin / width))
+        k1 = int(np.floor(xMax / width)) + 1
+        if last - first <= self.decimationThreshold * (k1 - k0):
+            self._drawPoints = points[first:last]
+            return
+
+        columns = self._m4Columns(x, points[:, 1], width, k0, k1)
+        index = np.concatenate(([first], np.sort(columns, 0).T.ravel(),
+                                [last - 1]))
+        index = index[index >= 0]
+        # drop repeats, the index is sorted already
+        index = index[np.concatenate(([True], np.diff(index) != 0))]
+        self._drawPoints = points[index]
+
+    def _m4Columns(self, x, y, width, k0, k1):
+        """
+        Returns the M4 points of columns k0 to k1, from the cache for this
+        zoom level, computing only the columns that are not in it.
+        """
+        levels = self._cache.setdefault('m4', {})
+        level = float("%.10g" % width)
+        cached = levels.pop(level, None)
+        if cached is not None and cached[0] <= k1 and k0 <= cached[1]:
+            c0, c1, columns = cached
+            parts = [columns]
+            if k0 < c0:
+                parts.insert(0, m4_columns(x, y, width, k0, c0))
+            if k1 > c1:
+                parts.append(m4_columns(x, y, width, c1, k1))
+            c0, c1 = min(k0, c0), max(k1, c1)
+            columns = np.concatenate(parts, 1)
+        else:
+            c0, c1 = k0, k1
+            columns = m4_columns(x, y, width, k0, k1)
+        # most recently used level last
+        levels[level] = (c0, c1, columns)
+        while len(levels) > self.decimationCacheSize:
+            del levels[next(iter(levels))]
+        return columns[:, k0 - c0:k1 - c0]
 
     def draw(self, dc, printerScale, coord=None):
         """
@@ -420,7 +731,12 @@ class PolyLine(PolyPoints):
         pen = wx.Pen(colour, int(width), style)
         pen.SetCap(wx.CAP_BUTT)
         dc.SetPen(pen)
-        if coord is None:
+        if coord is None and self._drawPoints is not None:
+            if len(self._drawPoints) >= 2:
+                scaled = (np.asarray(self.currentScale) * self._drawPoints
+                          + self.currentShift)
+                dc.DrawLines(scaled.astype(np.int32))
+        elif coord is None:
             if len(self.scaled):  # bugfix for Mac OS X
                 for c1, c2 in zip(self.scaled, self.scaled[1:]):
                     self._path(dc, c1, c2, drawstyle)
@@ -1279,6 +1595,15 @@ class PlotGraphics(object):
         for o in self.objects:
             o.scaleAndShift(scale, shift)
 
+    def decimate(self, xRange, scale):
+        """
+        Let the lines pick the points to draw for the x range in view, see
+        :meth:`~wx.lib.plot.polyobjects.PolyLine.decimate`.
+        """
+        for o in self.objects:
+            if hasattr(o, 'decimate'):
+                o.decimate(xRange, scale)
+
     def setPrinterScale(self, scale):
         """
         Thickens up lines and markers only for printing
@@ -324,6 +324,197 @@ def set_displayside(value):
     return DisplaySide(*_value)
 
 
+def m4_columns(x, y, width, k0, k1):
+    """
+    Finds the M4 points (first, min, max, last) of each column of data.
+
+    Column ``k`` holds the points with ``k * width <= x < (k + 1) * width``.
+    Drawing a line through the M4 points of each pixel column gives the
+    same picture as drawing every point, so this is used to decimate large
+    :class:`~wx.lib.plot.polyobjects.PolyLine` objects.
+
+    :param np.array `x`:   The x values, sorted in ascending order
+    :param np.array `y`:   The y values
+    :param float `width`:  The width of a column, in the units of `x`
+    :param int `k0`:       The first column
+    :param int `k1`:       One past the last column
+
+    :returns: A ``(4, k1 - k0)`` array with the indices of the first, min,
+              max and last point of each column, or -1 for empty columns.
+    :rtype: np.array
+    """
+    edges = np.arange(k0, k1 + 1) * width
+    bounds = np.searchsorted(x, edges, 'left')
+    starts, ends = bounds[:-1], bounds[1:]
+    result = np.full((4, len(starts)), -1, np.intp)
+    filled = ends > starts
+    if not filled.any():
+        return result
+    starts, ends = starts[filled], ends[filled]
+    counts = ends - starts
+    # the filled columns are contiguous in the data
+    data = y[starts[0]:ends[-1]]
+    offsets = starts - starts[0]
+
+    def locate(values):
+        # first index in each column that holds its value
+        where = np.flatnonzero(data == np.repeat(values, counts))
+        found = np.searchsorted(where, offsets)
+        index = where[np.minimum(found, len(where) - 1)] if len(where) else offsets
+        # all NaN columns: use the first point
+        return np.where((index >= offsets) & (index < offsets + counts),
+                        index, offsets) + starts[0]
+
+    result[0, filled] = starts
+    result[1, filled] = locate(np.fmin.reduceat(data, offsets))
+    result[2, filled] = locate(np.fmax.reduceat(data, offsets))
+    result[3, filled] = ends - 1
+    return result
+
+
+class SortedXIndex(object):
+    """
+    Finds the point closest to a given point, for points sorted by x.
+
+    A bisection on x finds a nearby point, and the distance to it limits the
+    search to the points whose x value is at most that far away.
+
+    :param points: The ``(x, y)`` points, in ascending order of x.
+    :type points: :class:`np.array` of shape ``(N, 2)``
+    """
+    def __init__(self, points):
+        self.points = np.asarray(points, np.float64)
+        self.x = self.points[:, 0]
+
+    def nearest(self, point):
+        """
+        Returns ``(index, distance)`` of the point closest to `point`.
+        """
+        point = np.asarray(point, np.float64)
+        n = len(self.x)
+        i = np.searchsorted(self.x, point[0])
+        lo, hi = max(i - 1, 0), min(i + 1, n)
+        d = self.points[lo:hi] - point
+        bound = np.sqrt((d ** 2).sum(1)).min()
+        lo = np.searchsorted(self.x, point[0] - bound, 'left')
+        hi = np.searchsorted(self.x, point[0] + bound, 'right')
+        d = self.points[lo:hi] - point
+        dist = np.sqrt((d ** 2).sum(1))
+        j = np.argmin(dist)
+        return lo + j, dist[j]
+
+
+class KDTree(object):
+    """
+    Finds the point closest to a given point, for points in any order.
+
+    A simple 2-d tree: each node splits its points in two halves along its
+    widest axis, down to leaves of ``leafSize`` points, which are searched
+    all at once.
+
+    :param points: The ``(x, y)`` points.
+    :type points: :class:`np.array` of shape ``(N, 2)``
+    """
+    #: The largest number of points in a leaf of the tree.
+    leafSize = 32
+
+    def __init__(self, points):
+        self.points = np.asarray(points, np.float64)
+        # the index of the points, grouped by leaf
+        self.order = np.arange(len(self.points))
+        # (start, end, axis, split, left, right), axis is -1 for leaves
+        self._nodes = []
+        # contiguous copies of x and y are much faster to work with
+        self._x = np.ascontiguousarray(self.points[:, 0])
+        self._y = np.ascontiguousarray(self.points[:, 1])
+        self._build(0, len(self.points))
+
+    def _build(self, start, end):
+        node = len(self._nodes)
+        if end - start <= self.leafSize:
+            self._nodes.append((start, end, -1, 0.0, -1, -1))
+            return node
+        self._nodes.append(None)
+        order = self.order[start:end]
+        x, y = self._x[order], self._y[order]
+        values = x if x.max() - x.min() >= y.max() - y.min() else y
+        axis = 0 if values is x else 1
+        mid = (end - start) // 2
+        part = np.argpartition(values, mid)
+        order[:] = order[part]
+        split = values[part[mid]]
+        left = self._build(start, start + mid)
+        right = self._build(start + mid, end)
+        self._nodes[node] = (start, end, axis, split, left, right)
+        return node
+
+    def nearest(self, point):
+        """
+        Returns ``(index, distance)`` of the point closest to `point`.
+        """
+        point = np.asarray(point, np.float64)
+        best, bestDist = 0, np.inf
+        # nodes to visit, with a lower bound of their distance to point
+        stack = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if bound > bestDist:
+                continue
+            start, end, axis, split, left, right = self._nodes[node]
+            if axis < 0:
+                index = self.order[start:end]
+                d = self.points[index] - point
+                dist = np.sqrt((d ** 2).sum(1))
+                closest = dist.min()
+                if closest <= bestDist:
+                    # the lowest index, when several are as close
+                    j = index[dist == closest].min()
+                    if closest < bestDist or j < best:
+                        best, bestDist = j, closest
+                continue
+            diff = point[axis] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            stack.append((far, max(bound, abs(diff))))
+            stack.append((near, bound))
+        return best, bestDist
+
+
+def nearest_point_index(points):
+    """
+    Makes an index to find the point closest to a given point.
+
+    The index has a ``nearest(point)`` method that returns the ``(index,
+    distance)`` of the closest point, like a search of all the points would,
+    in ``O(log N)`` time. Points that are not finite are never found.
+
+    :param points: The ``(x, y)`` points.
+    :type points: :class:`np.array` of shape ``(N, 2)``
+    :returns: a :class:`SortedXIndex` if the x values are in ascending order,
+              and a :class:`KDTree` otherwise.
+    """
+    points = np.asarray(points, np.float64)
+    finite = np.isfinite(points).all(1)
+    if len(points) and finite.all():
+        x = points[:, 0]
+        if (np.diff(x) >= 0).all():
+            return SortedXIndex(points)
+        return KDTree(points)
+    return _SubsetIndex(np.flatnonzero(finite), points[finite])
+
+
+class _SubsetIndex(object):
+    """ Searches a subset of the points, with the indices of all of them """
+    def __init__(self, index, points):
+        self.index = index
+        self.subset = nearest_point_index(points) if len(points) else None
+
+    def nearest(self, point):
+        if self.subset is None:
+            return 0, np.nan
+        j, dist = self.subset.nearest(point)
+        return self.index[j], dist
+
+
 def pairwise(iterable):
     "s -> (s0,s1), (s1,s2), (s2, s3), ..."
     a, b = itertools.tee(iterable)
@@ -61,6 +61,11 @@ class NotificationMgr:
             for handler in self.__handlers:
                 handler.notifyUnsubscribe(*args, **kwargs)
 
+    def isNotifyingSend(self):
+        """Return True if notifySend() would call any handler. Used to skip
+        the send notifications entirely when there is nobody to notify."""
+        return bool(self.__notifyOnSend and self.__handlers)
+
     def notifySend(self, *args, **kwargs):
         if self.__notifyOnSend and self.__handlers:
             for handler in self.__handlers:
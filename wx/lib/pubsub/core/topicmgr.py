@@ -73,6 +73,7 @@ class TopicManager:
         called by an instance of Publisher (see Publisher.getTopicManager())."""
         self.__allTopics = None # root of topic tree
         self._topicsMap = {} # registry of all topics
+        self.__topicCache = {} # topics found by getTopic(), by name given
         self.__treeConfig = treeConfig or TreeConfig()
         self.__defnProvider = _MasterTopicDefnProvider(self.__treeConfig)
 
@@ -127,11 +128,20 @@ class TopicManager:
         """Get the Topic instance for the given topic name. By default, raises
         an TopicNameError exception if a topic with given name doesn't exist. If
         okIfNone=True, returns None instead of raising an exception."""
+        # sendMessage() gets here for every message, so remember the topic
+        # for the name as given, to skip converting it to dotted form
+        try:
+            return self.__topicCache[name]
+        except (KeyError, TypeError):
+            pass
+
         topicNameDotted = stringize(name)
         #if not name:
         #    raise TopicNameError(name, 'Empty topic name not allowed')
         obj = self._topicsMap.get(topicNameDotted, None)
         if obj is not None:
+            if isinstance(name, (str, tuple)):
+                self.__topicCache[name] = obj
             return obj
 
         if okIfNone:
@@ -276,6 +286,7 @@ class TopicManager:
 
         #obj()._undefineSelf_(self._topicsMap)
         obj._undefineSelf_(self._topicsMap)
+        self.__topicCache.clear()
         #assert obj() is None
 
         return True
@@ -90,6 +90,8 @@ class Topic(PublisherMixin):
         # Listener instance which satisfies Listener == callable, and will return
         # the Listener. 
         self.__listeners = dict()
+        # the listeners to send messages to, see __getSendPlan()
+        self.__sendPlan = None
 
         # specification:
         self.__description  = None
@@ -302,6 +304,7 @@ class Topic(PublisherMixin):
             weakListener = Listener(
                 listener, argsInfo, onDead=self.__onDeadListener)
             self.__listeners[weakListener] = weakListener
+            self.__listenersChanged()
             subdLisnr, newSub = weakListener, True
 
         # notify of subscription
@@ -319,6 +322,7 @@ class Topic(PublisherMixin):
         unsubdLisnr = self.__listeners.pop(listener, None)
         if unsubdLisnr is None: 
             return None
+        self.__listenersChanged()
 
         unsubdLisnr._unlinkFromTopic_()
         assert listener == unsubdLisnr.getCallable()
@@ -346,6 +350,8 @@ class Topic(PublisherMixin):
                     unsubd.append(listener)
                     listener._unlinkFromTopic_()
                     del self.__listeners[listener]
+        if unsubd:
+            self.__listenersChanged()
 
         # send notification regarding all listeners actually unsubscribed
         notificationMgr = self._treeConfig.notificationMgr
@@ -369,32 +375,59 @@ class Topic(PublisherMixin):
         If an exception is raised in a listener, the publish is
         aborted, except if there is a handler (see
         pub.setListenerExcHandler)."""
-        self._treeConfig.notificationMgr.notifySend('pre', self)
+        notificationMgr = self._treeConfig.notificationMgr
+        # don't make the notification calls at all if nobody is notified
+        notify = notificationMgr.isNotifyingSend()
+        if notify:
+            notificationMgr.notifySend('pre', self)
+
+        listeners, parents = self.__getSendPlan()
 
         # send to ourself
         iterState = self._mix_prePublish(data)
-        self.__sendMessage(data, self, iterState)
-
-        # send up the chain
-        topicObj = self.getParent()
-        while topicObj is not None:
-            if topicObj.hasListeners():
-                iterState = self._mix_prePublish(data, topicObj, iterState)
-                self.__sendMessage(data, topicObj, iterState)
-
-            # done for this topic, continue up branch to parent towards root
-            topicObj = topicObj.getParent()
-
-        self._treeConfig.notificationMgr.notifySend('post', self)
-
-    def __sendMessage(self, data, topicObj, iterState):
+        self.__sendMessage(data, self, listeners, iterState, notify)
+
+        # send up the chain, to the parents that have listeners
+        for topicObj, listeners in parents:
+            iterState = self._mix_prePublish(data, topicObj, iterState)
+            self.__sendMessage(data, topicObj, listeners, iterState, notify)
+
+        if notify:
+            notificationMgr.notifySend('post', self)
+
+    def __getSendPlan(self):
+        """Get the listeners to send messages to: a tuple of our listeners,
+        and a tuple of (topic, listeners) for the parents up the chain that
+        have listeners. These are kept until a listener is subscribed or
+        unsubscribed anywhere in the topic tree, so sending a message doesn't
+        have to walk up the tree or copy the lists of listeners."""
+        version = self._treeConfig.listenersVersion
+        plan = self.__sendPlan
+        if plan is None or plan[0] != version:
+            parents = []
+            topicObj = self.getParent()
+            while topicObj is not None:
+                if topicObj.hasListeners():
+                    parents.append((topicObj, tuple(topicObj.getListeners())))
+                topicObj = topicObj.getParent()
+            plan = (version, tuple(self.__listeners), tuple(parents))
+            self.__sendPlan = plan
+        return plan[1], plan[2]
+
+    def __listenersChanged(self):
+        """Make all topics of the tree rebuild their send plan."""
+        self._treeConfig.listenersVersion += 1
+
+    def __sendMessage(self, data, topicObj, listeners, iterState, notify):
         # now send message data to each listener for current topic;
-        # use list of listeners rather than iterator, so that if listeners added/removed during
+        # the listeners are a tuple, so that if listeners added/removed during
         # send loop, no runtime exception:
-        for listener in topicObj.getListeners():
+        callListener = self._mix_callListener
+        for listener in listeners:
             try:
-                self._treeConfig.notificationMgr.notifySend('in', topicObj, pubListener=listener)
-                self._mix_callListener(listener, data, iterState)
+                if notify:
+                    self._treeConfig.notificationMgr.notifySend('in', topicObj, pubListener=listener)
+                callListener(listener, data, iterState)
 
             except Exception:
                 # if exception handling is on, handle, otherwise re-raise
@@ -463,6 +496,7 @@ class Topic(PublisherMixin):
     def __onDeadListener(self, weakListener):
         """One of our subscribed listeners has died, so remove it and notify"""
         pubListener = self.__listeners.pop(weakListener)
+        self.__listenersChanged()
         # notify:
         self._treeConfig.notificationMgr.notifyDeadListener(pubListener, self)
 
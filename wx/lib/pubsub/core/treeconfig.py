@@ -17,5 +17,9 @@ class TreeConfig:
         self.notificationMgr = NotificationMgr(notificationHandler)
         self.listenerExcHandler = listenerExcHandler
         self.raiseOnTopicUnspecified = False
+        # incremented whenever a listener is subscribed or unsubscribed
+        # anywhere in the tree, so that topics know when to rebuild the
+        # listener lists they cache for sending messages
+        self.listenersVersion = 0
 
 
@@ -6,6 +6,7 @@ __author__ += "David N. Mashburn <david.n.mashburn@gmail.com>"
 
 import os
 import sys
+import types
 from code import InteractiveInterpreter, compile_command
 from . import dispatcher
 from . import introspect
@@ -69,6 +70,12 @@ class Interpreter(InteractiveInterpreter):
             self.more=False
         else:
             more = self.more = self.runsource(source)
+        if not more and 'import' in source:
+            # Look up the names of the imported modules when idle,
+            # for the auto-completion.
+            introspect.warmAttributeCache(
+                [obj for obj in list(self.locals.values())
+                 if isinstance(obj, types.ModuleType)])
         dispatcher.send(signal='Interpreter.push', sender=self,
                         command=command, more=more, source=source)
         return more
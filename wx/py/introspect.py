@@ -5,17 +5,21 @@ __author__ = "Patrick K. O'Brien <pobrien@orbtech.com>"
 
 import re
 import sys
+import bisect
 import inspect
 import tokenize
 import types
+import weakref
 import wx
 from io import BytesIO
 
 def getAutoCompleteList(command='', locals=None, includeMagic=1,
-                        includeSingle=1, includeDouble=1):
+                        includeSingle=1, includeDouble=1, prefix=''):
     """Return list of auto-completion options for command.
 
-    The list of options will be based on the locals namespace."""
+    The list of options will be based on the locals namespace. If
+    prefix is given only the options starting with it, ignoring the
+    case, are returned."""
     attributes = []
     # Get the proper chunk of code from the command.
     root = getRoot(command, terminator='.')
@@ -28,12 +32,144 @@ def getAutoCompleteList(command='', locals=None, includeMagic=1,
         pass
     else:
         attributes = getAttributeNames(obj, includeMagic,
-                                       includeSingle, includeDouble)
+                                       includeSingle, includeDouble, prefix)
     return attributes
 
+# The attribute names of the objects already seen, so they are not
+# looked up again for every auto-completion popup. The entries are
+# removed when their object is deleted.
+_attributeCache = {}  # (id(obj), type(obj)): AttributeIndex
+
+class AttributeIndex:
+    """The sorted attribute names of an object, with a sorted list of
+    their upper case versions to find the names starting with a prefix."""
+
+    def __init__(self, names, signature=None, ref=None):
+        self.names = names
+        self.keys = [name.upper() for name in names]
+        self.signature = signature
+        self.ref = ref
+        self.filtered = {}  # (includeSingle, includeDouble): [names]
+
+    def getNames(self, includeSingle=1, includeDouble=1, prefix=''):
+        """Return a list of the names, starting with prefix when given."""
+        if prefix:
+            key = prefix.upper()
+            start = bisect.bisect_left(self.keys, key)
+            end = bisect.bisect_right(self.keys, key + '\U0010ffff', start)
+            names = self.names[start:end]
+        else:
+            names = self.filtered.get((includeSingle, includeDouble))
+            if names is not None:
+                return list(names)
+            names = self.names
+        if not includeSingle:
+            names = [item for item in names
+                     if item[0]!='_' or item[1:2]=='_']
+        if not includeDouble:
+            names = [item for item in names if item[:2]!='__']
+        if not prefix:
+            self.filtered[(includeSingle, includeDouble)] = names
+        return list(names)
+
 def getAttributeNames(obj, includeMagic=1, includeSingle=1,
-                      includeDouble=1):
-    """Return list of unique attributes, including inherited, for obj."""
+                      includeDouble=1, prefix=''):
+    """Return list of unique attributes, including inherited, for obj.
+
+    The names are cached until the attribute names of obj or its
+    classes change."""
+    index = getAttributeIndex(obj, includeMagic)
+    return index.getNames(includeSingle, includeDouble, prefix)
+
+def getAttributeIndex(obj, includeMagic=1):
+    """Return the AttributeIndex of obj, from the cache if it is still
+    valid."""
+    key = (id(obj), type(obj))
+    signature = getAttributeSignature(obj)
+    index = _attributeCache.get(key)
+    if index is not None and index.ref() is obj \
+       and signature is not None and index.signature == signature:
+        return index
+    index = AttributeIndex(findAttributeNames(obj, includeMagic))
+    # Looking up some attributes adds them, like __annotations__ of
+    # the modules, so take the signature again.
+    signature = getAttributeSignature(obj)
+    if signature is not None and isAttributeCacheable(obj):
+        try:
+            index.ref = weakref.ref(
+                obj, lambda ref, key=key: _attributeCache.pop(key, None))
+        except TypeError:
+            # Not all the objects can be weakly referenced.
+            pass
+        else:
+            index.signature = signature
+            _attributeCache[key] = index
+    return index
+
+def getAttributeSignature(obj):
+    """Return a tuple which changes when the names in the __dict__ of
+    obj or its classes change, or None if there isn't one.
+
+    It holds the hash of the names of each __dict__, so an attribute
+    replaced by another one, or a module reloaded with other names, is
+    noticed. Names added without going through a __dict__, like those
+    of a __getattr__ or __dir__, are not."""
+    try:
+        classes = type(obj).__mro__
+        if isinstance(obj, type):
+            classes = obj.__mro__ + classes
+        signature = [hash(tuple(klass.__dict__)) for klass in classes]
+    except Exception:
+        return None
+    try:
+        signature.append(hash(tuple(obj.__dict__)))
+    except Exception:  # Must catch all because object might have __getattr__.
+        pass
+    return tuple(signature)
+
+def isAttributeCacheable(obj):
+    """Return True if the attribute names of obj can be cached.
+
+    They can't for the objects which make up their attributes."""
+    if hasattrAlwaysReturnsTrue(obj):
+        return False
+    for name in ('_getAttributeNames', 'trait_get'):
+        try:
+            if hasattr(obj, name):
+                return False
+        except Exception:
+            return False
+    return True
+
+def clearAttributeCache():
+    """Forget the attribute names of all the objects."""
+    _attributeCache.clear()
+
+def warmAttributeCache(objects):
+    """Look up the attribute names of objects, one at a time from the
+    event loop, so they are cached before the first auto-completion
+    popup.
+
+    This stays on the main thread, as the look up may run code of the
+    objects, like the __getattr__ of a module. Nothing is done if there
+    is no wx.App."""
+    objects = [obj for obj in objects
+               if (id(obj), type(obj)) not in _attributeCache]
+    if objects and wx.GetApp() is not None:
+        wx.CallAfter(_warmAttributeCache, objects)
+
+def _warmAttributeCache(objects):
+    obj = objects.pop(0)
+    try:
+        getAttributeIndex(obj)
+    except Exception:
+        pass
+    if objects:
+        wx.CallAfter(_warmAttributeCache, objects)
+
+def findAttributeNames(obj, includeMagic=1):
+    """Return sorted list of unique attributes, including inherited,
+    for obj."""
     attributes = []
     dict = {}
     if not hasattrAlwaysReturnsTrue(obj):
@@ -85,11 +221,6 @@ def getAttributeNames(obj, includeMagic=1, includeSingle=1,
     attributes = [attribute for attribute in attributes
                   if type(attribute) == str]
     attributes.sort(key=lambda x: x.upper())
-    if not includeSingle:
-        attributes = filter(lambda item: item[0]!='_' \
-                            or item[1:2]=='_', attributes)
-    if not includeDouble:
-        attributes = filter(lambda item: item[:2]!='__', attributes)
     return attributes
 
 def hasattrAlwaysReturnsTrue(obj):
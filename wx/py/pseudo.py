@@ -2,6 +2,9 @@
 
 __author__ = "Patrick K. O'Brien <pobrien@orbtech.com>"
 
+import threading
+import time
+
 
 class PseudoKeyword:
     """A callable class that calls a method passed as a parameter.
@@ -97,3 +100,47 @@ class PseudoFileErr(PseudoFile):
 
     def isatty(self):
         return 1
+
+
+class OutputBuffer:
+    """Collects the text written to the pseudo files, from any thread, so
+    that it can be displayed in one batch instead of one write at a time.
+
+    display is called by flush with the kind of the output ('Output' or
+    'Error') and the text, once for each run of writes of the same kind.
+    schedule is called by write, from the writing thread, when text is
+    added to an empty buffer. It should arrange for flush to be called
+    soon from the GUI thread."""
+
+    def __init__(self, display, schedule=None):
+        if callable(display):
+            self.display = display
+        else:
+            raise ValueError('display must be callable')
+        self.schedule = schedule
+        self.lock = threading.Lock()
+        self.chunks = []
+        self.lastFlush = time.time()
+
+    def write(self, text, kind='Output'):
+        """Add text to the buffer."""
+        with self.lock:
+            empty = not self.chunks
+            if self.chunks and self.chunks[-1][0] == kind:
+                self.chunks[-1][1].append(text)
+            else:
+                self.chunks.append((kind, [text]))
+        if empty and self.schedule is not None:
+            self.schedule()
+
+    def flush(self):
+        """Display the text collected since the last flush."""
+        with self.lock:
+            chunks, self.chunks = self.chunks, []
+        self.lastFlush = time.time()
+        for kind, texts in chunks:
+            self.display(kind, ''.join(texts))
+
+    def pending(self):
+        """Return True if there is text waiting to be displayed."""
+        return bool(self.chunks)
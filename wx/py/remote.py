@@ -0,0 +1,514 @@
+"""An interpreter running in a child process, for the shells.
+
+RemoteInterpreter can be given as the InterpClass of a Shell or of the
+frames using one. The commands then run in another Python process, so a
+long computation doesn't freeze the window: the output is displayed while
+it runs, and Escape or Ctrl+Break interrupts it. Auto-completion and call
+tips are asked to the child process too, and give up after a timeout.
+
+    from wx.py.shell import ShellFrame
+    from wx.py.remote import RemoteInterpreter
+
+    frame = ShellFrame(InterpClass=RemoteInterpreter)
+
+The user namespace lives in the child process, so the objects of the
+application are not available in it, and the locals argument of the shell
+is not used. The two processes talk through a local socket, one JSON
+message per line. The output written to the file descriptors of the child
+by C code is read from its stdout and stderr pipes."""
+
+import ast
+import json
+import os
+import queue
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import weakref
+
+from . import dispatcher
+
+# Seconds to wait for the child process to start.
+START_TIMEOUT = 30
+# Seconds to wait for the answer to an auto-completion or call tip query.
+QUERY_TIMEOUT = 0.5
+# Seconds between the output messages sent by the child process.
+OUTPUT_FLUSH_TIME = 0.05
+
+
+class Connection:
+    """Sends and receives the JSON messages on a socket."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.reader = sock.makefile('r', encoding='utf-8', newline='\n')
+        self.lock = threading.Lock()
+
+    def send(self, **message):
+        data = (json.dumps(message) + '\n').encode('utf-8')
+        with self.lock:
+            self.sock.sendall(data)
+
+    def receive(self):
+        """Return the next message, or None when the other side is gone."""
+        line = self.reader.readline()
+        if not line:
+            return None
+        return json.loads(line)
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.reader.close()
+        self.sock.close()
+
+
+class RemoteInterpreter:
+    """Interpreter running the commands in a child process.
+
+    It has the same methods as interpreter.Interpreter."""
+
+    def __init__(self, locals=None, rawin=None,
+                 stdin=sys.stdin, stdout=sys.stdout, stderr=sys.stderr,
+                 showInterpIntro=True, python=None):
+        """Create an interpreter and start its child process.
+
+        python is the Python executable to run, by default the one
+        running the application."""
+        # Only seen by the parent, for compatibility with Interpreter.
+        self.locals = {} if locals is None else locals
+        self.rawin = rawin
+        self.stdin = stdin
+        self.stdout = stdout
+        self.stderr = stderr
+        self.python = python or sys.executable
+        self.showInterpIntro = showInterpIntro
+        self.introText = ''
+        self.more = False
+        self.startupScript = None
+        self.queryTimeout = QUERY_TIMEOUT
+
+        self.process = None
+        self.connection = None
+        self.lastId = 0
+        self.pending = {}       # request id --> [threading.Event, result]
+        # The prompts of the input requests of the child, read by _wait in
+        # the main thread. None only wakes _wait up.
+        self.inputRequests = queue.Queue()
+        self.lock = threading.Lock()
+        self.running = 0
+        self.start()
+
+    def start(self):
+        """Start the child process."""
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            listener.bind(('127.0.0.1', 0))
+            listener.listen(1)
+            listener.settimeout(START_TIMEOUT)
+            token = os.urandom(16).hex()
+
+            kwds = {}
+            if sys.platform == 'win32':
+                # needed to send it CTRL_BREAK_EVENT
+                kwds['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP
+            port = listener.getsockname()[1]
+            self.process = subprocess.Popen(
+                [self.python, '-u', '-m', 'wx.py.remote', str(port), token],
+                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE, **kwds)
+
+            # Only accept the connection of our child.
+            try:
+                while True:
+                    sock, address = listener.accept()
+                    sock.settimeout(START_TIMEOUT)
+                    connection = Connection(sock)
+                    try:
+                        hello = connection.receive()
+                    except (OSError, ValueError):
+                        hello = None
+                    if hello and hello.get('token') == token:
+                        break
+                    connection.close()
+            except Exception:
+                self.process.kill()
+                self.process = None
+                raise
+        finally:
+            listener.close()
+
+        sock.settimeout(None)
+        self.connection = connection
+        if self.showInterpIntro:
+            self.introText = hello['intro']
+        sys.ps1 = hello['ps1']
+        sys.ps2 = hello['ps2']
+
+        for target, args in [(self._readMessages, (connection,)),
+                             (self._readPipe, (self.process.stdout, 'stdout')),
+                             (self._readPipe, (self.process.stderr, 'stderr'))]:
+            thread = threading.Thread(target=target, args=args)
+            thread.daemon = True
+            thread.start()
+
+        self._finalizer = weakref.finalize(self, _stop, self.process, connection)
+
+    def isAlive(self):
+        """Return True if the child process is running."""
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self):
+        """Stop the child process."""
+        if self.process is not None:
+            self._finalizer()
+            self.process = None
+
+    def interrupt(self):
+        """Interrupt the command running in the child process."""
+        if self.running and self.isAlive():
+            if sys.platform == 'win32':
+                self.process.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                self.process.send_signal(signal.SIGINT)
+
+    def _request(self, op, **kwds):
+        with self.lock:
+            self.lastId += 1
+            id = self.lastId
+            self.pending[id] = [threading.Event(), None]
+        try:
+            self.connection.send(op=op, id=id, **kwds)
+        except OSError:
+            self.pending.pop(id)[0].set()
+            return None
+        return id
+
+    def _result(self, id):
+        return self.pending.pop(id)[1]
+
+    def _readMessages(self, connection):
+        while True:
+            try:
+                message = connection.receive()
+            except (OSError, ValueError):
+                message = None
+            if message is None:
+                break
+            op = message['op']
+            if op == 'output':
+                stream = self.stderr if message['kind'] == 'Error' else self.stdout
+                stream.write(message['text'])
+            elif op == 'result':
+                item = self.pending.get(message['id'])
+                if item is not None:
+                    item[1] = message['value']
+                    item[0].set()
+                    self.inputRequests.put(None)
+            elif op == 'input':
+                self.inputRequests.put(message['prompt'])
+
+        # The child process is gone, wake up everybody waiting for it.
+        for event, result in list(self.pending.values()):
+            event.set()
+        self.inputRequests.put(None)
+
+    def _readPipe(self, pipe, name):
+        stream = self.stderr if name == 'stderr' else self.stdout
+        while True:
+            data = pipe.read1(65536) if hasattr(pipe, 'read1') else pipe.read(4096)
+            if not data:
+                break
+            stream.write(data.decode('utf-8', 'replace'))
+
+    def _readInput(self, prompt):
+        if self.rawin is not None:
+            try:
+                text = self.rawin(prompt)
+            except Exception:
+                text = None
+        else:
+            self.stdout.write(prompt)
+            text = self.stdin.readline()
+        try:
+            self.connection.send(op='input', text=text)
+        except OSError:
+            pass
+
+    def _wait(self, id, timeout=None):
+        """Wait for the result of a request. When there is no timeout the
+        events are processed and the input asked by the command is read
+        while waiting.
+
+        The input is read from here rather than from an event, as the
+        rawin of a Shell processes the events itself, which it can't do
+        from inside a Yield."""
+        event = self.pending[id][0]
+        if timeout is not None:
+            return event.wait(timeout)
+
+        import wx
+        app = wx.GetApp()
+        while not event.is_set():
+            if app is not None:
+                app.Yield(onlyIfNeeded=True)
+            try:
+                prompt = self.inputRequests.get(timeout=0.02 if app else None)
+            except queue.Empty:
+                continue
+            if prompt is not None:
+                self._readInput(prompt)
+        return True
+
+    def push(self, command, astMod=None):
+        """Send command to the interpreter to be executed.
+
+        The events are processed until the command has run, so the
+        output is displayed as it comes and the command can be
+        interrupted."""
+        if not self.isAlive():
+            self.stderr.write('The interpreter process has stopped, '
+                              'starting a new one.\n')
+            self.stop()
+            self.start()
+
+        if astMod is not None:
+            command = ast.unparse(astMod)
+        id = self._request('push', command=command)
+        if id is None:
+            return False
+        self.running += 1
+        try:
+            self._wait(id)
+        finally:
+            self.running -= 1
+        result = self._result(id)
+        more = self.more = bool(result)
+        dispatcher.send(signal='Interpreter.push', sender=self,
+                        command=command, more=more, source=command)
+        return more
+
+    def getAutoCompleteKeys(self):
+        """Return list of auto-completion keycodes."""
+        return [ord('.')]
+
+    def getAutoCompleteList(self, command='', *args, **kwds):
+        """Return list of auto-completion options for a command.
+
+        The list is empty if the child process doesn't answer within
+        queryTimeout seconds."""
+        id = self._request('complete', command=command, options=kwds)
+        if id is None or not self._wait(id, self.queryTimeout):
+            self.pending.pop(id, None)
+            return []
+        return self._result(id) or []
+
+    def getCallTip(self, command='', *args, **kwds):
+        """Return call tip text for a command.
+
+        The call tip is empty if the child process doesn't answer within
+        queryTimeout seconds."""
+        id = self._request('calltip', command=command, options=kwds)
+        if id is None or not self._wait(id, self.queryTimeout):
+            self.pending.pop(id, None)
+            return ('', '', '')
+        result = self._result(id)
+        return tuple(result) if result else ('', '', '')
+
+
+def _stop(process, connection):
+    try:
+        connection.send(op='quit')
+    except OSError:
+        pass
+    connection.close()
+    try:
+        process.wait(1)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+#----------------------------------------------------------------------
+# The child process
+
+class _RemoteFile:
+    """The stdout and stderr of the commands run by the child."""
+
+    encoding = 'utf-8'
+
+    def __init__(self, output, kind):
+        self.output = output
+        self.kind = kind
+
+    def write(self, text):
+        self.output.write(str(text), self.kind)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return True
+
+
+class _RemoteStdin:
+    """The stdin of the commands run by the child, reading from the shell."""
+
+    def __init__(self, server):
+        self.server = server
+
+    def readline(self, size=-1):
+        """Return a line ending with a newline, or '' at the end of input."""
+        try:
+            return self.server.input('') + '\n'
+        except EOFError:
+            return ''
+
+    def readlines(self):
+        """Return the lines up to a blank line or the end of input."""
+        lines = []
+        while True:
+            line = self.readline()
+            if not line:
+                break
+            lines.append(line)
+            if line == '\n':
+                break
+        return lines
+
+    def isatty(self):
+        return True
+
+
+class _Server:
+    """Runs the commands received from the parent in the main thread, and
+    answers the queries from a reader thread, even while a command runs."""
+
+    def __init__(self, connection):
+        import builtins
+        from .pseudo import OutputBuffer
+        from .interpreter import Interpreter
+
+        self.connection = connection
+        self.running = False
+        self.commands = queue.Queue()
+        self.inputs = queue.Queue()
+        self.sendLock = threading.Lock()
+        self.output = OutputBuffer(self._sendOutput)
+
+        namespace = {'__name__': '__main__', '__builtins__': builtins}
+        self.interp = Interpreter(locals=namespace, rawin=self.input,
+                                  stdin=_RemoteStdin(self),
+                                  stdout=_RemoteFile(self.output, 'Output'),
+                                  stderr=_RemoteFile(self.output, 'Error'))
+        builtins.input = self.input
+
+    def _sendOutput(self, kind, text):
+        self.connection.send(op='output', kind=kind, text=text)
+
+    def flush(self):
+        # one flush at a time, so the output stays in order
+        with self.sendLock:
+            self.output.flush()
+
+    def input(self, prompt=''):
+        self.flush()
+        self.connection.send(op='input', prompt=str(prompt))
+        text = self.inputs.get()
+        if text is None:
+            raise EOFError
+        return text.rstrip('\n')
+
+    def _flushLoop(self):
+        event = threading.Event()
+        while not event.wait(OUTPUT_FLUSH_TIME):
+            self.flush()
+
+    def _readLoop(self):
+        while True:
+            try:
+                message = self.connection.receive()
+            except (OSError, ValueError):
+                message = None
+            if message is None or message['op'] == 'quit':
+                self.commands.put(None)
+                self.inputs.put(None)
+                return
+
+            op = message['op']
+            if op == 'push':
+                self.commands.put(message)
+            elif op == 'input':
+                self.inputs.put(message['text'])
+            elif op in ('complete', 'calltip'):
+                try:
+                    if op == 'complete':
+                        value = self.interp.getAutoCompleteList(
+                            message['command'], **message['options'])
+                    else:
+                        value = list(self.interp.getCallTip(
+                            message['command'], **message['options']))
+                except Exception:
+                    value = None
+                self.connection.send(op='result', id=message['id'], value=value)
+
+    def _onInterrupt(self, signum, frame):
+        # Only interrupt the commands, not the messages being sent.
+        if self.running:
+            raise KeyboardInterrupt
+
+    def run(self):
+        if sys.platform == 'win32':
+            signal.signal(signal.SIGBREAK, self._onInterrupt)
+        signal.signal(signal.SIGINT, self._onInterrupt)
+
+        for target in (self._readLoop, self._flushLoop):
+            thread = threading.Thread(target=target)
+            thread.daemon = True
+            thread.start()
+
+        while True:
+            try:
+                message = self.commands.get()
+                if message is None:
+                    break
+                self.running = True
+                try:
+                    more = self.interp.push(message['command'])
+                except SystemExit:
+                    self.running = False
+                    self.flush()
+                    self.connection.send(op='result', id=message['id'], value=False)
+                    break
+                finally:
+                    self.running = False
+                self.flush()
+                self.connection.send(op='result', id=message['id'], value=more)
+            except KeyboardInterrupt:
+                # interrupted while waiting for a command
+                pass
+
+
+def main(port, token):
+    sock = socket.create_connection(('127.0.0.1', port))
+    connection = Connection(sock)
+    copyright = 'Type "help", "copyright", "credits" or "license"'
+    copyright += ' for more information.'
+    intro = 'Python %s on %s (child process %d)%s%s' % \
+            (sys.version, sys.platform, os.getpid(), os.linesep, copyright)
+    sys.ps1 = getattr(sys, 'ps1', '>>> ')
+    sys.ps2 = getattr(sys, 'ps2', '... ')
+    connection.send(token=token, intro=intro, ps1=str(sys.ps1), ps2=str(sys.ps2))
+    _Server(connection).run()
+    connection.close()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]), sys.argv[2])
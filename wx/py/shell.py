@@ -22,6 +22,7 @@ from . import frame
 from .pseudo import PseudoFileIn
 from .pseudo import PseudoFileOut
 from .pseudo import PseudoFileErr
+from .pseudo import OutputBuffer
 from .version import VERSION
 from .magic import magic
 from .path import ls,cd,pwd,sx
@@ -30,6 +31,10 @@ sys.ps3 = '<-- '  # Input prompt.
 USE_MAGIC=True
 # Force updates from long-running commands after this many seconds
 PRINT_UPDATE_MAX_TIME=2
+# Display the output of long-running commands after this many seconds
+OUTPUT_FLUSH_TIME=0.1
+# The oldest lines are deleted when the shell has more lines than this
+MAX_SCROLLBACK_LINES=100000
 
 NAVKEYS = (wx.WXK_END, wx.WXK_LEFT, wx.WXK_RIGHT,
            wx.WXK_UP, wx.WXK_DOWN, wx.WXK_PAGEUP, wx.WXK_PAGEDOWN)
@@ -259,6 +264,11 @@ class Shell(editwindow.EditWindow):
         self.reader.input = ''
         self.reader.isreading = False
 
+        # Collect the output of the commands, to display it in batches.
+        self.output = OutputBuffer(self._displayOutput,
+                                   lambda: wx.CallAfter(self.flushOutput))
+        self.maxScrollback = MAX_SCROLLBACK_LINES
+
         # Set up the interpreter.
         self.interp = Interpreter(locals=locals,
                                   rawin=self.raw_input,
@@ -390,6 +400,8 @@ class Shell(editwindow.EditWindow):
         """Free the CPU to do other things."""
         if self.waiting:
             time.sleep(0.05)
+        else:
+            self.flushOutput()
         event.Skip()
 
     def showIntro(self, text=''):
@@ -514,6 +526,18 @@ class Shell(editwindow.EditWindow):
         # commands/responses.
         controlDown = event.ControlDown()
         rawControlDown = event.RawControlDown()
+
+        # With an out-of-process interpreter the events keep being
+        # processed while a command runs: only allow interrupting it,
+        # moving around and copying.
+        if self.waiting and not self.reader.isreading:
+            if key in (wx.WXK_ESCAPE, wx.WXK_CANCEL) \
+               and hasattr(self.interp, 'interrupt'):
+                self.interp.interrupt()
+            elif key in NAVKEYS or ((controlDown or rawControlDown)
+                                    and key in (ord('C'), ord('c'))):
+                event.Skip()
+            return
         altDown = event.AltDown()
         shiftDown = event.ShiftDown()
         currpos = self.GetCurrentPos()
@@ -996,6 +1020,7 @@ class Shell(editwindow.EditWindow):
         self.waiting = True
         self.lastUpdate=None
         self.more = self.interp.push(command)
+        self.flushOutput()
         self.lastUpdate=None
         self.waiting = False
         del busy
@@ -1018,7 +1043,16 @@ class Shell(editwindow.EditWindow):
     def write(self, text):
         """Display text in the shell.
 
-        Replace line endings with OS-specific endings."""
+        Replace line endings with OS-specific endings. The output of the
+        commands waiting to be displayed is written first. When called
+        from another thread, the text is added to that output instead."""
+        if not wx.IsMainThread():
+            self.output.write(text)
+            return
+        self.flushOutput()
+        self._write(text)
+
+    def _write(self, text):
         text = self.fixLineEndings(text)
         self.AddText(text)
         self.EnsureCaretVisible()
@@ -1174,14 +1208,21 @@ class Shell(editwindow.EditWindow):
                 else:
                     self.run(command, prompt=False, verbose=True)
 
-    def autoCompleteShow(self, command, offset = 0):
-        """Display auto-completion popup list."""
+    def autoCompleteShow(self, command, offset = 0, prefix = ''):
+        """Display auto-completion popup list.
+
+        prefix is the part of the name already typed, if any."""
         self.AutoCompSetAutoHide(self.autoCompleteAutoHide)
         self.AutoCompSetIgnoreCase(self.autoCompleteCaseInsensitive)
+        kwds = {}
+        if prefix:
+            # Only get the names that can match.
+            kwds['prefix'] = prefix
         list = self.interp.getAutoCompleteList(command,
                     includeMagic=self.autoCompleteIncludeMagic,
                     includeSingle=self.autoCompleteIncludeSingle,
-                    includeDouble=self.autoCompleteIncludeDouble)
+                    includeDouble=self.autoCompleteIncludeDouble,
+                    **kwds)
         if list:
             options = ' '.join(list)
             #offset = 0
@@ -1235,7 +1276,8 @@ class Shell(editwindow.EditWindow):
                 #call AutoComplete
                 stoppos = self.promptPosEnd
                 textbefore = self.GetTextRange(stoppos, pointavailpos)
-                self.autoCompleteShow(textbefore, len (textbehind))
+                self.autoCompleteShow(textbefore, len (textbehind),
+                                      textbehind)
             else:
                 #call CallTips
                 cpos = pointavailpos
@@ -1259,11 +1301,45 @@ class Shell(editwindow.EditWindow):
 
     def writeOut(self, text):
         """Replacement for stdout."""
-        self.write(text)
+        self.output.write(text, 'Output')
+        self._flushOutputIfDue()
 
     def writeErr(self, text):
         """Replacement for stderr."""
-        self.write(text)
+        self.output.write(text, 'Error')
+        self._flushOutputIfDue()
+
+    def flushOutput(self):
+        """Display the output collected by writeOut and writeErr."""
+        # The shell may have been destroyed since this was scheduled.
+        if self and self.output.pending():
+            self.output.flush()
+
+    def _flushOutputIfDue(self):
+        # While a command runs the event loop is blocked, so the output is
+        # displayed from here every OUTPUT_FLUSH_TIME seconds.
+        if self.waiting and wx.IsMainThread() \
+           and time.time() - self.output.lastFlush > OUTPUT_FLUSH_TIME:
+            self.flushOutput()
+
+    def _displayOutput(self, kind, text):
+        self._write(text)
+        self.trimScrollback()
+
+    def trimScrollback(self):
+        """Delete the oldest lines if there are more than maxScrollback."""
+        if not self.maxScrollback:
+            return
+        extra = self.GetLineCount() - self.maxScrollback
+        if not self.waiting:
+            # Keep the prompt and the command being typed.
+            extra = min(extra, self.LineFromPosition(self.promptPosStart))
+        if extra <= 0:
+            return
+        end = self.PositionFromLine(extra)
+        self.DeleteRange(0, end)
+        self.promptPosStart = max(0, self.promptPosStart - end)
+        self.promptPosEnd = max(0, self.promptPosEnd - end)
 
     def redirectStdin(self, redirect=True):
         """If redirect is true then sys.stdin will come from the shell."""
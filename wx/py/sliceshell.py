@@ -31,6 +31,7 @@ from . import frame
 from .pseudo import PseudoFileIn
 from .pseudo import PseudoFileOut
 from .pseudo import PseudoFileErr
+from .pseudo import OutputBuffer
 from .version import VERSION
 from .magic import magic
 from .parse import testForContinuations
@@ -41,6 +42,8 @@ sys.ps3 = '<-- '  # Input prompt.
 USE_MAGIC=True
 # Force updates from long-running commands after this many seconds
 PRINT_UPDATE_MAX_TIME=2
+# Display the output of long-running commands after this many seconds
+OUTPUT_FLUSH_TIME=0.1
 
 NAVKEYS = (wx.WXK_HOME, wx.WXK_END, wx.WXK_LEFT, wx.WXK_RIGHT,
            wx.WXK_UP, wx.WXK_DOWN, wx.WXK_PAGEUP, wx.WXK_PAGEDOWN)
@@ -628,6 +631,10 @@ class SlicesShell(editwindow.EditWindow):
         self.reader.input = ''
         self.reader.isreading = False
 
+        # Collect the output of the commands, to display it in batches.
+        self.output = OutputBuffer(self._displayOutput,
+                                   lambda: wx.CallAfter(self.flushOutput))
+
         # Set up the interpreter.
         self.interp = Interpreter(locals=locals,
                                   rawin=self.raw_input,
@@ -960,6 +967,8 @@ class SlicesShell(editwindow.EditWindow):
         """Free the CPU to do other things."""
         if self.waiting:
             time.sleep(0.05)
+        else:
+            self.flushOutput()
         event.Skip()
 
     def showIntro(self, text=''):
@@ -1623,6 +1632,17 @@ class SlicesShell(editwindow.EditWindow):
         endpos = self.GetTextLength()
         selecting = self.GetSelectionStart() != self.GetSelectionEnd()
 
+        # With an out-of-process interpreter the events keep being
+        # processed while a command runs: only allow interrupting it,
+        # moving around and copying.
+        if self.waiting and not self.reader.isreading:
+            if key in (wx.WXK_ESCAPE, wx.WXK_CANCEL) \
+               and hasattr(self.interp, 'interrupt'):
+                self.interp.interrupt()
+            elif key in NAVKEYS or (controlDown and key in (ord('C'), ord('c'))):
+                event.Skip()
+            return
+
         if key == wx.WXK_F12: #seb
             if self.noteMode:
                 # self.promptPosStart not used anyway - or ?
@@ -2471,6 +2491,7 @@ class SlicesShell(editwindow.EditWindow):
             # I could do the following, but I don't really like it!
             #if useMultiCommand:
             #    self.SplitSlice()
+        self.flushOutput()
         self.lastUpdate=None
 
         if not silent:
@@ -2683,7 +2704,16 @@ class SlicesShell(editwindow.EditWindow):
     def write(self, text,type='Input',silent=False):
         """Display text in the slices shell.
 
-        Replace line endings with OS-specific endings."""
+        Replace line endings with OS-specific endings. The output of the
+        commands waiting to be displayed is written first. When called
+        from another thread, the text is added to that output instead."""
+        if not wx.IsMainThread():
+            self.output.write(text, type)
+            return
+        self.flushOutput()
+        self._write(text, type, silent)
+
+    def _write(self, text, type='Input', silent=False):
         text = self.fixLineEndings(text)
         split=text.split(os.linesep)
         self.AddText(text)
@@ -3061,14 +3091,21 @@ class SlicesShell(editwindow.EditWindow):
                 else:
                     self.run(command, prompt=False, verbose=True)
 
-    def autoCompleteShow(self, command, offset = 0):
-        """Display auto-completion popup list."""
+    def autoCompleteShow(self, command, offset = 0, prefix = ''):
+        """Display auto-completion popup list.
+
+        prefix is the part of the name already typed, if any."""
         self.AutoCompSetAutoHide(self.autoCompleteAutoHide)
         self.AutoCompSetIgnoreCase(self.autoCompleteCaseInsensitive)
+        kwds = {}
+        if prefix:
+            # Only get the names that can match.
+            kwds['prefix'] = prefix
         list = self.interp.getAutoCompleteList(command,
                     includeMagic=self.autoCompleteIncludeMagic,
                     includeSingle=self.autoCompleteIncludeSingle,
-                    includeDouble=self.autoCompleteIncludeDouble)
+                    includeDouble=self.autoCompleteIncludeDouble,
+                    **kwds)
         if list:
             options = ' '.join(list)
             #offset = 0
@@ -3127,7 +3164,8 @@ class SlicesShell(editwindow.EditWindow):
                 #call AutoComplete
                 stoppos = self.PositionFromLine(self.GetIOSlice()[0])
                 textbefore = self.GetTextRange(stoppos, pointavailpos)
-                self.autoCompleteShow(textbefore, len (textbehind))
+                self.autoCompleteShow(textbefore, len (textbehind),
+                                      textbehind)
             else:
                 #call CallTips
                 cpos = pointavailpos
@@ -3151,12 +3189,29 @@ class SlicesShell(editwindow.EditWindow):
 
     def writeOut(self, text):
         """Replacement for stdout."""
-        self.write(text,type='Output')
-        # TODO : FLUSH?? How to make this update real-time...
+        self.output.write(text, 'Output')
+        self._flushOutputIfDue()
 
     def writeErr(self, text):
         """Replacement for stderr."""
-        self.write(text,type='Error')
+        self.output.write(text, 'Error')
+        self._flushOutputIfDue()
+
+    def flushOutput(self):
+        """Display the output collected by writeOut and writeErr."""
+        # The shell may have been destroyed since this was scheduled.
+        if self and self.output.pending():
+            self.output.flush()
+
+    def _flushOutputIfDue(self):
+        # While a command runs the event loop is blocked, so the output is
+        # displayed from here every OUTPUT_FLUSH_TIME seconds.
+        if self.waiting and wx.IsMainThread() \
+           and time.time() - self.output.lastFlush > OUTPUT_FLUSH_TIME:
+            self.flushOutput()
+
+    def _displayOutput(self, kind, text):
+        self._write(text, type=kind)
 
     def redirectStdin(self, redirect=True):
         """If redirect is true then sys.stdin will come from the shell."""
@@ -79,8 +79,12 @@ will be adjusted accordingly.::
 
     bmp = img.ConvertToScaledBitmap(wx.Size(24,24), self)
 
+The bitmaps created by ``ConvertToScaledBitmap`` are cached, so asking again for
+the same size is cheap, and so are the graphics paths, brushes and pens that
+``RenderToGC`` creates for each kind of :class:`wx.GraphicsRenderer`.
+
 """
-from itertools import zip_longest
+from collections import OrderedDict
 
 import wx
 
@@ -97,6 +101,18 @@ class SVGimage(SVGimageBase):
     in wxPython applications.
     """
 
+    #: The number of bitmaps made by :meth:`ConvertToScaledBitmap` that are
+    #: kept for each image, the least recently used ones are dropped first.
+    BitmapCacheSize = 8
+
+    def __init__(self):
+        super().__init__()
+        # (width, height, scale factor) --> wx.Bitmap, in LRU order
+        self._bitmaps = OrderedDict()
+        # renderer type --> [(path, brush, pen, fill rule, opacity), ...]
+        self._gcShapes = {}
+
+
     def ConvertToBitmap(self, tx=0.0, ty=0.0, scale=1.0,
                         width=-1, height=-1, stride=-1):
         """
@@ -129,11 +145,24 @@ class SVGimage(SVGimageBase):
         :param wx.Window `window`: Adjust the size by this window's content scale factor, if supported on the platform
 
         :returns: :class:`wx.Bitmap`
+
+        .. note::
+            The most recently created bitmaps are cached and returned again
+            for the same size and scale factor, so they should not be
+            modified. See :meth:`ClearCache`.
         """
         size = wx.Size(*size)
+        factor = 1.0
         if window:
-            size.width = int(size.width * window.GetContentScaleFactor())
-            size.height = int(size.height * window.GetContentScaleFactor())
+            factor = window.GetContentScaleFactor()
+            size.width = int(size.width * factor)
+            size.height = int(size.height * factor)
+
+        key = (size.width, size.height, factor)
+        bmp = self._bitmaps.get(key)
+        if bmp is not None:
+            self._bitmaps.move_to_end(key)
+            return bmp
 
         # We can only have one overall scale factor for both dimensions with
         # this rasterization method, so chose either the minimum of width or
@@ -141,7 +170,21 @@ class SVGimage(SVGimageBase):
         sx = size.width / self.width
         sy = size.height / self.height
         scale = min(sx, sy)
-        return self.ConvertToBitmap(scale=scale, width=size.width, height=size.height)
+        bmp = self.ConvertToBitmap(scale=scale, width=size.width, height=size.height)
+
+        self._bitmaps[key] = bmp
+        if len(self._bitmaps) > self.BitmapCacheSize:
+            self._bitmaps.popitem(last=False)
+        return bmp
+
+
+    def ClearCache(self):
+        """
+        Forgets the bitmaps cached by :meth:`ConvertToScaledBitmap` and the
+        paths, brushes and pens kept by :meth:`RenderToGC`.
+        """
+        self._bitmaps.clear()
+        self._gcShapes.clear()
 
 
     def RenderToGC(self, ctx, scale=None, size=None):
@@ -173,23 +216,9 @@ class SVGimage(SVGimageBase):
                 sy = size.height / self.height
                 ctx.Scale(sx, sy)
 
-            for shape in self.shapes:
-                if not shape.flags & SVG_FLAGS_VISIBLE:
-                    continue
-                if shape.opacity != 1.0:
-                    ctx.BeginLayer(shape.opacity)
-                brush = self._makeBrush(ctx, shape)
-                pen = self._makePen(ctx, shape)
-
-                rule = { SVG_FILLRULE_NONZERO : wx.WINDING_RULE,
-                        SVG_FILLRULE_EVENODD : wx.ODDEVEN_RULE }.get(shape.fillRule, 0)
-
-                # The shape's path is comprised of one or more subpaths, collect
-                # and accumulate them in a new GraphicsPath
-                path = ctx.CreatePath()
-                for svg_path in shape.paths:
-                    subpath = self._makeSubPath(ctx, svg_path)
-                    path.AddPath(subpath)
+            for path, brush, pen, rule, opacity in self._getGCShapes(ctx):
+                if opacity != 1.0:
+                    ctx.BeginLayer(opacity)
 
                 # Draw the combined set of paths, using the given pen and brush to
                 # fill and stroke the shape.
@@ -197,20 +226,52 @@ class SVGimage(SVGimageBase):
                 ctx.SetPen(pen)
                 ctx.DrawPath(path, rule)
 
-                if shape.opacity != 1.0:
+                if opacity != 1.0:
                     ctx.EndLayer()
         finally:
             ctx.Flush()
             ctx.PopState()
 
 
+    def _getGCShapes(self, ctx):
+        # The paths, brushes and pens only depend on the renderer, so they are
+        # made once for each kind of renderer and reused.
+        renderer = ctx.GetRenderer().GetType()
+        gcshapes = self._gcShapes.get(renderer)
+        if gcshapes is not None:
+            return gcshapes
+
+        gcshapes = []
+        for shape in self.shapes:
+            if not shape.flags & SVG_FLAGS_VISIBLE:
+                continue
+            brush = self._makeBrush(ctx, shape)
+            pen = self._makePen(ctx, shape)
+
+            rule = { SVG_FILLRULE_NONZERO : wx.WINDING_RULE,
+                    SVG_FILLRULE_EVENODD : wx.ODDEVEN_RULE }.get(shape.fillRule, 0)
+
+            # The shape's path is comprised of one or more subpaths, collect
+            # and accumulate them in a new GraphicsPath
+            path = ctx.CreatePath()
+            for svg_path in shape.paths:
+                subpath = self._makeSubPath(ctx, svg_path)
+                path.AddPath(subpath)
+
+            gcshapes.append((path, brush, pen, rule, shape.opacity))
+
+        self._gcShapes[renderer] = gcshapes
+        return gcshapes
+
+
     def _makeSubPath(self, ctx, svg_path):
-        points = svg_path.points
+        # All the points are fetched in one block: x0,y0, then 6 floats for
+        # each curve
+        pts = svg_path.pts_view.tolist()
         path = ctx.CreatePath()
-        x, y = points[0]
-        path.MoveToPoint(x,y)
-        for (cx1, cy1), (cx2, cy2), (x,y) in _chunker(points[1:], 3, (0,0)):
-            path.AddCurveToPoint(cx1, cy1, cx2, cy2, x,y)
+        path.MoveToPoint(pts[0], pts[1])
+        for i in range(2, len(pts) - 5, 6):
+            path.AddCurveToPoint(*pts[i:i+6])
         if svg_path.closed:
             path.CloseSubpath()
         return path
@@ -356,8 +417,3 @@ class SVGimage(SVGimageBase):
         return pen
 
 
-def _chunker(iterable, n, fillvalue=None):
-    "Collect items from an iterable into fixed-length chunks or blocks"
-    args = [iter(iterable)] * n
-    return zip_longest(fillvalue=fillvalue, *args)
-
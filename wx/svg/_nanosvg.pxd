@@ -112,4 +112,4 @@ cdef extern from 'nanosvgrast.h':
     cdef void nsvgRasterize(
             NSVGrasterizer* r,
             NSVGimage* image, float tx, float ty, float scale,
-            unsigned char* dst, int w, int h, int stride)
+            unsigned char* dst, int w, int h, int stride) nogil
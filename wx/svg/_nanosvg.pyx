@@ -41,10 +41,12 @@ for manipulating the SVG shape info in memory.
 """
 
 import sys
+import threading
 
 from cpython.buffer cimport (
     Py_buffer, PyObject_CheckBuffer, PyObject_GetBuffer, PyBUF_SIMPLE,
     PyBuffer_Release)
+from cpython.bytes cimport PyBytes_FromStringAndSize
 
 #----------------------------------------------------------------------------
 # Replicate the C enums and values for Python, dropping the leading 'N'
@@ -94,10 +96,13 @@ cdef class SVGimageBase:
     """
     cdef NSVGimage *_ptr
     cdef NSVGrasterizer *_rasterizer
+    # held while the image is rasterized, as the GIL is not
+    cdef object _lock
 
     def __cinit__(self):
         self._ptr = NULL
         self._rasterizer = NULL
+        self._lock = threading.Lock()
 
     def __dealloc__(self):
         if self._ptr != NULL:
@@ -110,14 +115,16 @@ cdef class SVGimageBase:
             raise ValueError("SVG not yet loaded")
 
     cdef _set_ptr(self, NSVGimage *ptr, str errmsg='Unable to parse SVG'):
-        if self._ptr != NULL:
-            nsvgDelete(self._ptr)
-        if self._rasterizer != NULL:
-            nsvgDeleteRasterizer(self._rasterizer)
-            self._rasterizer = NULL
-        if ptr == NULL:
-            raise ValueError(errmsg)
-        self._ptr = ptr
+        with self._lock:
+            if self._ptr != NULL:
+                nsvgDelete(self._ptr)
+                self._ptr = NULL
+            if self._rasterizer != NULL:
+                nsvgDeleteRasterizer(self._rasterizer)
+                self._rasterizer = NULL
+            if ptr == NULL:
+                raise ValueError(errmsg)
+            self._ptr = ptr
 
 
     @staticmethod
@@ -197,6 +204,8 @@ cdef class SVGimageBase:
         and be at least ``width * height * 4`` bytes long. Possibilities include
         bytearrays, memoryviews, numpy arrays, etc.
 
+        As with :meth:`Rasterize`, the GIL is released while rendering.
+
         :param `buf`: An object supporting the buffer protocol where the RGBA bytes will be written
         :param float `tx`: Image horizontal offset (applied after scaling)
         :param float `ty`: Image vertical offset (applied after scaling)
@@ -206,9 +215,6 @@ cdef class SVGimageBase:
         :param int `stride`: number of bytes per scan line in the destination buffer, typically ``width * 4``
         """
         self._check_ptr()
-        if self._rasterizer == NULL:
-            self._rasterizer = nsvgCreateRasterizer()
-
         if width == -1:
             width = self.width
         if height == -1:
@@ -226,9 +232,15 @@ cdef class SVGimageBase:
             PyBuffer_Release(&view)
             raise ValueError("Buffer object is smaller than height * stride")
 
-        nsvgRasterize(self._rasterizer, self._ptr, tx, ty, scale, <unsigned char*>view.buf,
-                      width, height, stride)
-        PyBuffer_Release(&view)
+        try:
+            with self._lock:
+                if self._rasterizer == NULL:
+                    self._rasterizer = nsvgCreateRasterizer()
+                with nogil:
+                    nsvgRasterize(self._rasterizer, self._ptr, tx, ty, scale,
+                                  <unsigned char*>view.buf, width, height, stride)
+        finally:
+            PyBuffer_Release(&view)
 
 
     def Rasterize(self, float tx=0.0, float ty=0.0, float scale=1.0,
@@ -236,6 +248,10 @@ cdef class SVGimageBase:
         """
         Renders the SVG image to a ``bytes`` object as a series of RGBA values.
 
+        The GIL is released while rendering, so this can be done in a worker
+        thread. The rasterizer of the image is shared, so when several threads
+        render the same image they take turns.
+
         :param float `tx`: Image horizontal offset (applied after scaling)
         :param float `ty`: Image vertical offset (applied after scaling)
         :param float `scale`: Image scale
@@ -246,9 +262,6 @@ cdef class SVGimageBase:
         :returns: A bytearray object containing the raw RGBA pixel color values
         """
         self._check_ptr()
-        if self._rasterizer == NULL:
-            self._rasterizer = nsvgCreateRasterizer()
-
         if width == -1:
             width = self.width
         if height == -1:
@@ -257,8 +270,13 @@ cdef class SVGimageBase:
             stride = width * 4;
 
         buf = bytes(bytearray(height * stride))
-        nsvgRasterize(self._rasterizer, self._ptr, tx, ty, scale, buf,
-                      width, height, stride)
+        cdef unsigned char *dst = buf
+        with self._lock:
+            if self._rasterizer == NULL:
+                self._rasterizer = nsvgCreateRasterizer()
+            with nogil:
+                nsvgRasterize(self._rasterizer, self._ptr, tx, ty, scale, dst,
+                              width, height, stride)
         return buf
 
     @property
@@ -460,12 +478,25 @@ cdef class SVGpath:
     @property
     def pts(self) -> list:
         """
-        Cubic bezier points: x0,y0, [cpx1,cpx1,cpx2,cpy2,x1,y1], ...
+        Cubic bezier points: x0,y0, [cpx1,cpy1,cpx2,cpy2,x1,y1], ...
         The return value is a list of floats.
         """
         self._check_ptr()
         return [self._ptr.pts[i] for i in range(self._ptr.npts*2)]
 
+    @property
+    def pts_view(self):
+        """
+        Cubic bezier points: x0,y0, [cpx1,cpy1,cpx2,cpy2,x1,y1], ...
+        The return value is a read-only memoryview of the floats, copied in
+        one block. It can be used with ``numpy.asarray`` without copying them
+        again, or turned into a list with ``tolist()``.
+        """
+        self._check_ptr()
+        data = PyBytes_FromStringAndSize(<char*>self._ptr.pts,
+                                         self._ptr.npts * 2 * sizeof(float))
+        return memoryview(data).cast('f')
+
     @property
     def npts(self) -> int:
         """Number of points"""
@@ -475,7 +506,7 @@ cdef class SVGpath:
     @property
     def points(self) -> list:
         """
-        Cubic bezier points: (x0,y0), [(cpx1,cpx1), (cpx2,cpy2), (x1,y1)], ...
+        Cubic bezier points: (x0,y0), [(cpx1,cpy1), (cpx2,cpy2), (x1,y1)], ...
         The return value is a list of tuples, each containing an x-y pair.
         """
         self._check_ptr()
@@ -0,0 +1,380 @@
+#----------------------------------------------------------------------
+# Name:        wx.svg.bundle
+# Purpose:     A wx.BitmapBundle implementation using wx.svg, with a
+#              process-wide cache of the rasterized bitmaps.
+#
+# Created:     18-October-2026
+# Licence:     wxWindows license
+#----------------------------------------------------------------------
+"""
+A :class:`wx.BitmapBundle` implementation that draws its bitmaps from an SVG
+image with :class:`wx.svg.SVGimage`, so that icons look sharp at any display
+scale instead of being scaled up from a fixed size PNG.
+
+Each SVG document is parsed only once, however many bundles are made from it.
+The bitmaps are rasterized lazily, the first time a size is asked for, and the
+sizes needed for the displays of the system are rasterized in advance in a
+worker thread. The bitmaps are kept in a cache shared by all the bundles of
+the process, which drops the least recently used ones when it grows past
+its memory limit, see :func:`GetBitmapCache`.
+
+Example::
+
+    import wx.svg.bundle
+
+    bundle = wx.svg.bundle.BitmapBundleFromSVGFile('open.svg', (24, 24))
+    toolbar.AddTool(wx.ID_OPEN, 'Open', bundle)
+
+"""
+
+import functools
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent import futures
+
+import wx
+from . import SVGimage
+
+#: The default memory limit of the bitmap cache, in bytes.
+DEFAULT_CACHE_SIZE = 32 * 1024 * 1024
+
+
+class BitmapCache(object):
+    """
+    A cache of :class:`wx.Bitmap` objects with a memory limit. The least
+    recently used bitmaps are dropped first when the limit is reached.
+
+    The cache is only used from the GUI thread, like the bitmaps it holds.
+    """
+
+    def __init__(self, maxBytes=DEFAULT_CACHE_SIZE):
+        """
+        Default class constructor.
+
+        :param integer `maxBytes`: the memory limit of the cache, in bytes.
+        """
+
+        self._maxBytes = maxBytes
+        self._bytes = 0
+        # key --> (wx.Bitmap, size in bytes), in LRU order
+        self._items = OrderedDict()
+
+
+    def Get(self, key):
+        """
+        Returns the bitmap cached for `key`, or ``None``.
+
+        :param `key`: a hashable key.
+        """
+
+        item = self._items.get(key)
+        if item is None:
+            return None
+        self._items.move_to_end(key)
+        return item[0]
+
+
+    def Put(self, key, bmp, nbytes):
+        """
+        Adds a bitmap to the cache, dropping the least recently used ones if
+        the cache gets too big.
+
+        :param `key`: a hashable key;
+        :param wx.Bitmap `bmp`: the bitmap;
+        :param integer `nbytes`: the memory used by the bitmap, in bytes.
+        """
+
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._items[key] = (bmp, nbytes)
+        self._bytes += nbytes
+        self.Trim()
+
+
+    def Trim(self):
+        """ Drops the least recently used bitmaps until the cache fits in its limit. """
+
+        while self._bytes > self._maxBytes and self._items:
+            key, (bmp, nbytes) = self._items.popitem(last=False)
+            self._bytes -= nbytes
+
+
+    def Clear(self):
+        """ Drops all the cached bitmaps. """
+
+        self._items.clear()
+        self._bytes = 0
+
+
+    def GetMaxBytes(self):
+        """ Returns the memory limit of the cache, in bytes. """
+
+        return self._maxBytes
+
+
+    def SetMaxBytes(self, maxBytes):
+        """
+        Sets the memory limit of the cache.
+
+        :param integer `maxBytes`: the new limit, in bytes.
+        """
+
+        self._maxBytes = maxBytes
+        self.Trim()
+
+
+    def GetBytes(self):
+        """ Returns the memory used by the cached bitmaps, in bytes. """
+
+        return self._bytes
+
+
+    def __len__(self):
+        return len(self._items)
+
+
+_cache = BitmapCache()
+
+# digest of the SVG data --> SVGSource
+_sources = weakref.WeakValueDictionary()
+_sourcesLock = threading.Lock()
+
+_executor = None
+
+
+def GetBitmapCache():
+    """
+    Returns the :class:`BitmapCache` shared by all the SVG bitmap bundles.
+    Use its :meth:`~BitmapCache.SetMaxBytes` method to change the memory limit.
+    """
+
+    return _cache
+
+
+def _PrefetchDone(source, width, height, future):
+    # called in the worker thread, the application may be gone already
+    try:
+        wx.CallAfter(source.Prefetched, width, height, future)
+    except Exception:
+        pass
+
+
+def _GetExecutor():
+    global _executor
+    if _executor is None:
+        _executor = futures.ThreadPoolExecutor(max_workers=1,
+                                               thread_name_prefix='wx.svg')
+    return _executor
+
+
+class SVGSource(object):
+    """
+    A parsed SVG document, shared by all the bundles made from the same data.
+    """
+
+    def __init__(self, image, key):
+        """
+        Default class constructor.
+
+        :param `image`: a :class:`wx.svg.SVGimage`;
+        :param `key`: the key identifying the SVG data.
+        """
+
+        self.image = image
+        self.key = key
+        # bitmap size --> future of the RGBA bytes being rasterized in the
+        # worker, only used from the GUI thread. The bytes are moved to the
+        # cache as soon as they are ready, so they count against its limit.
+        self.pending = {}
+
+
+    def Rasterize(self, width, height):
+        """
+        Renders the image, scaled to fit in the given size, and returns the
+        RGBA bytes. This can be called from any thread, the image takes care
+        of rasterizing for one thread at a time.
+
+        :param integer `width`: the width of the bitmap, in pixels;
+        :param integer `height`: the height of the bitmap, in pixels.
+        """
+
+        img = self.image
+        scale = min(width / img.width, height / img.height)
+        return img.Rasterize(0.0, 0.0, scale, width, height)
+
+
+    def Prefetched(self, width, height, future):
+        """
+        Called on the GUI thread when a bitmap rasterized in advance is ready,
+        to move it from the pending ones to the cache.
+
+        :param integer `width`: the width of the bitmap, in pixels;
+        :param integer `height`: the height of the bitmap, in pixels;
+        :param `future`: the future of the RGBA bytes.
+        """
+
+        if self.pending.get((width, height)) is not future:
+            # it was taken by GetBitmap already
+            return
+        del self.pending[(width, height)]
+        if future.cancelled() or future.exception() is not None:
+            return
+        key = (self.key, width, height)
+        if _cache.Get(key) is None:
+            bmp = wx.Bitmap.FromBufferRGBA(width, height, future.result())
+            _cache.Put(key, bmp, width * height * 4)
+
+
+def GetSVGSource(data, copy=True):
+    """
+    Returns the :class:`SVGSource` for the given SVG data, parsing it only if
+    no bundle made from the same data is alive.
+
+    :param bytes `data`: the SVG document;
+    :param boolean `copy`: if ``False``, the data is parsed in place, which
+     modifies it. Only use this if `data` is not used anywhere else.
+    """
+
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    key = hashlib.sha1(data).digest()
+    with _sourcesLock:
+        source = _sources.get(key)
+        if source is None:
+            image = SVGimage.CreateFromBytes(data, do_copy=copy)
+            source = SVGSource(image, key)
+            _sources[key] = source
+    return source
+
+
+class SVGBitmapBundleImpl(wx.BitmapBundleImpl):
+    """
+    A :class:`wx.BitmapBundleImpl` drawing its bitmaps from an SVG document.
+    Use :func:`BitmapBundleFromSVG` to make a :class:`wx.BitmapBundle` with it.
+    """
+
+    def __init__(self, source, size):
+        """
+        Default class constructor.
+
+        :param `source`: a :class:`SVGSource`;
+        :param wx.Size `size`: the default size of the bitmaps, in pixels.
+        """
+
+        wx.BitmapBundleImpl.__init__(self)
+        self._source = source
+        self._size = wx.Size(*size)
+
+
+    def GetDefaultSize(self):
+        """ Returns the default size of the bitmaps. """
+
+        return self._size
+
+
+    def GetPreferredBitmapSizeAtScale(self, scale):
+        """
+        Returns the size of the bitmap for the given display scale. Any size
+        can be drawn, so it is just the default size scaled.
+
+        :param float `scale`: the display scale factor.
+        """
+
+        return wx.Size(int(round(self._size.width * scale)),
+                       int(round(self._size.height * scale)))
+
+
+    def GetBitmap(self, size):
+        """
+        Returns the bitmap of the given size, from the cache if possible.
+
+        :param wx.Size `size`: the size of the bitmap, in pixels.
+        """
+
+        size = wx.Size(*size)
+        if size.width <= 0 or size.height <= 0:
+            size = self._size
+        width, height = size.width, size.height
+
+        key = (self._source.key, width, height)
+        bmp = _cache.Get(key)
+        if bmp is not None:
+            return bmp
+
+        future = self._source.pending.pop((width, height), None)
+        if future is not None:
+            # it is already being rasterized, or is done
+            buf = future.result()
+        else:
+            buf = self._source.Rasterize(width, height)
+
+        bmp = wx.Bitmap.FromBufferRGBA(width, height, buf)
+        _cache.Put(key, bmp, width * height * 4)
+        return bmp
+
+
+    def Prefetch(self, scales=None):
+        """
+        Starts rasterizing the bitmaps for the given display scales in the
+        worker thread, so that they are ready when they are needed.
+
+        :param `scales`: a list of scale factors, by default the scale factors
+         of all the displays.
+        """
+
+        if scales is None:
+            scales = [wx.Display(i).GetScaleFactor()
+                      for i in range(wx.Display.GetCount())]
+
+        for scale in set(scales):
+            size = self.GetPreferredBitmapSizeAtScale(scale)
+            width, height = size.width, size.height
+            if _cache.Get((self._source.key, width, height)) is not None:
+                continue
+            pending = self._source.pending
+            if (width, height) not in pending:
+                future = _GetExecutor().submit(self._source.Rasterize,
+                                               width, height)
+                pending[(width, height)] = future
+                future.add_done_callback(functools.partial(
+                    _PrefetchDone, self._source, width, height))
+
+
+def BitmapBundleFromSVG(data, size, prefetch=True):
+    """
+    Returns a :class:`wx.BitmapBundle` drawing its bitmaps from an SVG
+    document.
+
+    :param bytes `data`: the SVG document;
+    :param wx.Size `size`: the default size of the bitmaps, in pixels;
+    :param boolean `prefetch`: if ``True``, the bitmaps for the scale factors of
+     the displays are rasterized in advance, in a worker thread.
+    """
+
+    impl = SVGBitmapBundleImpl(GetSVGSource(data), size)
+    if prefetch and wx.GetApp() is not None:
+        impl.Prefetch()
+    return wx.BitmapBundle.FromImpl(impl)
+
+
+def BitmapBundleFromSVGFile(filename, size, prefetch=True):
+    """
+    Returns a :class:`wx.BitmapBundle` drawing its bitmaps from an SVG file.
+
+    :param string `filename`: the name of the SVG file;
+    :param wx.Size `size`: the default size of the bitmaps, in pixels;
+    :param boolean `prefetch`: if ``True``, the bitmaps for the scale factors of
+     the displays are rasterized in advance, in a worker thread.
+    """
+
+    with open(filename, 'rb') as f:
+        data = f.read()
+
+    # nobody else has the data, so it doesn't need to be copied for parsing
+    impl = SVGBitmapBundleImpl(GetSVGSource(data, copy=False), size)
+    if prefetch and wx.GetApp() is not None:
+        impl.Prefetch()
+    return wx.BitmapBundle.FromImpl(impl)